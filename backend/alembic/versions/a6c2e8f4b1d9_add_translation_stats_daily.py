@@ -0,0 +1,63 @@
+"""Add translation_stats_daily rollup table
+
+Revision ID: a6c2e8f4b1d9
+Revises: f3a9d5b7c2e4
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6c2e8f4b1d9"
+down_revision: str | None = "f3a9d5b7c2e4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "translation_stats_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("service_used", sa.String(length=50), nullable=False),
+        sa.Column("target_language", sa.String(length=10), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("translations", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("characters_billed", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("deepl_characters", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("google_characters", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("memory_chars_saved", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day", "service_used", "target_language", "status"),
+    )
+    # Backfill from the existing log; new rows are rolled up as they are written
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO translation_stats_daily (
+                day, service_used, target_language, status, translations,
+                characters_billed, deepl_characters, google_characters, memory_chars_saved
+            )
+            SELECT
+                CAST(timezone('UTC', timestamp) AS DATE),
+                service_used,
+                target_language,
+                COALESCE(status, 'success'),
+                COUNT(*),
+                COALESCE(SUM(characters_billed), 0),
+                COALESCE(SUM(deepl_characters), 0),
+                COALESCE(SUM(google_characters), 0),
+                COALESCE(SUM(memory_chars_saved), 0)
+            FROM translation_log
+            WHERE timestamp IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("translation_stats_daily")
@@ -0,0 +1,50 @@
+"""Add imdb_lookup_cache table
+
+Revision ID: a7c1e9d2f4b8
+Revises: 50c5b9471d51
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c1e9d2f4b8"
+down_revision: str | None = "50c5b9471d51"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "imdb_lookup_cache",
+        sa.Column("lookup_key", sa.String(length=600), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("content_type", sa.String(length=16), nullable=False),
+        sa.Column("imdb_id", sa.String(length=16), nullable=True),
+        sa.Column("found_type", sa.String(length=16), nullable=True),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("lookup_key"),
+    )
+    op.create_index(
+        op.f("ix_imdb_lookup_cache_title"), "imdb_lookup_cache", ["title"], unique=False
+    )
+    op.create_index(
+        op.f("ix_imdb_lookup_cache_expires_at"),
+        "imdb_lookup_cache",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_imdb_lookup_cache_expires_at"), table_name="imdb_lookup_cache")
+    op.drop_index(op.f("ix_imdb_lookup_cache_title"), table_name="imdb_lookup_cache")
+    op.drop_table("imdb_lookup_cache")
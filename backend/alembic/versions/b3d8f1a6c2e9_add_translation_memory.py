@@ -0,0 +1,61 @@
+"""Add translation_memory table and memory stats to translation_log
+
+Revision ID: b3d8f1a6c2e9
+Revises: a7c1e9d2f4b8
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d8f1a6c2e9"
+down_revision: str | None = "a7c1e9d2f4b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "translation_memory",
+        sa.Column("key_hash", sa.String(length=64), nullable=False),
+        sa.Column("source_language", sa.String(length=10), nullable=False),
+        sa.Column("target_language", sa.String(length=10), nullable=False),
+        sa.Column("source_text", sa.Text(), nullable=False),
+        sa.Column("translated_text", sa.Text(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key_hash"),
+    )
+    op.create_index(
+        op.f("ix_translation_memory_last_used_at"),
+        "translation_memory",
+        ["last_used_at"],
+        unique=False,
+    )
+
+    with op.batch_alter_table("translation_log", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("segments_total", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("memory_hits", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("memory_chars_saved", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("translation_log", schema=None) as batch_op:
+        batch_op.drop_column("memory_chars_saved")
+        batch_op.drop_column("memory_hits")
+        batch_op.drop_column("segments_total")
+
+    op.drop_index(op.f("ix_translation_memory_last_used_at"), table_name="translation_memory")
+    op.drop_table("translation_memory")
@@ -0,0 +1,33 @@
+"""Add keyset pagination indexes for the job list
+
+Revision ID: b7d3f9a5c2e8
+Revises: a6c2e8f4b1d9
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f9a5c2e8"
+down_revision: str | None = "a6c2e8f4b1d9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_jobs_submitted_at_id", "jobs", ["submitted_at", "id"], unique=False)
+    op.create_index(
+        "ix_jobs_user_id_submitted_at_id", "jobs", ["user_id", "submitted_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_jobs_status_submitted_at_id", "jobs", ["status", "submitted_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_submitted_at_id", table_name="jobs")
+    op.drop_index("ix_jobs_user_id_submitted_at_id", table_name="jobs")
+    op.drop_index("ix_jobs_submitted_at_id", table_name="jobs")
@@ -0,0 +1,36 @@
+"""Add updated_at to app_settings
+
+Revision ID: c4e2a7b9d1f3
+Revises: b3d8f1a6c2e9
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e2a7b9d1f3"
+down_revision: str | None = "b3d8f1a6c2e9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("app_settings", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.text("now()"),
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("app_settings", schema=None) as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,30 @@
+"""Add job log archive pointer columns
+
+Revision ID: c4e8a2f6d1b3
+Revises: b7d3f9a5c2e8
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a2f6d1b3"
+down_revision: str | None = "b7d3f9a5c2e8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Full output now lives in compressed files; jobs.full_logs is kept for older rows
+    op.add_column("jobs", sa.Column("log_path", sa.String(length=255), nullable=True))
+    op.add_column("jobs", sa.Column("log_size", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "log_size")
+    op.drop_column("jobs", "log_path")
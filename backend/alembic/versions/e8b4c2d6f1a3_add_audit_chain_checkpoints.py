@@ -0,0 +1,41 @@
+"""Add audit_chain_checkpoints table and chain-order index
+
+Revision ID: e8b4c2d6f1a3
+Revises: d7a3f5c1e8b2
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4c2d6f1a3"
+down_revision: str | None = "d7a3f5c1e8b2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_chain_checkpoints",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("last_log_id", sa.BigInteger(), nullable=True),
+        sa.Column("last_timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_event_hash", sa.String(length=64), nullable=True),
+        sa.Column("verified_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("issue_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_issue", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Created on the partitioned parent, so every monthly partition gets it
+    op.create_index("ix_audit_chain_order", "audit_logs", ["timestamp", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_chain_order", table_name="audit_logs")
+    op.drop_table("audit_chain_checkpoints")
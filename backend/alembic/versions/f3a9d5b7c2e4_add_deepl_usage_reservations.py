@@ -0,0 +1,33 @@
+"""Add reservation columns to deepl_usage
+
+Revision ID: f3a9d5b7c2e4
+Revises: e8b4c2d6f1a3
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9d5b7c2e4"
+down_revision: str | None = "e8b4c2d6f1a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("deepl_usage", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("reserved_count", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("reserved_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("deepl_usage", schema=None) as batch_op:
+        batch_op.drop_column("reserved_at")
+        batch_op.drop_column("reserved_count")
@@ -2,10 +2,11 @@
 import logging
 import uuid
 from collections.abc import Sequence
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
-from sqlalchemy import bindparam
+from sqlalchemy import bindparam, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select  # For SQLAlchemy 1.4+ style select
 from sqlalchemy.orm import selectinload
@@ -20,6 +21,7 @@ from app.core.users import (
     get_user_manager,
 )
 from app.db.models.app_settings import AppSettings
+from app.db.models.imdb_lookup_cache import ImdbLookupCache
 from app.db.models.user import User  # For ORM operations and type hinting
 from app.db.session import get_async_session
 from app.schemas.user import AdminUserUpdate, UserCreate, UserRead, UserRole  # Pydantic schemas
@@ -36,6 +38,18 @@ class OpenSignupUpdate(BaseModel):
     open_signup: bool
 
 
+class ImdbCacheStats(BaseModel):
+    total_entries: int
+    positive_entries: int
+    negative_entries: int
+    expired_entries: int
+    total_hits: int
+
+
+class ImdbCachePurgeResponse(BaseModel):
+    deleted: int
+
+
 admin_router = APIRouter(
     tags=["Admins - Admin Management"],
     dependencies=[Depends(get_current_active_admin_user)],  # Protects all routes in this router
@@ -474,3 +488,93 @@ async def update_open_signup_setting(
     )
 
     return OpenSignupResponse(open_signup=app_settings.open_signup)
+
+
+# --- IMDb ID Lookup Cache ---
+
+
+@admin_router.get(
+    "/imdb-cache",
+    response_model=ImdbCacheStats,
+    summary="Get IMDb ID lookup cache statistics (Admin only)",
+    description="Entry counts (positive/negative/expired) and accumulated hits of the cache.",
+)
+async def get_imdb_cache_stats(
+    session: AsyncSession = Depends(get_async_session),
+) -> ImdbCacheStats:
+    now = datetime.now(UTC)
+    row = (
+        await session.execute(
+            select(
+                func.count(),
+                func.count(ImdbLookupCache.imdb_id),
+                func.count().filter(ImdbLookupCache.expires_at <= now),
+                func.coalesce(func.sum(ImdbLookupCache.hit_count), 0),
+            )
+        )
+    ).one()
+    total, positive, expired, hits = row
+    return ImdbCacheStats(
+        total_entries=total,
+        positive_entries=positive,
+        negative_entries=total - positive,
+        expired_entries=expired,
+        total_hits=hits,
+    )
+
+
+@admin_router.delete(
+    "/imdb-cache",
+    response_model=ImdbCachePurgeResponse,
+    summary="Purge IMDb ID lookup cache entries (Admin only)",
+    description=(
+        "Deletes cached IMDb ID lookups. Without filters the whole cache is cleared; "
+        "`title` limits the purge to one (normalized) title, `negative_only` to "
+        "'not found' entries and `expired_only` to entries past their TTL."
+    ),
+)
+async def purge_imdb_cache(
+    title: str | None = Query(None, max_length=500),
+    negative_only: bool = Query(False),
+    expired_only: bool = Query(False),
+    current_user: User = Depends(get_current_active_admin_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> ImdbCachePurgeResponse:
+    from app.modules.subtitle.services.imdb_cache import normalize_title
+
+    stmt = delete(ImdbLookupCache)
+    if title:
+        stmt = stmt.where(ImdbLookupCache.title == normalize_title(title))
+    if negative_only:
+        stmt = stmt.where(ImdbLookupCache.imdb_id.is_(None))
+    if expired_only:
+        stmt = stmt.where(ImdbLookupCache.expires_at <= datetime.now(UTC))
+
+    result = await session.execute(stmt)
+    deleted = getattr(result, "rowcount", 0) or 0
+
+    from app.services import audit_service
+
+    await audit_service.log_event(
+        session,
+        category="admin",
+        action="admin.imdb_cache_purged",
+        severity="info",
+        actor_user_id=current_user.id,
+        details={
+            "title": title,
+            "negative_only": negative_only,
+            "expired_only": expired_only,
+            "deleted": deleted,
+        },
+    )
+    await session.commit()
+    logger.info(
+        "Admin %s purged %d IMDb cache entries (title=%s, negative_only=%s, expired_only=%s)",
+        _sanitize_for_log(current_user.email),
+        deleted,
+        _sanitize_for_log(title or ""),
+        negative_only,
+        expired_only,
+    )
+    return ImdbCachePurgeResponse(deleted=deleted)
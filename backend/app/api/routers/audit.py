@@ -7,7 +7,7 @@ Provides:
 - Get single audit entry
 - Export logs (async job)
 - Aggregate statistics
-- Verify integrity (hash chain)
+- Verify integrity (hash chain), on the latest entries or incrementally (async job)
 """
 
 import logging
@@ -29,6 +29,7 @@ from app.db.models.user import User
 from app.db.session import get_async_session
 from app.services import audit_service
 from app.tasks.audit_export import EXPORT_DIR, run_audit_export
+from app.tasks.audit_verify import verify_audit_chain_task
 from app.tasks.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
@@ -379,9 +380,7 @@ async def export_audit_logs(
     return AuditExportResponse(job_id=task.id)
 
 
-@audit_router.get("/export/status/{job_id}", response_model=AuditExportStatus)
-async def get_export_status(job_id: str) -> AuditExportStatus:
-    """Get the status of an export job."""
+def _task_status(job_id: str) -> AuditExportStatus:
     res = celery_app.AsyncResult(job_id)
     if res.state == "PENDING":
         return AuditExportStatus(status="PENDING")
@@ -394,6 +393,12 @@ async def get_export_status(job_id: str) -> AuditExportStatus:
     return AuditExportStatus(status=res.state)
 
 
+@audit_router.get("/export/status/{job_id}", response_model=AuditExportStatus)
+async def get_export_status(job_id: str) -> AuditExportStatus:
+    """Get the status of an export job."""
+    return _task_status(job_id)
+
+
 @audit_router.get("/export/download/{filename}")
 async def download_audit_export(filename: str) -> FileResponse:
     """Download a completed audit log export file."""
@@ -440,6 +445,30 @@ async def verify_audit_integrity(
     )
 
 
+@audit_router.post("/verify/chain", response_model=AuditExportResponse)
+async def start_chain_verification(
+    db: Annotated[AsyncSession, Depends(get_async_session)],
+    reset: bool = Query(False, description="Verify the full history, not just new entries"),
+) -> AuditExportResponse:
+    """Start verifying the hash chain from the last checkpoint (async job)."""
+    await audit_service.log_event(
+        db,
+        category="admin",
+        action="admin.audit.verify",
+        details={"mode": "chain", "reset": reset},
+    )
+    await db.commit()
+
+    task = verify_audit_chain_task.delay(reset=reset)
+    return AuditExportResponse(job_id=task.id)
+
+
+@audit_router.get("/verify/chain/{job_id}", response_model=AuditExportStatus)
+async def get_chain_verification_status(job_id: str) -> AuditExportStatus:
+    """Get the progress or result of a chain verification job."""
+    return _task_status(job_id)
+
+
 @audit_router.get("/{event_id}", response_model=AuditLogRead)
 async def get_audit_log(
     event_id: str,
@@ -1,5 +1,6 @@
 """Job management endpoints (create, list, cancel, retry, webhook)."""
 
+import asyncio
 import logging
 from datetime import UTC, datetime
 from pathlib import Path
@@ -13,19 +14,29 @@ from fastapi import (
     HTTPException,
     Query,
     Request,
+    Response,
     status,
 )
 from fastapi import Path as FastApiPath
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.core.api_key_auth import get_current_user_with_api_key_or_jwt
 from app.core.config import settings
+from app.core.job_log_archive import (
+    iter_job_log,
+    job_log_size,
+    parse_byte_range,
+    remove_job_log,
+)
 from app.core.log_utils import sanitize_for_log as _sanitize_for_log
 from app.core.path_utils import is_path_allowed, resolve_allowed_bases
 from app.core.rate_limit import get_api_key_or_ip, limiter
 from app.core.security import current_active_user
+from app.crud import crud_job
 from app.db.models.job import Job, JobStatus
 from app.db.models.user import User
 from app.db.session import get_async_session
@@ -274,6 +285,7 @@ async def _enqueue_celery_task_and_handle_errors(
                 job_to_enqueue.folder_path,
                 job_to_enqueue.language,
                 job_to_enqueue.log_level,  # Pass log level to the task
+                job_to_enqueue.incremental,
             ],
             task_id=job_to_enqueue.celery_task_id,  # Use the pre-set celery_task_id
         )
@@ -404,6 +416,7 @@ async def create_job(
         folder_path=normalized_job_folder_path_str,
         language=job_in.language,
         log_level=job_in.log_level,
+        incremental=job_in.incremental,
         user_id=current_user.id,
         # celery_task_id will be set after DB creation using job.id
     )
@@ -503,6 +516,7 @@ async def create_job_via_webhook(
         folder_path=normalized_job_folder_path_str,
         language=job_in.language,
         log_level=job_in.log_level,
+        incremental=job_in.incremental,
         user_id=admin_user.id,
     )
     db_job_with_celery_id = await _create_db_job_and_set_celery_id(
@@ -523,37 +537,66 @@ async def create_job_via_webhook(
     description=(
         "Retrieves a list of subtitle download jobs. "
         "Superusers can see all jobs. Regular users can only see their own jobs. "
-        "Jobs are ordered by submission time, newest first, by default."
+        "Jobs are ordered by submission time, newest first. When more jobs follow, "
+        "the `X-Next-Cursor` response header holds the `cursor` of the next page."
     ),
 )
 async def list_jobs(
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_async_session)],
     current_user: Annotated[User, Depends(current_active_user)],
-    skip: Annotated[int, Query(ge=0, description="Number of jobs to skip")] = 0,
+    cursor: Annotated[
+        str | None, Query(description="X-Next-Cursor of the previous page (keyset pagination)")
+    ] = None,
+    skip: Annotated[
+        int, Query(ge=0, description="Number of jobs to skip (deprecated, use cursor)")
+    ] = 0,
     limit: Annotated[
         int, Query(ge=1, le=200, description="Maximum number of jobs to return")
     ] = 100,
-) -> list[Job]:
+    job_status: Annotated[
+        list[JobStatus] | None, Query(alias="status", description="Only jobs in these states")
+    ] = None,
+    user_id: Annotated[
+        UUID | None, Query(description="Only jobs of this user (superusers only)")
+    ] = None,
+) -> list[JobReadLite]:
     """List subtitle download jobs for the current user."""
     logger.info(
-        "User '%s' (ID: %s, Superuser: %s) listing jobs. Skip: %d, Limit: %d",
+        "User '%s' (ID: %s, Superuser: %s) listing jobs. Cursor: %s, Skip: %d, Limit: %d",
         _sanitize_for_log(current_user.email),
         current_user.id,
         current_user.is_superuser,
+        cursor is not None,
         skip,
         limit,
     )
-    if current_user.is_superuser:
-        jobs = await crud.job.get_multi(db, skip=skip, limit=limit)
-    else:
-        jobs = await crud.job.get_multi_by_owner(
-            db, user_id=current_user.id, skip=skip, limit=limit
+    after = None
+    if cursor is not None:
+        try:
+            after = crud_job.decode_job_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": "INVALID_CURSOR", "message": "Invalid pagination cursor."},
+            ) from e
+
+    owner_id = user_id if current_user.is_superuser else current_user.id
+    rows = await crud.job.get_page(
+        db,
+        user_id=owner_id,
+        statuses=job_status,
+        after=after,
+        skip=0 if after is not None else skip,
+        limit=limit,
+    )
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = crud_job.encode_job_cursor(
+            rows[-1].submitted_at, rows[-1].id
         )
 
-    if jobs is None:
-        jobs = []
-    logger.info("Found %d jobs for user '%s'.", len(jobs), _sanitize_for_log(current_user.email))
-    return jobs
+    logger.info("Found %d jobs for user '%s'.", len(rows), _sanitize_for_log(current_user.email))
+    return [JobReadLite.model_validate(row) for row in rows]
 
 
 @router.get(
@@ -733,6 +776,86 @@ async def get_job_details(
     return job
 
 
+@router.get(
+    "/{job_id}/logs",
+    response_class=StreamingResponse,
+    summary="Read a job's full output",
+    description=(
+        "Streams the job's stdout/stderr as plain text from its compressed archive. "
+        "A single `Range: bytes=start-end` header (or `bytes=-N` for the last N bytes) "
+        "is answered with 206 Partial Content; the archive of a running job can be read "
+        "up to the last written chunk. Jobs finished before logs were archived are served "
+        "from the logs stored on the job."
+    ),
+    responses={
+        200: {"content": {"text/plain": {}}},
+        206: {"description": "The requested byte range", "content": {"text/plain": {}}},
+        416: {"description": "The range is outside the log"},
+    },
+)
+async def get_job_logs(
+    job_id: Annotated[UUID, FastApiPath(description="The ID of the job")],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[User, Depends(current_active_user)],
+) -> StreamingResponse:
+    """Stream a job's archived output, optionally a byte range of it."""
+    row = (
+        await db.execute(
+            select(Job.user_id, Job.log_path, Job.full_logs, Job.log_snippet).where(
+                Job.id == job_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JOB_NOT_FOUND")
+    if not current_user.is_superuser and row.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="NOT_AUTHORIZED_TO_ACCESS_JOB"
+        )
+
+    legacy_logs: bytes | None = None
+    size = 0
+    if row.log_path:
+        try:
+            size = await asyncio.to_thread(job_log_size, row.log_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Log archive of job %s is unreadable: %s", job_id, e)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="JOB_LOGS_NOT_FOUND"
+            ) from e
+    elif row.full_logs or row.log_snippet:
+        legacy_logs = (row.full_logs or row.log_snippet).encode("utf-8")
+        size = len(legacy_logs)
+    else:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JOB_LOGS_NOT_FOUND")
+
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="RANGE_NOT_SATISFIABLE",
+            headers={"Content-Range": f"bytes */{size}"},
+        ) from e
+
+    start, end = byte_range or (0, size)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start)}
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    body = (
+        iter([legacy_logs[start:end]])
+        if legacy_logs is not None
+        else iter_job_log(row.log_path, start, end)
+    )
+    return StreamingResponse(
+        body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type="text/plain; charset=utf-8",
+        headers=headers,
+    )
+
+
 @router.delete(
     "/{job_id}",
     response_model=JobRead,
@@ -812,6 +935,8 @@ async def delete_or_cancel_job(
         logger.info("Removing job '%s' from database.", job_id)
         await db.delete(job)
         await db.commit()
+        if job.log_path:
+            await asyncio.to_thread(remove_job_log, job.log_path)
         # Returns the job object as it was before deletion (with old status)
         # or we could return a specific message.
         # Returning the object is fine for now; frontend just invalidates list.
@@ -875,6 +1000,7 @@ async def retry_job(
         folder_path=original_job.folder_path,
         language=original_job.language,
         log_level=original_job.log_level or "INFO",
+        incremental=original_job.incremental,
         user_id=current_user.id,
     )
 
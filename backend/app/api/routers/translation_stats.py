@@ -1,18 +1,25 @@
 # backend/app/api/routers/translation_stats.py
 """
 Endpoints for translation statistics and history.
+
+Statistics are summed from the daily rollups in ``translation_stats_daily``
+(a few rows per day, today's included) rather than from ``translation_log``
+itself, and each API process reuses the result for TRANSLATION_STATS_CACHE_TTL_S.
 """
 
 import logging
+import time
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import bindparam, func, select
+from sqlalchemy import Row, bindparam, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.security import current_active_user
-from app.db.models.translation_log import TranslationLog
+from app.db.models.translation_log import TranslationLog, TranslationStatsDaily
 from app.db.models.user import User
 from app.db.session import get_async_session
 
@@ -38,6 +45,9 @@ class TranslationLogRead(BaseModel):
     google_characters: int
     status: str
     output_file_path: str | None = None
+    segments_total: int = 0
+    memory_hits: int = 0
+    memory_chars_saved: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -51,6 +61,7 @@ class AggregateStats(BaseModel):
     google_characters: int = 0
     success_count: int = 0
     failure_count: int = 0
+    memory_chars_saved: int = 0
 
 
 class TranslationStatsResponse(BaseModel):
@@ -70,6 +81,20 @@ class TranslationHistoryResponse(BaseModel):
     page_size: int
 
 
+# (expires at, response) of the last statistics computed by this process
+_stats_cache: tuple[float, "TranslationStatsResponse"] | None = None
+
+
+def _add_day(stats: AggregateStats, row: Row[Any]) -> None:
+    stats.total_translations += row.translations
+    stats.total_characters += row.characters_billed
+    stats.deepl_characters += row.deepl_characters
+    stats.google_characters += row.google_characters
+    stats.success_count += row.success_count
+    stats.failure_count += row.translations - row.success_count
+    stats.memory_chars_saved += row.memory_chars_saved
+
+
 # --- Endpoints ---
 
 
@@ -85,48 +110,46 @@ async def get_translation_stats(
     """
     Get aggregate translation statistics.
 
-    Returns totals for all time, last 30 days, and last 7 days.
+    Returns totals for all time, the last 30 days and the last 7 days (calendar
+    days in UTC, today included).
 
     **Accessible by all authenticated users.**
     """
-
-    async def get_stats_for_period(start_date: datetime | None = None) -> AggregateStats:
-        from sqlalchemy import case
-
-        query = select(
-            func.count(TranslationLog.id).label("total"),
-            func.coalesce(func.sum(TranslationLog.characters_billed), 0).label("total_chars"),
-            func.coalesce(func.sum(TranslationLog.deepl_characters), 0).label("deepl_chars"),
-            func.coalesce(func.sum(TranslationLog.google_characters), 0).label("google_chars"),
-            func.coalesce(
-                func.sum(case((TranslationLog.status == "success", 1), else_=0)), 0
-            ).label("success_count"),
-        )
-        if start_date:
-            query = query.where(TranslationLog.timestamp >= start_date)
-
-        result = await db.execute(query)
-        row = result.one()
-
-        return AggregateStats(
-            total_translations=row.total or 0,
-            total_characters=row.total_chars or 0,
-            deepl_characters=row.deepl_chars or 0,
-            google_characters=row.google_chars or 0,
-            success_count=row.success_count or 0,
-            failure_count=(row.total or 0) - (row.success_count or 0),
-        )
-
-    now = datetime.now(UTC)
-    all_time = await get_stats_for_period()
-    last_30_days = await get_stats_for_period(now - timedelta(days=30))
-    last_7_days = await get_stats_for_period(now - timedelta(days=7))
-
-    return TranslationStatsResponse(
+    global _stats_cache
+    if _stats_cache is not None and _stats_cache[0] > time.monotonic():
+        return _stats_cache[1]
+
+    daily = TranslationStatsDaily
+    query = select(
+        daily.day,
+        func.sum(daily.translations).label("translations"),
+        func.sum(daily.characters_billed).label("characters_billed"),
+        func.sum(daily.deepl_characters).label("deepl_characters"),
+        func.sum(daily.google_characters).label("google_characters"),
+        func.sum(daily.memory_chars_saved).label("memory_chars_saved"),
+        func.coalesce(
+            func.sum(case((daily.status == "success", daily.translations), else_=0)), 0
+        ).label("success_count"),
+    ).group_by(daily.day)
+    rows = (await db.execute(query)).all()
+
+    today = datetime.now(UTC).date()
+    all_time, last_30_days, last_7_days = AggregateStats(), AggregateStats(), AggregateStats()
+    for row in rows:
+        _add_day(all_time, row)
+        if row.day > today - timedelta(days=30):
+            _add_day(last_30_days, row)
+        if row.day > today - timedelta(days=7):
+            _add_day(last_7_days, row)
+
+    response = TranslationStatsResponse(
         all_time=all_time,
         last_30_days=last_30_days,
         last_7_days=last_7_days,
     )
+    if settings.TRANSLATION_STATS_CACHE_TTL_S > 0:
+        _stats_cache = (time.monotonic() + settings.TRANSLATION_STATS_CACHE_TTL_S, response)
+    return response
 
 
 @router.get(
@@ -145,8 +168,8 @@ async def get_translation_history(
 
     **Requires admin privileges.**
     """
-    # Get total count
-    count_query = select(func.count(TranslationLog.id))
+    # Total count from the daily rollups instead of a COUNT(*) over the whole log
+    count_query = select(func.coalesce(func.sum(TranslationStatsDaily.translations), 0))
     count_result = await db.execute(count_query)
     total = count_result.scalar() or 0
 
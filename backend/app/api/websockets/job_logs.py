@@ -1,9 +1,10 @@
 # backend/app/api/websockets/job_logs.py
 import asyncio
+import json
 import logging
+import re
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import Any
 from uuid import UUID
 
 import jwt
@@ -14,6 +15,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.websockets import WebSocketState
 
 from app.core.config import settings
+from app.core.job_log_archive import job_log_size, read_job_log
+from app.core.job_log_stream import (
+    STREAM_START_ID,
+    follow_job_log_stream,
+    job_log_stream_key,
+    with_stream_id,
+)
 from app.core.users import UserManager, get_user_manager
 from app.db.models.job import Job  # Assuming Job model exists
 from app.db.models.user import User  # Assuming User model has .role and .is_superuser
@@ -23,6 +31,30 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Redis Stream entry ID ("<ms>-<seq>") a reconnecting client may resume after.
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+# Once the Redis stream has expired, this much of the end of the job's log archive is sent.
+_ARCHIVE_REPLAY_MAX_BYTES = 1_000_000
+
+
+def _read_archive_tail(name: str) -> str:
+    size = job_log_size(name)
+    start = max(0, size - _ARCHIVE_REPLAY_MAX_BYTES)
+    text = read_job_log(name, start, size).decode("utf-8", errors="replace")
+    if start:
+        text = f"... [{start} earlier bytes omitted, see the full job log] ...\n{text}"
+    return text
+
+
+async def _stored_job_logs(job: Job) -> str | None:
+    """A finished job's logs: its archive's tail, else the logs stored on the row."""
+    if job.log_path:
+        try:
+            return await asyncio.to_thread(_read_archive_tail, job.log_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read log archive of job {job.id}: {e}")
+    return job.full_logs or job.log_snippet
+
 
 # --- Custom Exceptions for WebSocket Flow Control ---
 class WebSocketFlowException(Exception):
@@ -168,50 +200,33 @@ async def _validate_job_access_for_stream(
 
 
 @asynccontextmanager
-async def redis_pubsub_listener(
-    redis_url: str, channel_name: str, job_id: UUID
-) -> AsyncGenerator[Any, None]:
-    """Manages Redis connection and Pub/Sub subscription."""
+async def redis_log_stream_client(redis_url: str, job_id: UUID) -> AsyncGenerator[AsyncRedis, None]:
+    """Manages the Redis connection used to replay and follow a job's log stream."""
     if not redis_url:
         logger.error(f"REDIS_PUBSUB_URL not configured for job {job_id}.")
         raise RedisConfigurationError()
 
     redis_client: AsyncRedis | None = None
-    pubsub = None
     try:
         redis_client = AsyncRedis.from_url(str(redis_url), encoding="utf-8", decode_responses=False)
         await redis_client.ping()
-        logger.info(f"Successfully connected to Redis for Pub/Sub for job {job_id}.")
-
-        pubsub = redis_client.pubsub()
-        await pubsub.subscribe(channel_name)
-        logger.info(f"Subscribed to Redis channel '{channel_name}' for job {job_id}.")
-        yield pubsub
-    except WebSocketDisconnect:
-        # Re-raise to be handled by the main WebSocket handler as a normal disconnect
-        raise
+        logger.info(f"Successfully connected to Redis log stream for job {job_id}.")
     except Exception as e:
-        logger.error(
-            f"Failed to setup or connect to Redis Pub/Sub for job {job_id}: {e}", exc_info=True
-        )
+        logger.error(f"Failed to connect to Redis log stream for job {job_id}: {e}", exc_info=True)
+        if redis_client:
+            await redis_client.aclose()
         raise RedisConnectionError() from e
+
+    try:
+        yield redis_client
     finally:
-        if pubsub and pubsub.connection:
-            try:
-                await pubsub.unsubscribe(channel_name)
-                logger.info(f"Unsubscribed from Redis channel '{channel_name}' for job {job_id}.")
-            except Exception as unsub_err:
-                logger.error(
-                    f"Error unsubscribing pubsub for job {job_id}: {unsub_err}", exc_info=True
-                )
-        if redis_client:
-            try:
-                await redis_client.aclose()
-                logger.info(f"Closed Redis client connection for job {job_id}.")
-            except Exception as redis_close_err:
-                logger.error(
-                    f"Error closing Redis client for job {job_id}: {redis_close_err}", exc_info=True
-                )
+        try:
+            await redis_client.aclose()
+            logger.info(f"Closed Redis client connection for job {job_id}.")
+        except Exception as redis_close_err:
+            logger.error(
+                f"Error closing Redis client for job {job_id}: {redis_close_err}", exc_info=True
+            )
 
 
 async def _websocket_monitor_task(websocket: WebSocket, job_id: UUID) -> None:
@@ -228,28 +243,27 @@ async def _websocket_monitor_task(websocket: WebSocket, job_id: UUID) -> None:
 
 
 async def _redis_to_websocket_forwarder_task(
-    websocket: WebSocket, listener: Any, job_id: UUID
+    websocket: WebSocket, redis_client: AsyncRedis, job_id: UUID, after_id: str
 ) -> None:
-    """Listens to Redis Pub/Sub and forwards messages to the WebSocket."""
+    """
+    Replays the job's log stream after `after_id` in pages, then follows it live.
+    Each message carries its stream entry `id` so clients can resume after reconnecting.
+    """
     try:
-        async for message in listener.listen():  # listener is the pubsub object
+        async for batch in follow_job_log_stream(
+            redis_client,
+            job_id,
+            after_id=after_id,
+            page_size=settings.JOB_LOG_REPLAY_PAGE_SIZE,
+        ):
             if websocket.client_state == WebSocketState.DISCONNECTED:
                 logger.info(
                     f"WebSocket disconnected (checked in forwarder for job {job_id}). Aborting forwarder."
                 )
                 break
-
-            if message and message["type"] == "message":
-                message_data_bytes: bytes = message["data"]
-                message_data_str = message_data_bytes.decode("utf-8")
-                logger.debug(
-                    f"Forwarding message from Redis for job {job_id}: {message_data_str[:200]}"
-                )
-                await websocket.send_text(message_data_str)
-            elif message and message["type"] == "subscribe":
-                logger.debug(
-                    f"PubSub subscribe confirmation received by forwarder for job {job_id}."
-                )
+            logger.debug(f"Forwarding {len(batch)} log stream entries for job {job_id}")
+            for entry_id, message in batch:
+                await websocket.send_text(with_stream_id(entry_id, message))
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected during send_text for job {job_id}.")
     except Exception as e:
@@ -286,19 +300,20 @@ async def _handle_websocket_flow_exception(
 
 
 async def _run_streaming_session(  # noqa: C901
-    websocket: WebSocket, job_id: UUID, current_user: User, db: AsyncSession
+    websocket: WebSocket,
+    job_id: UUID,
+    current_user: User,
+    db: AsyncSession,
+    last_id: str | None = None,
 ) -> None:
-    """Manages the core log streaming session including tasks and Redis listener."""
+    """Manages the core log streaming session including tasks and the Redis log stream."""
     await _validate_job_access_for_stream(job_id, current_user, db)
 
-    redis_channel_name = f"job:{job_id}:logs"
     monitor_task: asyncio.Task[None] | None = None
     forwarder_task: asyncio.Task[None] | None = None
 
     try:
-        async with redis_pubsub_listener(
-            str(settings.REDIS_PUBSUB_URL), redis_channel_name, job_id
-        ) as listener:
+        async with redis_log_stream_client(str(settings.REDIS_PUBSUB_URL), job_id) as redis_client:
             await websocket.send_json(
                 {
                     "type": "system",
@@ -306,58 +321,42 @@ async def _run_streaming_session(  # noqa: C901
                 }
             )
 
-            # Fetch and send history from Redis list for late subscribers
-            history_found = False
-            try:
-                history_redis = AsyncRedis.from_url(
-                    str(settings.REDIS_PUBSUB_URL), encoding="utf-8", decode_responses=False
-                )
-                try:
-                    history_key = f"job:{job_id}:history"
-                    history_items = await history_redis.lrange(history_key, 0, -1)
-                    if history_items:
-                        history_found = True
-                        logger.debug(
-                            f"Sending {len(history_items)} historical log items for job {job_id}"
-                        )
-                        for item in history_items:
-                            # Direct send_text as items are already JSON strings
-                            await websocket.send_text(item.decode("utf-8"))
-                finally:
-                    await history_redis.aclose()
-            except Exception as e_hist:
-                logger.error(f"Failed to fetch log history for job {job_id}: {e_hist}")
-
-            # Fallback: If no Redis history, load from database
-            if not history_found:
+            # Fallback: If Redis holds no log stream for a fresh client, load from database
+            if last_id is None:
+                history_found = True
                 try:
-                    job = await db.get(Job, job_id)
-                    if job and (job.full_logs or job.log_snippet):
-                        logs_content = job.full_logs or job.log_snippet
-                        logger.info(f"Sending database logs for completed job {job_id}")
-                        # Send as a single log message
-                        import json
-
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "log",
-                                    "payload": {
-                                        "stream": "stdout",
-                                        "message": logs_content,
-                                        "source": "database",
-                                    },
-                                }
+                    history_found = bool(await redis_client.exists(job_log_stream_key(job_id)))
+                except Exception as e_hist:
+                    logger.error(f"Failed to check log history for job {job_id}: {e_hist}")
+                if not history_found:
+                    try:
+                        job = await db.get(Job, job_id)
+                        logs_content = await _stored_job_logs(job) if job else None
+                        if logs_content:
+                            logger.info(f"Sending database logs for completed job {job_id}")
+                            # Send as a single log message
+                            await websocket.send_text(
+                                json.dumps(
+                                    {
+                                        "type": "log",
+                                        "payload": {
+                                            "stream": "stdout",
+                                            "message": logs_content,
+                                            "source": "database",
+                                        },
+                                    }
+                                )
                             )
-                        )
-                except Exception as e_db:
-                    logger.error(f"Failed to fetch logs from database for job {job_id}: {e_db}")
+                    except Exception as e_db:
+                        logger.error(f"Failed to fetch logs from database for job {job_id}: {e_db}")
 
             monitor_task = asyncio.create_task(
                 _websocket_monitor_task(websocket, job_id), name=f"monitor-{job_id}"
             )
             forwarder_task = asyncio.create_task(
-                _redis_to_websocket_forwarder_task(websocket, listener, job_id),
+                _redis_to_websocket_forwarder_task(
+                    websocket, redis_client, job_id, last_id or STREAM_START_ID
+                ),
                 name=f"forwarder-{job_id}",
             )
 
@@ -393,11 +392,14 @@ async def _run_streaming_session(  # noqa: C901
 
 # --- Main WebSocket Endpoint ---
 @router.websocket("/jobs/{job_id}/logs")
-async def websocket_job_log_stream(
+async def websocket_job_log_stream(  # noqa: C901
     websocket: WebSocket,
     job_id: UUID,
     current_user: User | None = Depends(get_current_user_ws),
     db: AsyncSession = Depends(get_async_session),
+    last_id: str | None = Query(
+        None, description="Last log stream entry ID the client received; resume after it."
+    ),
 ) -> None:
     # Handle authentication failure outside the dependency to avoid ASGI exception noise
     if current_user is None:
@@ -416,8 +418,12 @@ async def websocket_job_log_stream(
     )
     await websocket.accept()
 
+    if last_id is not None and not _STREAM_ID_RE.match(last_id):
+        logger.warning(f"Ignoring malformed last_id '{last_id[:40]}' for job {job_id}.")
+        last_id = None
+
     try:
-        await _run_streaming_session(websocket, job_id, current_user, db)
+        await _run_streaming_session(websocket, job_id, current_user, db, last_id=last_id)
 
     except WebSocketFlowException as wf_exc:
         await _handle_websocket_flow_exception(websocket, wf_exc, job_id, current_user.email)
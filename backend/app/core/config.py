@@ -291,6 +291,24 @@ class Settings(  # pylint: disable=too-many-instance-attributes,invalid-name
         default=True, validation_alias="CELERY_TASK_TRACK_STARTED"
     )
 
+    # --- Audit Outbox Settings ---
+    # Each beat run drains the outbox in batches that double while full, within the time budget.
+    AUDIT_OUTBOX_BATCH_SIZE: int = Field(default=100, validation_alias="AUDIT_OUTBOX_BATCH_SIZE")
+    AUDIT_OUTBOX_MAX_BATCH_SIZE: int = Field(
+        default=5000, validation_alias="AUDIT_OUTBOX_MAX_BATCH_SIZE"
+    )
+    AUDIT_OUTBOX_DRAIN_TIME_BUDGET_S: float = Field(
+        default=10.0, validation_alias="AUDIT_OUTBOX_DRAIN_TIME_BUDGET_S"
+    )
+
+    # The hash chain is verified incrementally from a stored checkpoint, page by page.
+    AUDIT_CHAIN_VERIFY_PAGE_SIZE: int = Field(
+        default=5000, validation_alias="AUDIT_CHAIN_VERIFY_PAGE_SIZE"
+    )
+    AUDIT_CHAIN_VERIFY_LAG_S: float = Field(
+        default=900.0, validation_alias="AUDIT_CHAIN_VERIFY_LAG_S"
+    )
+
     # --- Job Runner Settings ---
     PYTHON_EXECUTABLE_PATH: str = Field(
         default=sys.executable, validation_alias="PYTHON_EXECUTABLE_PATH"
@@ -299,13 +317,32 @@ class Settings(  # pylint: disable=too-many-instance-attributes,invalid-name
         default="/app/scripts/sub_downloader.py",
         validation_alias="SUBTITLE_DOWNLOADER_SCRIPT_PATH",
     )
+    # "subprocess" spawns a fresh interpreter per job; "inprocess" forks the pre-warmed worker.
+    JOB_EXECUTION_MODE: Literal["subprocess", "inprocess"] = Field(
+        default="subprocess", validation_alias="JOB_EXECUTION_MODE"
+    )
     JOB_TIMEOUT_SEC: int = int(os.getenv("JOB_TIMEOUT_SEC", "900"))
     PROCESS_TERMINATE_GRACE_PERIOD_S: int = int(
         os.getenv("PROCESS_TERMINATE_GRACE_PERIOD_S", "5")
     )  # Added this, was missing from your new version
     JOB_MAX_RETRIES: int = Field(default=2, validation_alias="JOB_MAX_RETRIES")
     JOB_RESULT_MESSAGE_MAX_LEN: int = int(os.getenv("JOB_RESULT_MESSAGE_MAX_LEN", "500"))
+    # Live job logs are coalesced and written to Redis in one pipeline per batch.
+    JOB_LOG_BATCH_MAX_LINES: int = Field(default=200, validation_alias="JOB_LOG_BATCH_MAX_LINES")
+    JOB_LOG_BATCH_INTERVAL_MS: int = Field(
+        default=100, validation_alias="JOB_LOG_BATCH_INTERVAL_MS"
+    )
+    # Per-job Redis Stream retention (approximate MAXLEN) and WebSocket replay page size.
+    JOB_LOG_STREAM_MAXLEN: int = Field(default=20000, validation_alias="JOB_LOG_STREAM_MAXLEN")
+    JOB_LOG_REPLAY_PAGE_SIZE: int = Field(default=500, validation_alias="JOB_LOG_REPLAY_PAGE_SIZE")
     JOB_LOG_SNIPPET_MAX_LEN: int = int(os.getenv("JOB_LOG_SNIPPET_MAX_LEN", "50000"))
+    # Full job output is archived gzip-compressed, one member per chunk, instead of on the job row.
+    # The API serves the archive, so it must read the same directory the workers write.
+    JOB_LOG_ARCHIVE_ENABLED: bool = Field(default=True, validation_alias="JOB_LOG_ARCHIVE_ENABLED")
+    JOB_LOG_ARCHIVE_DIR_ENV: str | None = Field(
+        default=None, validation_alias="JOB_LOG_ARCHIVE_DIR"
+    )
+    JOB_LOG_ARCHIVE_CHUNK_KB: int = Field(default=256, validation_alias="JOB_LOG_ARCHIVE_CHUNK_KB")
     DEFAULT_PAGINATION_LIMIT_MAX: int = Field(
         default=200, validation_alias="DEFAULT_PAGINATION_LIMIT_MAX"
     )
@@ -346,6 +383,16 @@ class Settings(  # pylint: disable=too-many-instance-attributes,invalid-name
     # Translation Settings
     DEEPL_CHARACTER_QUOTA: int = Field(default=500000, validation_alias="DEEPL_CHARACTER_QUOTA")
     GOOGLE_CHARACTER_QUOTA: int = Field(default=500000, validation_alias="GOOGLE_CHARACTER_QUOTA")
+    # DeepL characters are reserved in the shared deepl_usage table, reconciled with the API.
+    DEEPL_QUOTA_LEDGER_ENABLED: bool = Field(
+        default=True, validation_alias="DEEPL_QUOTA_LEDGER_ENABLED"
+    )
+    DEEPL_QUOTA_RECONCILE_INTERVAL_S: int = Field(
+        default=600, validation_alias="DEEPL_QUOTA_RECONCILE_INTERVAL_S"
+    )
+    DEEPL_QUOTA_RESERVATION_TTL_S: int = Field(
+        default=600, validation_alias="DEEPL_QUOTA_RESERVATION_TTL_S"
+    )
 
     # Application Settings (Subtitle Tool Specific)
     USER_AGENT_APP_NAME: str = Field(
@@ -373,6 +420,115 @@ class Settings(  # pylint: disable=too-many-instance-attributes,invalid-name
     FFSUBSYNC_CHECK_TIMEOUT: int = Field(default=600, validation_alias="FFSUBSYNC_CHECK_TIMEOUT")
     FFSUBSYNC_TIMEOUT: int = Field(default=600, validation_alias="FFSUBSYNC_TIMEOUT")
     ALASS_TIMEOUT: int = Field(default=600, validation_alias="ALASS_TIMEOUT")
+    # Speech-activity (VAD) track per video, shared by the offset check, alass and ffsubsync.
+    SUBTITLE_SYNC_SPEECH_CACHE_ENABLED: bool = Field(
+        default=True, validation_alias="SUBTITLE_SYNC_SPEECH_CACHE_ENABLED"
+    )
+    SUBTITLE_SYNC_SPEECH_CACHE_DIR_ENV: str | None = Field(
+        default=None, validation_alias="SUBTITLE_SYNC_SPEECH_CACHE_DIR"
+    )
+    SUBTITLE_SYNC_SPEECH_CACHE_MAX_ENTRIES: int = Field(
+        default=5000, validation_alias="SUBTITLE_SYNC_SPEECH_CACHE_MAX_ENTRIES"
+    )
+    # In-process offset check (FFT cross-correlation); below the confidence it defers to ffsubsync.
+    SUBTITLE_SYNC_NATIVE_OFFSET_ENABLED: bool = Field(
+        default=True, validation_alias="SUBTITLE_SYNC_NATIVE_OFFSET_ENABLED"
+    )
+    SUBTITLE_SYNC_NATIVE_OFFSET_MIN_CONFIDENCE: float = Field(
+        default=0.15, validation_alias="SUBTITLE_SYNC_NATIVE_OFFSET_MIN_CONFIDENCE"
+    )
+
+    # IMDb ID lookup cache (in-memory LRU + imdb_lookup_cache table).
+    IMDB_CACHE_ENABLED: bool = Field(default=True, validation_alias="IMDB_CACHE_ENABLED")
+    IMDB_CACHE_POSITIVE_TTL_S: int = Field(
+        default=2592000, validation_alias="IMDB_CACHE_POSITIVE_TTL_S"
+    )  # 30 days
+    IMDB_CACHE_NEGATIVE_TTL_S: int = Field(
+        default=21600, validation_alias="IMDB_CACHE_NEGATIVE_TTL_S"
+    )  # 6 hours
+    IMDB_CACHE_MEMORY_SIZE: int = Field(default=1024, validation_alias="IMDB_CACHE_MEMORY_SIZE")
+    # DeepL/Google batch requests in flight per translated file (1 = one after another).
+    TRANSLATION_BATCH_CONCURRENCY: int = Field(
+        default=4, validation_alias="TRANSLATION_BATCH_CONCURRENCY"
+    )
+    # Translated SRT segments reused across files/jobs instead of being billed again.
+    TRANSLATION_MEMORY_ENABLED: bool = Field(
+        default=True, validation_alias="TRANSLATION_MEMORY_ENABLED"
+    )
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = Field(
+        default=200000, validation_alias="TRANSLATION_MEMORY_MAX_ENTRIES"
+    )
+    # Translation usage (translation_log, DeepL counts, JSON log) written by a background
+    # flusher in batches; spooled to disk while the database is unreachable.
+    TRANSLATION_USAGE_ASYNC_ENABLED: bool = Field(
+        default=True, validation_alias="TRANSLATION_USAGE_ASYNC_ENABLED"
+    )
+    TRANSLATION_USAGE_FLUSH_INTERVAL_S: float = Field(
+        default=2.0, validation_alias="TRANSLATION_USAGE_FLUSH_INTERVAL_S"
+    )
+    TRANSLATION_USAGE_SPOOL_DIR_ENV: str | None = Field(
+        default=None, validation_alias="TRANSLATION_USAGE_SPOOL_DIR"
+    )
+    # Seconds an API process reuses its computed translation statistics (0 = no cache).
+    TRANSLATION_STATS_CACHE_TTL_S: float = Field(
+        default=30.0, validation_alias="TRANSLATION_STATS_CACHE_TTL_S"
+    )
+    # Downloaded Subs.ro archives / OpenSubtitles files, reused by retries and rescans.
+    SUBTITLE_DOWNLOAD_CACHE_ENABLED: bool = Field(
+        default=True, validation_alias="SUBTITLE_DOWNLOAD_CACHE_ENABLED"
+    )
+    SUBTITLE_DOWNLOAD_CACHE_DIR_ENV: str | None = Field(
+        default=None, validation_alias="SUBTITLE_DOWNLOAD_CACHE_DIR"
+    )
+    SUBTITLE_DOWNLOAD_CACHE_MAX_MB: int = Field(
+        default=512, validation_alias="SUBTITLE_DOWNLOAD_CACHE_MAX_MB"
+    )
+    # ffprobe results per video file (path, size, mtime, inode), reused across jobs.
+    MEDIA_PROBE_CACHE_ENABLED: bool = Field(
+        default=True, validation_alias="MEDIA_PROBE_CACHE_ENABLED"
+    )
+    MEDIA_PROBE_CACHE_DIR_ENV: str | None = Field(
+        default=None, validation_alias="MEDIA_PROBE_CACHE_DIR"
+    )
+    MEDIA_PROBE_CACHE_MAX_ENTRIES: int = Field(
+        default=50000, validation_alias="MEDIA_PROBE_CACHE_MAX_ENTRIES"
+    )
+    # Directory listings per scanned folder, reused while a directory's mtime is unchanged.
+    LIBRARY_SCAN_INDEX_ENABLED: bool = Field(
+        default=True, validation_alias="LIBRARY_SCAN_INDEX_ENABLED"
+    )
+    LIBRARY_SCAN_INDEX_DIR_ENV: str | None = Field(
+        default=None, validation_alias="LIBRARY_SCAN_INDEX_DIR"
+    )
+    LIBRARY_SCAN_INDEX_MAX_ROOTS: int = Field(
+        default=500, validation_alias="LIBRARY_SCAN_INDEX_MAX_ROOTS"
+    )
+
+    # Parallel per-file pipelines within one job (1 = sequential) and per-provider caps.
+    SUBTITLE_PIPELINE_WORKERS: int = Field(default=4, validation_alias="SUBTITLE_PIPELINE_WORKERS")
+    SUBTITLE_CONCURRENCY_OPENSUBTITLES: int = Field(
+        default=2, validation_alias="SUBTITLE_CONCURRENCY_OPENSUBTITLES"
+    )
+    SUBTITLE_CONCURRENCY_SUBSRO: int = Field(
+        default=2, validation_alias="SUBTITLE_CONCURRENCY_SUBSRO"
+    )
+    SUBTITLE_CONCURRENCY_METADATA: int = Field(
+        default=4, validation_alias="SUBTITLE_CONCURRENCY_METADATA"
+    )
+    # The shared TranslationManager rotates DeepL keys and tracks usage per run; keep it serial.
+    SUBTITLE_CONCURRENCY_TRANSLATION: int = Field(
+        default=1, validation_alias="SUBTITLE_CONCURRENCY_TRANSLATION"
+    )
+    SUBTITLE_CONCURRENCY_SYNC: int = Field(default=2, validation_alias="SUBTITLE_CONCURRENCY_SYNC")
+    SUBTITLE_CONCURRENCY_FFMPEG: int = Field(
+        default=3, validation_alias="SUBTITLE_CONCURRENCY_FFMPEG"
+    )
+    # Online search/download tasks per file (still capped by the provider limits above).
+    ONLINE_FETCH_WORKERS: int = Field(default=6, validation_alias="ONLINE_FETCH_WORKERS")
+    # Stop searching once a RO candidate scores this much (0 = always search every provider).
+    ONLINE_FETCH_EARLY_STOP_SCORE: int = Field(
+        default=70, validation_alias="ONLINE_FETCH_EARLY_STOP_SCORE"
+    )
 
     # --- Fields for complex parsing ---
     allowed_media_folders_env_str: str = Field(
@@ -603,6 +759,54 @@ class Settings(  # pylint: disable=too-many-instance-attributes,invalid-name
             )
         return str(Path(self.APP_STATE_DIR) / "celerybeat-schedule.db")
 
+    @property
+    def SUBTITLE_DOWNLOAD_CACHE_DIR(self) -> str:
+        """Return the directory of the subtitle download cache."""
+        if self.SUBTITLE_DOWNLOAD_CACHE_DIR_ENV:
+            return str(
+                Path(os.path.expandvars(str(self.SUBTITLE_DOWNLOAD_CACHE_DIR_ENV))).expanduser()
+            )
+        return str(Path(self.APP_STATE_DIR) / "subtitle-download-cache")
+
+    @property
+    def MEDIA_PROBE_CACHE_DIR(self) -> str:
+        """Return the directory of the media probe index."""
+        if self.MEDIA_PROBE_CACHE_DIR_ENV:
+            return str(Path(os.path.expandvars(str(self.MEDIA_PROBE_CACHE_DIR_ENV))).expanduser())
+        return str(Path(self.APP_STATE_DIR) / "media-probe-cache")
+
+    @property
+    def TRANSLATION_USAGE_SPOOL_DIR(self) -> str:
+        """Return the directory of translation usage events waiting for the database."""
+        if self.TRANSLATION_USAGE_SPOOL_DIR_ENV:
+            return str(
+                Path(os.path.expandvars(str(self.TRANSLATION_USAGE_SPOOL_DIR_ENV))).expanduser()
+            )
+        return str(Path(self.APP_STATE_DIR) / "translation-usage-spool")
+
+    @property
+    def JOB_LOG_ARCHIVE_DIR(self) -> str:
+        """Return the directory of the compressed job output archives."""
+        if self.JOB_LOG_ARCHIVE_DIR_ENV:
+            return str(Path(os.path.expandvars(str(self.JOB_LOG_ARCHIVE_DIR_ENV))).expanduser())
+        return str(Path(self.APP_STATE_DIR) / "job-logs")
+
+    @property
+    def LIBRARY_SCAN_INDEX_DIR(self) -> str:
+        """Return the directory of the library scan index."""
+        if self.LIBRARY_SCAN_INDEX_DIR_ENV:
+            return str(Path(os.path.expandvars(str(self.LIBRARY_SCAN_INDEX_DIR_ENV))).expanduser())
+        return str(Path(self.APP_STATE_DIR) / "library-scan-index")
+
+    @property
+    def SUBTITLE_SYNC_SPEECH_CACHE_DIR(self) -> str:
+        """Return the directory of the cached speech tracks used by subtitle sync."""
+        if self.SUBTITLE_SYNC_SPEECH_CACHE_DIR_ENV:
+            return str(
+                Path(os.path.expandvars(str(self.SUBTITLE_SYNC_SPEECH_CACHE_DIR_ENV))).expanduser()
+            )
+        return str(Path(self.APP_STATE_DIR) / "sync-speech-cache")
+
     @property
     def REDIS_PUBSUB_URL(self) -> str | None:
         """Return the Redis Pub/Sub URL."""
@@ -652,7 +856,13 @@ if __name__ == "__main__":
     print("\n--- Job Runner ---")
     print(f"PYTHON_EXECUTABLE_PATH: {settings.PYTHON_EXECUTABLE_PATH}")
     print(f"SUBTITLE_DOWNLOADER_SCRIPT_PATH: {settings.SUBTITLE_DOWNLOADER_SCRIPT_PATH}")
+    print(f"JOB_EXECUTION_MODE: {settings.JOB_EXECUTION_MODE}")
     print(f"JOB_TIMEOUT_SEC: {settings.JOB_TIMEOUT_SEC}")
+    print(f"JOB_LOG_BATCH_MAX_LINES: {settings.JOB_LOG_BATCH_MAX_LINES}")
+    print(f"JOB_LOG_BATCH_INTERVAL_MS: {settings.JOB_LOG_BATCH_INTERVAL_MS}")
+    print(f"JOB_LOG_STREAM_MAXLEN: {settings.JOB_LOG_STREAM_MAXLEN}")
+    print(f"JOB_LOG_REPLAY_PAGE_SIZE: {settings.JOB_LOG_REPLAY_PAGE_SIZE}")
+    print(f"SUBTITLE_PIPELINE_WORKERS: {settings.SUBTITLE_PIPELINE_WORKERS}")
     print(f"PROCESS_TERMINATE_GRACE_PERIOD_S: {settings.PROCESS_TERMINATE_GRACE_PERIOD_S}")  # Added
     print(f"JOB_MAX_RETRIES: {settings.JOB_MAX_RETRIES}")
     print(f"JOB_RESULT_MESSAGE_MAX_LEN: {settings.JOB_RESULT_MESSAGE_MAX_LEN}")
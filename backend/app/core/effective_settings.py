@@ -5,13 +5,29 @@ Priority: Database values > Environment variables
 
 This module provides functions to get configuration values with proper
 fallback logic, used primarily by the Celery worker tasks.
+
+All readers go through an immutable `EffectiveSettingsSnapshot`, built from a
+single ``app_settings`` query with every encrypted field decrypted once. The
+snapshot is cached per process and keyed by the row's ``updated_at``, so a job
+only pays for one indexed timestamp lookup until the settings are changed.
+The subtitle services, which run in worker threads without an event loop, read
+the same snapshot through `get_effective_setting_sync`.
 """
 
 import json
 import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
 from typing import Any, cast
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.core.config import settings as env_settings
 from app.core.security import decrypt_value
@@ -20,6 +36,7 @@ from app.db.models.app_settings import AppSettings
 
 logger = logging.getLogger(__name__)
 
+SettingValue = str | int | list[str] | None
 
 # Mapping from DB field names to environment variable attribute names
 DB_TO_ENV_MAPPING = {
@@ -34,74 +51,99 @@ DB_TO_ENV_MAPPING = {
     "qbittorrent_username": "QBITTORRENT_USERNAME",
     "qbittorrent_password": "QBITTORRENT_PASSWORD",
     "allowed_media_folders": "ALLOWED_MEDIA_FOLDERS",
+    "google_cloud_project_id": "GOOGLE_PROJECT_ID",
 }
 
+# Secrets whose DB value, once set, must never be swapped for the env value: if it
+# cannot be decrypted the service stays off rather than silently using other keys.
+NO_ENV_FALLBACK_ON_DECRYPT_ERROR = frozenset({"deepl_api_keys"})
+
+# How long `get_effective_setting_sync` trusts the snapshot before checking its version
+SYNC_RECHECK_INTERVAL_S = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class EffectiveSettingsSnapshot:
+    """Resolved settings for one version of the ``app_settings`` row."""
+
+    version: datetime | None  # AppSettings.updated_at, None if the row does not exist
+    values: Mapping[str, SettingValue]  # DB > env, only fields that are set somewhere
+    subprocess_env: Mapping[str, str]  # Env var overrides coming from the DB
+    cleared: frozenset[str] = frozenset()  # Fields explicitly emptied in the DB ("")
+
+    def get(self, field: str) -> SettingValue:
+        return self.values.get(field)
+
+    def get_unless_cleared(self, field: str) -> SettingValue:
+        """Like `get`, but a field cleared in the DB is None instead of its env value."""
+        return None if field in self.cleared else self.values.get(field)
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.values)
+
+
+_snapshot: EffectiveSettingsSnapshot | None = None
+_snapshot_checked_at = 0.0  # time.monotonic() of the last sync version check
+_sync_lock = threading.Lock()
+
+
+def invalidate_settings_snapshot() -> None:
+    """Drops the cached snapshot; the next reader reloads it."""
+    global _snapshot, _snapshot_checked_at
+    _snapshot = None
+    _snapshot_checked_at = 0.0
+
 
 async def _get_db_settings(db: AsyncSession) -> AppSettings | None:
     """Fetch AppSettings from database without creating if missing."""
-    from sqlalchemy import select
-
     result = await db.execute(select(AppSettings).where(AppSettings.id == 1))
     return result.scalar_one_or_none()
 
 
-def _get_env_value(env_attr: str) -> str | int | list[str] | None:
+def _get_env_value(env_attr: str) -> SettingValue:
     """Get a value from environment settings."""
-    return cast(str | int | list[str] | None, getattr(env_settings, env_attr, None))
+    return cast(SettingValue, getattr(env_settings, env_attr, None))
 
 
-async def get_effective_setting(db: AsyncSession, field: str) -> str | int | list[str] | None:  # noqa: C901
-    """
-    Get a single effective setting value.
+def _parse_json_array(field: str, raw: str) -> list[str]:
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning(f"Failed to parse JSON for {field}")
+        return []
+    if isinstance(parsed, list) and all(isinstance(item, str) for item in parsed):
+        return parsed
+    logger.warning(f"Unexpected JSON format for {field}")
+    return []
 
-    Priority: DB (decrypted) > Environment variable
 
-    Args:
-        db: Database session
-        field: Field name (e.g., "tmdb_api_key")
-
-    Returns:
-        The effective value, or None if not set anywhere
+def _resolve_field(
+    db_settings: AppSettings | None, field: str, decrypted: str | None = None
+) -> SettingValue:
     """
-    db_settings = await _get_db_settings(db)
+    Resolves one field with the DB > env priority.
 
-    if db_settings:
-        raw_value = getattr(db_settings, field, None)
+    ``decrypted`` is the already decrypted DB value of an encrypted field, so
+    the snapshot builder can share one decryption with the subprocess env.
+    """
+    raw_value = getattr(db_settings, field, None) if db_settings else None
 
-        if raw_value:
-            # Decrypt if needed
-            if field in ENCRYPTED_FIELDS:
-                try:
-                    decrypted = decrypt_value(raw_value)
-                    # Parse JSON arrays
-                    if field in JSON_ARRAY_FIELDS:
-                        try:
-                            parsed = json.loads(decrypted)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Failed to parse JSON for {field}")
-                            return []
-                        if isinstance(parsed, list) and all(
-                            isinstance(item, str) for item in parsed
-                        ):
-                            return parsed
-                        logger.warning(f"Unexpected JSON format for {field}")
-                        return []
-                    return decrypted
-                except ValueError:
-                    logger.warning(f"Failed to decrypt {field}, falling back to env")
-            elif field in JSON_ARRAY_FIELDS:
-                # Non-encrypted JSON array
-                try:
-                    parsed = json.loads(raw_value)
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON for {field}")
-                    return []
-                if isinstance(parsed, list) and all(isinstance(item, str) for item in parsed):
-                    return parsed
-                logger.warning(f"Unexpected JSON format for {field}")
-                return []
-            else:
-                return cast(str | int | list[str] | None, raw_value)
+    if raw_value:
+        if field in ENCRYPTED_FIELDS:
+            try:
+                value = decrypted if decrypted is not None else decrypt_value(raw_value)
+                if field in JSON_ARRAY_FIELDS:
+                    return _parse_json_array(field, value)
+                return value
+            except ValueError:
+                if field in NO_ENV_FALLBACK_ON_DECRYPT_ERROR:
+                    logger.warning(f"Failed to decrypt {field}; leaving it unset (no env fallback)")
+                    return None
+                logger.warning(f"Failed to decrypt {field}, falling back to env")
+        elif field in JSON_ARRAY_FIELDS:
+            return _parse_json_array(field, raw_value)
+        else:
+            return cast(SettingValue, raw_value)
 
     # Fallback to environment
     env_attr = DB_TO_ENV_MAPPING.get(field)
@@ -111,6 +153,122 @@ async def get_effective_setting(db: AsyncSession, field: str) -> str | int | lis
     return None
 
 
+def build_settings_snapshot(db_settings: AppSettings | None) -> EffectiveSettingsSnapshot:
+    """Builds the snapshot for a loaded AppSettings row, decrypting each field once."""
+    values: dict[str, SettingValue] = {}
+    env_overrides: dict[str, str] = {}
+    cleared: set[str] = set()
+
+    for db_field, env_name in DB_TO_ENV_MAPPING.items():
+        raw_value = getattr(db_settings, db_field, None) if db_settings else None
+        if raw_value == "":
+            cleared.add(db_field)
+        decrypted = None
+        if raw_value:
+            try:
+                decrypted = decrypt_value(raw_value) if db_field in ENCRYPTED_FIELDS else None
+                value = decrypted if decrypted is not None else raw_value
+                # JSON arrays are passed through as their JSON string
+                env_overrides[env_name] = value if isinstance(value, str) else str(value)
+            except ValueError as e:
+                logger.warning(f"Failed to process {db_field} for subprocess env: {e}")
+                # Keep the original env value if decryption fails
+
+        value = _resolve_field(db_settings, db_field, decrypted)
+        if value is not None:
+            values[db_field] = value
+
+    return EffectiveSettingsSnapshot(
+        version=getattr(db_settings, "updated_at", None),
+        values=MappingProxyType(values),
+        subprocess_env=MappingProxyType(env_overrides),
+        cleared=frozenset(cleared),
+    )
+
+
+async def get_settings_snapshot(db: AsyncSession) -> EffectiveSettingsSnapshot:
+    """
+    Returns the effective settings snapshot, reloading it only when the
+    ``app_settings`` row changed (or appeared) since it was built.
+    """
+    global _snapshot
+
+    cached = _snapshot
+    if cached is not None:
+        result = await db.execute(select(AppSettings.updated_at).where(AppSettings.id == 1))
+        if result.scalar_one_or_none() == cached.version:
+            return cached
+
+    snapshot = build_settings_snapshot(await _get_db_settings(db))
+    _snapshot = snapshot
+    return snapshot
+
+
+def get_settings_snapshot_sync(session: Session) -> EffectiveSettingsSnapshot:
+    """Sync variant of `get_settings_snapshot`, sharing the same cached snapshot."""
+    global _snapshot
+
+    cached = _snapshot
+    if cached is not None:
+        version = session.scalar(select(AppSettings.updated_at).where(AppSettings.id == 1))
+        if version == cached.version:
+            return cached
+
+    snapshot = build_settings_snapshot(
+        session.scalar(select(AppSettings).where(AppSettings.id == 1))
+    )
+    _snapshot = snapshot
+    return snapshot
+
+
+def get_effective_setting_sync(field: str) -> SettingValue:
+    """
+    Effective value of a mapped setting, for sync callers (subtitle services).
+
+    The snapshot's version is checked at most every SYNC_RECHECK_INTERVAL_S, so
+    per-request callers such as the OMDb/TMDb helpers usually make no query at
+    all. A field cleared in the DB ("") reads as None, i.e. disabled, rather than
+    falling back to the env. Without a usable DB the last snapshot (or the env
+    alone) is used.
+    """
+    global _snapshot_checked_at
+
+    with _sync_lock:
+        cached = _snapshot
+        if cached is not None and time.monotonic() - _snapshot_checked_at < SYNC_RECHECK_INTERVAL_S:
+            return cached.get_unless_cleared(field)
+        try:
+            from app.db.session import SyncSessionLocal
+
+            if SyncSessionLocal is None:
+                raise RuntimeError("sync database session is not configured")
+            with SyncSessionLocal() as session:
+                snapshot = get_settings_snapshot_sync(session)
+            _snapshot_checked_at = time.monotonic()
+        except Exception as e:
+            logger.debug(f"Could not refresh settings snapshot, using the last one or env: {e}")
+            snapshot = cached if cached is not None else build_settings_snapshot(None)
+    return snapshot.get_unless_cleared(field)
+
+
+async def get_effective_setting(db: AsyncSession, field: str) -> SettingValue:
+    """
+    Get a single effective setting value.
+
+    Priority: DB (decrypted) > Environment variable
+
+    Args:
+        db: Database session
+        field: Field name (e.g., "tmdb_api_key")
+
+    Returns:
+        The effective value, or None if not set anywhere
+    """
+    if field in DB_TO_ENV_MAPPING:
+        return (await get_settings_snapshot(db)).get(field)
+    return _resolve_field(await _get_db_settings(db), field)
+
+
 async def get_effective_settings_dict(db: AsyncSession) -> dict[str, Any]:
     """
     Get all effective settings as a dictionary.
@@ -120,14 +278,7 @@ async def get_effective_settings_dict(db: AsyncSession) -> dict[str, Any]:
     Returns:
         Dictionary with all setting values (DB > Env fallback)
     """
-    result = {}
-
-    for db_field in DB_TO_ENV_MAPPING:
-        value = await get_effective_setting(db, db_field)
-        if value is not None:
-            result[db_field] = value
-
-    return result
+    return (await get_settings_snapshot(db)).as_dict()
 
 
 async def build_subprocess_env(db: AsyncSession) -> dict[str, str]:
@@ -140,44 +291,5 @@ async def build_subprocess_env(db: AsyncSession) -> dict[str, str]:
     Returns:
         Dictionary suitable for asyncio.create_subprocess_exec(env=...)
     """
-    import os
-
-    # Start with current environment
-    env_vars = os.environ.copy()
-
-    # Override with DB settings
-    db_settings = await _get_db_settings(db)
-
-    if db_settings:
-        for db_field, env_name in DB_TO_ENV_MAPPING.items():
-            raw_value = getattr(db_settings, db_field, None)
-
-            if not raw_value:
-                continue
-
-            try:
-                # Decrypt if needed
-                if db_field in ENCRYPTED_FIELDS:
-                    value = decrypt_value(raw_value)
-                else:
-                    value = raw_value
-
-                # Convert lists to JSON strings for env vars
-                if db_field in JSON_ARRAY_FIELDS:
-                    if isinstance(value, str):
-                        # Already JSON string (from non-encrypted field)
-                        env_vars[env_name] = value
-                    else:
-                        # List that needs to be JSON serialized
-                        env_vars[env_name] = json.dumps(value)
-                elif isinstance(value, int):
-                    env_vars[env_name] = str(value)
-                else:
-                    env_vars[env_name] = value
-
-            except (ValueError, json.JSONDecodeError) as e:
-                logger.warning(f"Failed to process {db_field} for subprocess env: {e}")
-                # Keep the original env value if decryption/parsing fails
-                continue
-
-    return env_vars
+    snapshot = await get_settings_snapshot(db)
+    return {**os.environ, **snapshot.subprocess_env}
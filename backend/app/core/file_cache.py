@@ -0,0 +1,112 @@
+# backend/app/core/file_cache.py
+"""
+Building blocks shared by the process-local and on-disk caches of the subtitle
+services (IMDb IDs, downloads, media probes, speech tracks, library scans).
+
+- `CacheCounters`: thread-safe named counters behind each cache's ``stats()``.
+- `atomic_write`: writes through a temp file in the target directory and
+  renames it into place, so workers sharing a directory never read a partial
+  entry. Temp names start with a dot, which the eviction scans skip.
+- `EvictionSchedule`: spreads the directory scans of a cache over its stores.
+- `evict_least_recently_used`: count-bounded LRU eviction by file mtime.
+  Caches mark an entry as used by touching it (``os.utime``) on every hit.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import IO, Any
+
+
+class CacheCounters:
+    """Named integer counters, safe to bump from several threads."""
+
+    def __init__(self, *names: str) -> None:
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(names, 0)
+
+    def add(self, name: str, amount: int = 1) -> int:
+        """Adds ``amount`` to a counter and returns its new value."""
+        with self._lock:
+            self._values[name] += amount
+            return self._values[name]
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+class EvictionSchedule:
+    """Says which stores should scan the cache directory: the first, then every `every`-th."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._since_scan = 0
+
+    def due(self, every: int) -> bool:
+        """Records one store; True if it should be followed by an eviction scan."""
+        with self._lock:
+            self._stores += 1
+            self._since_scan += 1
+            if self._stores == 1 or self._since_scan >= every:
+                self._since_scan = 0
+                return True
+            return False
+
+
+def atomic_write(path: Path, write: Callable[[IO[bytes]], object], suffix: str = "") -> None:
+    """Creates or replaces ``path`` with what ``write`` writes to a temp file next to it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=suffix, dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        Path(tmp_name).replace(path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    atomic_write(path, lambda f: f.write(data))
+
+
+def atomic_write_json(path: Path, value: Any, **dumps_kwargs: Any) -> None:
+    """Serializes before touching the disk, so an unserializable value leaves no temp file."""
+    atomic_write_bytes(path, json.dumps(value, **dumps_kwargs).encode("utf-8"))
+
+
+def evict_least_recently_used(paths: Iterable[Path], max_entries: int) -> int:
+    """
+    Unlinks the least recently used (oldest mtime) of ``paths`` beyond
+    ``max_entries`` and returns how many were removed. Temp files are ignored.
+    """
+    entries = []
+    for path in paths:
+        if path.name.startswith("."):
+            continue
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:  # Evicted by another worker meanwhile
+            continue
+    excess = len(entries) - max_entries
+    if excess <= 0:
+        return 0
+    entries.sort(key=lambda item: item[0])
+    for _, path in entries[:excess]:
+        path.unlink(missing_ok=True)
+    return excess
+
+
+__all__ = [
+    "CacheCounters",
+    "EvictionSchedule",
+    "atomic_write",
+    "atomic_write_bytes",
+    "atomic_write_json",
+    "evict_least_recently_used",
+]
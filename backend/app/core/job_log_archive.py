@@ -0,0 +1,284 @@
+# backend/app/core/job_log_archive.py
+"""Compressed on-disk archive of a job's full output.
+
+The worker writes a job's stdout/stderr, in arrival order, to
+``<JOB_LOG_ARCHIVE_DIR>/<job_id>.log.gz`` while the job runs. Output is
+buffered up to ``JOB_LOG_ARCHIVE_CHUNK_KB`` and each chunk is compressed into
+its own gzip member, so the file is an ordinary multi-member gzip (``zcat``
+reads it) and the worker never holds more than one chunk.
+
+Every member's uncompressed and compressed offsets are appended to the
+``<job_id>.log.idx`` sidecar after the member itself has been written.
+Readers use it to decompress only the members overlapping a requested byte
+range, and never see an index entry whose data is not on disk yet, so a
+running job's archive can be read too.
+
+The job row only keeps the archive's name (``Job.log_path``) and its
+uncompressed size (``Job.log_size``), next to the bounded ``log_snippet``.
+`JobOutputCapture` replaces the unbounded per-stream byte lists the worker
+used to accumulate: it forwards everything to the archive and only keeps the
+head and tail needed for the snippet and result message.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import re
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".log.gz"
+INDEX_SUFFIX = ".log.idx"
+_COMPRESS_LEVEL = 6
+# Kept per stream for the result message, which looks at the last lines of output
+_TAIL_BYTES = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def job_log_archive_name(job_id: Any) -> str:
+    return f"{job_id}{ARCHIVE_SUFFIX}"
+
+
+def _archive_paths(name: str, directory: str | Path | None = None) -> tuple[Path, Path]:
+    """Resolves an archive name to its data and index files inside the archive directory."""
+    if Path(name).name != name or not name.endswith(ARCHIVE_SUFFIX):
+        raise ValueError(f"Invalid job log archive name: {name!r}")
+    base = Path(directory or settings.JOB_LOG_ARCHIVE_DIR)
+    return base / name, base / (name.removesuffix(ARCHIVE_SUFFIX) + INDEX_SUFFIX)
+
+
+@dataclass(frozen=True)
+class JobLogArchiveSummary:
+    name: str
+    size: int  # Uncompressed bytes
+    compressed_size: int
+
+
+class JobLogArchive:
+    """Appends one job's output to its archive, compressing one chunk at a time."""
+
+    def __init__(
+        self,
+        job_id: Any,
+        *,
+        directory: str | Path | None = None,
+        chunk_bytes: int | None = None,
+    ) -> None:
+        self.name = job_log_archive_name(job_id)
+        self._data_path, self._index_path = _archive_paths(self.name, directory)
+        self._data_path.parent.mkdir(parents=True, exist_ok=True)
+        self._chunk_bytes = chunk_bytes or settings.JOB_LOG_ARCHIVE_CHUNK_KB * 1024
+        self._buffer = bytearray()
+        self._size = 0
+        self._compressed_size = 0
+        self._failed = False
+        self._closed = False
+        self._summary: JobLogArchiveSummary | None = None
+        # Set by the caller once the job row points at this archive
+        self.recorded = False
+        # A rerun of the same job replaces the previous archive
+        self._data = self._data_path.open("wb")
+        self._index = self._index_path.open("w", encoding="ascii")
+
+    @property
+    def size(self) -> int:
+        return self._size + len(self._buffer)
+
+    def write(self, data: bytes) -> None:
+        if self._closed or self._failed or not data:
+            return
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_bytes:
+            self._flush_chunk()
+
+    def _flush_chunk(self) -> None:
+        if not self._buffer:
+            return
+        raw = bytes(self._buffer)
+        self._buffer.clear()
+        member = gzip.compress(raw, compresslevel=_COMPRESS_LEVEL, mtime=0)
+        try:
+            self._data.write(member)
+            self._data.flush()
+            self._index.write(f"{self._size} {len(raw)} {self._compressed_size} {len(member)}\n")
+            self._index.flush()
+        except OSError as e:
+            logger.warning(f"Job log archive {self.name} could not be written, dropping it: {e}")
+            self._failed = True
+            return
+        self._size += len(raw)
+        self._compressed_size += len(member)
+
+    def close(self) -> JobLogArchiveSummary | None:
+        """
+        Writes the last chunk and closes the files; later calls return the same summary.
+
+        Returns None, and removes the files, if nothing was written or a write failed.
+        """
+        if self._closed:
+            return self._summary
+        self._flush_chunk()
+        self._closed = True
+        for handle in (self._data, self._index):
+            try:
+                handle.close()
+            except OSError:
+                self._failed = True
+        if self._failed or not self._size:
+            remove_job_log(self.name, self._data_path.parent)
+            return None
+        self._summary = JobLogArchiveSummary(self.name, self._size, self._compressed_size)
+        return self._summary
+
+
+class JobOutputCapture:
+    """
+    Bounded stand-in for the list of byte lines one output stream used to be collected in.
+
+    Appended data is forwarded to the (shared) archive; only the first `head_bytes` and
+    the last `tail_bytes` are retained. Iterating yields the retained output, with a
+    marker where bytes were left out, so `b"".join(capture)` works as it did for the list.
+    """
+
+    def __init__(
+        self,
+        archive: JobLogArchive | None = None,
+        *,
+        head_bytes: int | None = None,
+        tail_bytes: int = _TAIL_BYTES,
+    ) -> None:
+        self._archive = archive
+        self._head_limit = (
+            head_bytes if head_bytes is not None else settings.JOB_LOG_SNIPPET_MAX_LEN
+        )
+        self._tail_limit = tail_bytes
+        self._head = bytearray()
+        self._tail: deque[bytes] = deque()
+        self._tail_size = 0
+        self._omitted = 0
+
+    def append(self, data: bytes) -> None:
+        if self._archive:
+            self._archive.write(data)
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+            if not data:
+                return
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= self._tail_limit:
+            dropped = self._tail.popleft()
+            self._tail_size -= len(dropped)
+            self._omitted += len(dropped)
+
+    def __bool__(self) -> bool:
+        return bool(self._head or self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield bytes(self._head)
+        tail = b"".join(self._tail)
+        omitted = self._omitted + max(0, len(tail) - self._tail_limit)
+        if omitted:
+            yield f"\n... [{omitted} bytes omitted, see the full job log] ...\n".encode()
+            tail = tail[-self._tail_limit :]
+        yield tail
+
+
+def _load_index(index_path: Path) -> list[tuple[int, int, int, int]]:
+    entries: list[tuple[int, int, int, int]] = []
+    with index_path.open(encoding="ascii") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Entry still being written
+            raw_offset, raw_len, gz_offset, gz_len = (int(v) for v in line.split())
+            entries.append((raw_offset, raw_len, gz_offset, gz_len))
+    return entries
+
+
+def job_log_size(name: str, directory: str | Path | None = None) -> int:
+    """Uncompressed bytes readable from an archive (FileNotFoundError if there is none)."""
+    _, index_path = _archive_paths(name, directory)
+    entries = _load_index(index_path)
+    return entries[-1][0] + entries[-1][1] if entries else 0
+
+
+def iter_job_log(
+    name: str, start: int = 0, end: int | None = None, directory: str | Path | None = None
+) -> Iterator[bytes]:
+    """Yields the uncompressed bytes [start, end) of an archive, one member at a time."""
+    data_path, index_path = _archive_paths(name, directory)
+    entries = _load_index(index_path)
+    if not entries:
+        return
+    i = max(0, bisect_right([entry[0] for entry in entries], start) - 1)
+    with data_path.open("rb") as f:
+        for raw_offset, raw_len, gz_offset, gz_len in entries[i:]:
+            if end is not None and raw_offset >= end:
+                break
+            f.seek(gz_offset)
+            raw = gzip.decompress(f.read(gz_len))
+            lo = max(0, start - raw_offset)
+            hi = raw_len if end is None else min(raw_len, end - raw_offset)
+            if lo < hi:
+                yield raw[lo:hi]
+
+
+def read_job_log(
+    name: str, start: int = 0, end: int | None = None, directory: str | Path | None = None
+) -> bytes:
+    return b"".join(iter_job_log(name, start, end, directory))
+
+
+def remove_job_log(name: str, directory: str | Path | None = None) -> None:
+    for path in _archive_paths(name, directory):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove job log file {path}: {e}")
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parses a single-range ``Range: bytes=`` header into [start, end) for a body of `size` bytes.
+
+    Returns None when the whole body should be sent (no header, or several ranges, which
+    are not supported); raises ValueError when the range cannot be satisfied.
+    """
+    if not header or "," in header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError(f"Malformed range: {header!r}")
+    first, last = match.groups()
+    if not first:  # Suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size
+    else:
+        start = int(first)
+        end = size if not last else min(int(last) + 1, size)
+    if start >= size or start >= end:
+        raise ValueError(f"Range {header!r} not satisfiable for {size} bytes")
+    return start, end
+
+
+__all__ = [
+    "JobLogArchive",
+    "JobLogArchiveSummary",
+    "JobOutputCapture",
+    "iter_job_log",
+    "job_log_archive_name",
+    "job_log_size",
+    "parse_byte_range",
+    "read_job_log",
+    "remove_job_log",
+]
@@ -0,0 +1,221 @@
+# backend/app/core/job_log_stream.py
+"""Redis Stream storage and buffered publishing for live job logs.
+
+Every job message (``{"type": ..., "payload": {...}}``) is appended with XADD
+to the ``job:{id}:stream`` Redis Stream under the ``data`` field. The stream
+is trimmed with ``MAXLEN ~ JOB_LOG_STREAM_MAXLEN`` and expires
+``JOB_LOG_HISTORY_TTL_S`` after the last write, so Redis memory per job is
+bounded.
+
+The stream is the single source for both replay and live delivery: readers
+page through it with XRANGE and then follow it with XREAD BLOCK from the last
+entry ID they delivered. A reconnecting client passes its last seen ID and
+resumes exactly after it, without gaps or duplicates.
+
+`JobLogSink` coalesces log lines for a short window (or up to a line count)
+and writes them with a single pipelined XADD.../EXPIRE round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_LOG_HISTORY_TTL_S = 604800  # 7 days, refreshed on every write (sliding window)
+JOB_LOG_STREAM_FIELD = "data"
+STREAM_START_ID = "0-0"
+
+
+def job_log_stream_key(job_id: Any) -> str:
+    return f"job:{job_id}:stream"
+
+
+def serialize_job_log_message(message_type: str, payload: dict) -> str:
+    """Serializes a job message, stamping ``payload["ts"]`` if it is missing."""
+    if "ts" not in payload:
+        payload["ts"] = datetime.now(UTC).isoformat()
+    elif isinstance(payload["ts"], datetime):
+        payload["ts"] = payload["ts"].isoformat()
+    return json.dumps({"type": message_type, "payload": payload})
+
+
+def with_stream_id(entry_id: str, serialized_message: str) -> str:
+    """Adds the stream entry ID as a top-level ``id`` key without re-encoding the message."""
+    return f'{{"id": {json.dumps(entry_id)}, {serialized_message[1:]}'
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _entry_message(fields: dict) -> str | None:
+    raw = fields.get(JOB_LOG_STREAM_FIELD.encode()) or fields.get(JOB_LOG_STREAM_FIELD)
+    return _decode(raw) if raw is not None else None
+
+
+async def write_job_log_messages(
+    redis_client: aioredis.Redis,
+    job_id: Any,
+    serialized_messages: list[str],
+    maxlen: int | None = None,
+) -> None:
+    """Appends messages to the job's log stream with one pipelined XADD/EXPIRE round trip."""
+    if not serialized_messages:
+        return
+    stream_key = job_log_stream_key(job_id)
+    stream_maxlen = maxlen if maxlen is not None else settings.JOB_LOG_STREAM_MAXLEN
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for message in serialized_messages:
+            pipe.xadd(
+                stream_key,
+                {JOB_LOG_STREAM_FIELD: message},
+                maxlen=stream_maxlen,
+                approximate=True,
+            )
+        pipe.expire(stream_key, JOB_LOG_HISTORY_TTL_S)
+        await pipe.execute()
+
+
+async def read_job_log_page(
+    redis_client: aioredis.Redis,
+    job_id: Any,
+    after_id: str = STREAM_START_ID,
+    count: int = 500,
+) -> list[tuple[str, str]]:
+    """Returns up to ``count`` ``(entry_id, message)`` pairs stored strictly after ``after_id``."""
+    entries = await redis_client.xrange(
+        job_log_stream_key(job_id), min=f"({after_id}", max="+", count=count
+    )
+    page: list[tuple[str, str]] = []
+    for entry_id, fields in entries:
+        message = _entry_message(fields)
+        if message is not None:
+            page.append((_decode(entry_id), message))
+    return page
+
+
+async def follow_job_log_stream(
+    redis_client: aioredis.Redis,
+    job_id: Any,
+    after_id: str = STREAM_START_ID,
+    page_size: int = 500,
+    block_ms: int = 5000,
+) -> AsyncIterator[list[tuple[str, str]]]:
+    """
+    Yields batches of ``(entry_id, message)`` after ``after_id``: first the stored
+    history in XRANGE pages, then new entries via XREAD BLOCK. Runs until cancelled.
+    """
+    last_id = after_id
+    while True:
+        page = await read_job_log_page(redis_client, job_id, last_id, page_size)
+        if not page:
+            break
+        last_id = page[-1][0]
+        yield page
+        if len(page) < page_size:
+            break
+
+    stream_key = job_log_stream_key(job_id)
+    while True:
+        response = await redis_client.xread({stream_key: last_id}, count=page_size, block=block_ms)
+        if not response:
+            continue
+        batch: list[tuple[str, str]] = []
+        for _stream, entries in response:
+            for entry_id, fields in entries:
+                last_id = _decode(entry_id)
+                message = _entry_message(fields)
+                if message is not None:
+                    batch.append((last_id, message))
+        if batch:
+            yield batch
+
+
+class JobLogSink:
+    """Buffers job log messages and appends them to the job's log stream in batches.
+
+    A flush happens when ``max_lines`` messages are pending, when
+    ``flush_interval_s`` has elapsed since the first pending message, or on
+    `aclose()`. Redis errors are logged and the affected batch is dropped; the
+    job itself keeps running and its full output is still saved to the DB.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        job_id: Any,
+        task_log_prefix: str = "",
+        max_lines: int = 200,
+        flush_interval_s: float = 0.1,
+    ) -> None:
+        self._redis_client = redis_client
+        self._job_id = job_id
+        self._task_log_prefix = task_log_prefix
+        self._max_lines = max(1, int(max_lines))
+        self._flush_interval_s = max(0.0, float(flush_interval_s))
+        self._pending: list[str] = []
+        self._lock = asyncio.Lock()
+        self._timer_task: asyncio.Task[None] | None = None
+        self.lines_published = 0
+        self.round_trips = 0
+
+    async def publish(self, message_type: str, payload: dict) -> None:
+        self._pending.append(serialize_job_log_message(message_type, payload))
+        if len(self._pending) >= self._max_lines:
+            await self.flush()
+        elif self._timer_task is None:
+            self._timer_task = asyncio.create_task(
+                self._flush_after_interval(), name=f"job_log_flush_{self._job_id}"
+            )
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self._flush_interval_s)
+        self._timer_task = None
+        # Shielded so a cancel arriving mid-flush cannot drop the batch it already popped.
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await write_job_log_messages(self._redis_client, self._job_id, batch)
+                self.lines_published += len(batch)
+                self.round_trips += 1
+            except aioredis.RedisError as e_redis:
+                logger.error(
+                    f"{self._task_log_prefix} Redis error flushing {len(batch)} log lines "
+                    f"for job {self._job_id}: {e_redis}"
+                )
+            except Exception as e_general:
+                logger.error(
+                    f"{self._task_log_prefix} Unexpected error flushing {len(batch)} log lines "
+                    f"for job {self._job_id}: {e_general}",
+                    exc_info=True,
+                )
+
+    async def aclose(self) -> None:
+        """Stops the flush timer and writes out anything still buffered.
+
+        A timer still sleeping is cancelled; one already flushing finishes its
+        batch first, since `flush()` is shielded and serialized by the lock.
+        """
+        timer_task, self._timer_task = self._timer_task, None
+        if timer_task is not None and not timer_task.done():
+            timer_task.cancel()
+            try:
+                await timer_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
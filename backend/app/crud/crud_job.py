@@ -1,4 +1,8 @@
+import base64
+import binascii
+import json
 import logging
+from collections.abc import Sequence
 from datetime import (
     UTC,  # Keeping your import if you prefer it and are on Python 3.11+
     datetime,  # Adding timezone for timezone.utc consistency
@@ -6,7 +10,7 @@ from datetime import (
 from typing import Any  # Added for type hint in _prepare_update_data
 from uuid import UUID
 
-from sqlalchemy import desc, select
+from sqlalchemy import Row, desc, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.elements import ColumnElement
 
@@ -19,6 +23,32 @@ from app.schemas.job import (  # Assuming JobCreateInternal and JobUpdate are de
 
 logger = logging.getLogger(__name__)
 
+# What JobReadLite shows; list queries never load the log columns
+JOB_LIST_COLUMNS = (
+    Job.id,
+    Job.folder_path,
+    Job.status,
+    Job.submitted_at,
+    Job.updated_at,
+    Job.language,
+    Job.user_id,
+)
+
+
+def encode_job_cursor(submitted_at: datetime, job_id: UUID) -> str:
+    """Opaque cursor for the position of a job in (submitted_at, id) order."""
+    payload = json.dumps({"s": submitted_at.isoformat(), "i": str(job_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_job_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of `encode_job_cursor`. Raises ValueError for a malformed cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["s"]), UUID(payload["i"])
+    except (binascii.Error, TypeError, KeyError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid job cursor: {e}") from e
+
 
 class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
     async def get_multi_by_owner(
@@ -69,6 +99,44 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
         logger.debug(f"Found {len(jobs)} total jobs.")
         return jobs
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID | None = None,
+        statuses: Sequence[JobStatus] | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[Row[Any]]:
+        """
+        One page of the job list, newest first, as rows of JOB_LIST_COLUMNS.
+
+        `after` is the (submitted_at, id) of the last job of the previous page;
+        the page starts right after it (keyset pagination, served by the
+        (…, submitted_at, id) indexes). The status index only gives an ordered
+        scan for a single status; with several, Postgres sorts the matching
+        rows. `skip` is only for callers still paging by offset.
+        """
+        stmt = select(*JOB_LIST_COLUMNS)
+        if user_id is not None:
+            stmt = stmt.where(self.model.user_id == user_id)
+        if statuses:
+            stmt = stmt.where(self.model.status.in_(statuses))
+        if after is not None:
+            submitted_at, job_id = after
+            stmt = stmt.where(
+                tuple_(self.model.submitted_at, self.model.id) < (submitted_at, job_id)
+            )
+        stmt = stmt.order_by(desc(self.model.submitted_at), desc(self.model.id)).limit(limit)
+        if skip:
+            stmt = stmt.offset(skip)
+
+        result = await db.execute(stmt)
+        rows = list(result.all())
+        logger.debug(f"Found {len(rows)} jobs (user_id: {user_id}, statuses: {statuses}).")
+        return rows
+
     # MOVED METHODS START HERE (Indented to be part of CRUDJob class) - Preserving your comment
     async def update_job_completion_details(
         self,
@@ -83,6 +151,8 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
         full_logs: str | None = None,
         started_at: datetime | None = None,
         celery_task_id: str | None = None,
+        log_path: str | None = None,
+        log_size: int | None = None,
     ) -> Job | None:
         """
         Updates job status and other completion or running details using JobUpdate schema.
@@ -109,6 +179,8 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
             full_logs,
             started_at,
             celery_task_id,
+            log_path,
+            log_size,
         )
 
         try:
@@ -135,6 +207,8 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
         full_logs: str | None,
         started_at: datetime | None,
         celery_task_id: str | None = None,
+        log_path: str | None = None,
+        log_size: int | None = None,
     ) -> dict[str, Any]:  # Added type hint for return
         """
         Prepares update data dictionary based on the job status and provided parameters.
@@ -154,6 +228,9 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
             update_data["full_logs"] = full_logs
         if celery_task_id is not None:
             update_data["celery_task_id"] = celery_task_id
+        if log_path is not None:
+            update_data["log_path"] = log_path
+            update_data["log_size"] = log_size
 
         current_time_utc = datetime.now(UTC)  # Changed from UTC to timezone.utc
 
@@ -176,9 +253,12 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
         job_id: UUID,
         celery_task_id: str,
         started_at: datetime | None = None,
+        log_path: str | None = None,
     ) -> Job | None:
         """
         Updates a job to set its start time, Celery task ID, and status to RUNNING.
+        `log_path` names the output archive the worker has opened for the run, so
+        the job's log can be read while it runs.
         """
         # CRUDBase.get expects 'id' as the kwarg for the primary key.
         db_obj = await self.get(db, id=job_id)  # Using self.get from CRUDBase
@@ -196,6 +276,9 @@ class CRUDJob(CRUDBase[Job, JobCreateInternal, JobUpdate]):
         )  # Changed to timezone.utc
         db_obj.status = JobStatus.RUNNING
         db_obj.celery_task_id = celery_task_id
+        if log_path is not None:
+            db_obj.log_path = log_path
+            db_obj.log_size = None  # Known once the run is finished
         # db_obj.updated_at is handled by the database's onupdate mechanism if configured on the model,
         # or needs to be set manually if not. Your Job model has onupdate=func.now() for updated_at.
 
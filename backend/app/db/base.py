@@ -17,13 +17,15 @@
 from app.db.base_class import Base  # noqa: F401
 from app.db.models.api_key import ApiKey  # noqa: F401
 from app.db.models.app_settings import AppSettings  # noqa: F401
-from app.db.models.audit_log import AuditLog, AuditOutbox  # noqa: F401
+from app.db.models.audit_log import AuditChainCheckpoint, AuditLog, AuditOutbox  # noqa: F401
 from app.db.models.dashboard import DashboardTile  # noqa: F401
 from app.db.models.deepl_usage import DeepLUsage  # noqa: F401
+from app.db.models.imdb_lookup_cache import ImdbLookupCache  # noqa: F401
 from app.db.models.job import Job  # noqa: F401
 from app.db.models.login_attempt import LoginAttempt  # noqa: F401
 from app.db.models.storage_path import StoragePath  # noqa: F401
-from app.db.models.translation_log import TranslationLog  # noqa: F401
+from app.db.models.translation_log import TranslationLog, TranslationStatsDaily  # noqa: F401
+from app.db.models.translation_memory import TranslationMemoryEntry  # noqa: F401
 from app.db.models.trusted_device import TrustedDevice  # noqa: F401
 from app.db.models.user import User  # noqa: F401
 from app.db.models.webhook_key import WebhookKey  # noqa: F401
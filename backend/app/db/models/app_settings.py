@@ -7,7 +7,7 @@ user-configurable settings like API keys and preferences.
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -88,5 +88,13 @@ class AppSettings(Base):
     opensubtitles_allowed_downloads: Mapped[int | None] = mapped_column(Integer, nullable=True)
     opensubtitles_rate_limited: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
 
+    # Bumped on every write; versions the cached effective settings snapshot
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
     def __repr__(self) -> str:
         return f"<AppSettings(id={self.id}, setup_completed={self.setup_completed})>"
@@ -4,6 +4,7 @@ Audit log models for tracking security, admin, and data events.
 Implements:
 - AuditLog: Main audit table (partitioned by month)
 - AuditOutbox: Transactional outbox for reliable logging
+- AuditChainCheckpoint: How far the hash chain has been verified
 """
 
 import uuid
@@ -135,6 +136,8 @@ class AuditLog(Base):
             postgresql_where=severity.in_(["warning", "critical"]),
         ),
         Index("ix_audit_reason_code", "reason_code", postgresql_where=reason_code.isnot(None)),
+        # Hash-chain order, walked by the incremental verifier
+        Index("ix_audit_chain_order", "timestamp", "id"),
         # Postgres Partitioning Clause (SQLAlchemy notation)
         {
             "postgresql_partition_by": "RANGE (timestamp)",
@@ -177,3 +180,30 @@ class AuditOutbox(Base):
 
     def __repr__(self) -> str:
         return f"<AuditOutbox({self.event_id}, {self.processed})>"
+
+
+class AuditChainCheckpoint(Base):
+    """
+    Last audit log entry whose hash has been verified, one row per chain.
+
+    The incremental verifier resumes after (last_timestamp, last_log_id) and
+    chains the next entry onto last_event_hash, so each run only checks new events.
+    """
+
+    __tablename__ = "audit_chain_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True, default="audit_logs")
+    last_log_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_timestamp: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_event_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    verified_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    issue_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_issue: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AuditChainCheckpoint({self.name}, {self.last_log_id}, {self.verified_count})>"
@@ -21,6 +21,9 @@ class DeepLUsage(Base):
     key_identifier: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     character_count: Mapped[int] = mapped_column(Integer, default=0)
     character_limit: Mapped[int] = mapped_column(Integer, default=500000)
+    # Characters held by requests in flight on any worker (see deepl_quota ledger)
+    reserved_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    reserved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     valid: Mapped[bool] = mapped_column(Boolean, default=True)
     last_updated: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
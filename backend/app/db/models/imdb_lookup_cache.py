@@ -0,0 +1,41 @@
+# backend/app/db/models/imdb_lookup_cache.py
+"""
+Persistent cache of IMDb ID lookups done by the subtitle pipeline.
+Lets every episode of a show (and re-runs over a library) skip OMDb/TMDb/IMDbPY.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class ImdbLookupCache(Base):
+    """
+    One resolved (or unresolved) lookup, keyed by normalized title, year and content type.
+    Rows with ``imdb_id`` NULL are negative results and get a shorter ``expires_at``.
+    """
+
+    __tablename__ = "imdb_lookup_cache"
+
+    # "<content_type>|<normalized title>|<year or ''>"
+    lookup_key: Mapped[str] = mapped_column(String(600), primary_key=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
+    year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    content_type: Mapped[str] = mapped_column(String(16), nullable=False)  # movie/series/any
+    imdb_id: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    found_type: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImdbLookupCache(key={self.lookup_key}, imdb_id={self.imdb_id})>"
@@ -8,13 +8,17 @@ from typing import (  # Using Optional for broader Python compatibility if neede
 )
 
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     event,
+    false,
     func,  # For server_default and onupdate
 )
 from sqlalchemy import Enum as SQLAlchemyEnum  # Renamed to avoid conflict with Python's enum
@@ -45,6 +49,11 @@ class Job(Base):
             "(status NOT IN ('RUNNING', 'CANCELLING')) OR (celery_task_id IS NOT NULL)",
             name="check_job_running_has_task_id",
         ),
+        # Keyset pagination of the job list (newest first), overall, per user and per status
+        # (the status index serves single-status filters; IN (...) lists need a sort)
+        Index("ix_jobs_submitted_at_id", "submitted_at", "id"),
+        Index("ix_jobs_user_id_submitted_at_id", "user_id", "submitted_at", "id"),
+        Index("ix_jobs_status_submitted_at_id", "status", "submitted_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -66,6 +75,10 @@ class Job(Base):
     folder_path: Mapped[str] = mapped_column(String(1024), nullable=False)
     language: Mapped[str | None] = mapped_column(String(10), nullable=True)
     log_level: Mapped[str] = mapped_column(String(10), nullable=False, default="INFO")
+    # Only new or changed video files are processed (see library_scan_index)
+    incremental: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
 
     status: Mapped[JobStatus] = mapped_column(
         SQLAlchemyEnum(  # Using the aliased import
@@ -106,9 +119,14 @@ class Job(Base):
     # A snippet of the job's logs, e.g., last N lines or relevant error output
     log_snippet: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    # Complete logs from job execution (stdout + stderr combined)
+    # Complete logs from job execution (stdout + stderr combined); only jobs that
+    # finished before logs were archived, or ran with JOB_LOG_ARCHIVE_ENABLED off
     full_logs: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Compressed output archive (file name within JOB_LOG_ARCHIVE_DIR) and its uncompressed size
+    log_path: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    log_size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
     # The actual command string executed by the Celery worker
     script_command: Mapped[str | None] = mapped_column(Text, nullable=True)
 
@@ -4,9 +4,9 @@ Model for tracking individual translation jobs.
 Replaces the JSON-based translation_log.json file.
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import BigInteger, Date, DateTime, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -40,9 +40,40 @@ class TranslationLog(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     # Path to the translated output file (for download)
     output_file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Translation memory: segments in the file, segments not sent to a provider
+    # (memory hits or repeats within the file) and the characters that saved.
+    segments_total: Mapped[int] = mapped_column(Integer, default=0)
+    memory_hits: Mapped[int] = mapped_column(Integer, default=0)
+    memory_chars_saved: Mapped[int] = mapped_column(Integer, default=0)
 
     def __repr__(self) -> str:
         return (
             f"<TranslationLog(file={self.file_name}, service={self.service_used}, "
             f"chars={self.characters_billed})>"
         )
+
+
+class TranslationStatsDaily(Base):
+    """
+    Daily totals of translation_log (UTC days) per service, target language and status.
+    Updated together with the log rows (see usage_accounting), so the statistics
+    endpoint sums a few rows per day instead of scanning the whole log.
+    """
+
+    __tablename__ = "translation_stats_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    service_used: Mapped[str] = mapped_column(String(50), primary_key=True)
+    target_language: Mapped[str] = mapped_column(String(10), primary_key=True)
+    status: Mapped[str] = mapped_column(String(50), primary_key=True)
+    translations: Mapped[int] = mapped_column(BigInteger, default=0)
+    characters_billed: Mapped[int] = mapped_column(BigInteger, default=0)
+    deepl_characters: Mapped[int] = mapped_column(BigInteger, default=0)
+    google_characters: Mapped[int] = mapped_column(BigInteger, default=0)
+    memory_chars_saved: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TranslationStatsDaily(day={self.day}, service={self.service_used}, "
+            f"status={self.status}, translations={self.translations})>"
+        )
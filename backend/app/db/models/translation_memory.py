@@ -0,0 +1,46 @@
+# backend/app/db/models/translation_memory.py
+"""
+Translation memory used by the SRT translator.
+Segments translated once are reused instead of being sent (and billed) again.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class TranslationMemoryEntry(Base):
+    """
+    One translated segment, keyed by source language, target language and normalized text.
+    ``last_used_at`` drives eviction once the table exceeds TRANSLATION_MEMORY_MAX_ENTRIES.
+    """
+
+    __tablename__ = "translation_memory"
+
+    # sha256 of "<source lang>|<target lang>|<normalized text>"
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    source_language: Mapped[str] = mapped_column(String(10), nullable=False)  # "auto" if unknown
+    target_language: Mapped[str] = mapped_column(String(10), nullable=False)
+    source_text: Mapped[str] = mapped_column(Text, nullable=False)
+    translated_text: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TranslationMemoryEntry({self.source_language}->{self.target_language}, "
+            f"hits={self.hit_count})>"
+        )
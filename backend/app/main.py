@@ -311,6 +311,7 @@ if settings.BACKEND_CORS_ORIGINS:
                 "Origin",
                 "X-Requested-With",
             ],
+            expose_headers=["X-Next-Cursor"],  # Job list pagination
         )
         logger.info(f"CORS enabled for origins: {origins}")
     else:
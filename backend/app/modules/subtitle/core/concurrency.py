@@ -0,0 +1,169 @@
+"""
+Concurrency helpers for running the per-file subtitle pipeline in parallel.
+
+`run_file_pipelines` fans the files of a movie/TV folder out over a bounded
+thread pool (SUBTITLE_PIPELINE_WORKERS). Pipelines spend most of their time
+waiting on HTTP providers, ffmpeg/ffprobe and ffsubsync subprocesses, so
+threads are enough to overlap that work.
+
+`provider_slot(name)` caps how many pipelines may use one external dependency
+at the same time (OpenSubtitles rate limits, DeepL quota bursts, CPU-bound
+sync runs), independently of the worker count.
+
+While a parallel run is active, every log record emitted from a worker thread
+is prefixed with ``[<file name>]`` so interleaved job output stays readable.
+"""
+
+import contextlib
+import logging
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Provider name -> settings attribute holding its concurrency limit.
+PROVIDER_LIMIT_SETTINGS: dict[str, str] = {
+    "opensubtitles": "SUBTITLE_CONCURRENCY_OPENSUBTITLES",
+    "subsro": "SUBTITLE_CONCURRENCY_SUBSRO",
+    "metadata": "SUBTITLE_CONCURRENCY_METADATA",
+    "translation": "SUBTITLE_CONCURRENCY_TRANSLATION",
+    "sync": "SUBTITLE_CONCURRENCY_SYNC",
+    "ffmpeg": "SUBTITLE_CONCURRENCY_FFMPEG",
+}
+
+_current_file: ContextVar[str | None] = ContextVar("subtitle_pipeline_file", default=None)
+
+_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+def _provider_limit(name: str) -> int:
+    setting_name = PROVIDER_LIMIT_SETTINGS.get(name)
+    if setting_name is None:
+        raise ValueError(f"Unknown provider for concurrency limit: {name}")
+    return max(1, int(getattr(settings, setting_name, 1)))
+
+
+def _get_semaphore(name: str) -> threading.BoundedSemaphore:
+    semaphore = _semaphores.get(name)
+    if semaphore is None:
+        with _semaphores_lock:
+            semaphore = _semaphores.get(name)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(_provider_limit(name))
+                _semaphores[name] = semaphore
+    return semaphore
+
+
+def reset_provider_limits() -> None:
+    """Drops the cached semaphores so limits are re-read from settings (used by tests)."""
+    with _semaphores_lock:
+        _semaphores.clear()
+
+
+@contextlib.contextmanager
+def provider_slot(name: str) -> Iterator[None]:
+    """Blocks until a concurrency slot for the named provider is free, holding it for the block."""
+    semaphore = _get_semaphore(name)
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+def current_file_label() -> str | None:
+    """Returns the label of the file processed by the current worker thread, if any."""
+    return _current_file.get()
+
+
+class FileLabelFilter(logging.Filter):
+    """Prefixes log records emitted while processing a file with ``[<file name>]``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        label = _current_file.get()
+        if label and not getattr(record, "subtitle_file_label", None):
+            record.msg = f"[{label}] {record.getMessage()}"
+            record.args = None
+            record.subtitle_file_label = label
+        return True
+
+
+@contextlib.contextmanager
+def _file_labelled_logging() -> Iterator[None]:
+    root_logger = logging.getLogger()
+    label_filter = FileLabelFilter()
+    handlers = list(root_logger.handlers)
+    for handler in handlers:
+        handler.addFilter(label_filter)
+    try:
+        yield
+    finally:
+        for handler in handlers:
+            handler.removeFilter(label_filter)
+
+
+def submit_with_context[T](executor: Executor, fn: Callable[..., T], /, *args: object) -> Future[T]:
+    """Submits `fn` so it runs with the caller's context (keeps the ``[<file name>]`` label)."""
+    return executor.submit(copy_context().run, fn, *args)
+
+
+def resolve_worker_count(item_count: int, workers: int | None = None) -> int:
+    """Number of pipeline threads to use for `item_count` files (at least 1)."""
+    configured = workers if workers is not None else settings.SUBTITLE_PIPELINE_WORKERS
+    return max(1, min(int(configured), item_count))
+
+
+def run_file_pipelines[T](
+    file_paths: Sequence[str],
+    run_one: Callable[[str], T],
+    on_error: Callable[[str, Exception], T],
+    workers: int | None = None,
+) -> list[T]:
+    """
+    Runs `run_one(path)` for every file and returns the results in input order.
+
+    With a single worker the files are processed sequentially on the calling
+    thread, exactly as before. Exceptions raised by `run_one` are passed to
+    `on_error`, whose return value becomes that file's result, so one failing
+    file never stops the others.
+    """
+    if not file_paths:
+        return []
+
+    def _run(path: str) -> T:
+        token = _current_file.set(Path(path).name)
+        try:
+            return run_one(path)
+        except Exception as e:
+            return on_error(path, e)
+        finally:
+            _current_file.reset(token)
+
+    worker_count = resolve_worker_count(len(file_paths), workers)
+    if worker_count == 1:
+        return [_run(path) for path in file_paths]
+
+    logger.info(f"Processing {len(file_paths)} files with {worker_count} parallel pipelines.")
+    with (
+        _file_labelled_logging(),
+        ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="subpipe") as executor,
+    ):
+        return list(executor.map(_run, file_paths))
+
+
+__all__ = [
+    "PROVIDER_LIMIT_SETTINGS",
+    "FileLabelFilter",
+    "current_file_label",
+    "provider_slot",
+    "reset_provider_limits",
+    "resolve_worker_count",
+    "run_file_pipelines",
+    "submit_with_context",
+]
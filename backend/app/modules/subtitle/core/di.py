@@ -1,5 +1,7 @@
 import logging
-from typing import Any
+import threading
+from types import TracebackType
+from typing import Any, Self
 
 # Import service modules/classes (adjust paths as needed)
 # Stateless services (can often be referenced directly by module)
@@ -24,10 +26,19 @@ class ServiceContainer:
     """
     A simple container for lazily initializing and accessing services required
     by the subtitle processing pipeline strategies.
+
+    A per-file container (the default) is shut down by the pipeline when the
+    file is done. A shared container (``shared=True``) is scoped to a whole
+    folder/job instead: every file's pipeline borrows it, so logins and client
+    setup happen once, and `shutdown()` from a pipeline is ignored until the
+    owner calls `close()` (or leaves the ``with`` block).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, shared: bool = False) -> None:
         """Initializes the container, setting up references but deferring actual client instantiation."""
+        self.shared = shared
+        # Guards lazy initialization when several pipelines borrow the container concurrently.
+        self._init_lock = threading.RLock()
         # References to stateless service modules
         self._imdb_service = imdb_service
         self._subsro_service = subsro_service
@@ -55,6 +66,12 @@ class ServiceContainer:
         Lazily initializes and returns the Translation Manager singleton instance.
         Returns None if initialization fails.
         """
+        if self._translator_manager_instance is None:
+            with self._init_lock:
+                return self._init_translator()
+        return self._translator_manager_instance
+
+    def _init_translator(self) -> translator_service.TranslationManager | None:
         if self._translator_manager_instance is None:
             logger.debug("Initializing Translation Manager...")
             try:
@@ -83,6 +100,12 @@ class ServiceContainer:
         """
         # Note: This property might not be used by the core pipeline strategies,
         # but is kept for potential use by post_process_completed_torrents if called separately.
+        if self._qb_client_instance is None:
+            with self._init_lock:
+                return self._init_qbittorrent()
+        return self._qb_client_instance
+
+    def _init_qbittorrent(self) -> qb_client_service.qbittorrentapi.Client | None:
         if self._qb_client_instance is None:
             logger.debug("Initializing qBittorrent client...")
             try:
@@ -109,6 +132,12 @@ class ServiceContainer:
         Handles authentication internally within the client wrapper.
         Returns None if client initialization fails.
         """
+        if self._opensubtitles_client_instance is None:
+            with self._init_lock:
+                return self._init_opensubtitles()
+        return self._opensubtitles_client_instance
+
+    def _init_opensubtitles(self) -> OpenSubtitlesClient | None:
         if self._opensubtitles_client_instance is None:
             logger.debug("Initializing OpenSubtitlesClient wrapper...")
             try:
@@ -128,8 +157,30 @@ class ServiceContainer:
     def shutdown(self) -> None:
         """
         Performs cleanup actions for managed services, like logging out.
-        Called by the pipeline at the end of processing for a file.
+        Called by the pipeline at the end of processing for a file; a no-op for
+        shared containers, which are cleaned up by `close()`.
         """
+        if self.shared:
+            logger.debug("Shared ServiceContainer stays open for the next file.")
+            return
+        self._shutdown_services()
+
+    def close(self) -> None:
+        """Shuts down the container's services regardless of its scope."""
+        self._shutdown_services()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _shutdown_services(self) -> None:
         logger.info("Shutting down services via ServiceContainer...")
 
         # --- OpenSubtitles Logout ---
@@ -0,0 +1,180 @@
+"""
+Entry point shared by the CLI worker script and the in-process job runner.
+
+`run_subtitle_job` contains the orchestration that used to live in
+`scripts/sub_downloader.py::main`: content-type detection, dispatch to the
+movie/TV processors and the final exit-code decision. It returns the exit code
+instead of calling `sys.exit`, so it can run inside a forked worker child too.
+"""
+
+import logging
+from pathlib import Path
+
+from app.modules.subtitle.core.processor import (
+    determine_content_type_for_path,
+    process_movie_folder,
+    process_tv_show_file,
+    process_tv_show_folder,
+)
+from app.modules.subtitle.services.download_cache import subtitle_download_cache
+from app.modules.subtitle.services.imdb_cache import imdb_id_cache
+from app.modules.subtitle.services.library_scan_index import library_scan_index
+from app.modules.subtitle.services.media_probe_cache import media_probe_cache
+from app.modules.subtitle.services.speech_track_cache import speech_track_cache
+from app.modules.subtitle.utils.logging_config import setup_logging
+
+logger = logging.getLogger("sub_downloader")
+
+SCRIPT_STARTED_MARKER = "=== SUBTITLE DOWNLOADER SCRIPT STARTED ==="
+SCRIPT_ENDED_MARKER = "=== SUBTITLE DOWNLOADER SCRIPT ENDED ({outcome}) ==="
+
+
+class ErrorTrackingHandler(logging.Handler):
+    """Custom handler to track if any ERROR level logs were emitted."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.has_errors = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.ERROR:
+            self.has_errors = True
+
+
+def _print_end_marker(outcome: str) -> None:
+    print(SCRIPT_ENDED_MARKER.format(outcome=outcome), flush=True)
+
+
+def run_subtitle_job(
+    folder_path: str,
+    language: str | None = "ro",
+    log_level: str = "INFO",
+    skip_translation: bool = False,
+    skip_sync: bool = False,
+    incremental: bool = False,
+) -> int:
+    """
+    Runs the subtitle pipeline for a folder or file and returns the process exit code.
+
+    Args:
+        folder_path (str): Path to the media folder or a single video file.
+        language (str, optional): Target language code (informational). Defaults to "ro".
+        log_level (str): Console log level for the run. Defaults to "INFO".
+        skip_translation (bool): Skip the automatic translation step.
+        skip_sync (bool): Skip the subtitle synchronization step.
+        incremental (bool): Only process video files that are new or changed since the last run.
+
+    Returns:
+        int: 0 on success (or nothing to do), 1 on failure.
+    """
+    print(SCRIPT_STARTED_MARKER, flush=True)
+
+    # Setup logging with the specified level - this takes over ALL logging
+    setup_logging(console_level_override=log_level.upper(), include_timestamp=False)
+
+    # Re-attach error tracker to root logger after setup_logging clears handlers
+    error_tracker = ErrorTrackingHandler()
+    logging.getLogger().addHandler(error_tracker)
+
+    target_path = Path(folder_path)
+
+    logger.info("=== Subtitle Downloader Started ===")
+    logger.info(f"Folder path: {folder_path}")
+    logger.info(f"Language: {language or 'ro'}")
+    logger.info(f"Log level: {log_level.upper()}")
+    logger.info(f"Skip translation: {skip_translation}")
+    logger.info(f"Skip sync: {skip_sync}")
+    logger.info(f"Incremental: {incremental}")
+
+    if not target_path.exists():
+        logger.error(f"Folder path does not exist: {folder_path}")
+        _print_end_marker("error")
+        return 1
+
+    # Build processing options
+    processing_options = {
+        "skip_translation": skip_translation,
+        "skip_sync": skip_sync,
+        "incremental": incremental,
+    }
+
+    # Determine content type
+    logger.info(f"Analyzing content type for: {folder_path}")
+    content_type = determine_content_type_for_path(folder_path)
+    logger.info(f"Detected content type: {content_type}")
+
+    success_count = 0
+    try:
+        if target_path.is_file():
+            if content_type == "tvshow":
+                logger.info("Input is a file. Processing as a single TV episode.")
+                success_count = process_tv_show_file(folder_path, options=processing_options)
+            else:
+                logger.info("Input is a file. Processing as a single movie file.")
+                success_count = process_movie_folder(folder_path, options=processing_options)
+        elif content_type == "movie":
+            logger.info(f"Processing as MOVIE: {folder_path}")
+            success_count = process_movie_folder(folder_path, options=processing_options)
+        elif content_type == "tvshow":
+            logger.info(f"Processing as TV SHOW: {folder_path}")
+            success_count = process_tv_show_folder(folder_path, options=processing_options)
+        else:
+            logger.warning(
+                f"Could not determine content type for: {folder_path}. Defaulting to movie processing."
+            )
+            success_count = process_movie_folder(folder_path, options=processing_options)
+    except Exception as e:
+        logger.error(f"Error during processing: {e}", exc_info=True)
+        _print_end_marker("error")
+        return 1
+
+    logger.info("=== Processing Complete ===")
+    logger.info(f"Subtitles processed successfully: {success_count}")
+    cache_stats = imdb_id_cache.stats()
+    logger.info(
+        f"IMDb ID cache: {cache_stats['memory_hits'] + cache_stats['store_hits']} hits "
+        f"({cache_stats['memory_hits']} memory, {cache_stats['store_hits']} stored), "
+        f"{cache_stats['misses']} misses"
+    )
+    download_stats = subtitle_download_cache.stats()
+    logger.info(
+        f"Subtitle download cache: {download_stats['hits']} hits, "
+        f"{download_stats['misses']} misses, {download_stats['evictions']} evicted"
+    )
+    probe_stats = media_probe_cache.stats()
+    logger.info(
+        f"Media probe index: {probe_stats['memory_hits'] + probe_stats['store_hits']} hits "
+        f"({probe_stats['store_hits']} from earlier jobs), {probe_stats['stores']} probed"
+    )
+    scan_stats = library_scan_index.stats()
+    logger.info(
+        f"Library scan index: {scan_stats['reused']} directories reused, "
+        f"{scan_stats['listed']} listed"
+    )
+    speech_stats = speech_track_cache.stats()
+    logger.info(
+        f"Sync speech tracks: {speech_stats['hits']} reused, {speech_stats['stores']} extracted"
+    )
+
+    # If we successfully processed at least one subtitle, consider it a success
+    # even if there were some non-fatal errors logged during processing
+    if success_count > 0:
+        if error_tracker.has_errors:
+            logger.info(
+                "Some non-fatal errors occurred during processing, but subtitles were processed successfully."
+            )
+        _print_end_marker("success")
+        return 0
+
+    # Check if any errors were logged during processing with no success
+    if error_tracker.has_errors:
+        logger.warning("Errors occurred during processing and no subtitles were processed.")
+        _print_end_marker("with errors")
+        return 1
+
+    # No errors but also no subtitles found - still success (nothing to do)
+    _print_end_marker("success")
+    return 0
+
+
+__all__ = ["ErrorTrackingHandler", "run_subtitle_job"]
@@ -1,5 +1,4 @@
 import logging
-import os
 import re
 import time
 from collections.abc import Callable
@@ -10,6 +9,7 @@ from typing import Any
 
 # Note: opensubtitles_service is NOT directly used here anymore for core processing
 # --- Import Config & Constants ---
+from app.modules.subtitle.core.concurrency import provider_slot, run_file_pipelines
 from app.modules.subtitle.core.constants import SKIP_PATTERNS, VIDEO_EXTENSIONS
 
 # --- Import New Pipeline Components ---
@@ -29,6 +29,7 @@ from app.modules.subtitle.core.strategies import (
 # --- Import Services ---
 # IMDB service is used for initial info gathering
 from app.modules.subtitle.services import imdb as imdb_service
+from app.modules.subtitle.services.library_scan_index import LibraryScan, library_scan_index
 
 # --- Get Logger ---
 logger = logging.getLogger(__name__)
@@ -67,6 +68,7 @@ class DetectionSignals:
     # Metadata
     path_depth: int = 0
     is_file: bool = True
+    scan_incomplete: bool = False  # Directory scan cut short by its time limit or an error
 
 
 @dataclass
@@ -146,10 +148,21 @@ _SEASON_PATTERN = TV_PATTERNS[
 
 # Keep the underscore prefix as it's primarily called by the functions within this module
 # or the main orchestrator (main.py).
+def _lookup_imdb_id(
+    di_container: ServiceContainer, title: str, year: Any, content_type: str
+) -> str | None:
+    """Resolves the IMDb ID, bounded by the shared metadata-provider concurrency limit."""
+    imdb_id: str | None
+    with provider_slot("metadata"):
+        imdb_id, _, _ = di_container.imdb.get_imdb_id(title, year, content_type=content_type)
+    return imdb_id
+
+
 def _run_pipeline_for_file(
     video_file_path: str,
     options: dict[str, Any] | None = None,
     tv_show_details: dict[str, str | None] | None = None,
+    di_container: ServiceContainer | None = None,
 ) -> bool:
     """
     Sets up and runs the subtitle processing pipeline for a single video file.
@@ -157,6 +170,8 @@ def _run_pipeline_for_file(
     Args:
         video_file_path (str): Full path to the video file.
         options (dict, optional): Processing options (e.g., skip flags). Defaults to {}.
+        di_container (ServiceContainer, optional): Shared folder-scoped container to borrow.
+            A private per-file container is created (and shut down) when omitted.
 
     Returns:
         bool: True if the pipeline reported overall success (found RO or suitable EN),
@@ -167,9 +182,10 @@ def _run_pipeline_for_file(
     logger.info(f"Preparing pipeline for: {video_basename}")
 
     # --- 1. Initialize DI Container ---
-    # A fresh container for each file ensures service states (like login tokens)
-    # are managed correctly per processing run.
-    di_container = ServiceContainer()
+    # Folder runs pass a shared container so logins and clients are reused across
+    # files; its shutdown() calls below are no-ops until the folder run closes it.
+    if di_container is None:
+        di_container = ServiceContainer()
 
     # --- 2. Gather Initial Video Info ---
     video_info: dict[str, Any] = {"basename": video_basename}
@@ -192,9 +208,7 @@ def _run_pipeline_for_file(
             media_type = "episode"
             title_or_show_name = show_name
             video_info.update({"s": s, "e": e, "year": year, "show_name": show_name})
-            imdb_id_result, _, _ = di_container.imdb.get_imdb_id(
-                show_name, year, content_type="series"
-            )
+            imdb_id_result = _lookup_imdb_id(di_container, show_name, year, content_type="series")
             imdb_id = imdb_id_result
         else:
             # Try TV show extraction first (more specific pattern)
@@ -204,8 +218,8 @@ def _run_pipeline_for_file(
                 title_or_show_name = show_name
                 video_info.update({"s": s, "e": e, "year": year, "show_name": show_name})
                 # Get IMDb ID for the show (using DI container's instance if needed)
-                imdb_id_result, _, _ = di_container.imdb.get_imdb_id(
-                    show_name, year, content_type="series"
+                imdb_id_result = _lookup_imdb_id(
+                    di_container, show_name, year, content_type="series"
                 )
                 imdb_id = imdb_id_result
             else:
@@ -216,8 +230,8 @@ def _run_pipeline_for_file(
                     title_or_show_name = title
                     video_info.update({"year": year, "title": title})
                     # Get IMDb ID for the movie
-                    imdb_id_result, _, _ = di_container.imdb.get_imdb_id(
-                        title, year, content_type="movie"
+                    imdb_id_result = _lookup_imdb_id(
+                        di_container, title, year, content_type="movie"
                     )
                     imdb_id = imdb_id_result
                 else:
@@ -300,6 +314,32 @@ def _run_pipeline_for_file(
         return False
 
 
+def _select_files_to_process(
+    scan: LibraryScan, video_paths: list[str], options: dict[str, Any]
+) -> list[str]:
+    """In incremental runs, keeps only the new or changed videos that still lack a RO subtitle."""
+    if not options.get("incremental"):
+        return video_paths
+    selected = [path for path in video_paths if scan.needs_processing(path)]
+    logger.info(
+        f"Incremental run: {len(selected)} of {len(video_paths)} video file(s) are new or changed."
+    )
+    return selected
+
+
+def _record_processed_files(
+    scan: LibraryScan, video_paths: list[str], results: list[bool | None]
+) -> None:
+    """
+    Marks the videos the pipeline succeeded for, so later incremental runs skip them.
+    Failed videos stay eligible and are retried by the next incremental run.
+    """
+    for video_path, result in zip(video_paths, results, strict=True):
+        if result is True:
+            scan.mark_processed(video_path)
+    scan.save()
+
+
 # === Public Processing Functions ===
 
 
@@ -317,11 +357,10 @@ def process_movie_folder(movie_path: str, options: dict[str, Any] | None = None)
     """
     logger.info(f"Starting Movie Folder/File Processing (Pipeline): {movie_path}")
     options = options or {}
-    processed_files_count = 0
-    successful_pipelines_count = 0
     target_path = Path(movie_path).resolve()
 
     files_to_process = []
+    scan: LibraryScan | None = None
     if target_path.is_file():
         # Check if it's a video file before adding
         if target_path.suffix.lower() in VIDEO_EXTENSIONS and not any(
@@ -332,7 +371,8 @@ def process_movie_folder(movie_path: str, options: dict[str, Any] | None = None)
             logger.warning(f"Input path is a file but not a processable video file: {movie_path}")
     elif target_path.is_dir():
         logger.info(f"Scanning for movie files in: {target_path}")
-        for root, _, files in os.walk(str(target_path)):
+        scan = library_scan_index.open(target_path)
+        for root, _, files in scan.walk():
             for file in files:
                 if file.lower().endswith(tuple(VIDEO_EXTENSIONS)) and not any(
                     p in file.upper() for p in SKIP_PATTERNS
@@ -350,34 +390,40 @@ def process_movie_folder(movie_path: str, options: dict[str, Any] | None = None)
         logger.error(f"Invalid path provided to process_movie_folder: {movie_path}")
         return 0
 
+    if scan is not None:
+        files_to_process = _select_files_to_process(scan, files_to_process, options)
     if not files_to_process:
         logger.info("No suitable movie files found to process.")
+        if scan is not None:
+            scan.save()
         return 0
 
     logger.info(f"Found {len(files_to_process)} potential movie file(s) to process.")
 
-    for video_file_path in files_to_process:
+    def _process_movie_file(video_file_path: str) -> bool | None:
         if not Path(video_file_path).exists():
             logger.warning(
                 f"Video file seems to have been removed during scan: {video_file_path}. Skipping."
             )
-            continue
+            return None
+        # Success/failure logging is handled inside _run_pipeline_for_file and pipeline
+        return _run_pipeline_for_file(video_file_path, options, di_container=services)
 
-        processed_files_count += 1
-        try:
-            # Run the pipeline for the individual file and check success
-            if _run_pipeline_for_file(video_file_path, options):
-                successful_pipelines_count += 1
-                # Success logging is handled inside _run_pipeline_for_file and pipeline
-            else:
-                # Failure logging is handled inside _run_pipeline_for_file and pipeline
-                pass
-        except Exception as e:
-            # Catch unexpected errors at the file level to allow processing others
-            logger.error(
-                f"!! Unhandled error during pipeline invocation for movie file {video_file_path}: {e}",
-                exc_info=True,
-            )
+    def _on_movie_error(video_file_path: str, e: Exception) -> bool:
+        # Catch unexpected errors at the file level to allow processing others
+        logger.error(
+            f"!! Unhandled error during pipeline invocation for movie file {video_file_path}: {e}",
+            exc_info=True,
+        )
+        return False
+
+    # Files run in parallel (bounded by SUBTITLE_PIPELINE_WORKERS); results keep input order.
+    with ServiceContainer(shared=True) as services:
+        results = run_file_pipelines(files_to_process, _process_movie_file, _on_movie_error)
+    if scan is not None:
+        _record_processed_files(scan, files_to_process, results)
+    processed_files_count = sum(1 for result in results if result is not None)
+    successful_pipelines_count = sum(1 for result in results if result)
 
     logger.info(f"Movie Folder/File Processing Complete (Pipeline): {movie_path}")
     logger.info(
@@ -453,8 +499,6 @@ def process_tv_show_folder(tv_show_path: str, options: dict[str, Any] | None = N
     """
     logger.info(f"Starting TV Show Folder Processing (Pipeline): {tv_show_path}")
     options = options or {}
-    processed_episodes_count = 0
-    successful_pipelines_count = 0
     target_path = Path(tv_show_path).resolve()
 
     if not target_path.is_dir():
@@ -463,8 +507,9 @@ def process_tv_show_folder(tv_show_path: str, options: dict[str, Any] | None = N
 
     episode_paths = []
     logger.info(f"Scanning for TV episode files in: {target_path}...")
+    scan = library_scan_index.open(target_path)
     try:
-        for root, _, files in os.walk(str(target_path)):
+        for root, _, files in scan.walk():
             for file in files:
                 if any(p in file.upper() for p in SKIP_PATTERNS):
                     continue
@@ -472,8 +517,6 @@ def process_tv_show_folder(tv_show_path: str, options: dict[str, Any] | None = N
                     continue
 
                 video_file_path = Path(root) / file
-                if not video_file_path.exists():
-                    continue
 
                 # Check if it looks like an episode file using naming convention
                 show_name, season, episode, _ = imdb_service.extract_tv_show_details(file)
@@ -486,34 +529,37 @@ def process_tv_show_folder(tv_show_path: str, options: dict[str, Any] | None = N
         logger.error(f"Error scanning directory {tv_show_path}: {walk_err}", exc_info=True)
         return 0  # Cannot proceed if scan fails
 
+    episode_paths = _select_files_to_process(scan, episode_paths, options)
     if not episode_paths:
         logger.info("No TV show episodes found matching expected patterns.")
+        scan.save()
         return 0
     logger.info(f"Scan complete. Found {len(episode_paths)} potential episode files.")
 
     # --- Process Each Episode File ---
-    for video_path in episode_paths:
+    def _process_episode_file(video_path: str) -> bool | None:
         if not Path(video_path).exists():
             logger.warning(
                 f"Episode file gone before processing: {Path(video_path).name}. Skipping."
             )
-            continue
+            return None
+        # Success/failure logging handled by pipeline
+        return _run_pipeline_for_file(video_path, options, di_container=services)
 
-        processed_episodes_count += 1
-        try:
-            # Run the pipeline for the individual episode file
-            if _run_pipeline_for_file(video_path, options):
-                successful_pipelines_count += 1
-            # Success logging handled by pipeline
-            else:
-                # Failure logging handled by pipeline
-                pass
-        except Exception as e:
-            # Catch errors at the file level
-            logger.error(
-                f"!! Unhandled error during pipeline invocation for episode file {video_path}: {e}",
-                exc_info=True,
-            )
+    def _on_episode_error(video_path: str, e: Exception) -> bool:
+        # Catch errors at the file level
+        logger.error(
+            f"!! Unhandled error during pipeline invocation for episode file {video_path}: {e}",
+            exc_info=True,
+        )
+        return False
+
+    # One container (logins, translator, HTTP clients) serves every episode of the folder.
+    with ServiceContainer(shared=True) as services:
+        results = run_file_pipelines(episode_paths, _process_episode_file, _on_episode_error)
+    _record_processed_files(scan, episode_paths, results)
+    processed_episodes_count = sum(1 for result in results if result is not None)
+    successful_pipelines_count = sum(1 for result in results if result)
 
     logger.info(f"TV Show Folder Processing Finished (Pipeline): {tv_show_path}")
     logger.info(
@@ -706,7 +752,9 @@ def decide_content_type(signals: DetectionSignals, config: DetectionConfig) -> C
     return ContentType.UNKNOWN
 
 
-def _extract_signals(p: Path, config: DetectionConfig) -> DetectionSignals:
+def _extract_signals(
+    p: Path, config: DetectionConfig, scan: LibraryScan | None = None
+) -> DetectionSignals:
     """Extract all detection signals from a path"""
     signals = DetectionSignals()
     signals.is_file = p.is_file() if p.exists() else True  # Assume file if unsure
@@ -720,7 +768,7 @@ def _extract_signals(p: Path, config: DetectionConfig) -> DetectionSignals:
         signals = _analyze_path_structure(p, config, signals)
     else:
         # For directories: scan contents (with limits)
-        signals = _scan_directory(p, config, signals)
+        signals = _scan_directory(p, config, signals, scan)
 
     return signals
 
@@ -843,7 +891,7 @@ def _scan_files_in_dir(
 
 
 def _scan_directory(
-    p: Path, config: DetectionConfig, signals: DetectionSignals
+    p: Path, config: DetectionConfig, signals: DetectionSignals, scan: LibraryScan | None = None
 ) -> DetectionSignals:
     """
     Scan directory contents to detect patterns.
@@ -853,18 +901,20 @@ def _scan_directory(
     - Maximum depth limit
     - Maximum time limit
     - No symlink following (prevents loops)
+    - Unchanged directories served from the library scan index
     """
+    if scan is None:
+        with library_scan_index.open(p) as scan:
+            return _scan_directory(p, config, signals, scan)
+
     start_time = time.time()
     files_checked = 0
 
     try:
-        # Use os.walk with safeguards
-        for root, dirs, files in os.walk(
-            str(p),
-            topdown=True,
-            followlinks=False,  # CRITICAL: Prevent symlink loops
-        ):
+        # Top-down walk with safeguards; symlinks are not followed (prevents loops)
+        for root, dirs, files in scan.walk():
             if _scan_timed_out(start_time, config, p):
+                signals.scan_incomplete = True
                 break
 
             if _prune_by_depth(root, p, config, dirs):
@@ -877,13 +927,31 @@ def _scan_directory(
                 return signals
 
     except PermissionError:
+        signals.scan_incomplete = True
         logger.warning(f"Permission denied scanning directory {p}")
     except OSError as e:
+        signals.scan_incomplete = True
         logger.warning(f"Error scanning directory {p}: {e}")
 
     return signals
 
 
+def _classify_directory(p: Path, config: DetectionConfig) -> ContentType:
+    """Classifies a directory, reusing the stored result while its sampled folders are unchanged."""
+    with library_scan_index.open(p) as scan:
+        cached = scan.cached_content_type()
+        if cached is not None:
+            logger.debug(f"Classified '{p.name}' as {cached} (library scan index)")
+            return ContentType(cached)
+        signals = _extract_signals(p, config, scan)
+        result = decide_content_type(signals, config)
+        # A partial scan saw only part of the folder; unchanged mtimes would keep it forever
+        if not signals.scan_incomplete:
+            scan.store_content_type(result.value)
+    logger.debug(f"Classified '{p.name}' as {result.value} (Signals: {signals})")
+    return result
+
+
 def determine_content_type_for_path(
     directory: str | Path | None, config: DetectionConfig | None = None, strict_exists: bool = False
 ) -> str | None:
@@ -901,6 +969,8 @@ def determine_content_type_for_path(
     """
     logger.debug(f"Attempting content type detection for: {directory}")
 
+    # Only detections with the default config are stored in the library scan index
+    use_index = config is None
     if config is None:
         config = DetectionConfig()
 
@@ -914,12 +984,15 @@ def determine_content_type_for_path(
         if strict_exists and not target_path.exists():
             raise FileNotFoundError(f"Path does not exist: {directory}")
 
-        # Extract signals
-        signals = _extract_signals(target_path, config)
+        if use_index and target_path.is_dir():
+            result = _classify_directory(target_path, config)
+        else:
+            # Extract signals
+            signals = _extract_signals(target_path, config)
 
-        # Decide
-        result = decide_content_type(signals, config)
-        logger.debug(f"Classified '{target_path.name}' as {result.value} (Signals: {signals})")
+            # Decide
+            result = decide_content_type(signals, config)
+            logger.debug(f"Classified '{target_path.name}' as {result.value} (Signals: {signals})")
 
         if result == ContentType.TV:
             return "tvshow"
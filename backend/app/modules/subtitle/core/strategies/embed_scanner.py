@@ -1,7 +1,10 @@
 import logging
+import tempfile
 from pathlib import Path
+from typing import Any
 
 from ...core import constants  # Go up two levels to src/, then down to core/
+from ...core.concurrency import provider_slot
 from ...utils import media_utils  # Go up two levels to src/, then down to utils/
 from .base import ProcessingContext, ProcessingStrategy
 
@@ -21,8 +24,21 @@ class EmbedScanner(ProcessingStrategy):
     - If no RO goal met, DETECTS the best potential EN stream (text or allowed image):
         - Stores its info (index, codec, type, flags) in the context for potential later
           extraction by FinalSelector.
+    The EN stream is detected before the RO check (both read the same cached probe). If
+    the RO check has to demux the file and the EN stream is text, the EN track is
+    extracted in the same ffmpeg pass, so FinalSelector does not read the file again.
     """
 
+    def _detect_en_stream(self, context: ProcessingContext) -> dict[str, Any] | None:
+        # Use the function that *only finds* the best stream info for EN.
+        # Prefer text codecs for EN detection scoring.
+        with provider_slot("ffmpeg"):
+            return media_utils.find_best_embedded_stream_info(
+                context.video_path,
+                "en",  # Function handles normalization ('eng' would also work)
+                preferred_codecs=list(TEXT_SUBTITLE_CODECS),  # Preferred text codecs for scoring
+            )
+
     def execute(self, context: ProcessingContext) -> bool:  # noqa: C901
         # Check if dependency is loaded
         if not media_utils:
@@ -37,15 +53,37 @@ class EmbedScanner(ProcessingStrategy):
         video_filename = Path(context.video_path).name
         self.logger.info(f"Checking for embedded subtitles in '{video_filename}'...")
 
+        best_en_stream_info = None
+        en_detection_error = None
+        try:
+            best_en_stream_info = self._detect_en_stream(context)
+        except Exception as e:
+            en_detection_error = e
+
+        # An EN text track is pulled in the same ffmpeg pass as a RO extraction
+        prefetch: dict[int, str] = {}
+        if best_en_stream_info:
+            en_index = best_en_stream_info.get("stream_index")
+            en_codec = best_en_stream_info.get("codec_name", "unknown").lower()
+            if en_index is not None and en_codec in TEXT_SUBTITLE_CODECS:
+                base_name = Path(context.video_path).stem
+                temp_extract_dir = tempfile.mkdtemp(prefix=f"embed_extract_{base_name}_")
+                context.add_temp_dir(temp_extract_dir)  # Cleaned up by the pipeline
+                prefetch[en_index] = str(
+                    Path(temp_extract_dir) / f"{base_name}_stream_{en_index}.srt"
+                )
+
         # --- Check for RO Embedded (Extraction happens immediately for RO) ---
         ro_status = "failed"  # Default
         ro_extracted_path = None
         try:
             # Pass 'ro', the function will normalize it
-            ro_status, ro_extracted_path = media_utils.check_and_extract_embedded_subtitle(
-                context.video_path,
-                "ro",  # Function handles normalization
-            )
+            with provider_slot("ffmpeg"):
+                ro_status, ro_extracted_path = media_utils.check_and_extract_embedded_subtitle(
+                    context.video_path,
+                    "ro",  # Function handles normalization
+                    prefetch=prefetch,
+                )
 
             if ro_status == "text_found_no_extract":
                 self.logger.info(
@@ -89,15 +127,8 @@ class EmbedScanner(ProcessingStrategy):
         if not context.found_final_ro:
             self.logger.info("RO goal not met, detecting potential embedded EN streams...")
             try:
-                # Use the function that *only finds* the best stream info for EN.
-                # Prefer text codecs for EN detection scoring.
-                best_en_stream_info = media_utils.find_best_embedded_stream_info(
-                    context.video_path,
-                    "en",  # Function handles normalization ('eng' would also work)
-                    preferred_codecs=list(
-                        TEXT_SUBTITLE_CODECS
-                    ),  # Pass preferred text codecs for scoring
-                )
+                if en_detection_error is not None:
+                    raise en_detection_error
 
                 if best_en_stream_info:
                     codec = best_en_stream_info.get("codec_name", "unknown").lower()
@@ -132,6 +163,13 @@ class EmbedScanner(ProcessingStrategy):
                             best_en_stream_info
                         )  # Make a copy
                         context.potential_embedded_en_info["codec_type"] = codec_type
+                        prefetched_path = prefetch.get(index)
+                        if prefetched_path and Path(prefetched_path).exists():
+                            self.logger.info(
+                                f"Embedded EN stream #{index} was already extracted with the RO check."
+                            )
+                            context.potential_embedded_en_info["extracted_path"] = prefetched_path
+                            context.candidate_en_path_embedded = prefetched_path
                     else:
                         context.potential_embedded_en_info = None  # Explicitly clear if not usable
 
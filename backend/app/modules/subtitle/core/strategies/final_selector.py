@@ -2,6 +2,7 @@ import logging
 import tempfile
 from pathlib import Path
 
+from app.modules.subtitle.core.concurrency import provider_slot
 from app.modules.subtitle.utils import (
     media_utils,  # Assuming new functions exist here
 )
@@ -46,15 +47,22 @@ class FinalSelector(ProcessingStrategy):
         elif context.potential_embedded_en_info:
             stream_index = context.potential_embedded_en_info.get("stream_index")
             codec_name = context.potential_embedded_en_info.get("codec_name", "unknown")
-            self.logger.info(
-                f"No higher priority EN found. Attempting extraction of detected embedded EN (Stream #{stream_index}, Codec: {codec_name})..."
-            )
-
-            if stream_index is None:
+            prefetched_path = context.potential_embedded_en_info.get("extracted_path")
+            if prefetched_path and Path(prefetched_path).exists():
+                # Already extracted by EmbedScanner in the same ffmpeg pass as the RO check
+                self.logger.info(
+                    f"No higher priority EN found. Using embedded EN (Stream #{stream_index}, Codec: {codec_name}) extracted during the embedded scan."
+                )
+                selected_en_path = prefetched_path
+                selection_source = "Embedded (Extracted)"
+            elif stream_index is None:
                 self.logger.error(
                     "Cannot extract embedded EN: Stream index missing in context info."
                 )
             else:
+                self.logger.info(
+                    f"No higher priority EN found. Attempting extraction of detected embedded EN (Stream #{stream_index}, Codec: {codec_name})..."
+                )
                 # Create a dedicated temp directory for this extraction
                 # Use the main video filename to make the temp dir more identifiable
                 base_name = Path(context.video_path).stem
@@ -64,9 +72,10 @@ class FinalSelector(ProcessingStrategy):
                     context.add_temp_dir(temp_extract_dir)  # Register for cleanup!
 
                     # Call the extraction utility
-                    extracted_path = media_utils.extract_embedded_stream_by_index(
-                        context.video_path, stream_index, temp_extract_dir
-                    )
+                    with provider_slot("ffmpeg"):
+                        extracted_path = media_utils.extract_embedded_stream_by_index(
+                            context.video_path, stream_index, temp_extract_dir
+                        )
 
                     if extracted_path and Path(extracted_path).exists():
                         self.logger.info(
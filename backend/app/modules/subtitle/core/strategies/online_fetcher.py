@@ -1,10 +1,17 @@
 import logging
 import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
 from app.core.config import settings
-from app.modules.subtitle.utils import file_utils, subtitle_matcher, subtitle_parser
+from app.modules.subtitle.core.concurrency import provider_slot, submit_with_context
+from app.modules.subtitle.services.download_cache import (
+    SubtitleDownloadCache,
+    subtitle_download_cache,
+)
+from app.modules.subtitle.utils import file_utils, srt_codec, subtitle_matcher, subtitle_parser
 
 from .base import ProcessingContext, ProcessingStrategy
 
@@ -15,6 +22,10 @@ MIN_SCORE_THRESHOLD = getattr(
 )  # Min score to accept candidate
 
 
+def _download_cache() -> SubtitleDownloadCache | None:
+    return subtitle_download_cache if settings.SUBTITLE_DOWNLOAD_CACHE_ENABLED else None
+
+
 class OnlineFetcher(ProcessingStrategy):
     """
     Strategy to find, download, and process subtitles from online sources
@@ -49,7 +60,6 @@ class OnlineFetcher(ProcessingStrategy):
 
         self.logger.info(f"Searching online sources for IMDb ID: {imdb_id} (Type: {media_type})...")
 
-        all_candidates = []
         # Create one main temp dir for this strategy run, will contain subdirs
         main_temp_dir = tempfile.mkdtemp(prefix=f"online_fetch_{imdb_id}_")
         context.add_temp_dir(main_temp_dir)
@@ -59,194 +69,17 @@ class OnlineFetcher(ProcessingStrategy):
         subsro = context.di.subsro
         opensubs = context.di.opensubtitles  # This is the OpenSubtitlesClient instance
 
-        # --- Gather Candidates ---
+        # --- Gather Candidates (concurrently across providers, languages and archives) ---
         try:
-            # --- Subs.ro ---
-            if subsro:
-                try:
-                    # Use a subdir within the main temp dir for subs.ro downloads
-                    subsro_temp_sub_dir = Path(main_temp_dir) / "subsro"
-                    subsro_temp_sub_dir.mkdir(exist_ok=True)
-
-                    for lang in ["ro", "en"]:
-                        urls = subsro.find_subtitle_download_urls(imdb_id, language_code=lang)
-                        if not urls:
-                            continue
-
-                        self.logger.info(f"Processing {len(urls)} Subs.ro '{lang}' URLs...")
-                        for index, url in enumerate(urls):
-                            # Create a unique subdir for each archive to avoid filename collisions
-                            archive_extract_dir = subsro_temp_sub_dir / f"{lang}_{index}"
-                            extracted_sub_file_path = None
-                            try:
-                                archive_extract_dir.mkdir(exist_ok=True)
-                                # Download archive into the extraction dir itself
-                                archive_path = subsro.download_subtitle_archive(
-                                    url,
-                                    str(archive_extract_dir),
-                                    filename_prefix=f"subsro_{lang}_{index}",
-                                )
-                                if not archive_path:
-                                    continue
-
-                                # Extract archive within its specific subdir
-                                if not file_utils.extract_archive(
-                                    archive_path, str(archive_extract_dir)
-                                ):
-                                    self.logger.warning(
-                                        f"Failed to extract Subs.ro archive: {archive_path}"
-                                    )
-                                    continue
-
-                                # Find the best sub *within* the extracted archive dir
-                                best_local_path, _ = (
-                                    subtitle_matcher.find_best_matching_subtitle_local(
-                                        context.video_path,
-                                        str(archive_extract_dir),
-                                        lang,  # Pass lang hint
-                                    )
-                                )
-
-                                if best_local_path:
-                                    extracted_sub_file_path = best_local_path
-                                    self.logger.debug(
-                                        f"Selected best local match from Subs.ro archive: {Path(extracted_sub_file_path).name}"
-                                    )
-                                else:
-                                    # Fallback: find *any* subtitle file if local matching fails
-                                    extracted_subs = [
-                                        str(p)
-                                        for p in archive_extract_dir.rglob("*")
-                                        if p.is_file()
-                                        and p.suffix.lower() in {".srt", ".sub", ".ass"}
-                                        and not p.name.lower().endswith((".bak", ".syncbak"))
-                                    ]
-                                    if extracted_subs:
-                                        extracted_sub_file_path = extracted_subs[
-                                            0
-                                        ]  # Take the first one found
-                                        self.logger.warning(
-                                            f"Could not determine best local match in Subs.ro archive, using first found: {Path(extracted_sub_file_path).name}"
-                                        )
-                                    else:
-                                        self.logger.warning(
-                                            f"No subtitle files found after extracting Subs.ro archive: {archive_path}"
-                                        )
-
-                                if (
-                                    extracted_sub_file_path
-                                    and Path(extracted_sub_file_path).exists()
-                                ):
-                                    # Determine language (prefer detected, fallback to search lang)
-                                    detected_lang = (
-                                        subtitle_matcher.get_subtitle_language_code(
-                                            Path(extracted_sub_file_path).name
-                                        )
-                                        or lang
-                                    )
-
-                                    candidate_dict = {
-                                        "source": "subsro",
-                                        "language": detected_lang,
-                                        "id": url,
-                                        "extracted_path": extracted_sub_file_path,  # Path to temp file within archive_extract_dir
-                                        "file_name": Path(extracted_sub_file_path).name,
-                                        "release_name": None,
-                                        "score_bonus": 0,
-                                        "attributes": {},
-                                    }
-                                    all_candidates.append(candidate_dict)
-                                    self.logger.debug(
-                                        f"Added Subs.ro candidate: Lang={detected_lang}, File={candidate_dict['file_name']}"
-                                    )
-
-                            except Exception as e_inner:
-                                context.add_error(
-                                    self.name, f"Error processing Subs.ro URL {url}: {e_inner}"
-                                )
-                                self.logger.exception(
-                                    f"Error processing Subs.ro URL {url}.", exc_info=True
-                                )
-
-                except Exception as e_subsro:
-                    context.add_error(self.name, f"Error gathering Subs.ro candidates: {e_subsro}")
-                    self.logger.exception("Error gathering Subs.ro candidates.", exc_info=True)
-            else:
-                self.logger.warning("Subs.ro service not available in DI container.")
-
-            # --- OpenSubtitles ---
-            if opensubs:
-                if not opensubs.authenticate():  # Use client's authenticate method
-                    self.logger.warning(
-                        "OpenSubtitles authentication failed or skipped. Skipping OpenSubtitles search."
-                    )
-                else:
-                    search_params = {
-                        "language": None,  # Iterate below
-                        "imdb_id": imdb_id if media_type == "movie" else None,
-                        "parent_imdb_id": imdb_id if media_type == "episode" else None,
-                        "season_number": int(context.video_info["s"])
-                        if context.video_info.get("s")
-                        else None,
-                        "episode_number": int(context.video_info["e"])
-                        if context.video_info.get("e")
-                        else None,
-                        "query": context.video_info.get("basename", ""),  # Fallback query
-                        "type": media_type,
-                        "machine_translated": "exclude",
-                        "hearing_impaired": "exclude",
-                    }
-                    for lang in ["ro", "en"]:
-                        try:
-                            search_params["language"] = lang
-                            results = opensubs.search_subtitles(
-                                **search_params
-                            )  # Call client's search
-                            if results:
-                                self.logger.info(
-                                    f"Processing {len(results)} OpenSubtitles '{lang}' candidates (metadata only)..."
-                                )
-                                for result in results:
-                                    attrs = result.get("attributes", {})
-                                    files = attrs.get("files", [])
-                                    file_info = files[0] if files else {}
-                                    file_id = file_info.get("file_id")
-                                    if not file_id:
-                                        continue
-
-                                    api_lang = attrs.get("language")
-                                    candidate_lang = api_lang if api_lang else lang
-                                    all_candidates.append(
-                                        {
-                                            "source": "opensubtitles",
-                                            "language": candidate_lang,
-                                            "id": file_id,
-                                            "release_name": attrs.get("release"),
-                                            "file_name": file_info.get("file_name"),
-                                            "attributes": attrs,
-                                            "score_bonus": 0,
-                                            "extracted_path": None,
-                                        }
-                                    )
-                            else:
-                                self.logger.debug(f"No OpenSubtitles results found for '{lang}'.")
-                        except Exception as e_os_search:
-                            context.add_error(
-                                self.name,
-                                f"Error searching OpenSubtitles for lang '{lang}': {e_os_search}",
-                            )
-                            self.logger.exception(
-                                f"Error searching OpenSubtitles for lang '{lang}'.", exc_info=True
-                            )
-            else:
-                self.logger.warning("OpenSubtitles service not available in DI container.")
-
+            all_candidates = self._gather_candidates(
+                context, subsro, opensubs, imdb_id, media_type, main_temp_dir
+            )
         except Exception as gather_err:
             context.add_error(
                 self.name, f"Unexpected error during candidate gathering: {gather_err}"
             )
             self.logger.exception("Unexpected error during candidate gathering.", exc_info=True)
-            # Proceed to ranking if any candidates gathered before error
+            all_candidates = []
 
         # --- Ranking and Processing ---
         if not all_candidates:
@@ -334,6 +167,349 @@ class OnlineFetcher(ProcessingStrategy):
 
         return True  # Strategy completed its run
 
+    def _gather_candidates(  # noqa: C901
+        self,
+        context: ProcessingContext,
+        subsro: Any,
+        opensubs: Any,
+        imdb_id: str,
+        media_type: str,
+        main_temp_dir: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Runs every provider search and Subs.ro archive download/extraction as a separate
+        task on a small thread pool (per-host limits come from `provider_slot`).
+
+        As soon as a RO candidate scores at least ONLINE_FETCH_EARLY_STOP_SCORE, queued
+        tasks are cancelled and in-flight archive downloads skip their work. Candidates
+        are returned in the same order the sequential search produced them, so ranking
+        ties resolve as before.
+        """
+        media_basename = context.video_info.get("basename", "")
+        early_stop_score = settings.ONLINE_FETCH_EARLY_STOP_SCORE
+        stop_event = threading.Event()
+        results: list[tuple[tuple[int, ...], dict[str, Any]]] = []
+
+        subsro_temp_sub_dir = Path(main_temp_dir) / "subsro"
+        if subsro:
+            subsro_temp_sub_dir.mkdir(exist_ok=True)
+        else:
+            self.logger.warning("Subs.ro service not available in DI container.")
+        if not opensubs:
+            self.logger.warning("OpenSubtitles service not available in DI container.")
+
+        search_params: dict[str, Any] = {
+            "language": None,  # Set per task
+            "imdb_id": imdb_id if media_type == "movie" else None,
+            "parent_imdb_id": imdb_id if media_type == "episode" else None,
+            "season_number": int(context.video_info["s"]) if context.video_info.get("s") else None,
+            "episode_number": int(context.video_info["e"]) if context.video_info.get("e") else None,
+            "query": media_basename,  # Fallback query
+            "type": media_type,
+            "machine_translated": "exclude",
+            "hearing_impaired": "exclude",
+        }
+
+        def _is_good_enough(candidate: dict[str, Any]) -> bool:
+            if early_stop_score <= 0 or (candidate.get("language") or "").lower() != "ro":
+                return False
+            ranked = self._rank_candidates(
+                [candidate],
+                media_basename,
+                context.video_info.get("s"),
+                context.video_info.get("e"),
+                required_language="ro",
+            )
+            return bool(ranked) and ranked[0][0] >= early_stop_score
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.ONLINE_FETCH_WORKERS), thread_name_prefix="online_fetch"
+        ) as executor:
+            pending: dict[Future, tuple[int, ...]] = {}
+
+            def _submit(order: tuple[int, ...], fn: Any, *args: Any) -> None:
+                pending[submit_with_context(executor, fn, *args)] = order
+
+            for lang_index, lang in enumerate(["ro", "en"]):
+                if subsro:
+                    _submit((0, lang_index), self._search_subsro, context, subsro, imdb_id, lang)
+                if opensubs:
+                    _submit(
+                        (1, lang_index),
+                        self._search_opensubtitles,
+                        context,
+                        opensubs,
+                        {**search_params, "language": lang},
+                    )
+
+            while pending and not stop_event.is_set():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    order = pending.pop(future)
+                    try:
+                        task_candidates, follow_ups = future.result()
+                    except Exception as e_task:
+                        # One failing search must not discard what the others already found.
+                        context.add_error(self.name, f"Online subtitle search failed: {e_task}")
+                        self.logger.exception("Online subtitle search task failed.")
+                        continue
+                    for index, candidate in enumerate(task_candidates):
+                        results.append(((*order, index), candidate))
+                        if not stop_event.is_set() and _is_good_enough(candidate):
+                            self.logger.info(
+                                f"High-scoring RO candidate from {candidate['source']} "
+                                "found; cancelling remaining online searches."
+                            )
+                            stop_event.set()
+                    for index, (lang, url) in enumerate(follow_ups):
+                        _submit(
+                            (*order, index),
+                            self._fetch_subsro_archive,
+                            context,
+                            subsro,
+                            url,
+                            lang,
+                            subsro_temp_sub_dir / f"{lang}_{index}",
+                            index,
+                            stop_event,
+                        )
+
+            for future in pending:
+                future.cancel()
+
+        results.sort(key=lambda item: item[0])
+        return [candidate for _, candidate in results]
+
+    def _search_subsro(
+        self, context: ProcessingContext, subsro: Any, imdb_id: str, lang: str
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+        """Finds Subs.ro archive URLs for one language; archives are fetched as follow-up tasks."""
+        try:
+            with provider_slot("subsro"):
+                urls = subsro.find_subtitle_download_urls(imdb_id, language_code=lang)
+        except Exception as e_subsro:
+            context.add_error(self.name, f"Error gathering Subs.ro candidates: {e_subsro}")
+            self.logger.exception("Error gathering Subs.ro candidates.", exc_info=True)
+            return [], []
+        if urls:
+            self.logger.info(f"Processing {len(urls)} Subs.ro '{lang}' URLs...")
+        return [], [(lang, url) for url in urls or []]
+
+    def _fetch_subsro_archive(
+        self,
+        context: ProcessingContext,
+        subsro: Any,
+        url: str,
+        lang: str,
+        archive_extract_dir: Path,
+        index: int,
+        stop_event: threading.Event,
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+        """Downloads and extracts one Subs.ro archive into its own subdir (avoids name clashes)."""
+        if stop_event.is_set():
+            return [], []
+        extracted_sub_file_path = None
+        try:
+            archive_extract_dir.mkdir(exist_ok=True)
+            if not self._download_and_extract_subsro(
+                subsro, url, lang, archive_extract_dir, index, stop_event
+            ):
+                return [], []
+
+            # Find the best sub *within* the extracted archive dir
+            best_local_path, _ = subtitle_matcher.find_best_matching_subtitle_local(
+                context.video_path,
+                str(archive_extract_dir),
+                lang,  # Pass lang hint
+            )
+
+            if best_local_path:
+                extracted_sub_file_path = best_local_path
+                self.logger.debug(
+                    f"Selected best local match from Subs.ro archive: {Path(extracted_sub_file_path).name}"
+                )
+            else:
+                # Fallback: find *any* subtitle file if local matching fails
+                extracted_subs = [
+                    str(p)
+                    for p in archive_extract_dir.rglob("*")
+                    if p.is_file()
+                    and p.suffix.lower() in {".srt", ".sub", ".ass"}
+                    and not p.name.lower().endswith((".bak", ".syncbak"))
+                ]
+                if extracted_subs:
+                    extracted_sub_file_path = extracted_subs[0]  # Take the first one found
+                    self.logger.warning(
+                        f"Could not determine best local match in Subs.ro archive, using first found: {Path(extracted_sub_file_path).name}"
+                    )
+                else:
+                    self.logger.warning(
+                        f"No subtitle files found after extracting Subs.ro archive: {url}"
+                    )
+
+            if not extracted_sub_file_path or not Path(extracted_sub_file_path).exists():
+                return [], []
+
+            # Determine language (prefer detected, fallback to search lang)
+            detected_lang = (
+                subtitle_matcher.get_subtitle_language_code(Path(extracted_sub_file_path).name)
+                or lang
+            )
+            candidate_dict: dict[str, Any] = {
+                "source": "subsro",
+                "language": detected_lang,
+                "id": url,
+                "extracted_path": extracted_sub_file_path,  # Path to temp file within archive_extract_dir
+                "file_name": Path(extracted_sub_file_path).name,
+                "release_name": None,
+                "score_bonus": 0,
+                "attributes": {},
+            }
+            self.logger.debug(
+                f"Added Subs.ro candidate: Lang={detected_lang}, File={candidate_dict['file_name']}"
+            )
+            return [candidate_dict], []
+        except Exception as e_inner:
+            context.add_error(self.name, f"Error processing Subs.ro URL {url}: {e_inner}")
+            self.logger.exception(f"Error processing Subs.ro URL {url}.", exc_info=True)
+            return [], []
+
+    def _download_and_extract_subsro(
+        self,
+        subsro: Any,
+        url: str,
+        lang: str,
+        archive_extract_dir: Path,
+        index: int,
+        stop_event: threading.Event,
+    ) -> bool:
+        """
+        Fills `archive_extract_dir` with the archive's subtitles. A download cache hit
+        skips the request and, once extracted before, the decompression as well.
+        """
+        cache = _download_cache()
+        cached = cache.get("subsro", url) if cache else None
+        if cache and cached and cached.extracted_dir:
+            if cache.copy_extracted(cached, archive_extract_dir):
+                self.logger.info(f"Using cached Subs.ro archive contents for {url[:100]}")
+                return True
+            cached = None  # Evicted by another worker meanwhile: download again
+
+        if cache and cached:
+            archive_path = str(
+                archive_extract_dir / (cached.file_name or f"subsro_{lang}_{index}.zip")
+            )
+            if cache.copy_payload(cached, Path(archive_path)):
+                self.logger.info(f"Using cached Subs.ro archive for {url[:100]}")
+            else:
+                cached = None
+        if not cached:
+            # Download archive into the extraction dir itself
+            with provider_slot("subsro"):
+                archive_path = subsro.download_subtitle_archive(
+                    url,
+                    str(archive_extract_dir),
+                    filename_prefix=f"subsro_{lang}_{index}",
+                )
+            if not archive_path or stop_event.is_set():
+                return False
+            if cache:
+                cached = cache.put(
+                    "subsro", url, Path(archive_path).read_bytes(), Path(archive_path).name
+                )
+
+        # Extract archive within its specific subdir
+        if not file_utils.extract_archive(archive_path, str(archive_extract_dir)):
+            self.logger.warning(f"Failed to extract Subs.ro archive: {archive_path}")
+            return False
+        if cache and cached:
+            cache.store_extracted(
+                cached.sha256, archive_extract_dir, exclude={Path(archive_path).name}
+            )
+        return True
+
+    def _search_opensubtitles(
+        self, context: ProcessingContext, opensubs: Any, search_params: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+        """Searches OpenSubtitles for one language (metadata only, downloads happen later)."""
+        lang = search_params["language"]
+        candidates: list[dict[str, Any]] = []
+        try:
+            # The client logs in once and shares the session, so calling this per task is cheap.
+            with provider_slot("opensubtitles"):
+                authenticated = opensubs.authenticate()  # Use client's authenticate method
+            if not authenticated:
+                self.logger.warning(
+                    f"OpenSubtitles authentication failed or skipped. Skipping OpenSubtitles '{lang}' search."
+                )
+                return [], []
+
+            with provider_slot("opensubtitles"):
+                results = opensubs.search_subtitles(**search_params)  # Call client's search
+            if not results:
+                self.logger.debug(f"No OpenSubtitles results found for '{lang}'.")
+                return [], []
+            self.logger.info(
+                f"Processing {len(results)} OpenSubtitles '{lang}' candidates (metadata only)..."
+            )
+            for result in results:
+                attrs = result.get("attributes", {})
+                files = attrs.get("files", [])
+                file_info = files[0] if files else {}
+                file_id = file_info.get("file_id")
+                if not file_id:
+                    continue
+
+                api_lang = attrs.get("language")
+                candidates.append(
+                    {
+                        "source": "opensubtitles",
+                        "language": api_lang if api_lang else lang,
+                        "id": file_id,
+                        "release_name": attrs.get("release"),
+                        "file_name": file_info.get("file_name"),
+                        "attributes": attrs,
+                        "score_bonus": 0,
+                        "extracted_path": None,
+                    }
+                )
+        except Exception as e_os_search:
+            context.add_error(
+                self.name,
+                f"Error searching OpenSubtitles for lang '{lang}': {e_os_search}",
+            )
+            self.logger.exception(
+                f"Error searching OpenSubtitles for lang '{lang}'.", exc_info=True
+            )
+        return candidates, []
+
+    def _download_opensubtitles_file(self, opensubs: Any, file_id: int) -> tuple[bytes, str]:
+        """
+        Returns the file's bytes and name, from the download cache when possible:
+        a cache hit needs neither a download link nor any of the daily download quota.
+        """
+        cache = _download_cache()
+        cached = cache.get("opensubtitles", file_id) if cache else None
+        content = cache.read(cached) if cache and cached else None
+        if cached and content is not None:
+            self.logger.info(f"Using cached OpenSubtitles download for file_id {file_id}.")
+            return content, cached.file_name or f"opensubs_download_{file_id}.bin"
+
+        with provider_slot("opensubtitles"):
+            download_info = opensubs.get_download_info(file_id)
+        if not download_info or not download_info.get("link"):
+            raise RuntimeError(f"Failed to get OpenSubtitles download link for file_id {file_id}.")
+
+        with provider_slot("opensubtitles"):
+            content_bytes = opensubs.download_subtitle_content(download_info["link"])
+        if not content_bytes:
+            raise RuntimeError(f"Failed to download OpenSubtitles content for file_id {file_id}.")
+
+        file_name = download_info.get("file_name", f"opensubs_download_{file_id}.bin")
+        if cache:
+            cache.put("opensubtitles", file_id, content_bytes, file_name)
+        return content_bytes, file_name
+
     def _rank_candidates(
         self,
         candidates: list[dict[str, Any]],
@@ -346,30 +522,20 @@ class OnlineFetcher(ProcessingStrategy):
         """Scores and ranks candidates using subtitle_matcher."""
         if not candidates:
             return []
-        media_tokens = subtitle_matcher.tokenize_and_normalize(Path(media_basename).stem)
+        profile = subtitle_matcher.get_media_profile(media_basename)
         scored_results = []
-        self.logger.debug(f"Ranking {len(candidates)} online candidates...")
+        self.logger.debug(f"Ranking {len(candidates)} online candidates ({profile.describe()})...")
 
-        for candidate in candidates:
-            candidate_id_repr = str(candidate.get("id", "N/A"))[:80]  # Truncate long URLs
-            try:
-                scored_tuple = subtitle_matcher.score_candidate(
-                    candidate, media_tokens, media_basename, media_s, media_e, required_language
-                )
-                if scored_tuple:
-                    _, _, _ = scored_tuple  # Unpack but ignore since we append the tuple itself
-                    # _score, _priority, _ = scored_tuple  # unpack for potential use or debugging
-                    scored_results.append(scored_tuple)
-                else:
-                    self.logger.debug(
-                        f"Candidate {candidate.get('source')} {candidate_id_repr} disqualified during scoring (e.g., episode mismatch)."
-                    )
-            except Exception:
-                # Use context.add_error here? Or let the caller handle it? Let's add error here.
-                # context.add_error(self.name, f"Error scoring candidate {candidate.get('source')} {candidate_id_repr}: {e}")
-                self.logger.exception(
-                    f"Error scoring candidate {candidate.get('source')} {candidate_id_repr}.",
-                    exc_info=True,
+        scored_tuples = profile.score_candidates(
+            candidates, required_language, check_episode=bool(media_e), media_s=media_s
+        )
+        for candidate, scored_tuple in zip(candidates, scored_tuples, strict=True):
+            if scored_tuple:
+                scored_results.append(scored_tuple)
+            else:
+                candidate_id_repr = str(candidate.get("id", "N/A"))[:80]  # Truncate long URLs
+                self.logger.debug(
+                    f"Candidate {candidate.get('source')} {candidate_id_repr} disqualified during scoring (e.g., episode mismatch)."
                 )
 
         if not scored_results:
@@ -459,30 +625,13 @@ class OnlineFetcher(ProcessingStrategy):
                 opensubs_dl_dir.mkdir(exist_ok=True)
                 # No need to add opensubs_dl_dir to context cleanup, main_temp_dir covers it.
 
-                download_info = opensubs.get_download_info(file_id)
-                if not download_info or not download_info.get("link"):
-                    raise RuntimeError(
-                        f"Failed to get OpenSubtitles download link for file_id {file_id}."
-                    )
-
-                content_bytes = opensubs.download_subtitle_content(download_info["link"])
-                if not content_bytes:
-                    raise RuntimeError(
-                        f"Failed to download OpenSubtitles content for file_id {file_id}."
-                    )
-
-                # Save raw downloaded bytes temporarily
-                dl_filename_hint = download_info.get(
-                    "file_name", f"opensubs_download_{file_id}.bin"
+                content_bytes, dl_filename_hint = self._download_opensubtitles_file(
+                    opensubs, file_id
                 )
+
                 safe_hint = "".join(
                     c for c in dl_filename_hint if c.isalnum() or c in ("._- ")
                 ).strip()
-                temp_bin_path = opensubs_dl_dir / (
-                    safe_hint if safe_hint else f"opensubs_download_{file_id}.bin"
-                )
-                with temp_bin_path.open("wb") as f:
-                    f.write(content_bytes)
 
                 # Convert to UTF-8 SRT for consistent processing
                 extracted_sub_file_source_path = str(
@@ -493,9 +642,8 @@ class OnlineFetcher(ProcessingStrategy):
                     )
                 )
                 try:
-                    content_str = file_utils.read_srt_file(
-                        str(temp_bin_path)
-                    )  # Reads with detected encoding
+                    # Decoded in memory with the detected encoding
+                    content_str = srt_codec.decode_srt_bytes(content_bytes)
                     file_utils.write_srt_file(
                         extracted_sub_file_source_path, content_str, allow_fallback=False
                     )  # Writes as UTF-8 BOM
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from app.modules.subtitle.core.concurrency import provider_slot
 from app.modules.subtitle.utils import subtitle_sync  # Import the sync utility functions
 
 from .base import ProcessingContext, ProcessingStrategy
@@ -79,9 +80,10 @@ class Synchronizer(ProcessingStrategy):
         try:
             # Call the main sync function from subtitle_sync utility
             # It handles offset checks and tool execution internally.
-            subtitle_sync.sync_subtitles_with_audio(
-                video_file_path=context.video_path, subtitle_file_path=target_sub_path
-            )
+            with provider_slot("sync"):
+                subtitle_sync.sync_subtitles_with_audio(
+                    video_file_path=context.video_path, subtitle_file_path=target_sub_path
+                )
             # sync_subtitles_with_audio handles its own logging for tool success/failure.
             self.logger.info(
                 f"Synchronization process completed for {Path(target_sub_path).name} (check utility logs for details)."
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from app.modules.subtitle.core.concurrency import provider_slot
 from app.modules.subtitle.utils import file_utils  # For reading/writing files
 
 from .base import ProcessingContext, ProcessingStrategy
@@ -146,12 +147,13 @@ class Translator(ProcessingStrategy):
         # This handles cases where tracks are mislabeled (e.g., German labeled as English).
         try:
             # Call the METHOD on the manager instance
-            result = translator_manager.translate_file_content(
-                input_file=en_path_to_translate,
-                content=en_content,
-                source_lang=None,  # Use API Auto-Detect
-                target_lang="ro",
-            )
+            with provider_slot("translation"):
+                result = translator_manager.translate_file_content(
+                    input_file=en_path_to_translate,
+                    content=en_content,
+                    source_lang=None,  # Use API Auto-Detect
+                    target_lang="ro",
+                )
 
             # Check translation result status
             # Possible statuses: "deepl_key_X", "google", "mixed", "partial_failure", "failed", "failed_parsing", etc.
@@ -0,0 +1,235 @@
+"""
+Cluster-wide DeepL quota ledger on the ``deepl_usage`` table.
+
+Each job process used to ask the DeepL usage API about every key at start-up
+and then count characters in its own memory, so concurrent jobs could not see
+each other's consumption and overdrew keys (HTTP 456). The ledger makes the
+table the shared account of every key:
+
+- reserve: before a request, moves characters from the free budget into
+  ``reserved_count`` with one conditional UPDATE. It is refused if the key is
+  invalid or the reservation would go over ``character_limit``;
+- commit: after a billed request, turns the reservation into ``character_count``;
+- release: gives back a reservation that was not billed.
+
+`TranslationManager` reads the state of all its keys in one SELECT instead of
+calling the usage API per key; only keys the ledger has never seen are looked
+up. The beat task in ``app.tasks.deepl_quota`` replaces the counts with the
+DeepL usage API's figures every DEEPL_QUOTA_RECONCILE_INTERVAL_S and drops
+reservations left behind by crashed workers.
+
+Database errors never fail a translation: calls log a warning and the manager
+falls back to its in-process accounting.
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters
+from app.db.models.deepl_usage import DeepLUsage
+
+logger = logging.getLogger(__name__)
+
+
+def key_identifier(api_key: str) -> str:
+    """The ``deepl_usage.key_identifier`` of an API key (SHA-256 of the stripped key)."""
+    return hashlib.sha256(api_key.strip().encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class QuotaState:
+    character_count: int
+    reserved_count: int
+    character_limit: int
+    valid: bool
+
+    @property
+    def available(self) -> int:
+        if not self.valid:
+            return 0
+        return max(0, self.character_limit - self.character_count - self.reserved_count)
+
+
+def _default_session_factory() -> Session | None:
+    from app.db.session import SyncSessionLocal
+
+    return SyncSessionLocal() if SyncSessionLocal is not None else None
+
+
+class DeepLQuotaLedger:
+    """Atomic reserve/commit/release of DeepL characters, shared by all workers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session | None] = _default_session_factory,
+        enabled: bool = True,
+    ) -> None:
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self._counters = CacheCounters("reserved", "refused", "errors")
+
+    def stats(self) -> dict[str, int]:
+        return self._counters.snapshot()
+
+    def _execute[T](self, action: str, work: Callable[[Session], T]) -> T | None:
+        """Runs `work` in its own committed transaction; None if the ledger is unusable."""
+        if not self.enabled:
+            return None
+        try:
+            session = self.session_factory()
+            if session is None:
+                return None
+            with session:
+                result = work(session)
+                session.commit()
+                return result
+        except Exception as e:
+            self._counters.add("errors")
+            logger.warning(f"DeepL quota ledger: could not {action}: {e}")
+            return None
+
+    def load(self, identifiers: list[str]) -> dict[str, QuotaState] | None:
+        """States of the given keys in one query (keys without a row are left out)."""
+
+        def work(session: Session) -> dict[str, QuotaState]:
+            rows = session.execute(
+                select(
+                    DeepLUsage.key_identifier,
+                    DeepLUsage.character_count,
+                    DeepLUsage.reserved_count,
+                    DeepLUsage.character_limit,
+                    DeepLUsage.valid,
+                ).where(DeepLUsage.key_identifier.in_(identifiers))
+            ).all()
+            return {
+                row.key_identifier: QuotaState(
+                    row.character_count or 0,
+                    row.reserved_count or 0,
+                    row.character_limit or 0,
+                    bool(row.valid),
+                )
+                for row in rows
+            }
+
+        return self._execute("load key states", work)
+
+    def seed(
+        self, identifier: str, character_count: int, character_limit: int, valid: bool
+    ) -> None:
+        """Records usage fetched from the DeepL API for a key the ledger did not know."""
+
+        def work(session: Session) -> None:
+            record = session.execute(
+                select(DeepLUsage).where(DeepLUsage.key_identifier == identifier)
+            ).scalar_one_or_none()
+            if record is None:
+                record = DeepLUsage(key_identifier=identifier, reserved_count=0)
+                session.add(record)
+            record.character_count = character_count
+            record.character_limit = character_limit
+            record.valid = valid
+            record.last_updated = datetime.now(UTC)
+
+        self._execute("seed key usage", work)
+
+    def reserve(self, identifier: str, chars: int) -> tuple[bool, QuotaState | None]:
+        """
+        Reserves `chars` on a key if its shared budget allows it.
+
+        Returns (granted, state after the attempt). If the ledger is unusable
+        the reservation is granted with no state, leaving the check to the caller.
+        """
+
+        def work(session: Session) -> tuple[bool, QuotaState | None]:
+            row = session.execute(
+                update(DeepLUsage)
+                .where(
+                    DeepLUsage.key_identifier == identifier,
+                    DeepLUsage.valid.is_(True),
+                    DeepLUsage.character_count + DeepLUsage.reserved_count + chars
+                    <= DeepLUsage.character_limit,
+                )
+                .values(
+                    reserved_count=DeepLUsage.reserved_count + chars,
+                    reserved_at=datetime.now(UTC),
+                    # last_updated keeps meaning "last synced with the DeepL API"
+                    last_updated=DeepLUsage.last_updated,
+                )
+                .returning(
+                    DeepLUsage.character_count,
+                    DeepLUsage.reserved_count,
+                    DeepLUsage.character_limit,
+                    DeepLUsage.valid,
+                )
+            ).first()
+            if row is not None:
+                return True, QuotaState(*row)
+            current = session.execute(
+                select(
+                    DeepLUsage.character_count,
+                    DeepLUsage.reserved_count,
+                    DeepLUsage.character_limit,
+                    DeepLUsage.valid,
+                ).where(DeepLUsage.key_identifier == identifier)
+            ).first()
+            # A key the ledger does not track yet is not limited by it
+            return current is None, QuotaState(*current) if current is not None else None
+
+        result = self._execute("reserve characters", work)
+        if result is None:
+            return True, None
+        self._counters.add("reserved" if result[0] else "refused")
+        return result
+
+    def _settle(self, identifier: str, reserved: int, billed: int, **values: Any) -> None:
+        remaining = DeepLUsage.reserved_count - reserved
+        values = {
+            "reserved_count": case((remaining > 0, remaining), else_=0),
+            "character_count": DeepLUsage.character_count + billed,
+            "last_updated": DeepLUsage.last_updated,
+            **values,
+        }
+
+        def work(session: Session) -> None:
+            session.execute(
+                update(DeepLUsage).where(DeepLUsage.key_identifier == identifier).values(**values)
+            )
+
+        self._execute("settle a reservation", work)
+
+    def commit(self, identifier: str, reserved: int, billed: int) -> None:
+        """Turns a reservation into `billed` characters (usually the same amount)."""
+        self._settle(identifier, reserved, billed)
+
+    def release(self, identifier: str, reserved: int) -> None:
+        """Gives back a reservation whose request was not billed."""
+        self._settle(identifier, reserved, 0)
+
+    def mark_exhausted(self, identifier: str, reserved: int = 0) -> None:
+        """DeepL answered 456: the key is out of quota until reconciliation says otherwise."""
+        self._settle(
+            identifier, reserved, 0, character_count=DeepLUsage.character_limit, valid=False
+        )
+
+    def mark_invalid(self, identifier: str, reserved: int = 0) -> None:
+        """DeepL rejected the key (403)."""
+        self._settle(identifier, reserved, 0, valid=False)
+
+
+deepl_quota_ledger = DeepLQuotaLedger(enabled=settings.DEEPL_QUOTA_LEDGER_ENABLED)
+
+
+__all__ = [
+    "DeepLQuotaLedger",
+    "QuotaState",
+    "deepl_quota_ledger",
+    "key_identifier",
+]
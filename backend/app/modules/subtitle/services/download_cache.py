@@ -0,0 +1,251 @@
+"""
+On-disk cache for subtitle downloads (Subs.ro archives, OpenSubtitles files).
+
+Payloads are content-addressed: each one is stored once under its SHA-256, and a
+small index file maps every provider key (Subs.ro URL, OpenSubtitles file_id) to
+that hash. The extracted contents of an archive are kept next to its blob, so a
+hit skips both the download and the decompression. Retried jobs and library
+rescans therefore cost no OpenSubtitles download quota.
+
+The total size is bounded by SUBTITLE_DOWNLOAD_CACHE_MAX_MB. Entries are evicted
+least recently used first (blob mtime, refreshed on every hit); the directory is
+scanned for eviction on the first store and then every _EVICT_EVERY stores.
+Files are written to a temp name and renamed into place, so all workers can
+share the directory. Cache errors never fail a download, they only count as
+misses, and so does an entry evicted by another worker while it is being read.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters, EvictionSchedule, atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+_EVICT_EVERY = 32  # Stores between two scans of the blob directory
+
+
+@dataclass(frozen=True, slots=True)
+class CachedDownload:
+    sha256: str
+    path: Path  # The downloaded payload (archive or subtitle file)
+    file_name: str | None
+    extracted_dir: Path | None  # Decompressed archive contents, if stored
+
+
+def _key_digest(provider: str, key: str | int) -> str:
+    return hashlib.sha1(f"{provider}|{key}".encode(), usedforsecurity=False).hexdigest()
+
+
+def _tree_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+class SubtitleDownloadCache:
+    """Size-bounded, content-addressed LRU of downloaded subtitle payloads."""
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None) -> None:
+        self._root = Path(root) if root is not None else None
+        self._max_bytes = max_bytes
+        self._eviction_schedule = EvictionSchedule()
+        self._counters = CacheCounters("hits", "misses", "stores", "evictions", "errors")
+
+    # --- Layout ---
+
+    @property
+    def root(self) -> Path:
+        return self._root if self._root is not None else Path(settings.SUBTITLE_DOWNLOAD_CACHE_DIR)
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.SUBTITLE_DOWNLOAD_CACHE_MAX_MB * 1024 * 1024
+
+    def _key_path(self, provider: str, key: str | int) -> Path:
+        return self.root / "keys" / f"{_key_digest(provider, key)}.json"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256
+
+    def _extracted_path(self, sha256: str) -> Path:
+        return self.root / "extracted" / sha256
+
+    # --- Public API ---
+
+    def get(self, provider: str, key: str | int) -> CachedDownload | None:
+        """Returns the cached payload for a provider key, or None on a miss."""
+        key_path = self._key_path(provider, key)
+        try:
+            entry = json.loads(key_path.read_text(encoding="utf-8"))
+            blob = self._blob_path(entry["sha256"])
+            if not blob.is_file():
+                key_path.unlink(missing_ok=True)  # Blob was evicted
+                self._counters.add("misses")
+                return None
+            os.utime(blob)  # Mark as recently used
+        except FileNotFoundError:
+            self._counters.add("misses")
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Subtitle download cache: could not read entry {provider}:{key}: {e}")
+            return None
+
+        extracted = self._extracted_path(entry["sha256"])
+        self._counters.add("hits")
+        return CachedDownload(
+            sha256=entry["sha256"],
+            path=blob,
+            file_name=entry.get("file_name"),
+            extracted_dir=extracted if extracted.is_dir() else None,
+        )
+
+    def put(
+        self, provider: str, key: str | int, content: bytes, file_name: str | None = None
+    ) -> CachedDownload | None:
+        """Stores a downloaded payload under its content hash and indexes it by provider key."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob = self._blob_path(sha256)
+        try:
+            if blob.is_file():
+                os.utime(blob)  # Same content under another key/URL: store it once
+            else:
+                atomic_write_bytes(blob, content)
+            atomic_write_bytes(
+                self._key_path(provider, key),
+                json.dumps(
+                    {
+                        "provider": provider,
+                        "key": str(key),
+                        "sha256": sha256,
+                        "file_name": file_name,
+                    }
+                ).encode("utf-8"),
+            )
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Subtitle download cache: could not store {provider}:{key}: {e}")
+            return None
+        self._counters.add("stores")
+        self._maybe_evict()
+        extracted = self._extracted_path(sha256)
+        return CachedDownload(sha256, blob, file_name, extracted if extracted.is_dir() else None)
+
+    def store_extracted(
+        self, sha256: str, source_dir: str | Path, exclude: set[str] | None = None
+    ) -> None:
+        """Keeps a copy of an archive's extracted contents so later hits skip decompression."""
+        target = self._extracted_path(sha256)
+        if target.is_dir() or not self._blob_path(sha256).is_file():
+            return
+        exclude = exclude or set()
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f".{sha256[:12]}_", dir=target.parent))
+            shutil.copytree(
+                source_dir,
+                staging,
+                dirs_exist_ok=True,
+                ignore=lambda _dir, names: [n for n in names if n in exclude],
+            )
+            try:
+                staging.rename(target)
+            except OSError:  # Another worker stored it first
+                shutil.rmtree(staging, ignore_errors=True)
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Subtitle download cache: could not store extracted {sha256}: {e}")
+            return
+        self._maybe_evict()
+
+    def read(self, entry: CachedDownload) -> bytes | None:
+        """Returns the payload of an entry from `get`, or None if it was evicted meanwhile."""
+        try:
+            return entry.path.read_bytes()
+        except OSError as e:
+            self._counters.add("misses")
+            logger.debug(f"Subtitle download cache: blob {entry.sha256} vanished: {e}")
+            return None
+
+    def copy_payload(self, entry: CachedDownload, target: Path) -> bool:
+        """Copies an entry's payload to `target`; False if it was evicted meanwhile."""
+        try:
+            shutil.copyfile(entry.path, target)
+        except OSError as e:
+            self._counters.add("misses")
+            logger.debug(f"Subtitle download cache: blob {entry.sha256} vanished: {e}")
+            target.unlink(missing_ok=True)
+            return False
+        return True
+
+    def copy_extracted(self, entry: CachedDownload, target_dir: Path) -> bool:
+        """
+        Copies an entry's extracted archive contents into `target_dir`. False if
+        they were evicted meanwhile, in which case `target_dir` is emptied again.
+        """
+        if entry.extracted_dir is None:
+            return False
+        try:
+            shutil.copytree(entry.extracted_dir, target_dir, dirs_exist_ok=True)
+        except (OSError, shutil.Error) as e:
+            self._counters.add("misses")
+            logger.debug(f"Subtitle download cache: extracted {entry.sha256} vanished: {e}")
+            shutil.rmtree(target_dir, ignore_errors=True)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            return False
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return self._counters.snapshot()
+
+    # --- Internals ---
+
+    def _maybe_evict(self) -> None:
+        if self._eviction_schedule.due(_EVICT_EVERY):
+            self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used blobs (and their extracted trees) until under the limit."""
+        blobs_dir = self.root / "blobs"
+        try:
+            entries = []
+            total = 0
+            for blob in blobs_dir.iterdir():
+                if blob.name.startswith("."):
+                    continue
+                stat = blob.stat()
+                size = stat.st_size
+                extracted = self._extracted_path(blob.name)
+                if extracted.is_dir():
+                    size += _tree_size(extracted)
+                entries.append((stat.st_mtime, blob, extracted, size))
+                total += size
+            if total <= self.max_bytes:
+                return
+            entries.sort(key=lambda item: item[0])
+            for _, blob, extracted, size in entries:
+                if total <= self.max_bytes:
+                    break
+                blob.unlink(missing_ok=True)
+                shutil.rmtree(extracted, ignore_errors=True)
+                total -= size
+                self._counters.add("evictions")
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Subtitle download cache: eviction failed: {e}")
+
+
+subtitle_download_cache = SubtitleDownloadCache()
+
+
+__all__ = ["CachedDownload", "SubtitleDownloadCache", "subtitle_download_cache"]
@@ -24,10 +24,12 @@ import imdb  # noqa: E402
 from rapidfuzz import fuzz  # noqa: E402
 
 from app.core.config import settings  # noqa: E402
+from app.core.effective_settings import get_effective_setting_sync  # noqa: E402
 from app.modules.subtitle.core.constants import (  # noqa: E402
     FUZZY_MATCH_THRESHOLD,
     TYPE_MAP,
 )
+from app.modules.subtitle.services.imdb_cache import imdb_id_cache  # noqa: E402
 from app.modules.subtitle.utils.network_utils import (  # noqa: E402
     create_session_with_retries,
     make_request,
@@ -60,41 +62,16 @@ def _fuzzy_match(title: str, candidate: str, threshold: int = FUZZY_MATCH_THRESH
 
 
 # Helper for dynamic key retrieval
-def _get_dynamic_api_key(db_field: str, env_var_name: str | None = None) -> str | None:
-    """
-    Fetches API key synchronously from DB, falling back to Environment/Settings.
-    """
-    # 1. Try Database
-    try:
-        from sqlalchemy import select
-
-        from app.core.security import decrypt_value
-        from app.db.models.app_settings import AppSettings
-        from app.db.session import SyncSessionLocal
-
-        if SyncSessionLocal:
-            with SyncSessionLocal() as session:
-                settings_row = session.scalar(select(AppSettings).where(AppSettings.id == 1))
-                if settings_row:
-                    val = getattr(settings_row, db_field, None)
-                    if val is not None:
-                        if val == "":
-                            return None  # Explicitly disabled in DB
-                        return decrypt_value(val)
-    except Exception as e:
-        # Avoid spamming logs for every key check, debug only
-        logging.debug(f"Failed to fetch {db_field} from DB: {e}")
-
-    # 2. Fallback to Environment (Module-level settings object)
-    if env_var_name:
-        return getattr(settings, env_var_name, None)
-    return None
+def _get_dynamic_api_key(db_field: str) -> str | None:
+    """Current API key (DB > env) from the effective settings snapshot; None if disabled."""
+    value = get_effective_setting_sync(db_field)
+    return str(value) if value else None
 
 
 # --- OMDb Functions ---
 def _search_omdb_api(params: dict[str, Any]) -> dict[str, Any] | None:
     """Internal helper to query the OMDb API."""
-    api_key = _get_dynamic_api_key("omdb_api_key", "OMDB_API_KEY")
+    api_key = _get_dynamic_api_key("omdb_api_key")
 
     if not api_key:
         # Log only once or less frequently? For now, log per call.
@@ -173,7 +150,7 @@ def search_omdb_by_query(
 # --- TMDb Functions ---
 def _search_tmdb_api(endpoint: str, query_params: dict[str, Any]) -> dict[str, Any] | None:
     """Internal helper to query the TMDb API."""
-    api_key = _get_dynamic_api_key("tmdb_api_key", "TMDB_API_KEY")
+    api_key = _get_dynamic_api_key("tmdb_api_key")
 
     if not api_key:
         logging.error("TMDb API key is not configured.")
@@ -408,7 +385,37 @@ def _generate_search_candidates(
 
 
 # --- Consolidated ID Retrieval (Modified) ---
-def get_imdb_id(  # noqa: C901
+def get_imdb_id(
+    title: str, year: str | int | None = None, content_type: str | None = None
+) -> tuple[str | None, str | None, list[str]]:
+    """
+    Cached front for `_resolve_imdb_id`. Lookups already answered for the same
+    normalized title/year/type (by an earlier episode or job) make no API calls.
+    A miss that came with provider errors is not cached: the providers cannot
+    tell an outage or rate limit apart from "not found", so the next job retries.
+
+    Returns:
+        tuple: (imdb_id, found_type, errors) - errors is empty for cached results.
+    """
+    if not settings.IMDB_CACHE_ENABLED or not title:
+        return _resolve_imdb_id(title, year, content_type)
+
+    with imdb_id_cache.key_lock(title, year, content_type):
+        cached = imdb_id_cache.get(title, year, content_type)
+        if cached is not None:
+            logging.info(
+                f"IMDb ID cache hit for Title='{title}', Year={year}, TypeHint={content_type}: "
+                f"{cached.imdb_id or 'no match (negative entry)'}"
+            )
+            return cached.imdb_id, cached.found_type, []
+
+        imdb_id, found_type, errors = _resolve_imdb_id(title, year, content_type)
+        if imdb_id or not errors:
+            imdb_id_cache.put(title, year, content_type, imdb_id, found_type)
+        return imdb_id, found_type, errors
+
+
+def _resolve_imdb_id(  # noqa: C901
     title: str, year: str | int | None = None, content_type: str | None = None
 ) -> tuple[str | None, str | None, list[str]]:
     """
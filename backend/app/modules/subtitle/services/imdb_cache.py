@@ -0,0 +1,250 @@
+"""
+Two-level cache for IMDb ID lookups (`imdb.get_imdb_id`).
+
+Lookups are keyed by normalized title, year and content type, so "The.Office.US"
+episodes, "The Office (US)" and "the office us" share one entry. An in-memory
+LRU sits in front of the ``imdb_lookup_cache`` Postgres table:
+
+- positive results live for IMDB_CACHE_POSITIVE_TTL_S (IDs practically never change),
+- negative results ("nothing found") only for IMDB_CACHE_NEGATIVE_TTL_S, so a
+  newly listed title or newly configured API key is picked up soon. Misses
+  that came with provider errors are not cached at all (see `imdb.get_imdb_id`).
+
+The LRU is per process, which means per job in both execution modes; the table
+is shared by every worker. DB errors never fail a lookup, they only disable
+the persistent level for that call.
+"""
+
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_KEY_LOCK_STRIPES = 64
+
+
+@dataclass(frozen=True, slots=True)
+class CachedImdbLookup:
+    imdb_id: str | None
+    found_type: str | None
+    expires_at: datetime
+
+    @property
+    def is_negative(self) -> bool:
+        return self.imdb_id is None
+
+
+def normalize_title(title: str) -> str:
+    """Lowercases, strips accents/punctuation and collapses whitespace."""
+    decomposed = unicodedata.normalize("NFKD", title.replace("&", " and "))
+    ascii_title = decomposed.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM_RE.sub(" ", ascii_title).strip()
+
+
+def normalize_year(year: str | int | None) -> int | None:
+    try:
+        value = int(str(year).strip()[:4]) if year not in (None, "") else None
+    except ValueError:
+        return None
+    return value if value and 1870 <= value <= 2200 else None
+
+
+def make_lookup_key(title: str, year: str | int | None, content_type: str | None) -> str:
+    normalized_year = normalize_year(year)
+    return (
+        f"{content_type or 'any'}|{normalize_title(title)}|"
+        f"{normalized_year if normalized_year is not None else ''}"
+    )
+
+
+# --- Persistent level (Postgres via the sync session used by the subtitle services) ---
+
+
+def _db_load(lookup_key: str, now: datetime) -> CachedImdbLookup | None:
+    """Returns the unexpired row for ``lookup_key`` and counts the hit, in one round trip."""
+    from sqlalchemy import update
+
+    from app.db.models.imdb_lookup_cache import ImdbLookupCache
+    from app.db.session import SyncSessionLocal
+
+    if SyncSessionLocal is None:
+        return None
+    with SyncSessionLocal() as session:
+        row = session.execute(
+            update(ImdbLookupCache)
+            .where(ImdbLookupCache.lookup_key == lookup_key, ImdbLookupCache.expires_at > now)
+            .values(hit_count=ImdbLookupCache.hit_count + 1)
+            .returning(
+                ImdbLookupCache.imdb_id, ImdbLookupCache.found_type, ImdbLookupCache.expires_at
+            )
+        ).first()
+        session.commit()
+    return CachedImdbLookup(row.imdb_id, row.found_type, row.expires_at) if row else None
+
+
+def _db_save(lookup_key: str, values: dict[str, Any]) -> None:
+    from sqlalchemy.dialects.postgresql import insert
+
+    from app.db.models.imdb_lookup_cache import ImdbLookupCache
+    from app.db.session import SyncSessionLocal
+
+    if SyncSessionLocal is None:
+        return
+    stmt = insert(ImdbLookupCache).values(lookup_key=lookup_key, hit_count=0, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ImdbLookupCache.lookup_key],
+        set_={
+            "imdb_id": stmt.excluded.imdb_id,
+            "found_type": stmt.excluded.found_type,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    )
+    with SyncSessionLocal() as session:
+        session.execute(stmt)
+        session.commit()
+
+
+class ImdbIdCache:
+    """In-memory LRU in front of a persistent store, with hit/miss counters."""
+
+    def __init__(
+        self,
+        memory_size: int | None = None,
+        positive_ttl_s: int | None = None,
+        negative_ttl_s: int | None = None,
+        load: Callable[[str, datetime], CachedImdbLookup | None] = _db_load,
+        save: Callable[[str, dict[str, Any]], None] = _db_save,
+    ) -> None:
+        self._memory_size = max(
+            1, memory_size if memory_size is not None else settings.IMDB_CACHE_MEMORY_SIZE
+        )
+        self._positive_ttl = timedelta(
+            seconds=positive_ttl_s
+            if positive_ttl_s is not None
+            else settings.IMDB_CACHE_POSITIVE_TTL_S
+        )
+        self._negative_ttl = timedelta(
+            seconds=negative_ttl_s
+            if negative_ttl_s is not None
+            else settings.IMDB_CACHE_NEGATIVE_TTL_S
+        )
+        self._load = load
+        self._save = save
+        self._memory: OrderedDict[str, CachedImdbLookup] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(_KEY_LOCK_STRIPES)]
+        self._counters = CacheCounters("memory_hits", "store_hits", "misses", "store_errors")
+
+    def _remember(self, lookup_key: str, entry: CachedImdbLookup) -> None:
+        with self._lock:
+            self._memory[lookup_key] = entry
+            self._memory.move_to_end(lookup_key)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
+    def key_lock(
+        self, title: str, year: str | int | None, content_type: str | None
+    ) -> threading.Lock:
+        """
+        Lock serializing lookups of one key, so parallel episodes of the same show
+        wait for the first resolution instead of querying the providers themselves.
+        """
+        lookup_key = make_lookup_key(title, year, content_type)
+        return self._key_locks[hash(lookup_key) % _KEY_LOCK_STRIPES]
+
+    def get(
+        self, title: str, year: str | int | None, content_type: str | None
+    ) -> CachedImdbLookup | None:
+        """Returns the cached lookup, or None if the caller has to query the providers."""
+        lookup_key = make_lookup_key(title, year, content_type)
+        now = datetime.now(UTC)
+
+        with self._lock:
+            entry = self._memory.get(lookup_key)
+            if entry is not None and entry.expires_at > now:
+                self._memory.move_to_end(lookup_key)
+            elif entry is not None:
+                del self._memory[lookup_key]
+                entry = None
+        if entry is not None:
+            self._counters.add("memory_hits")
+            return entry
+
+        try:
+            entry = self._load(lookup_key, now)
+        except Exception as e:
+            self._counters.add("store_errors")
+            logger.warning(f"IMDb ID cache: persistent lookup failed for '{lookup_key}': {e}")
+            entry = None
+
+        if entry is None:
+            self._counters.add("misses")
+            return None
+        self._counters.add("store_hits")
+        self._remember(lookup_key, entry)
+        return entry
+
+    def put(
+        self,
+        title: str,
+        year: str | int | None,
+        content_type: str | None,
+        imdb_id: str | None,
+        found_type: str | None,
+    ) -> None:
+        """Stores a provider result; ``imdb_id=None`` is cached as a short-lived negative result."""
+        lookup_key = make_lookup_key(title, year, content_type)
+        now = datetime.now(UTC)
+        expires_at = now + (self._positive_ttl if imdb_id else self._negative_ttl)
+        entry = CachedImdbLookup(imdb_id, found_type, expires_at)
+        self._remember(lookup_key, entry)
+        try:
+            self._save(
+                lookup_key,
+                {
+                    "title": normalize_title(title)[:500],
+                    "year": normalize_year(year),
+                    "content_type": content_type or "any",
+                    "imdb_id": imdb_id,
+                    "found_type": found_type,
+                    "created_at": now,
+                    "expires_at": expires_at,
+                },
+            )
+        except Exception as e:
+            self._counters.add("store_errors")
+            logger.warning(f"IMDb ID cache: could not persist '{lookup_key}': {e}")
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            memory_entries = len(self._memory)
+        return {**self._counters.snapshot(), "memory_entries": memory_entries}
+
+
+imdb_id_cache = ImdbIdCache()
+
+
+__all__ = [
+    "CachedImdbLookup",
+    "ImdbIdCache",
+    "imdb_id_cache",
+    "make_lookup_key",
+    "normalize_title",
+    "normalize_year",
+]
@@ -0,0 +1,348 @@
+"""
+Persistent index of library directory listings, for folder scans.
+
+Content-type detection and the movie/TV folder processors all walk the job's
+folder. On a NAS-mounted library, listing thousands of directories and
+stat'ing every video dominates short jobs. The index keeps, per scanned
+root, the listing of each directory it has seen. A listing is reused while
+the directory's mtime is unchanged, so an unchanged subtree costs one stat per
+directory and is never listed again.
+
+Besides the raw listing (what `os.walk` yields), each directory records:
+
+- size and mtime of its video files, and which of them already have a
+  non-empty '<stem>.ro.srt' next to them;
+- which videos were processed, and at which size/mtime, so an incremental job
+  only takes new or changed files (`LibraryScan.needs_processing`);
+- for the root, the detected content type, together with the mtimes of the
+  directories the detection looked at.
+
+Adding, removing or renaming an entry (what downloaders and the pipeline itself
+do) changes the directory's mtime. A file rewritten in place does not, so
+incremental jobs miss it until a full job runs. Listings taken within
+_RACY_WINDOW_NS of the directory's last change are not trusted, in case a
+coarse NAS timestamp hides a later change.
+
+One JSON file per scan root lives under LIBRARY_SCAN_INDEX_DIR. It is
+written to a temp name and renamed into place. The directory is bounded by
+LIBRARY_SCAN_INDEX_MAX_ROOTS (least recently used first). Index errors never
+fail a scan: they only cost a fresh listing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters, atomic_write_json, evict_least_recently_used
+from app.modules.subtitle.core.constants import VIDEO_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+_RACY_WINDOW_NS = 2_000_000_000  # SMB/FAT timestamps can be 2 s coarse
+_TOP = "."
+
+
+@dataclass(slots=True)
+class DirectoryListing:
+    """What the index knows about one directory, as of its mtime `mtime_ns`."""
+
+    mtime_ns: int
+    listed_at_ns: int
+    dirs: list[str]
+    files: list[str]
+    videos: dict[str, list[int]] = field(default_factory=dict)  # name -> [size, mtime_ns]
+    with_ro: list[str] = field(default_factory=list)  # Videos with a non-empty .ro.srt
+    processed: dict[str, list[int]] = field(default_factory=dict)  # name -> [size, mtime_ns]
+
+    def is_current(self, mtime_ns: int) -> bool:
+        return mtime_ns == self.mtime_ns and self.listed_at_ns - mtime_ns > _RACY_WINDOW_NS
+
+
+def _list_directory(
+    path: Path, mtime_ns: int, previous: DirectoryListing | None
+) -> DirectoryListing:
+    listed_at_ns = time.time_ns()
+    dirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)  # Never follow links (loops)
+            except OSError:
+                continue
+            (dirs if is_dir else files).append(entry.name)
+    dirs.sort()
+    files.sort()
+
+    videos: dict[str, list[int]] = {}
+    with_ro = []
+    names = set(files)
+    for name in files:
+        stem, _, ext = name.rpartition(".")
+        if not stem or f".{ext.lower()}" not in VIDEO_EXTENSIONS:
+            continue
+        try:
+            stat = (path / name).stat()
+            videos[name] = [stat.st_size, stat.st_mtime_ns]
+            ro_name = f"{stem}.ro.srt"
+            if ro_name in names and (path / ro_name).stat().st_size > 0:
+                with_ro.append(name)
+        except OSError:
+            continue
+
+    processed = {}
+    if previous is not None:  # Processing records survive a re-listing
+        processed = {name: fp for name, fp in previous.processed.items() if name in videos}
+    return DirectoryListing(mtime_ns, listed_at_ns, dirs, files, videos, with_ro, processed)
+
+
+class LibraryScan:
+    """
+    The index of one scan root, loaded for the duration of a scan.
+
+    Use as a context manager; changed listings are written back on exit.
+    """
+
+    def __init__(
+        self,
+        index: "LibraryScanIndex",
+        top: Path,
+        listings: dict[str, DirectoryListing],
+        content_type: dict[str, Any] | None,
+        persistent: bool,
+    ) -> None:
+        self.top = top
+        self._index = index
+        self._listings = listings
+        self._content_type = content_type
+        self._persistent = persistent
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._visited: dict[str, int] = {}
+
+    def __enter__(self) -> "LibraryScan":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.save()
+
+    def _video_listing(self, video_path: Path) -> DirectoryListing | None:
+        try:
+            rel = video_path.parent.relative_to(self.top).as_posix()
+        except ValueError:
+            return None
+        return self._listings.get(rel if rel != "." else _TOP)
+
+    def _listing(self, rel: str) -> DirectoryListing | None:
+        """Current listing of a directory, re-listed only if it changed since last time."""
+        path = self.top if rel == _TOP else self.top / rel
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        previous = self._listings.get(rel)
+        self._visited[rel] = mtime_ns
+        if previous is not None and previous.is_current(mtime_ns):
+            self._index._counters.add("reused")
+            return previous
+        try:
+            listing = _list_directory(path, mtime_ns, previous)
+        except OSError as e:
+            logger.warning(f"Error scanning directory {path}: {e}")
+            return None
+        self._index._counters.add("listed")
+        with self._lock:
+            if previous is not None:
+                for name in set(previous.dirs) - set(listing.dirs):  # Forget removed subtrees
+                    self._forget(rel, name)
+            self._listings[rel] = listing
+            self._dirty = True
+        return listing
+
+    def _forget(self, rel: str, name: str) -> None:
+        prefix = name if rel == _TOP else f"{rel}/{name}"
+        for key in [k for k in self._listings if k == prefix or k.startswith(f"{prefix}/")]:
+            del self._listings[key]
+
+    # --- Public API ---
+
+    def walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        """
+        Top-down `os.walk` of the root (symlinks not followed), served from the index.
+
+        As with `os.walk`, pruning the yielded `dirs` list in place skips those
+        subtrees.
+        """
+        pending = [_TOP]
+        while pending:
+            rel = pending.pop()
+            listing = self._listing(rel)
+            if listing is None:
+                continue
+            dirs, files = list(listing.dirs), list(listing.files)
+            yield str(self.top if rel == _TOP else self.top / rel), dirs, files
+            pending.extend(name if rel == _TOP else f"{rel}/{name}" for name in reversed(dirs))
+
+    def has_ro_subtitle(self, video_path: str | Path) -> bool:
+        """True if the last listing saw a non-empty '<stem>.ro.srt' next to the video."""
+        video_path = Path(video_path)
+        listing = self._video_listing(video_path)
+        return listing is not None and video_path.name in listing.with_ro
+
+    def needs_processing(self, video_path: str | Path) -> bool:
+        """
+        True for videos that are new or changed since they were last processed
+        and have no Romanian subtitle yet.
+        """
+        video_path = Path(video_path)
+        listing = self._video_listing(video_path)
+        if listing is None or video_path.name not in listing.videos:
+            return True
+        if video_path.name in listing.with_ro:
+            return False
+        return listing.processed.get(video_path.name) != listing.videos[video_path.name]
+
+    def mark_processed(self, video_path: str | Path) -> None:
+        """Records that the video, at its listed size and mtime, went through the pipeline."""
+        video_path = Path(video_path)
+        with self._lock:
+            listing = self._video_listing(video_path)
+            if listing is None or video_path.name not in listing.videos:
+                return
+            listing.processed[video_path.name] = listing.videos[video_path.name]
+            self._dirty = True
+
+    def cached_content_type(self) -> str | None:
+        """
+        The content type stored by `store_content_type`, if none of the
+        directories it was derived from changed since. Returns None on a miss.
+        """
+        cached = self._content_type
+        if not cached:
+            return None
+        for rel, mtime_ns in cached["dirs"].items():
+            try:
+                path = self.top if rel == _TOP else self.top / rel
+                if path.stat().st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        return str(cached["value"])
+
+    def store_content_type(self, value: str) -> None:
+        """Stores the content type detected from the directories walked so far."""
+        with self._lock:
+            self._content_type = {"value": value, "dirs": dict(self._visited)}
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not (self._persistent and self._dirty):
+                return
+            data = {
+                "version": _INDEX_VERSION,
+                "top": str(self.top),
+                "content_type": self._content_type,
+                "dirs": {rel: asdict(listing) for rel, listing in self._listings.items()},
+            }
+            self._dirty = False
+        self._index._write(self.top, data)
+
+
+class LibraryScanIndex:
+    """Shared on-disk index of directory listings, one file per scan root."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        max_roots: int | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self._root = Path(root) if root is not None else None
+        self._max_roots = max_roots
+        self._enabled = enabled
+        self._counters = CacheCounters("reused", "listed", "errors")
+
+    @property
+    def root(self) -> Path:
+        return self._root if self._root is not None else Path(settings.LIBRARY_SCAN_INDEX_DIR)
+
+    @property
+    def max_roots(self) -> int:
+        if self._max_roots is not None:
+            return self._max_roots
+        return settings.LIBRARY_SCAN_INDEX_MAX_ROOTS
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return settings.LIBRARY_SCAN_INDEX_ENABLED
+
+    def _entry_path(self, top: Path) -> Path:
+        key = hashlib.sha1(str(top).encode(), usedforsecurity=False).hexdigest()
+        return self.root / f"{key}.json"
+
+    # --- Public API ---
+
+    def open(self, top: str | Path) -> LibraryScan:
+        """
+        Loads the index of a scan root. With the index disabled the scan works
+        the same but lists every directory and keeps nothing.
+        """
+        top = Path(top).resolve()
+        if not self.enabled:
+            return LibraryScan(self, top, {}, None, persistent=False)
+
+        entry_path = self._entry_path(top)
+        listings: dict[str, DirectoryListing] = {}
+        content_type = None
+        try:
+            data = json.loads(entry_path.read_text(encoding="utf-8"))
+            os.utime(entry_path)  # Mark as recently used
+            if data.get("version") == _INDEX_VERSION and data.get("top") == str(top):
+                listings = {rel: DirectoryListing(**item) for rel, item in data["dirs"].items()}
+                content_type = data.get("content_type")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Library scan index: could not read index of {top}: {e}")
+        return LibraryScan(self, top, listings, content_type, persistent=True)
+
+    def stats(self) -> dict[str, int]:
+        return self._counters.snapshot()
+
+    # --- Internals ---
+
+    def _write(self, top: Path, data: dict[str, Any]) -> None:
+        try:
+            atomic_write_json(self._entry_path(top), data, separators=(",", ":"))
+        except (OSError, TypeError, ValueError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Library scan index: could not store index of {top}: {e}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used root indexes until within the limit."""
+        try:
+            evict_least_recently_used(self.root.glob("*.json"), self.max_roots)
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Library scan index: eviction failed: {e}")
+
+
+library_scan_index = LibraryScanIndex()
+
+
+__all__ = ["DirectoryListing", "LibraryScan", "LibraryScanIndex", "library_scan_index"]
@@ -0,0 +1,182 @@
+"""
+Persistent index of ffprobe results for video files.
+
+One `ffprobe -show_streams -show_format` per file yields all streams, the
+duration and the container tags (`MediaProbe`). EmbedScanner and the embedded
+stream helpers in media_utils all read from it, so a video is no longer probed
+once per target language.
+
+Entries are keyed by (resolved path, size, mtime, inode): a replaced or
+re-muxed file gets a new key and is probed again, while a rescan of an
+unchanged library is served entirely from the index. Probes are kept in a
+small in-process LRU and as JSON files under MEDIA_PROBE_CACHE_DIR, written to
+a temp name and renamed into place so all workers can share the directory.
+The directory is bounded by MEDIA_PROBE_CACHE_MAX_ENTRIES (oldest entries
+evicted first). Cache errors never fail a probe, they only count as misses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.file_cache import (
+    CacheCounters,
+    EvictionSchedule,
+    atomic_write_json,
+    evict_least_recently_used,
+)
+
+logger = logging.getLogger(__name__)
+
+_EVICT_EVERY = 64  # Stores between two scans of the index directory
+
+
+@dataclass(frozen=True, slots=True)
+class MediaProbe:
+    """Streams and container format of a video file, as reported by ffprobe."""
+
+    streams: tuple[dict[str, Any], ...]
+    format: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_ffprobe(cls, data: dict[str, Any]) -> "MediaProbe":
+        return cls(streams=tuple(data.get("streams") or ()), format=data.get("format") or {})
+
+    def to_ffprobe(self) -> dict[str, Any]:
+        return {"streams": list(self.streams), "format": self.format}
+
+    @property
+    def subtitle_streams(self) -> list[dict[str, Any]]:
+        return [s for s in self.streams if s.get("codec_type") == "subtitle"]
+
+    @property
+    def duration(self) -> float | None:
+        """Container duration in seconds, if ffprobe reported one."""
+        try:
+            return float(self.format["duration"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @property
+    def tags(self) -> dict[str, Any]:
+        return self.format.get("tags") or {}
+
+
+def make_probe_key(video_path: str | Path) -> str | None:
+    """Identity of the file's current contents; None if it cannot be stat'ed."""
+    try:
+        path = Path(video_path).resolve()
+        stat = path.stat()
+    except OSError:
+        return None
+    identity = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{stat.st_ino}"
+    return hashlib.sha1(identity.encode(), usedforsecurity=False).hexdigest()
+
+
+class MediaProbeCache:
+    """In-process LRU in front of a shared on-disk index of ffprobe results."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        max_entries: int | None = None,
+        memory_size: int = 256,
+    ) -> None:
+        self._root = Path(root) if root is not None else None
+        self._max_entries = max_entries
+        self._memory_size = memory_size
+        self._memory: OrderedDict[str, MediaProbe] = OrderedDict()
+        self._lock = threading.Lock()
+        self._eviction_schedule = EvictionSchedule()
+        self._counters = CacheCounters(
+            "memory_hits", "store_hits", "misses", "stores", "evictions", "errors"
+        )
+
+    @property
+    def root(self) -> Path:
+        return self._root if self._root is not None else Path(settings.MEDIA_PROBE_CACHE_DIR)
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return settings.MEDIA_PROBE_CACHE_MAX_ENTRIES
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, probe: MediaProbe) -> None:
+        with self._lock:
+            self._memory[key] = probe
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
+    # --- Public API ---
+
+    def get(self, key: str) -> MediaProbe | None:
+        """Returns the stored probe for a key from `make_probe_key`, or None on a miss."""
+        with self._lock:
+            probe = self._memory.get(key)
+            if probe is not None:
+                self._memory.move_to_end(key)
+        if probe is not None:
+            self._counters.add("memory_hits")
+            return probe
+
+        entry_path = self._entry_path(key)
+        try:
+            probe = MediaProbe.from_ffprobe(json.loads(entry_path.read_text(encoding="utf-8")))
+            os.utime(entry_path)  # Mark as recently used
+        except FileNotFoundError:
+            self._counters.add("misses")
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Media probe cache: could not read entry {key}: {e}")
+            return None
+
+        self._remember(key, probe)
+        self._counters.add("store_hits")
+        return probe
+
+    def put(self, key: str, probe: MediaProbe) -> None:
+        self._remember(key, probe)
+        try:
+            atomic_write_json(self._entry_path(key), probe.to_ffprobe())
+        except (OSError, TypeError, ValueError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Media probe cache: could not store entry {key}: {e}")
+            return
+
+        self._counters.add("stores")
+        if self._eviction_schedule.due(_EVICT_EVERY):
+            self._evict()
+
+    def stats(self) -> dict[str, int]:
+        return self._counters.snapshot()
+
+    # --- Internals ---
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until the index is within the limit."""
+        try:
+            evicted = evict_least_recently_used(self.root.glob("*/*.json"), self.max_entries)
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Media probe cache: eviction failed: {e}")
+            return
+        self._counters.add("evictions", evicted)
+
+
+media_probe_cache = MediaProbeCache()
+
+
+__all__ = ["MediaProbe", "MediaProbeCache", "make_probe_key", "media_probe_cache"]
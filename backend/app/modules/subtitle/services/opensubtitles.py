@@ -5,8 +5,9 @@ from typing import Any
 
 # Import config, network utils, etc.
 from app.core.config import settings
+from app.core.effective_settings import get_effective_setting_sync
 from app.modules.subtitle.utils.network_utils import create_session_with_retries, make_request
-from app.modules.subtitle.utils.subtitle_matcher import calculate_match_score
+from app.modules.subtitle.utils.subtitle_matcher import MediaMatchProfile
 
 # Import necessary utils for matching and parsing
 from app.modules.subtitle.utils.subtitle_parser import tokenize_and_normalize
@@ -28,49 +29,17 @@ LOGOUT_URL = f"{BASE_URL}/logout"
 
 # Shared session
 network_session = create_session_with_retries()
+download_session = create_session_with_retries()
+download_session.headers.update({"User-Agent": f"{APP_NAME} v{APP_VERSION}"})
 
 _current_opensubs_token: str | None = None
 _auth_failed_this_run: bool = False  # Tracks if auth failed in the current script execution
 
 
 # Helper for dynamic setting retrieval
-def _get_dynamic_setting(db_field: str, env_var_name: str | None = None) -> Any:
-    """
-    Fetches setting synchronously from DB, falling back to Environment/Settings.
-    """
-    # 1. Try Database
-    try:
-        from sqlalchemy import select
-
-        from app.core.security import decrypt_value
-        from app.db.models.app_settings import AppSettings
-        from app.db.session import SyncSessionLocal
-
-        if SyncSessionLocal:
-            with SyncSessionLocal() as session:
-                settings_row = session.scalar(select(AppSettings).where(AppSettings.id == 1))
-                if settings_row:
-                    val = getattr(settings_row, db_field, None)
-                    if val is not None:
-                        # Handle potentially unnecessary decryption check if field isn't encrypted?
-                        # Assuming these specific fields MIGHT be encrypted in DB model.
-                        # Based on AppSettings model, keys/passwords are usually encrypted.
-                        # We'll try decrypting, if it fails assume plain or handle error.
-                        # Actually for AppSettings, we should know if it matches the schema.
-                        # Just calling decrypt_value is safe if value is encrypted string.
-                        if val == "":
-                            return None
-                        try:
-                            return decrypt_value(val)
-                        except Exception:
-                            return val
-    except Exception:
-        pass
-
-    # 2. Fallback to Environment
-    if env_var_name:
-        return getattr(settings, env_var_name, None)
-    return None
+def _get_dynamic_setting(db_field: str) -> Any:
+    """Current value of a setting (DB > env) from the effective settings snapshot."""
+    return get_effective_setting_sync(db_field) or None
 
 
 def set_token(token: str | None) -> None:
@@ -120,9 +89,9 @@ def authenticate() -> bool:
         return False
 
     # 3. Credentials check
-    api_key = _get_dynamic_setting("opensubtitles_api_key", "OPENSUBTITLES_API_KEY")
-    username = _get_dynamic_setting("opensubtitles_username", "OPENSUBTITLES_USERNAME")
-    password = _get_dynamic_setting("opensubtitles_password", "OPENSUBTITLES_PASSWORD")
+    api_key = _get_dynamic_setting("opensubtitles_api_key")
+    username = _get_dynamic_setting("opensubtitles_username")
+    password = _get_dynamic_setting("opensubtitles_password")
 
     if not all([api_key, username, password]):
         logger.error("OpenSubtitles Auth Error: Credentials/API Key missing in config.")
@@ -191,7 +160,7 @@ def logout() -> bool:
         logger.debug("OpenSubtitles Logout: Not currently logged in or no API key.")
         logout_success = True  # Consider it "successful" in terms of state being logged out
     else:
-        api_key = _get_dynamic_setting("opensubtitles_api_key", "OPENSUBTITLES_API_KEY")
+        api_key = _get_dynamic_setting("opensubtitles_api_key")
         if not api_key:
             logger.error("OpenSubtitles Logout Error: API Key missing.")
             logout_success = False
@@ -232,7 +201,7 @@ def _opensubs_api_request(
     Handles token expiry (401 retry).
     """
     headers = kwargs.pop("headers", {})
-    api_key = _get_dynamic_setting("opensubtitles_api_key", "OPENSUBTITLES_API_KEY")
+    api_key = _get_dynamic_setting("opensubtitles_api_key")
     headers["Api-Key"] = api_key
     headers["User-Agent"] = f"{APP_NAME} v{APP_VERSION}"
     if "Content-Type" not in headers and ("json" in kwargs or "data" in kwargs):
@@ -499,11 +468,10 @@ def download_subtitle_content(download_link: str) -> bytes | None:
         logger.error("Cannot download subtitle: link missing.")
         return None
     logger.info(f"Downloading OpenSubtitles content from link: {download_link[:70]}...")
-    # Use a temporary session for this potentially external URL, respecting redirects
-    temp_session = create_session_with_retries()  # Use network_utils session creator
-    temp_session.headers.update({"User-Agent": f"{APP_NAME} v{APP_VERSION}"})  # Add user agent
+    # Separate (auth-free) session for these external CDN links, respecting redirects;
+    # shared across files so its keep-alive connections are reused.
     response = make_request(
-        temp_session, "GET", download_link, stream=True, allow_redirects=True
+        download_session, "GET", download_link, stream=True, allow_redirects=True
     )  # Use network_utils maker
 
     if response and response.status_code == 200:
@@ -543,7 +511,9 @@ def find_best_subtitle_match(  # noqa: C901
     logger.info(
         f"Finding best match for '{target_release_name}' among {len(subtitle_results)} OpenSubtitles results..."
     )
-    target_tokens = tokenize_and_normalize(target_release_name)
+    target = MediaMatchProfile.from_filename(
+        target_release_name, tokenize_and_normalize(target_release_name)
+    )
     scored_subtitles = []
     for sub_result in subtitle_results:
         try:
@@ -559,8 +529,8 @@ def find_best_subtitle_match(  # noqa: C901
             if not release_tokens and not file_tokens:
                 continue
 
-            release_score = calculate_match_score(target_tokens, release_tokens)
-            file_score = calculate_match_score(target_tokens, file_tokens)
+            release_score = target.score_tokens(release_tokens)
+            file_score = target.score_tokens(file_tokens)
             # v2 scoring weights release name slightly higher
             combined_score = (release_score * 1.2) + (file_score * 0.8)
             # Bonus/Penalties
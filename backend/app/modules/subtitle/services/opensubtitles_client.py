@@ -1,4 +1,5 @@
 import logging
+import threading
 from typing import Any
 
 # Import the original module for its functions and config constants
@@ -7,6 +8,11 @@ from app.modules.subtitle.services import opensubtitles as opensubtitles_service
 
 logger = logging.getLogger(__name__)
 
+# The service token is module state shared by every client in the process. When
+# pipelines run in parallel they share one login; only the last client logs out.
+_session_lock = threading.Lock()
+_active_sessions = 0
+
 
 class OpenSubtitlesClient:
     """
@@ -54,13 +60,21 @@ class OpenSubtitlesClient:
 
         logger.info("OpenSubtitlesClient: Attempting authentication via underlying service...")
 
-        # Call the underlying service function to perform authentication.
-        # This function sets the module-level token in opensubtitles.py
-        auth_success = opensubtitles_service.authenticate()
+        global _active_sessions
+        with _session_lock:
+            if self._token:
+                # Another thread sharing this client logged in while we waited.
+                return True
+            # Call the underlying service function to perform authentication.
+            # This function sets the module-level token in opensubtitles.py
+            # (or reuses it if another client already logged in).
+            auth_success = opensubtitles_service.authenticate()
+            # Retrieve the token that the service function obtained and stored globally
+            self._token = opensubtitles_service.get_token() if auth_success else None
+            if self._token:
+                _active_sessions += 1
 
         if auth_success:
-            # Retrieve the token that the service function obtained and stored globally
-            self._token = opensubtitles_service.get_token()
             if self._token:
                 logger.info(
                     f"OpenSubtitlesClient: Authentication successful (Token stored locally, ends '...{self._token[-5:]}')."
@@ -96,10 +110,21 @@ class OpenSubtitlesClient:
             self._auth_failed_this_session = False  # Reset failure flag on explicit logout attempt
             return True
 
-        logger.info("OpenSubtitlesClient: Attempting logout via underlying service...")
-        # Call the service's logout function, which handles the API call
-        # and clears the service's internal token state.
-        logout_success = bool(opensubtitles_service.logout())
+        global _active_sessions
+        with _session_lock:
+            _active_sessions = max(0, _active_sessions - 1)
+            if _active_sessions > 0:
+                logger.info(
+                    "OpenSubtitlesClient: Session still used by other pipelines, skipping API logout."
+                )
+                self._token = None
+                self._auth_failed_this_session = False
+                return True
+
+            logger.info("OpenSubtitlesClient: Attempting logout via underlying service...")
+            # Call the service's logout function, which handles the API call
+            # and clears the service's internal token state.
+            logout_success = bool(opensubtitles_service.logout())
 
         if logout_success:
             logger.info("OpenSubtitlesClient: Logout successful (via underlying service function).")
@@ -0,0 +1,202 @@
+"""
+On-disk cache of the speech-activity track of video files, for subtitle sync.
+
+ffsubsync turns the audio of a video into a 100 Hz speech/no-speech track (VAD)
+before aligning anything, and can serialize that track to a compressed .npz
+(`--serialize-speech`) or read one back as its reference. The first offset
+check for a video stores the track here; every later ffsubsync run for that
+video (the sync itself, re-syncs of other subtitle candidates, later jobs)
+uses the .npz instead of decoding the audio again, and alass aligns against a
+reference SRT built from the same track (`speech_segments`). The in-process
+offset estimator (`utils/sync_offset.py`) reads and stores tracks here too.
+
+Tracks are keyed by the video's identity (resolved path, size, mtime, inode; see
+`make_probe_key`), so a replaced file is analysed again. The directory is
+bounded by SUBTITLE_SYNC_SPEECH_CACHE_MAX_ENTRIES (least recently used first).
+Cache errors never fail a sync, they only count as misses.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters, atomic_write, evict_least_recently_used
+
+logger = logging.getLogger(__name__)
+
+SPEECH_SAMPLE_RATE = 100  # ffsubsync's VAD frames per second
+
+
+def load_speech_track(npz_path: str | Path) -> np.ndarray:
+    """Loads a serialized ffsubsync speech track (values in [0, 1], 100 per second)."""
+    with np.load(npz_path) as data:
+        return np.asarray(data["speech"], dtype=np.float32)
+
+
+def speech_segments(
+    speech: np.ndarray,
+    sample_rate: int = SPEECH_SAMPLE_RATE,
+    min_gap_s: float = 0.3,
+    min_length_s: float = 0.2,
+) -> list[tuple[int, int]]:
+    """
+    Returns the speech intervals of a track as (start_ms, end_ms) pairs.
+
+    Pauses shorter than `min_gap_s` are bridged and blips shorter than
+    `min_length_s` dropped, so the intervals look like subtitle cues.
+    """
+    active = np.concatenate(([0], (np.asarray(speech) >= 0.5).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(active))
+    starts, ends = edges[0::2], edges[1::2]
+
+    segments: list[tuple[int, int]] = []
+    min_gap = int(min_gap_s * sample_rate)
+    for start, end in zip(starts.tolist(), ends.tolist(), strict=True):
+        if segments and start - segments[-1][1] < min_gap:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    min_length = int(min_length_s * sample_rate)
+    step_ms = 1000 // sample_rate
+    return [(s * step_ms, e * step_ms) for s, e in segments if e - s >= min_length]
+
+
+class SpeechTrackCache:
+    """Size-bounded LRU directory of serialized speech tracks, one .npz per video identity."""
+
+    def __init__(self, root: str | Path | None = None, max_entries: int | None = None) -> None:
+        self._root = Path(root) if root is not None else None
+        self._max_entries = max_entries
+        self._counters = CacheCounters("hits", "misses", "stores", "evictions", "errors")
+
+    @property
+    def root(self) -> Path:
+        if self._root is not None:
+            return self._root
+        return Path(settings.SUBTITLE_SYNC_SPEECH_CACHE_DIR)
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return settings.SUBTITLE_SYNC_SPEECH_CACHE_MAX_ENTRIES
+
+    def _track_path(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    # --- Public API ---
+
+    def get(self, key: str) -> Path | None:
+        """Returns the stored .npz for a video key, or None on a miss."""
+        path = self._track_path(key)
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            self._counters.add("misses")
+            return None
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: could not read entry {key}: {e}")
+            return None
+        self._counters.add("hits")
+        return path
+
+    def put(self, key: str, speech: np.ndarray) -> Path | None:
+        """Stores a speech track computed in-process, in ffsubsync's .npz format."""
+        target = self._track_path(key)
+        track = np.asarray(speech, dtype=np.float64)
+        try:
+            atomic_write(target, lambda f: np.savez_compressed(f, speech=track), suffix=".npz")
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: could not store entry {key}: {e}")
+            return None
+        self._counters.add("stores")
+        self._evict()
+        return target
+
+    def invalidate(self, key: str) -> None:
+        """Removes a stored track that turned out to be unreadable."""
+        try:
+            self._track_path(key).unlink(missing_ok=True)
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: could not remove entry {key}: {e}")
+
+    def staging_reference(self, key: str, video_path: str | Path) -> Path | None:
+        """
+        Links the video into a private staging directory inside the cache.
+
+        ffsubsync writes the serialized track next to its reference
+        (`<reference stem>.npz`), so it is pointed at this link rather than at
+        the video in the library. Pass the link to `store` afterwards.
+        """
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}_", dir=self.root))
+            link = staging / f"reference{Path(video_path).suffix}"
+            link.symlink_to(Path(video_path).resolve())
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: could not stage {Path(video_path).name}: {e}")
+            return None
+        return link
+
+    def store(self, key: str, staged_reference: Path) -> Path | None:
+        """
+        Moves the track ffsubsync serialized next to `staged_reference` into the
+        cache, after checking that it loads. Call only after a successful run.
+        """
+        serialized = staged_reference.with_suffix(".npz")
+        target = self._track_path(key)
+        try:
+            if not serialized.is_file():
+                return None
+            if load_speech_track(serialized).size == 0:
+                raise ValueError("empty speech track")
+            serialized.replace(target)  # Same directory tree: an atomic rename
+        except Exception as e:  # np.load raises OSError, ValueError, BadZipFile, KeyError...
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: could not store entry {key}: {e}")
+            return None
+        finally:
+            self.discard(staged_reference)
+        self._counters.add("stores")
+        self._evict()
+        return target
+
+    def discard(self, staged_reference: Path) -> None:
+        """Removes a staging directory from `staging_reference`, with anything written into it."""
+        shutil.rmtree(staged_reference.parent, ignore_errors=True)
+
+    def stats(self) -> dict[str, int]:
+        return self._counters.snapshot()
+
+    # --- Internals ---
+
+    def _evict(self) -> None:
+        """Removes the least recently used tracks until the cache is within the limit."""
+        try:
+            evicted = evict_least_recently_used(self.root.glob("*.npz"), self.max_entries)
+        except OSError as e:
+            self._counters.add("errors")
+            logger.warning(f"Speech track cache: eviction failed: {e}")
+            return
+        self._counters.add("evictions", evicted)
+
+
+speech_track_cache = SpeechTrackCache()
+
+
+__all__ = [
+    "SPEECH_SAMPLE_RATE",
+    "SpeechTrackCache",
+    "load_speech_track",
+    "speech_segments",
+    "speech_track_cache",
+]
@@ -0,0 +1,207 @@
+"""
+Persistent translation memory for `TranslationManager.batched_srt_translate`.
+
+Segments are keyed by source language, target language and normalized text, so
+recurring dialogue, intros and re-processed releases are sent to (and billed by)
+DeepL/Google only once. The ``translation_memory`` table is bounded by
+TRANSLATION_MEMORY_MAX_ENTRIES: after each store the least recently used rows
+beyond the limit are deleted.
+
+Like the IMDb ID cache, DB errors never fail a translation; they only turn the
+lookup into a miss or skip the store.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SPACES_RE = re.compile(r"[ \t\u00a0]+")
+_BATCH_SIZE = 1000  # Keys per IN (...) query / rows per upsert
+
+
+def normalize_segment(text: str) -> str:
+    """Collapses spacing and drops blank lines, keeping the line structure of the cue."""
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.replace("\r\n", "\n").split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _language(code: str | None) -> str:
+    return (code or "auto").lower()[:10]
+
+
+def make_memory_key(source_lang: str | None, target_lang: str, normalized_text: str) -> str:
+    return hashlib.sha256(
+        f"{_language(source_lang)}|{_language(target_lang)}|{normalized_text}".encode()
+    ).hexdigest()
+
+
+# --- Persistent level (Postgres via the sync session used by the subtitle services) ---
+
+
+def _db_load(key_hashes: list[str], now: datetime) -> dict[str, str]:
+    """Returns translations for the known keys and marks them used, in one round trip."""
+    from sqlalchemy import update
+
+    from app.db.models.translation_memory import TranslationMemoryEntry
+    from app.db.session import SyncSessionLocal
+
+    if SyncSessionLocal is None:
+        return {}
+    with SyncSessionLocal() as session:
+        rows = session.execute(
+            update(TranslationMemoryEntry)
+            .where(TranslationMemoryEntry.key_hash.in_(key_hashes))
+            .values(hit_count=TranslationMemoryEntry.hit_count + 1, last_used_at=now)
+            .returning(TranslationMemoryEntry.key_hash, TranslationMemoryEntry.translated_text)
+        ).all()
+        session.commit()
+    return {row.key_hash: row.translated_text for row in rows}
+
+
+def _db_save(rows: list[dict[str, Any]], max_entries: int) -> int:
+    """Upserts translated segments and evicts the oldest rows over the limit; returns evictions."""
+    from sqlalchemy import delete, func, select
+    from sqlalchemy.dialects.postgresql import insert
+
+    from app.db.models.translation_memory import TranslationMemoryEntry
+    from app.db.session import SyncSessionLocal
+
+    if SyncSessionLocal is None:
+        return 0
+    stmt = insert(TranslationMemoryEntry).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TranslationMemoryEntry.key_hash],
+        set_={
+            "translated_text": stmt.excluded.translated_text,
+            "last_used_at": stmt.excluded.last_used_at,
+        },
+    )
+    with SyncSessionLocal() as session:
+        session.execute(stmt)
+        excess = (
+            session.execute(select(func.count()).select_from(TranslationMemoryEntry)).scalar_one()
+            - max_entries
+        )
+        if excess > 0:
+            oldest = (
+                select(TranslationMemoryEntry.key_hash)
+                .order_by(TranslationMemoryEntry.last_used_at)
+                .limit(excess)
+                .scalar_subquery()
+            )
+            session.execute(
+                delete(TranslationMemoryEntry).where(TranslationMemoryEntry.key_hash.in_(oldest))
+            )
+        session.commit()
+    return max(excess, 0)
+
+
+class TranslationMemory:
+    """Looks up and stores translated segments, with hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        load: Callable[[list[str], datetime], dict[str, str]] = _db_load,
+        save: Callable[[list[dict[str, Any]], int], int] = _db_save,
+    ) -> None:
+        self._max_entries = max_entries
+        self._load = load
+        self._save = save
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.store_errors = 0
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return settings.TRANSLATION_MEMORY_MAX_ENTRIES
+
+    def lookup(
+        self, source_lang: str | None, target_lang: str, normalized_texts: Sequence[str]
+    ) -> dict[str, str]:
+        """Maps each remembered normalized text to its stored translation."""
+        keys = {make_memory_key(source_lang, target_lang, text): text for text in normalized_texts}
+        found: dict[str, str] = {}
+        key_list = list(keys)
+        now = datetime.now(UTC)
+        try:
+            for start in range(0, len(key_list), _BATCH_SIZE):
+                found.update(self._load(key_list[start : start + _BATCH_SIZE], now))
+        except Exception as e:
+            with self._lock:
+                self.store_errors += 1
+            logger.warning(f"Translation memory: lookup failed, translating everything: {e}")
+            found = {}
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {keys[key]: translation for key, translation in found.items()}
+
+    def store(
+        self, source_lang: str | None, target_lang: str, pairs: Iterable[tuple[str, str]]
+    ) -> None:
+        """Remembers (normalized source text, translation) pairs."""
+        now = datetime.now(UTC)
+        rows = {}
+        for normalized_text, translation in pairs:
+            key = make_memory_key(source_lang, target_lang, normalized_text)
+            rows[key] = {
+                "key_hash": key,
+                "source_language": _language(source_lang),
+                "target_language": _language(target_lang),
+                "source_text": normalized_text,
+                "translated_text": translation,
+                "hit_count": 0,
+                "created_at": now,
+                "last_used_at": now,
+            }
+        if not rows:
+            return
+        row_list = list(rows.values())
+        evicted = 0
+        try:
+            for start in range(0, len(row_list), _BATCH_SIZE):
+                evicted += self._save(row_list[start : start + _BATCH_SIZE], self.max_entries)
+        except Exception as e:
+            with self._lock:
+                self.store_errors += 1
+            logger.warning(f"Translation memory: could not store {len(rows)} segments: {e}")
+            return
+        with self._lock:
+            self.stored += len(rows)
+            self.evicted += evicted
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stored": self.stored,
+                "evicted": self.evicted,
+                "store_errors": self.store_errors,
+            }
+
+
+translation_memory = TranslationMemory()
+
+
+__all__ = [
+    "TranslationMemory",
+    "make_memory_key",
+    "normalize_segment",
+    "translation_memory",
+]
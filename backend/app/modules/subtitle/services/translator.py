@@ -6,7 +6,9 @@ import logging
 import os
 import re  # Added for regex parsing and SRT corrections
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -45,21 +47,40 @@ except ImportError:
     google_translate = None  # type: ignore[assignment]
     google_exceptions = None  # type: ignore[assignment]
 
+from app.modules.subtitle.utils import srt_codec
+
 try:
     # Example: Using a hypothetical settings object
     from app.core.config import settings
+    from app.core.effective_settings import get_effective_setting_sync
     from app.db import base as _  # noqa: F401 Ensure all models are registered before DB access
     from app.db.models.deepl_usage import DeepLUsage
     from app.db.models.translation_log import TranslationLog
     from app.db.session import SyncSessionLocal
+    from app.modules.subtitle.services.deepl_quota import (
+        DeepLQuotaLedger,
+        QuotaState,
+        deepl_quota_ledger,
+        key_identifier,
+    )
+    from app.modules.subtitle.services.translation_memory import (
+        TranslationMemory,
+        normalize_segment,
+        translation_memory,
+    )
+    from app.modules.subtitle.services.usage_accounting import usage_accountant
 
     CONFIG_LOADER_AVAILABLE = True
     DATABASE_AVAILABLE = True
 except ImportError:
     settings = None  # type: ignore[assignment]
     SyncSessionLocal = None
+    get_effective_setting_sync = None  # type: ignore[assignment]
     DeepLUsage = None  # type: ignore[assignment, misc]
     TranslationLog = None  # type: ignore[assignment, misc]
+    translation_memory = None  # type: ignore[assignment]
+    deepl_quota_ledger = None  # type: ignore[assignment]
+    usage_accountant = None  # type: ignore[assignment]
     CONFIG_LOADER_AVAILABLE = False
     DATABASE_AVAILABLE = False
     # In a real application, handle missing config loader more robustly.
@@ -423,136 +444,6 @@ def chunk_text_list_for_translation(  # noqa: C901
     return batches
 
 
-def parse_srt_into_segments(srt_content: str) -> list[tuple[str, str, str]]:  # noqa: C901
-    """
-    Parses SRT content into a list of (index_line, timestamp_line, subtitle_text).
-    Robustly handles formatting variations and potential errors.
-    """
-    segments = []
-    if not isinstance(srt_content, str):
-        logger.error("SRT parsing failed: Input content is not a string.")
-        return segments
-
-    # Pre-process: Ensure basic timestamp format and clean up whitespace
-    srt_content = ensure_correct_timestamp_format(srt_content.strip())
-    lines = srt_content.splitlines()
-
-    segment_index = 0
-    current_index_line = None
-    current_ts_line = None
-    current_text_lines: list[str] = []
-    state = "index"  # Possible states: index, timestamp, text
-
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-
-        if state == "index":
-            if re.fullmatch(r"\d+", stripped_line):
-                current_index_line = line  # Keep original line
-                state = "timestamp"
-            elif stripped_line:  # Non-empty, non-numeric line where index was expected
-                logger.warning(
-                    f"SRT Parse (Line {line_num}): Expected index number, found: '{line}'. Skipping line."
-                )
-            # Ignore blank lines when expecting index
-
-        elif state == "timestamp":
-            # Use regex for more flexible timestamp matching
-            ts_match = re.match(
-                r"\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}", stripped_line
-            )
-            if ts_match:
-                # Re-ensure format using the matched part for consistency
-                current_ts_line = ensure_correct_timestamp_format(
-                    line
-                )  # Keep original line spacing if needed
-                state = "text"
-            elif stripped_line:  # Non-empty, non-timestamp line where timestamp was expected
-                logger.warning(
-                    f"SRT Parse (Line {line_num}): Expected timestamp 'HH:MM:SS,ms --> HH:MM:SS,ms', found: '{line}'. Resetting segment."
-                )
-                # Reset state and discard the partial segment
-                current_index_line, current_ts_line, current_text_lines = None, None, []
-                state = "index"  # Look for a new index
-            # Ignore blank lines when expecting timestamp
-
-        elif state == "text":
-            if stripped_line:  # Collect non-empty lines as text
-                current_text_lines.append(line)  # Keep original line
-            else:  # Blank line marks the end of the text block
-                if current_index_line and current_ts_line:
-                    segment_text = "\n".join(current_text_lines)
-                    segments.append((current_index_line, current_ts_line, segment_text))
-                    segment_index += 1
-                else:
-                    # Should not happen if state machine is correct, but safeguard
-                    logger.warning(
-                        f"SRT Parse (Near Line {line_num}): Reached end of text block (blank line) but missing index or timestamp. Discarding collected text: {current_text_lines}"
-                    )
-
-                # Reset for the next segment
-                current_index_line, current_ts_line, current_text_lines = None, None, []
-                state = "index"  # Expect index next
-
-    # Handle the last segment if the file doesn't end with a blank line
-    if state == "text" and current_text_lines:
-        if current_index_line and current_ts_line:
-            segment_text = "\n".join(current_text_lines)
-            segments.append((current_index_line, current_ts_line, segment_text))
-            segment_index += 1
-        else:
-            logger.warning(
-                f"SRT Parse (End of File): Reached EOF while collecting text, but missing index or timestamp. Discarding final text: {current_text_lines}"
-            )
-
-    if not segments and srt_content:
-        logger.warning(
-            "SRT parsing resulted in zero segments, although content was provided. Check SRT format."
-        )
-    elif segments:
-        logger.info(f"Parsed {len(segments)} SRT segments.")
-
-    return segments
-
-
-def rebuild_srt_from_segments(segments: list[tuple[str, str, str]]) -> str:
-    """
-    Rebuilds an SRT file content string from parsed segments.
-    Ensures standard formatting with blank lines between entries.
-    """
-    if not segments:
-        return ""
-
-    srt_blocks = []
-    for i, (idx_line, ts_line, text_content) in enumerate(segments):
-        idx_str = str(idx_line).strip() if idx_line is not None else ""
-        ts_str = str(ts_line).strip() if ts_line is not None else ""
-        txt_str = str(text_content) if text_content is not None else ""  # Allow empty text
-
-        if not idx_str or "-->" not in ts_str:  # Check if timestamp line looks valid
-            logger.warning(
-                f"Skipping segment {i + 1} during rebuild due to invalid index ('{idx_str}') or timestamp ('{ts_str}')."
-            )
-            continue
-
-        # Use original lines to preserve potential formatting, ensure they end with newline
-        idx_line_fmt = str(idx_line).rstrip("\n") + "\n"
-        ts_line_fmt = str(ts_line).rstrip("\n") + "\n"
-        txt_fmt = txt_str  # Text content might already have internal newlines
-
-        # Add block: index, timestamp, text (potentially multi-line)
-        srt_blocks.append(f"{idx_line_fmt}{ts_line_fmt}{txt_fmt}")
-
-    # Join blocks with exactly one blank line (two newlines)
-    result = "\n\n".join(srt_blocks)
-
-    # Ensure the final string ends with exactly one newline if there's content
-    if result:
-        result = result.strip() + "\n"
-
-    return result
-
-
 def get_deepl_usage(api_key: str) -> dict | None:  # noqa: C901
     """Gets usage info for a single DeepL API key (Free or Pro)."""
     if not deepl or not requests:
@@ -697,6 +588,10 @@ class TranslationManager:
         # These globals should be populated by an external mechanism before instantiation
         global DEEPL_KEYS, GOOGLE_PROJECT_ID_CONFIG, GOOGLE_CREDENTIALS_PATH, DEEPL_QUOTA_PER_KEY
         self.deepl_keys = [key for key in DEEPL_KEYS if key]  # Filter out empty keys
+        # Rows of the shared quota ledger (deepl_usage.key_identifier), by key index
+        self.deepl_key_ids = (
+            [key_identifier(key) for key in self.deepl_keys] if deepl_quota_ledger else []
+        )
         self.deepl_quota_per_key = DEEPL_QUOTA_PER_KEY if DEEPL_QUOTA_PER_KEY > 0 else 500000
         self.google_project_id_config = GOOGLE_PROJECT_ID_CONFIG
         self.google_credentials_path = GOOGLE_CREDENTIALS_PATH
@@ -716,6 +611,8 @@ class TranslationManager:
             int, dict[str, Any]
         ] = {}  # { key_index: {"count": int, "limit": int, "valid": bool} }
         self.google_used_session = 0  # Track chars translated by Google in this run
+        # Guards key switching and usage counters while batches are translated concurrently
+        self._deepl_state_lock = threading.RLock()
 
         if not self.deepl_keys:
             logger.warning(
@@ -816,7 +713,7 @@ class TranslationManager:
             self._reset_google_state()
 
         if self.deepl_keys:
-            self.update_deepl_usage_cache()  # Fetch initial usage
+            self.load_deepl_usage()  # Initial usage, from the shared ledger where possible
 
     def _reset_google_state(self) -> None:
         """Helper to reset Google-related instance variables."""
@@ -824,8 +721,60 @@ class TranslationManager:
         self.google_parent = None
         self.google_project_id_num = None
 
-    def update_deepl_usage_cache(self) -> None:
-        """Fetches and updates usage info for all configured, valid DeepL keys."""
+    def _quota_ledger(self, key_index: int) -> "tuple[DeepLQuotaLedger, str] | None":
+        """The shared quota ledger and the key's row in it, if the ledger is in use."""
+        if deepl_quota_ledger is None or not deepl_quota_ledger.enabled:
+            return None
+        if key_index >= len(self.deepl_key_ids):
+            return None
+        return deepl_quota_ledger, self.deepl_key_ids[key_index]
+
+    def _cache_quota_state(self, key_index: int, state: "QuotaState") -> None:
+        """Mirrors a ledger state (including other workers' reservations) into the cache."""
+        limit = state.character_limit
+        if self.deepl_quota_per_key > 0:
+            limit = min(limit, self.deepl_quota_per_key)
+        self.deepl_usage_cache[key_index] = {
+            "count": state.character_count + state.reserved_count,
+            "limit": max(0, limit),
+            "valid": state.valid,
+        }
+
+    def load_deepl_usage(self) -> None:
+        """
+        Fills the usage cache from the shared quota ledger with one query. Only keys
+        the ledger does not know yet are checked with the DeepL usage API; without
+        a usable ledger every key is.
+        """
+        if not self.deepl_keys:
+            return
+        states = (
+            deepl_quota_ledger.load(self.deepl_key_ids)
+            if deepl_quota_ledger is not None and self.deepl_key_ids
+            else None
+        )
+        if states is None:
+            self.update_deepl_usage_cache()
+            return
+
+        unknown = []
+        for index, identifier in enumerate(self.deepl_key_ids):
+            state = states.get(identifier)
+            if state is None:
+                unknown.append(index)
+            else:
+                self._cache_quota_state(index, state)
+        logger.info(
+            f"Loaded DeepL usage of {len(self.deepl_keys) - len(unknown)} key(s) from the quota ledger."
+        )
+        if unknown:
+            self.update_deepl_usage_cache(unknown)
+
+    def update_deepl_usage_cache(self, key_indices: list[int] | None = None) -> None:
+        """
+        Fetches and updates usage info for all configured (or the given) DeepL keys,
+        recording it in the shared quota ledger.
+        """
         if not self.deepl_keys:
             logger.debug("No DeepL keys to update usage cache for.")
             return
@@ -833,7 +782,10 @@ class TranslationManager:
         logger.info("Updating DeepL API key usage cache...")
         valid_count = 0
         invalid_count = 0
-        for index, key in enumerate(self.deepl_keys):
+        if key_indices is None:
+            key_indices = list(range(len(self.deepl_keys)))
+        for index in key_indices:
+            key = self.deepl_keys[index]
             key_suffix = key[-4:] if len(key) >= 4 else "***"
             usage_info = get_deepl_usage(key)
 
@@ -857,6 +809,9 @@ class TranslationManager:
                     "limit": effective_limit,
                     "valid": is_valid,
                 }
+                ledger = self._quota_ledger(index)
+                if ledger is not None:
+                    ledger[0].seed(ledger[1], count, api_limit, is_valid)
                 status = "VALID" if is_valid else "QUOTA EXCEEDED"
                 logger.info(
                     f"  [Key {index + 1} ..{key_suffix}]: Usage {count}/{effective_limit} chars. Status: {status}"
@@ -877,13 +832,16 @@ class TranslationManager:
             f"DeepL usage cache update complete. Usable keys: {valid_count}, Invalid/Quota Exceeded: {invalid_count}"
         )
 
-    def _get_current_deepl_key_info(self) -> tuple[int, str | None, int, bool]:
-        """Returns (key_index, key_str, available_chars, is_valid) for the current key."""
+    def _get_current_deepl_key_info(
+        self, key_index: int | None = None
+    ) -> tuple[int, str | None, int, bool]:
+        """Returns (key_index, key_str, available_chars, is_valid) for the current (or given) key."""
         num_keys = len(self.deepl_keys)
-        if num_keys == 0 or self.current_deepl_key_index >= num_keys:
-            return self.current_deepl_key_index, None, 0, False
+        if key_index is None:
+            key_index = self.current_deepl_key_index
+        if num_keys == 0 or key_index >= num_keys:
+            return key_index, None, 0, False
 
-        key_index = self.current_deepl_key_index
         key = self.deepl_keys[key_index]
         usage = self.deepl_usage_cache.get(key_index)
 
@@ -912,11 +870,21 @@ class TranslationManager:
 
         return key_index, key, available, is_valid
 
-    def _switch_deepl_key(self) -> bool:
+    def _switch_deepl_key(self, failed_index: int | None = None) -> bool:
         """
         Cycles to the next DeepL key that is valid and has quota > 0.
         Returns True if a usable key was found (could be the same one), False otherwise.
+
+        `failed_index` is the key the caller's request failed with. If a concurrent batch
+        already switched away from it, the current key is kept instead of skipping past it.
         """
+        with self._deepl_state_lock:
+            if failed_index is not None and self.current_deepl_key_index != failed_index:
+                if self._get_current_deepl_key_info()[3]:
+                    return True
+            return self._switch_deepl_key_locked()
+
+    def _switch_deepl_key_locked(self) -> bool:
         num_keys = len(self.deepl_keys)
         if num_keys == 0:
             logger.warning("Cannot switch DeepL key: no keys configured.")
@@ -971,6 +939,70 @@ class TranslationManager:
         # self.update_deepl_usage_cache()
         return False
 
+    def _reserve_deepl_chars(self, key_index: int, chars: int) -> bool:
+        """
+        Adds `chars` to the cached usage of a key if it has that much quota left,
+        then reserves them in the shared quota ledger so other workers see them.
+        A negative value releases an earlier reservation and always succeeds.
+        """
+        with self._deepl_state_lock:
+            usage = self.deepl_usage_cache.get(key_index)
+            if usage is None:
+                return chars <= 0
+            if chars > 0 and (
+                not usage.get("valid", False) or usage.get("limit", 0) - usage["count"] < chars
+            ):
+                return False
+            usage["count"] = max(0, usage["count"] + chars)
+
+        ledger = self._quota_ledger(key_index)
+        if ledger is None or chars == 0:
+            return True
+        if chars < 0:
+            ledger[0].release(ledger[1], -chars)
+            return True
+
+        granted, state = ledger[0].reserve(ledger[1], chars)
+        with self._deepl_state_lock:
+            if not granted:
+                self.deepl_usage_cache[key_index]["count"] = max(
+                    0, self.deepl_usage_cache[key_index]["count"] - chars
+                )
+            # Other workers' usage since the last look becomes visible here
+            if state is not None:
+                self._cache_quota_state(key_index, state)
+        if not granted:
+            available = state.available if state is not None else 0
+            logger.info(
+                f"DeepL Key {key_index + 1}: shared quota ledger refused {chars} chars (~{available} left)."
+            )
+        return granted
+
+    def _commit_deepl_chars(self, key_index: int, chars: int) -> None:
+        """Records a reservation as billed in the shared quota ledger."""
+        ledger = self._quota_ledger(key_index)
+        if ledger is not None:
+            ledger[0].commit(ledger[1], chars, chars)
+
+    def _mark_deepl_key_exhausted(self, key_index: int, reserved_chars: int) -> None:
+        """DeepL reported the key out of quota: full usage, locally and in the ledger."""
+        with self._deepl_state_lock:
+            if key_index in self.deepl_usage_cache:
+                limit = self.deepl_usage_cache[key_index].get("limit", 0)
+                self.deepl_usage_cache[key_index]["count"] = limit  # Assume full usage
+                self.deepl_usage_cache[key_index]["valid"] = False
+        ledger = self._quota_ledger(key_index)
+        if ledger is not None:
+            ledger[0].mark_exhausted(ledger[1], reserved_chars)
+
+    def _mark_deepl_key_invalid(self, key_index: int) -> None:
+        with self._deepl_state_lock:
+            if key_index in self.deepl_usage_cache:
+                self.deepl_usage_cache[key_index]["valid"] = False
+        ledger = self._quota_ledger(key_index)
+        if ledger is not None:
+            ledger[0].mark_invalid(ledger[1])
+
     def _translate_deepl_chunk(  # noqa: C901
         self, text: str, target_language: str, source_language: str | None = None
     ) -> tuple[str, int]:
@@ -1002,7 +1034,7 @@ class TranslationManager:
                 f"DeepL Key {key_index + 1} (..{key_suffix}) has no available quota ({available})."
             )
             raise deepl.QuotaExceededException("Pre-flight check: No available quota.")
-        if chars_to_bill > available:
+        if not self._reserve_deepl_chars(key_index, chars_to_bill):
             logger.warning(
                 f"Estimated billing {chars_to_bill} exceeds available quota {available} for key {key_index + 1} (..{key_suffix})."
             )
@@ -1048,12 +1080,12 @@ class TranslationManager:
             else:
                 translated_text = result.text
 
-            # Update usage cache immediately after successful call
-            if key_index in self.deepl_usage_cache:
-                self.deepl_usage_cache[key_index]["count"] += chars_to_bill
-                new_count = self.deepl_usage_cache[key_index]["count"]
-                limit = self.deepl_usage_cache[key_index].get("limit", 0)
-                logger.debug(f"Updated DeepL Key {key_index + 1} usage cache: {new_count}/{limit}")
+            # Usage cache was already updated by the reservation
+            self._commit_deepl_chars(key_index, chars_to_bill)
+            usage = self.deepl_usage_cache.get(key_index, {})
+            logger.debug(
+                f"DeepL Key {key_index + 1} usage cache: {usage.get('count')}/{usage.get('limit')}"
+            )
 
             if truncated:
                 translated_text += " [[TRUNCATED]]"
@@ -1065,21 +1097,20 @@ class TranslationManager:
             logger.error(
                 f"DeepL API error on chunk with key {key_index + 1} (..{key_suffix}): {type(e).__name__} - {e}"
             )
-            if isinstance(e, deepl.AuthorizationException):
-                if key_index in self.deepl_usage_cache:
-                    self.deepl_usage_cache[key_index]["valid"] = False
-                logger.error(
-                    f"Marked DeepL Key {key_index + 1} as INVALID due to Authorization error."
-                )
-            elif isinstance(e, deepl.QuotaExceededException):
-                if key_index in self.deepl_usage_cache:
-                    limit = self.deepl_usage_cache[key_index].get("limit", 0)
-                    self.deepl_usage_cache[key_index]["count"] = limit  # Assume full usage
-                    self.deepl_usage_cache[key_index]["valid"] = False  # Mark invalid
+            if isinstance(e, deepl.QuotaExceededException):
+                self._mark_deepl_key_exhausted(key_index, chars_to_bill)
                 logger.warning(f"DeepL Key {key_index + 1} hit quota limit. Marked invalid.")
+            else:
+                self._reserve_deepl_chars(key_index, -chars_to_bill)  # Not billed
+                if isinstance(e, deepl.AuthorizationException):
+                    self._mark_deepl_key_invalid(key_index)
+                    logger.error(
+                        f"Marked DeepL Key {key_index + 1} as INVALID due to Authorization error."
+                    )
             # Re-raise the specific DeepL error for caller
             raise e
         except Exception as e:
+            self._reserve_deepl_chars(key_index, -chars_to_bill)  # Not billed
             # Catch unexpected errors during the process
             logger.error(
                 f"Unexpected error during DeepL chunk translation with key {key_index + 1} (..{key_suffix}): {e}",
@@ -1096,16 +1127,17 @@ class TranslationManager:
         target_language: str,
         source_language: str | None = None,
         _use_bytes: bool = False,
+        key_index: int | None = None,
     ) -> tuple[list[str], int]:
         """
-        Translates a list of strings using the current DeepL key. Internal use.
+        Translates a list of strings using the current (or given) DeepL key. Internal use.
         Returns (list_of_translated_texts, total_characters_billed).
         Raises DeepLException or subclasses if API call fails.
         """
         if not deepl:
             raise RuntimeError("DeepL library not available.")
 
-        key_index, key, available, is_valid = self._get_current_deepl_key_info()
+        key_index, key, available, is_valid = self._get_current_deepl_key_info(key_index)
         key_suffix = key[-4:] if key and len(key) >= 4 else "N/A"
 
         if not is_valid or not key:
@@ -1142,7 +1174,8 @@ class TranslationManager:
                 f"DeepL Key {key_index + 1} (..{key_suffix}) has no available quota ({available}) for list."
             )
             raise deepl.QuotaExceededException("Pre-flight check: No available quota for list.")
-        if chars_to_bill > available:
+        # Reserve the characters up front so concurrent batches cannot overdraw the key
+        if not self._reserve_deepl_chars(key_index, chars_to_bill):
             logger.warning(
                 f"List billing {chars_to_bill} exceeds available quota {available} for key {key_index + 1} (..{key_suffix})."
             )
@@ -1192,12 +1225,12 @@ class TranslationManager:
                         i
                     ]  # Fallback to original text for that segment
 
-            # Update usage cache
-            if key_index in self.deepl_usage_cache:
-                self.deepl_usage_cache[key_index]["count"] += chars_to_bill
-                new_count = self.deepl_usage_cache[key_index]["count"]
-                limit = self.deepl_usage_cache[key_index].get("limit", 0)
-                logger.debug(f"Updated DeepL Key {key_index + 1} usage cache: {new_count}/{limit}")
+            # Usage cache was already updated by the reservation
+            self._commit_deepl_chars(key_index, chars_to_bill)
+            usage = self.deepl_usage_cache.get(key_index, {})
+            logger.debug(
+                f"DeepL Key {key_index + 1} usage cache: {usage.get('count')}/{usage.get('limit')}"
+            )
 
             return final_translations, chars_to_bill
 
@@ -1206,20 +1239,19 @@ class TranslationManager:
             logger.error(
                 f"DeepL API error on list with key {key_index + 1} (..{key_suffix}): {type(e).__name__} - {e}"
             )
-            if isinstance(e, deepl.AuthorizationException):
-                if key_index in self.deepl_usage_cache:
-                    self.deepl_usage_cache[key_index]["valid"] = False
-                logger.error(f"Marked DeepL Key {key_index + 1} as INVALID.")
-            elif isinstance(e, deepl.QuotaExceededException):
-                if key_index in self.deepl_usage_cache:
-                    limit = self.deepl_usage_cache[key_index].get("limit", 0)
-                    self.deepl_usage_cache[key_index]["count"] = limit
-                    self.deepl_usage_cache[key_index]["valid"] = False
+            if isinstance(e, deepl.QuotaExceededException):
+                self._mark_deepl_key_exhausted(key_index, chars_to_bill)
                 logger.warning(
                     f"DeepL Key {key_index + 1} hit quota limit during list. Marked invalid."
                 )
+            else:
+                self._reserve_deepl_chars(key_index, -chars_to_bill)  # Not billed
+                if isinstance(e, deepl.AuthorizationException):
+                    self._mark_deepl_key_invalid(key_index)
+                    logger.error(f"Marked DeepL Key {key_index + 1} as INVALID.")
             raise e  # Re-raise for caller
         except Exception as e:
+            self._reserve_deepl_chars(key_index, -chars_to_bill)  # Not billed
             logger.error(
                 f"Unexpected error during DeepL list translation with key {key_index + 1} (..{key_suffix}): {e}",
                 exc_info=True,
@@ -1376,7 +1408,8 @@ class TranslationManager:
                 return None, 0
 
             translated_list = [t.translated_text for t in response.translations]
-            self.google_used_session += total_chars_to_bill
+            with self._deepl_state_lock:
+                self.google_used_session += total_chars_to_bill
             logger.debug(
                 f"Google list translated. Session usage: {self.google_used_session} chars."
             )
@@ -1406,14 +1439,36 @@ class TranslationManager:
         start_time = time.monotonic()
         logger.info(f"Starting batched SRT translation for: {Path(input_file).name}")
 
-        original_segments = parse_srt_into_segments(srt_content)
-        if not original_segments:
+        original_cues = srt_codec.parse_srt(srt_content)
+        if not original_cues:
             logger.warning(
                 f"No valid segments parsed from {input_file}. Returning original content."
             )
             return TranslationResult(input_file, srt_content, 0, "failed_parsing")
 
-        texts_to_translate = [seg[2] for seg in original_segments]  # List of text blocks
+        segment_texts = [cue.text for cue in original_cues]  # List of text blocks
+
+        # Only segments that are neither in the translation memory nor repeats of an
+        # earlier segment in this file are sent to DeepL/Google.
+        memory = _get_translation_memory()
+        normalized_texts = [normalize_segment(text) for text in segment_texts]
+        remembered = memory.lookup(source_lang, target_lang, normalized_texts) if memory else {}
+        texts_to_translate: list[str] = []
+        pending_index: dict[str, int] = {}  # normalized text -> index in texts_to_translate
+        for text, normalized in zip(segment_texts, normalized_texts, strict=True):
+            if normalized in remembered or normalized in pending_index:
+                continue
+            pending_index[normalized] = len(texts_to_translate)
+            texts_to_translate.append(text)
+        memory_hits = len(segment_texts) - len(texts_to_translate)
+        memory_chars_saved = sum(len(t) for t in segment_texts) - sum(
+            len(t) for t in texts_to_translate
+        )
+        if memory_hits:
+            logger.info(
+                f"Translation memory: {memory_hits}/{len(segment_texts)} segments reused "
+                f"({len(remembered)} remembered texts), {memory_chars_saved} chars not sent."
+            )
 
         # Use DeepL limits first as it's preferred.
         deepl_batches = chunk_text_list_for_translation(
@@ -1433,8 +1488,10 @@ class TranslationManager:
 
         original_text_index = 0  # Track progress through texts_to_translate
 
+        # Batches are translated concurrently; outcomes are reassembled in batch order below.
+        batch_outcomes = self._dispatch_srt_batches(deepl_batches, target_lang, source_lang)
+
         for i, deepl_batch in enumerate(deepl_batches):
-            batch_start_time = time.monotonic()
             batch_idx = i + 1
             if not deepl_batch:
                 logger.warning(f"Skipping empty batch #{batch_idx}")
@@ -1459,171 +1516,9 @@ class TranslationManager:
                 original_text_index += len(current_batch_texts_original)  # Try to recover index
                 continue
 
-            translated_batch_texts = None
-            billed_chars_batch = 0
-            service_used_for_batch = "failed"
-            last_exception_batch: Exception | None = None
-
-            if self.deepl_keys:  # Only attempt if DeepL keys are configured
-                should_retry_deepl = True
-                while should_retry_deepl:
-                    should_retry_deepl = False  # Assume no retry unless key switches
-                    current_key_idx_batch = self.current_deepl_key_index
-                    try:
-                        translated_batch_texts, billed_chars_batch = self._translate_deepl_list(
-                            deepl_batch, target_lang, source_lang
-                        )
-                        # _translate_deepl_list returns None on certain errors, but raises on API/Quota/Auth errors
-                        if translated_batch_texts is not None:
-                            service_used_for_batch = f"deepl_key_{current_key_idx_batch + 1}"
-                            logger.info(
-                                f"Batch {batch_idx}/{len(deepl_batches)} (Size: {batch_size}): Translated via {service_used_for_batch}."
-                            )
-                            break  # Success, exit DeepL attempts for this batch
-                        else:
-                            # This case should be rare if exceptions are raised correctly
-                            logger.error(
-                                f"Batch {batch_idx}: _translate_deepl_list returned None unexpectedly. Treating as failure."
-                            )
-                            last_exception_batch = RuntimeError(
-                                "_translate_deepl_list returned None"
-                            )
-                            break  # Exit DeepL attempts
-
-                    except (
-                        deepl.QuotaExceededException,
-                        deepl.AuthorizationException,
-                        ValueError,
-                        deepl.DeepLException,
-                    ) as e:
-                        last_exception_batch = e
-                        logger.warning(
-                            f"Batch {batch_idx}: DeepL Key {current_key_idx_batch + 1} failed: {type(e).__name__}. Attempting key switch or fallback."
-                        )
-                        # Try switching key. If successful and key *changed*, retry.
-                        if (
-                            self._switch_deepl_key()
-                            and self.current_deepl_key_index != current_key_idx_batch
-                        ):
-                            logger.info(f"Batch {batch_idx}: Switched key. Retrying DeepL.")
-                            should_retry_deepl = True  # Loop again with the new key
-                        else:
-                            # Switch failed, or no *new* usable key found, or non-recoverable error
-                            logger.warning(
-                                f"Batch {batch_idx}: DeepL key switch failed or no new key available. Falling back to Google Translate API."
-                            )
-                            translated_batch_texts = None  # Ensure fallback is triggered
-                            break  # Exit DeepL attempts
-
-                    except Exception as e:  # Catch other unexpected errors
-                        last_exception_batch = e
-                        logger.error(
-                            f"Batch {batch_idx}: Unexpected DeepL error on Key {current_key_idx_batch + 1}: {e}. Falling back.",
-                            exc_info=True,
-                        )
-                        translated_batch_texts = None
-                        break  # Exit DeepL attempts
-            else:
-                logger.info(f"Batch {batch_idx}: DeepL not configured. Skipping DeepL attempt.")
-                translated_batch_texts = None  # Proceed directly to Google fallback
-
-            if translated_batch_texts is None:
-                if self.google_client:  # Check if Google is available
-                    # Build a user-friendly reason for the fallback
-                    fallback_reason = "DeepL unavailable"
-                    if last_exception_batch:
-                        if isinstance(last_exception_batch, ValueError):
-                            fallback_reason = "No valid DeepL keys available"
-                        else:
-                            fallback_reason = f"DeepL error: {type(last_exception_batch).__name__}"
-                    logger.info(
-                        f"Batch {batch_idx}: Falling back to Google Translate. Reason: {fallback_reason}"
-                    )
-
-                    # Re-chunk the *current DeepL batch* for Google's limits
-                    google_sub_batches = chunk_text_list_for_translation(
-                        texts=deepl_batch,  # Chunk the texts from the current DeepL batch
-                        max_length=GOOGLE_MAX_CHUNK_SIZE_BYTES,  # Google uses bytes
-                        max_strings=GOOGLE_MAX_STRINGS_PER_REQUEST,
-                        use_bytes=True,
-                    )
-                    if len(google_sub_batches) > 1:
-                        logger.debug(
-                            f"Batch {batch_idx}: Sub-batching for Google resulted in {len(google_sub_batches)} chunks."
-                        )
-
-                    temp_google_translations = []
-                    google_billed_total = 0
-                    google_batch_success = True
-
-                    for sub_batch_idx, google_chunk in enumerate(google_sub_batches):
-                        if not google_chunk:
-                            continue
-                        try:
-                            chunk_translation, chunk_billed = self._translate_google_list(
-                                google_chunk, target_lang, source_lang
-                            )
-                            if chunk_translation is not None:  # Check if sub-chunk succeeded
-                                temp_google_translations.extend(chunk_translation)
-                                google_billed_total += chunk_billed
-                            else:
-                                logger.error(
-                                    f"Google fallback failed for sub-chunk {sub_batch_idx + 1}/{len(google_sub_batches)} within Batch {batch_idx}. Marking batch as partially failed."
-                                )
-                                google_batch_success = False
-                                # Append original texts for the failed sub-chunk with markers
-                                failed_sub_chunk_originals = list(
-                                    google_chunk
-                                )  # Get originals corresponding to this sub-batch
-                                temp_google_translations.extend(
-                                    [
-                                        f"[[FAIL-G:SUB_BATCH]] {txt}"
-                                        for txt in failed_sub_chunk_originals
-                                    ]
-                                )
-                                # Continue processing other sub-chunks unless we want to fail the whole batch on first error
-
-                        except Exception as e:
-                            logger.error(
-                                f"Unexpected error during Google fallback sub-chunk {sub_batch_idx + 1} of Batch {batch_idx}: {e}",
-                                exc_info=True,
-                            )
-                            google_batch_success = False
-                            failed_sub_chunk_originals = list(google_chunk)
-                            temp_google_translations.extend(
-                                [
-                                    f"[[FAIL-G:SUB_BATCH_EXC]] {txt}"
-                                    for txt in failed_sub_chunk_originals
-                                ]
-                            )
-
-                    # Assess outcome of Google fallback attempt for the whole original batch
-                    if google_batch_success:
-                        translated_batch_texts = temp_google_translations
-                        billed_chars_batch = google_billed_total
-                        service_used_for_batch = "google_api"
-                        logger.info(
-                            f"Batch {batch_idx}: Translated via Google fallback (potentially {len(google_sub_batches)} sub-batches)."
-                        )
-                    else:
-                        # Use the partially failed list from Google attempt
-                        translated_batch_texts = (
-                            temp_google_translations  # Contains markers for failed parts
-                        )
-                        billed_chars_batch = google_billed_total  # Log partial billing
-                        service_used_for_batch = (
-                            "failed_google_fallback"  # Indicate partial/full failure
-                        )
-                        logger.error(
-                            f"Batch {batch_idx}: Google fallback translation failed or partially failed."
-                        )
-
-                else:  # Google client not available
-                    logger.error(
-                        f"Batch {batch_idx}: DeepL failed and Google Translate is not configured/available. Translation failed for this batch."
-                    )
-                    service_used_for_batch = "failed_no_fallback"
-                    translated_batch_texts = None  # Ensure failure state persists
+            outcome = batch_outcomes[i]
+            assert outcome is not None  # Only empty batches have no outcome
+            translated_batch_texts, billed_chars_batch, service_used_for_batch = outcome
 
             if translated_batch_texts is not None and len(translated_batch_texts) == batch_size:
                 # Success (either DeepL or full Google fallback)
@@ -1662,38 +1557,49 @@ class TranslationManager:
                 )
 
             original_text_index += batch_size  # Move index forward by processed batch size
-            batch_duration = time.monotonic() - batch_start_time
-            logger.debug(f"Batch {batch_idx} processing took {batch_duration:.2f} seconds.")
 
-        if len(all_translated_texts) != len(original_segments):
+        if len(all_translated_texts) != len(texts_to_translate):
             logger.critical(
                 f"CRITICAL MISMATCH after processing all batches: "
-                f"Expected {len(original_segments)} translated segments, but collected {len(all_translated_texts)}. "
+                f"Expected {len(texts_to_translate)} translated segments, but collected {len(all_translated_texts)}. "
                 f"This indicates a flaw in batch processing logic. Returning original content."
             )
             # Log details for debugging
-            logger.debug(f"Original segment count: {len(original_segments)}")
+            logger.debug(f"Original segment count: {len(original_cues)}")
+            logger.debug(f"Segments sent for translation: {len(texts_to_translate)}")
             logger.debug(f"Collected translated text count: {len(all_translated_texts)}")
             logger.debug(f"Service summary parts: {service_summary_parts}")
             return TranslationResult(input_file, srt_content, total_billed_chars, "failed_mismatch")
 
-        # Rebuild SRT with translated text
-        new_segments = []
-        for i, (idx_line, ts_line, _) in enumerate(original_segments):
-            # Safety check for index out of bounds (should be caught by mismatch check above)
-            if i < len(all_translated_texts):
-                # Apply general text corrections (like unescaping) to the translated text *before* rebuilding
-                corrected_text = correct_text_after_translation(all_translated_texts[i])
-                new_segments.append((idx_line, ts_line, corrected_text))
-            else:
-                # This case should ideally not be reached due to the mismatch check
-                logger.error(
-                    f"Index {i} out of bounds for translated texts during SRT rebuild. Skipping segment."
-                )
+        if memory:
+            # Failed batches keep their [[FAIL...]] marker and are never remembered
+            memory.store(
+                source_lang,
+                target_lang,
+                (
+                    (normalized, translated)
+                    for normalized, translated in zip(
+                        pending_index, all_translated_texts, strict=True
+                    )
+                    if not translated.startswith("[[FAIL")
+                ),
+            )
+        segment_translations = [
+            remembered[normalized]
+            if normalized in remembered
+            else all_translated_texts[pending_index[normalized]]
+            for normalized in normalized_texts
+        ]
+        if not service_summary_parts and memory_hits:
+            service_summary_parts.append("memory")  # Nothing had to be sent to a provider
 
-        final_srt = rebuild_srt_from_segments(new_segments)
-        # Apply SRT-specific corrections (timestamp format) after rebuilding
-        final_srt = ensure_correct_timestamp_format(final_srt)  # Ensure timestamps one last time
+        # Rebuild SRT with translated text
+        # Apply general text corrections (like unescaping) to the translated text before
+        # rebuilding; timing lines are written in the standard format by the codec
+        final_srt = srt_codec.compose_srt(
+            cue.with_text(correct_text_after_translation(translation))
+            for cue, translation in zip(original_cues, segment_translations, strict=True)
+        )
 
         # Summarize overall service usage
         final_service_status = self._summarize_service_status(service_summary_parts)
@@ -1717,6 +1623,9 @@ class TranslationManager:
             billing_details=batch_billing_details,  # NEW: Pass detailed billing
             target_lang=target_lang,
             source_lang=source_lang,
+            segments_total=len(segment_texts),
+            memory_hits=memory_hits,
+            memory_chars_saved=memory_chars_saved,
         )
 
         total_duration = time.monotonic() - start_time
@@ -1726,6 +1635,229 @@ class TranslationManager:
 
         return TranslationResult(input_file, final_srt, total_billed_chars, final_service_status)
 
+    def _dispatch_srt_batches(
+        self, batches: list[list[str]], target_lang: str, source_lang: str | None
+    ) -> list[tuple[list[str] | None, int, str] | None]:
+        """
+        Runs `_translate_srt_batch` for every batch with at most TRANSLATION_BATCH_CONCURRENCY
+        requests in flight. Outcomes are returned in batch order (None for empty batches).
+        """
+        window = max(1, settings.TRANSLATION_BATCH_CONCURRENCY) if settings else 1
+        jobs = [(index, batch) for index, batch in enumerate(batches) if batch]
+        outcomes: list[tuple[list[str] | None, int, str] | None] = [None] * len(batches)
+
+        if window == 1 or len(jobs) <= 1:
+            for index, batch in jobs:
+                outcomes[index] = self._translate_srt_batch(
+                    batch, index + 1, len(batches), target_lang, source_lang
+                )
+            return outcomes
+
+        from app.modules.subtitle.core.concurrency import submit_with_context
+
+        logger.info(f"Translating {len(jobs)} batches with up to {window} requests in flight.")
+        with ThreadPoolExecutor(
+            max_workers=min(window, len(jobs)), thread_name_prefix="translate"
+        ) as executor:
+            futures = {
+                index: submit_with_context(
+                    executor,
+                    self._translate_srt_batch,
+                    batch,
+                    index + 1,
+                    len(batches),
+                    target_lang,
+                    source_lang,
+                )
+                for index, batch in jobs
+            }
+            for index, future in futures.items():
+                outcomes[index] = future.result()
+        return outcomes
+
+    def _translate_srt_batch(  # noqa: C901
+        self,
+        deepl_batch: list[str],
+        batch_idx: int,
+        batch_count: int,
+        target_lang: str,
+        source_lang: str | None,
+    ) -> tuple[list[str] | None, int, str]:
+        """
+        Translates one DeepL-sized batch: DeepL with key switching first, then Google
+        (re-chunked to its limits) as fallback. Safe to run for several batches at once.
+        Returns (translated_texts or None, billed_chars, service_used).
+        """
+        batch_start_time = time.monotonic()
+        batch_size = len(deepl_batch)
+        translated_batch_texts = None
+        billed_chars_batch = 0
+        service_used_for_batch = "failed"
+        last_exception_batch: Exception | None = None
+
+        if self.deepl_keys:  # Only attempt if DeepL keys are configured
+            should_retry_deepl = True
+            while should_retry_deepl:
+                should_retry_deepl = False  # Assume no retry unless key switches
+                current_key_idx_batch = self.current_deepl_key_index
+                try:
+                    translated_batch_texts, billed_chars_batch = self._translate_deepl_list(
+                        deepl_batch, target_lang, source_lang, key_index=current_key_idx_batch
+                    )
+                    # _translate_deepl_list returns None on certain errors, but raises on API/Quota/Auth errors
+                    if translated_batch_texts is not None:
+                        service_used_for_batch = f"deepl_key_{current_key_idx_batch + 1}"
+                        logger.info(
+                            f"Batch {batch_idx}/{batch_count} (Size: {batch_size}): Translated via {service_used_for_batch}."
+                        )
+                        break  # Success, exit DeepL attempts for this batch
+                    else:
+                        # This case should be rare if exceptions are raised correctly
+                        logger.error(
+                            f"Batch {batch_idx}: _translate_deepl_list returned None unexpectedly. Treating as failure."
+                        )
+                        last_exception_batch = RuntimeError("_translate_deepl_list returned None")
+                        break  # Exit DeepL attempts
+
+                except (
+                    deepl.QuotaExceededException,
+                    deepl.AuthorizationException,
+                    ValueError,
+                    deepl.DeepLException,
+                ) as e:
+                    last_exception_batch = e
+                    logger.warning(
+                        f"Batch {batch_idx}: DeepL Key {current_key_idx_batch + 1} failed: {type(e).__name__}. Attempting key switch or fallback."
+                    )
+                    # Try switching key. If successful and key *changed*, retry.
+                    if (
+                        self._switch_deepl_key(failed_index=current_key_idx_batch)
+                        and self.current_deepl_key_index != current_key_idx_batch
+                    ):
+                        logger.info(f"Batch {batch_idx}: Switched key. Retrying DeepL.")
+                        should_retry_deepl = True  # Loop again with the new key
+                    else:
+                        # Switch failed, or no *new* usable key found, or non-recoverable error
+                        logger.warning(
+                            f"Batch {batch_idx}: DeepL key switch failed or no new key available. Falling back to Google Translate API."
+                        )
+                        translated_batch_texts = None  # Ensure fallback is triggered
+                        break  # Exit DeepL attempts
+
+                except Exception as e:  # Catch other unexpected errors
+                    last_exception_batch = e
+                    logger.error(
+                        f"Batch {batch_idx}: Unexpected DeepL error on Key {current_key_idx_batch + 1}: {e}. Falling back.",
+                        exc_info=True,
+                    )
+                    translated_batch_texts = None
+                    break  # Exit DeepL attempts
+        else:
+            logger.info(f"Batch {batch_idx}: DeepL not configured. Skipping DeepL attempt.")
+            translated_batch_texts = None  # Proceed directly to Google fallback
+
+        if translated_batch_texts is None:
+            if self.google_client:  # Check if Google is available
+                # Build a user-friendly reason for the fallback
+                fallback_reason = "DeepL unavailable"
+                if last_exception_batch:
+                    if isinstance(last_exception_batch, ValueError):
+                        fallback_reason = "No valid DeepL keys available"
+                    else:
+                        fallback_reason = f"DeepL error: {type(last_exception_batch).__name__}"
+                logger.info(
+                    f"Batch {batch_idx}: Falling back to Google Translate. Reason: {fallback_reason}"
+                )
+
+                # Re-chunk the *current DeepL batch* for Google's limits
+                google_sub_batches = chunk_text_list_for_translation(
+                    texts=deepl_batch,  # Chunk the texts from the current DeepL batch
+                    max_length=GOOGLE_MAX_CHUNK_SIZE_BYTES,  # Google uses bytes
+                    max_strings=GOOGLE_MAX_STRINGS_PER_REQUEST,
+                    use_bytes=True,
+                )
+                if len(google_sub_batches) > 1:
+                    logger.debug(
+                        f"Batch {batch_idx}: Sub-batching for Google resulted in {len(google_sub_batches)} chunks."
+                    )
+
+                temp_google_translations = []
+                google_billed_total = 0
+                google_batch_success = True
+
+                for sub_batch_idx, google_chunk in enumerate(google_sub_batches):
+                    if not google_chunk:
+                        continue
+                    try:
+                        chunk_translation, chunk_billed = self._translate_google_list(
+                            google_chunk, target_lang, source_lang
+                        )
+                        if chunk_translation is not None:  # Check if sub-chunk succeeded
+                            temp_google_translations.extend(chunk_translation)
+                            google_billed_total += chunk_billed
+                        else:
+                            logger.error(
+                                f"Google fallback failed for sub-chunk {sub_batch_idx + 1}/{len(google_sub_batches)} within Batch {batch_idx}. Marking batch as partially failed."
+                            )
+                            google_batch_success = False
+                            # Append original texts for the failed sub-chunk with markers
+                            failed_sub_chunk_originals = list(
+                                google_chunk
+                            )  # Get originals corresponding to this sub-batch
+                            temp_google_translations.extend(
+                                [
+                                    f"[[FAIL-G:SUB_BATCH]] {txt}"
+                                    for txt in failed_sub_chunk_originals
+                                ]
+                            )
+                            # Continue processing other sub-chunks unless we want to fail the whole batch on first error
+
+                    except Exception as e:
+                        logger.error(
+                            f"Unexpected error during Google fallback sub-chunk {sub_batch_idx + 1} of Batch {batch_idx}: {e}",
+                            exc_info=True,
+                        )
+                        google_batch_success = False
+                        failed_sub_chunk_originals = list(google_chunk)
+                        temp_google_translations.extend(
+                            [
+                                f"[[FAIL-G:SUB_BATCH_EXC]] {txt}"
+                                for txt in failed_sub_chunk_originals
+                            ]
+                        )
+
+                # Assess outcome of Google fallback attempt for the whole original batch
+                if google_batch_success:
+                    translated_batch_texts = temp_google_translations
+                    billed_chars_batch = google_billed_total
+                    service_used_for_batch = "google_api"
+                    logger.info(
+                        f"Batch {batch_idx}: Translated via Google fallback (potentially {len(google_sub_batches)} sub-batches)."
+                    )
+                else:
+                    # Use the partially failed list from Google attempt
+                    translated_batch_texts = (
+                        temp_google_translations  # Contains markers for failed parts
+                    )
+                    billed_chars_batch = google_billed_total  # Log partial billing
+                    service_used_for_batch = (
+                        "failed_google_fallback"  # Indicate partial/full failure
+                    )
+                    logger.error(
+                        f"Batch {batch_idx}: Google fallback translation failed or partially failed."
+                    )
+
+            else:  # Google client not available
+                logger.error(
+                    f"Batch {batch_idx}: DeepL failed and Google Translate is not configured/available. Translation failed for this batch."
+                )
+                service_used_for_batch = "failed_no_fallback"
+                translated_batch_texts = None  # Ensure failure state persists
+
+        batch_duration = time.monotonic() - batch_start_time
+        logger.debug(f"Batch {batch_idx} processing took {batch_duration:.2f} seconds.")
+        return translated_batch_texts, billed_chars_batch, service_used_for_batch
+
     def translate_generic_text(self, job: TranslationJob) -> TranslationResult:  # noqa: C901
         """
         Translates generic text content (non-SRT).
@@ -1960,7 +2092,7 @@ class TranslationManager:
         else:  # Only "no_action" or empty details?
             return "no_action"
 
-    def _log_usage(  # noqa: C901
+    def _log_usage(
         self,
         deepl_chars: int,
         google_chars: int,
@@ -1970,338 +2102,194 @@ class TranslationManager:
         output_file_path: str | None = None,
         target_lang: str | None = None,
         source_lang: str | None = None,
+        segments_total: int = 0,
+        memory_hits: int = 0,
+        memory_chars_saved: int = 0,
     ) -> None:
-        """Logs translation usage details to the JSON log file and Database."""
-        global TRANSLATION_LOG_FILE, DATABASE_AVAILABLE, SyncSessionLocal, DeepLUsage
+        """
+        Queues translation usage for the database and the JSON log file. The writes
+        happen in the background (see usage_accounting), off the translation path.
+        """
+        global TRANSLATION_LOG_FILE, DATABASE_AVAILABLE
         if not TRANSLATION_LOG_FILE:
             logger.error("Translation log file path not set. Skipping usage logging.")
             return
 
-        # 1. Update Database (New)
-        if DATABASE_AVAILABLE and SyncSessionLocal is not None and DeepLUsage is not None:
-            try:
-                with SyncSessionLocal() as db:
-                    # Update counts for each key used
-                    if billing_details:
-                        # Aggregate by service
-                        deepl_usage_updates: dict[
-                            str, dict[str, Any]
-                        ] = {}  # {key_hash: {"count_incr": int, "limit": int, "valid": bool}}
-
-                        import hashlib
-
-                        for detail in billing_details:
-                            service = str(detail.get("service", ""))
-                            if service.startswith("deepl_key_"):
-                                try:
-                                    idx = int(service.replace("deepl_key_", "")) - 1
-                                    if 0 <= idx < len(self.deepl_keys):
-                                        key_str = self.deepl_keys[idx]
-                                        # Use standard SHA256 hash for identifier
-                                        key_hash = hashlib.sha256(
-                                            key_str.strip().encode()
-                                        ).hexdigest()
-
-                                        # Get latest info from cache or just use billed chars
-                                        info = self.deepl_usage_cache.get(idx, {})
-                                        count_incr = int(detail.get("chars", 0))
-
-                                        if key_hash not in deepl_usage_updates:
-                                            deepl_usage_updates[key_hash] = {
-                                                "count_incr": 0,
-                                                "limit": info.get("limit", 500000),
-                                                "valid": info.get("valid", True),
-                                            }
-                                        deepl_usage_updates[key_hash]["count_incr"] += count_incr
-                                        # Update limit/validity if we have more recent info in cache
-                                        if info.get("limit"):
-                                            deepl_usage_updates[key_hash]["limit"] = info["limit"]
-                                        if "valid" in info:
-                                            deepl_usage_updates[key_hash]["valid"] = info["valid"]
-                                except (ValueError, IndexError):
-                                    continue
-
-                        for key_hash, data in deepl_usage_updates.items():
-                            usage_record = (
-                                db.query(DeepLUsage)
-                                .filter(DeepLUsage.key_identifier == key_hash)
-                                .first()
-                            )
-                            if not usage_record:
-                                usage_record = DeepLUsage(
-                                    key_identifier=key_hash,
-                                    character_count=data["count_incr"],
-                                    character_limit=data["limit"],
-                                    valid=data["valid"],
-                                )
-                                db.add(usage_record)
-                                logger.debug(
-                                    f"Created new DeepL usage record for key: {key_hash[:16]}..."
-                                )
-                            else:
-                                usage_record.character_count += data["count_incr"]
-                                # Only update limit if it changed and we have a valid value
-                                if data["limit"] and data["limit"] != 500000:
-                                    usage_record.character_limit = data["limit"]
-                                usage_record.valid = data["valid"]
-                                logger.debug(
-                                    f"Updated DeepL usage for key {key_hash[:16]}...: +{data['count_incr']} chars"
-                                )
-
-                        db.commit()
-
-                    if TranslationLog is not None:
-                        # Determine overall status
-                        overall_status = self._summarize_service_status(service_details)
-
-                        log_entry = TranslationLog(
-                            file_name=file_name,
-                            source_language=source_lang,
-                            target_language=target_lang or "unknown",
-                            service_used=overall_status,
-                            characters_billed=deepl_chars + google_chars,
-                            deepl_characters=deepl_chars,
-                            google_characters=google_chars,
-                            status="success"
-                            if overall_status not in ("failed", "partial_failure")
-                            else overall_status,
-                            output_file_path=output_file_path,
-                        )
-                        db.add(log_entry)
-                        db.commit()
-                        logger.debug(f"Logged translation job for file: {file_name}")
-
-            except Exception as e:
-                logger.error(f"CRITICAL Database error in _log_usage: {e}", exc_info=True)
-                raise  # Propagate error so job fails properly
-
-        # 2. Update JSON Log (Maintain for backward compatibility/backup)
-        try:
-            log_path = Path(TRANSLATION_LOG_FILE)
-            if not _is_writable_log_path(log_path):
-                logger.warning(
-                    "Translation log path not writable or accessible: %s. Skipping JSON log.",
-                    TRANSLATION_LOG_FILE,
-                )
-                return
-
-            log_data: dict[str, Any] = {
-                "log_schema_version": "1.1",  # Add versioning
-                "cumulative_totals": {"deepl": 0, "google": 0, "overall": 0, "last_updated": None},
-                "jobs": [],
-                "deepl_keys_snapshot": {},
-            }
-            try:
-                log_exists = log_path.exists()
-            except PermissionError as e:
-                logger.warning(
-                    "No permission to access translation log file '%s': %s. Skipping JSON log.",
-                    TRANSLATION_LOG_FILE,
-                    e,
-                )
-                return
-
-            if log_exists:
-                try:
-                    with log_path.open(encoding="utf-8") as f:
-                        log_data = cast(dict[str, Any], json.load(f))
-                    # Migrate older log formats
-                    if "total_chars" in log_data and "cumulative_totals" not in log_data:
-                        log_data["cumulative_totals"] = log_data.pop("total_chars")
-                        log_data["cumulative_totals"]["last_updated"] = None
-                    if "files" in log_data and "jobs" not in log_data:
-                        log_data["jobs"] = log_data.pop("files")
-                    if (
-                        "deepl_keys_usage_snapshot" in log_data
-                        and "deepl_keys_snapshot" not in log_data
-                    ):
-                        log_data["deepl_keys_snapshot"] = log_data.pop("deepl_keys_usage_snapshot")
-
-                    # Ensure current structure exists
-                    log_data.setdefault("log_schema_version", "1.0")  # Mark older logs
-                    log_data.setdefault(
-                        "cumulative_totals",
-                        {"deepl": 0, "google": 0, "overall": 0, "last_updated": None},
-                    )
-                    log_data["cumulative_totals"].setdefault("deepl", 0)
-                    log_data["cumulative_totals"].setdefault("google", 0)
-                    log_data.setdefault("jobs", [])
-                    log_data.setdefault("deepl_keys_snapshot", {})
-
-                except (OSError, json.JSONDecodeError, TypeError, KeyError) as e:
-                    logger.warning(
-                        f"Log file '{TRANSLATION_LOG_FILE}' invalid, unreadable, or old format: {e}. Re-initializing log."
-                    )
-                    # Use default structure initialized above
-
-            # Update cumulative totals
-            current_time_iso = datetime.now(UTC).isoformat()
-            totals = cast(dict[str, Any], log_data["cumulative_totals"])
-            totals["deepl"] = totals.get("deepl", 0) + deepl_chars
-            totals["google"] = totals.get("google", 0) + google_chars
-            totals["overall"] = totals["deepl"] + totals["google"]
-            totals["last_updated"] = current_time_iso
-
-            # Create entry for this specific job
-            job_entry = {
-                "file_basename": Path(file_name).name
-                if file_name
-                else "Unknown",  # Handle potential None
-                "timestamp_utc": current_time_iso,
-                "billed_chars": {
-                    "deepl": deepl_chars,
-                    "google": google_chars,
-                    "total": deepl_chars + google_chars,
+        now_iso = datetime.now(UTC).isoformat()
+        overall_status = self._summarize_service_status(service_details)
+        event: dict[str, Any] = {}
+
+        # 1. Database rows (translation_log, and DeepL counts unless the quota ledger keeps them)
+        if DATABASE_AVAILABLE:
+            if TranslationLog is not None:
+                event["log"] = {
+                    "timestamp": now_iso,
+                    "file_name": file_name,
+                    "source_language": source_lang,
+                    "target_language": target_lang or "unknown",
+                    "service_used": overall_status,
+                    "characters_billed": deepl_chars + google_chars,
+                    "deepl_characters": deepl_chars,
+                    "google_characters": google_chars,
+                    "status": "success"
+                    if overall_status not in ("failed", "partial_failure")
+                    else overall_status,
+                    "output_file_path": output_file_path,
+                    "segments_total": segments_total,
+                    "memory_hits": memory_hits,
+                    "memory_chars_saved": memory_chars_saved,
+                }
+            ledger_in_use = deepl_quota_ledger is not None and deepl_quota_ledger.enabled
+            if billing_details and not ledger_in_use:
+                event["deepl_keys"] = self._deepl_usage_increments(billing_details)
+
+        # 2. JSON log (maintained for backward compatibility/backup)
+        log_path = Path(TRANSLATION_LOG_FILE)
+        if _is_writable_log_path(log_path):
+            event["file_log"] = {
+                "path": str(log_path),
+                "deepl": deepl_chars,
+                "google": google_chars,
+                "job": {
+                    "file_basename": Path(file_name).name if file_name else "Unknown",
+                    "timestamp_utc": now_iso,
+                    "billed_chars": {
+                        "deepl": deepl_chars,
+                        "google": google_chars,
+                        "total": deepl_chars + google_chars,
+                    },
+                    # Provide a sorted, unique list of raw service identifiers used
+                    "services_used_raw": sorted(set(service_details))
+                    if service_details
+                    else ["none"],
+                    "overall_status": overall_status,
+                    "translation_memory": {
+                        "segments": segments_total,
+                        "hits": memory_hits,
+                        "hit_rate": round(memory_hits / segments_total, 3)
+                        if segments_total
+                        else 0.0,
+                        "chars_saved": memory_chars_saved,
+                    },
+                },
+                # Snapshot of DeepL key usage based on the current cache state
+                "deepl_keys_snapshot": {
+                    f"key_{key_idx + 1}": {
+                        "count": usage_info.get("count", "N/A"),
+                        "limit": usage_info.get("limit", "N/A"),
+                        "valid": usage_info.get("valid", False),
+                        "snapshot_timestamp_utc": now_iso,
+                    }
+                    for key_idx, usage_info in self.deepl_usage_cache.items()
                 },
-                # Provide a sorted, unique list of raw service identifiers used
-                "services_used_raw": sorted(set(service_details)) if service_details else ["none"],
-                "overall_status": self._summarize_service_status(
-                    service_details
-                ),  # Add summary status
             }
-            jobs_list = cast(list[Any], log_data["jobs"])
-            jobs_list.append(job_entry)
-
-            # Update the snapshot of DeepL key usage based on the current cache state
-            for key_idx, usage_info in self.deepl_usage_cache.items():
-                key_id = f"key_{key_idx + 1}"  # Consistent identifier
-                snapshot = cast(dict[str, Any], log_data["deepl_keys_snapshot"])
-                snapshot[key_id] = {
-                    "count": usage_info.get("count", "N/A"),
-                    "limit": usage_info.get("limit", "N/A"),
-                    "valid": usage_info.get("valid", False),  # Default to False if missing
-                    "snapshot_timestamp_utc": current_time_iso,
-                }
-
-            # Write updated log data back to file
-            try:
-                log_dir = log_path.parent
-                if log_dir and not log_dir.exists():
-                    log_dir.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"Created directory for log file: {log_dir}")
-
-                with log_path.open("w", encoding="utf-8") as f:
-                    json.dump(log_data, f, indent=2, ensure_ascii=False)
+        else:
+            logger.warning(
+                "Translation log path not writable or accessible: %s. Skipping JSON log.",
+                TRANSLATION_LOG_FILE,
+            )
 
-            except OSError as e:
-                logger.error(
-                    f"Could not write to translation log file '{TRANSLATION_LOG_FILE}': {e}"
-                )
-            except TypeError as e:
-                logger.error(f"Data serialization error writing to log file: {e}", exc_info=True)
+        if event and usage_accountant is not None:
+            usage_accountant.record(event)
 
-        except Exception as e:
-            logger.error(f"Unexpected error updating translation log: {e}", exc_info=True)
+    def _deepl_usage_increments(self, billing_details: list[dict]) -> dict[str, dict[str, Any]]:
+        """Billed characters per DeepL key hash, with the key's cached limit and validity."""
+        increments: dict[str, dict[str, Any]] = {}
+        for detail in billing_details:
+            service = str(detail.get("service", ""))
+            if not service.startswith("deepl_key_"):
+                continue
+            try:
+                idx = int(service.replace("deepl_key_", "")) - 1
+            except ValueError:
+                continue
+            if not 0 <= idx < len(self.deepl_keys):
+                continue
+            key_hash = key_identifier(self.deepl_keys[idx])
+            info = self.deepl_usage_cache.get(idx, {})
+            usage = increments.setdefault(key_hash, {"chars": 0, "limit": 500000, "valid": True})
+            usage["chars"] += int(detail.get("chars", 0))
+            # Update limit/validity if we have more recent info in cache
+            if info.get("limit"):
+                usage["limit"] = info["limit"]
+            if "valid" in info:
+                usage["valid"] = info["valid"]
+        return increments
+
+
+def _get_translation_memory() -> "TranslationMemory | None":
+    if translation_memory is None or not settings.TRANSLATION_MEMORY_ENABLED:
+        return None
+    return translation_memory
 
 
 _translation_manager_instance = None
+_translation_manager_lock = threading.Lock()
 
 
-def get_translation_manager() -> TranslationManager:  # noqa: C901
+def get_translation_manager() -> TranslationManager:
     """
     Singleton accessor for the TranslationManager.
     Initializes the manager on first call. Ensures config is loaded first.
     """
     global _translation_manager_instance
     if _translation_manager_instance is None:
-        _ensure_initialized()
+        # Pipelines for several files may run concurrently; initialize only once.
+        with _translation_manager_lock:
+            if _translation_manager_instance is not None:
+                return _translation_manager_instance
+            _ensure_initialized()
 
-        logger.info("Initializing TranslationManager instance...")
-        try:
-            global \
-                DEEPL_KEYS, \
-                GOOGLE_PROJECT_ID_CONFIG, \
-                GOOGLE_CREDENTIALS_PATH, \
-                DEEPL_QUOTA_PER_KEY
-
-            if CONFIG_LOADER_AVAILABLE and settings:
-                DEEPL_KEYS = [k for k in (getattr(settings, "DEEPL_API_KEYS", None) or []) if k]
-                GOOGLE_PROJECT_ID_CONFIG = getattr(settings, "GOOGLE_PROJECT_ID", None)
-                GOOGLE_CREDENTIALS_PATH = getattr(settings, "GOOGLE_CREDENTIALS_PATH", None)
-                DEEPL_QUOTA_PER_KEY = getattr(settings, "DEEPL_CHARACTER_QUOTA", 500000)
-
-            # This ensures that changes made in the UI (saved to DB) take precedence
-            # over static environment variables.
-            if DATABASE_AVAILABLE and SyncSessionLocal:
-                logger.debug("Checking Database for configuration overrides...")
-                try:
-                    # Import base to ensure all models are registered in metadata/mapping
-                    from sqlalchemy import select
-
-                    from app.core.security import decrypt_value
-                    from app.db.models.app_settings import AppSettings
-
-                    with SyncSessionLocal() as session:
-                        result = session.execute(select(AppSettings).where(AppSettings.id == 1))
-                        db_settings = result.scalar_one_or_none()
-
-                        if db_settings:
-                            # If deepl_api_keys is set in DB (even empty string), it overrides Env
-                            if db_settings.deepl_api_keys is not None:
-                                raw_keys = db_settings.deepl_api_keys
-                                if raw_keys == "":
-                                    # Explicitly disabled
-                                    DEEPL_KEYS = []
-                                    logger.info(
-                                        "DeepL API Keys explicitly cleared by Database settings."
-                                    )
-                                else:
-                                    try:
-                                        decrypted_json = decrypt_value(raw_keys)
-                                        parsed_keys = json.loads(decrypted_json)
-                                        if isinstance(parsed_keys, list):
-                                            DEEPL_KEYS = [
-                                                str(k).strip()
-                                                for k in parsed_keys
-                                                if str(k).strip()
-                                            ]
-                                            logger.info(
-                                                f"Loaded {len(DEEPL_KEYS)} DeepL keys from Database settings (overriding env)."
-                                            )
-                                    except Exception as db_key_err:
-                                        DEEPL_KEYS = []
-                                        logger.error(
-                                            "Failed to decrypt/parse DeepL keys from DB; disabling DeepL keys to avoid env fallback: %s",
-                                            db_key_err,
-                                        )
-
-                            # Logic: If DB has credential blob, use that.
-                            # Since we can't easily write a temp file here safely in all contexts,
-                            # we might rely on the Env path if DB is empty, OR we need to handle blob usage.
-                            # For now, let's respect project_id override at least.
-                            if db_settings.google_cloud_project_id:
-                                GOOGLE_PROJECT_ID_CONFIG = db_settings.google_cloud_project_id
-                                logger.info(
-                                    f"Using Google Project ID from Database: {GOOGLE_PROJECT_ID_CONFIG}"
-                                )
-
-                            # Note: Handling raw Google Credentials blob from DB requires writing to a file
-                            # because google-cloud-library expects a file path or environment variable content.
-                            # Current implementation prioritizes the config path if DB blob logic isn't fully implemented in Translator.
-                            # However, if using Env vars, user settings usually write to a generic shared path or rely on Env.
-
-                except Exception as db_err:
+            logger.info("Initializing TranslationManager instance...")
+            try:
+                global \
+                    DEEPL_KEYS, \
+                    GOOGLE_PROJECT_ID_CONFIG, \
+                    GOOGLE_CREDENTIALS_PATH, \
+                    DEEPL_QUOTA_PER_KEY
+
+                if CONFIG_LOADER_AVAILABLE and settings:
+                    DEEPL_KEYS = [k for k in (getattr(settings, "DEEPL_API_KEYS", None) or []) if k]
+                    GOOGLE_PROJECT_ID_CONFIG = getattr(settings, "GOOGLE_PROJECT_ID", None)
+                    GOOGLE_CREDENTIALS_PATH = getattr(settings, "GOOGLE_CREDENTIALS_PATH", None)
+                    DEEPL_QUOTA_PER_KEY = getattr(settings, "DEEPL_CHARACTER_QUOTA", 500000)
+
+                # Settings saved in the UI (DB) take precedence over static environment
+                # variables; they come from the shared effective-settings snapshot.
+                if DATABASE_AVAILABLE:
+                    try:
+                        # None when the keys were cleared in the DB or cannot be decrypted
+                        db_keys = get_effective_setting_sync("deepl_api_keys")
+                        if not isinstance(db_keys, list):
+                            db_keys = []
+                        DEEPL_KEYS = [k.strip() for k in db_keys if k.strip()]
+                        project_id = get_effective_setting_sync("google_cloud_project_id")
+                        if project_id:
+                            GOOGLE_PROJECT_ID_CONFIG = str(project_id)
+                    except Exception as db_err:
+                        logger.warning(
+                            f"Failed to load settings from Database (falling back to Env): {db_err}"
+                        )
+
+                if not CONFIG_LOADER_AVAILABLE:
                     logger.warning(
-                        f"Failed to load settings from Database (falling back to Env): {db_err}"
+                        "Configuration loader not available. Ensure global config variables (DEEPL_KEYS, etc.) are set manually."
                     )
 
-            if not CONFIG_LOADER_AVAILABLE:
-                logger.warning(
-                    "Configuration loader not available. Ensure global config variables (DEEPL_KEYS, etc.) are set manually."
+                logger.debug(f"Reference Settings Loaded -> DEEPL_KEYS: {len(DEEPL_KEYS)} keys")
+                logger.debug(
+                    f"Reference Settings Loaded -> GOOGLE_PROJECT_ID: {GOOGLE_PROJECT_ID_CONFIG}"
                 )
 
-            logger.debug(f"Reference Settings Loaded -> DEEPL_KEYS: {len(DEEPL_KEYS)} keys")
-            logger.debug(
-                f"Reference Settings Loaded -> GOOGLE_PROJECT_ID: {GOOGLE_PROJECT_ID_CONFIG}"
-            )
-
-            # Now, instantiate the manager
-            _translation_manager_instance = TranslationManager()
-            logger.info("TranslationManager instance created successfully.")
+                # Now, instantiate the manager
+                _translation_manager_instance = TranslationManager()
+                logger.info("TranslationManager instance created successfully.")
 
-        except Exception as e:
-            logger.critical(f"FATAL: Could not initialize TranslationManager: {e}", exc_info=True)
-            raise RuntimeError(f"Fatal: TranslationManager initialization failed: {e}") from e
+            except Exception as e:
+                logger.critical(
+                    f"FATAL: Could not initialize TranslationManager: {e}", exc_info=True
+                )
+                raise RuntimeError(f"Fatal: TranslationManager initialization failed: {e}") from e
 
     return _translation_manager_instance
 
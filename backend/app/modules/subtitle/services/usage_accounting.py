@@ -0,0 +1,448 @@
+"""
+Asynchronous accounting of translation usage for `TranslationManager`.
+
+`_log_usage` used to do all of this in the translation path, before the
+translation returned: open a DB session, run one query per DeepL key, commit,
+insert the ``translation_log`` row, and rewrite the JSON usage log. Now it only
+queues a usage event. A background thread collects what has been queued every
+TRANSLATION_USAGE_FLUSH_INTERVAL_S and applies it in one transaction:
+
+- one multi-row INSERT into ``translation_log``, and one upsert adding the
+  same rows to their ``translation_stats_daily`` rollups;
+- one ``INSERT ... ON CONFLICT DO UPDATE`` per batch that adds the billed
+  characters of each DeepL key. This only happens without the quota ledger,
+  which counts them itself;
+- one read-modify-write of the JSON log file for the whole batch.
+
+If the database cannot be reached, the database part of the batch goes to a
+spool file in TRANSLATION_USAGE_SPOOL_DIR. Later flushes replay each spool
+file on its own, in this process or any other one. A file the database keeps
+rejecting while other writes go through is renamed to '.bad' and left for an
+operator. Events still queued when the
+interpreter exits are flushed (or spooled) by an atexit hook, so a job
+subprocess does not lose the usage of its last file.
+
+Usage accounting errors never fail a translation.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+from app.core.config import settings
+from app.core.file_cache import CacheCounters
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_KEY_LIMIT = 500000  # DeepLUsage.character_limit default; says nothing about the key
+_STALE_CLAIM_S = 600  # A claimed spool file this old belongs to a process that died mid-replay
+_WAKE_AT_QUEUED = 200  # Flush early once this many events are waiting
+_ROLLUP_SUMS = ("characters_billed", "deepl_characters", "google_characters", "memory_chars_saved")
+
+
+def daily_rollups(logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sums translation_log rows into translation_stats_daily rows (UTC days)."""
+    rollups: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for log in logs:
+        key = (
+            log["timestamp"].astimezone(UTC).date(),
+            log.get("service_used") or "unknown",
+            log.get("target_language") or "unknown",
+            log.get("status") or "success",
+        )
+        row = rollups.get(key)
+        if row is None:
+            row = rollups[key] = {
+                "day": key[0],
+                "service_used": key[1],
+                "target_language": key[2],
+                "status": key[3],
+                "translations": 0,
+                **dict.fromkeys(_ROLLUP_SUMS, 0),
+            }
+        row["translations"] += 1
+        for column in _ROLLUP_SUMS:
+            row[column] += log.get(column) or 0
+    return list(rollups.values())
+
+
+def _db_apply(events: list[dict[str, Any]]) -> None:
+    """Writes a batch of usage events in one transaction."""
+    from sqlalchemy import case, insert
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.db.models.deepl_usage import DeepLUsage
+    from app.db.models.translation_log import TranslationLog, TranslationStatsDaily
+    from app.db.session import SyncSessionLocal
+
+    if SyncSessionLocal is None:
+        raise RuntimeError("Synchronous session factory is not initialized")
+
+    logs = [
+        {**event["log"], "timestamp": datetime.fromisoformat(event["log"]["timestamp"])}
+        for event in events
+        if event.get("log")
+    ]
+    keys: dict[str, dict[str, Any]] = {}
+    for event in events:
+        for key_hash, usage in (event.get("deepl_keys") or {}).items():
+            row = keys.setdefault(key_hash, {"key_identifier": key_hash, "character_count": 0})
+            row["character_count"] += usage["chars"]
+            # Limit and validity of the most recent event win
+            row["character_limit"] = usage["limit"]
+            row["valid"] = usage["valid"]
+
+    with SyncSessionLocal() as session:
+        if logs:
+            session.execute(insert(TranslationLog), logs)
+            stmt = pg_insert(TranslationStatsDaily).values(daily_rollups(logs))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    TranslationStatsDaily.day,
+                    TranslationStatsDaily.service_used,
+                    TranslationStatsDaily.target_language,
+                    TranslationStatsDaily.status,
+                ],
+                set_={
+                    column: getattr(TranslationStatsDaily, column) + stmt.excluded[column]
+                    for column in ("translations", *_ROLLUP_SUMS)
+                },
+            )
+            session.execute(stmt)
+        if keys:
+            stmt = pg_insert(DeepLUsage).values(list(keys.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DeepLUsage.key_identifier],
+                set_={
+                    "character_count": DeepLUsage.character_count + stmt.excluded.character_count,
+                    "character_limit": case(
+                        (
+                            stmt.excluded.character_limit.in_((0, _DEFAULT_KEY_LIMIT)),
+                            DeepLUsage.character_limit,
+                        ),
+                        else_=stmt.excluded.character_limit,
+                    ),
+                    "valid": stmt.excluded.valid,
+                    "last_updated": datetime.now(UTC),
+                },
+            )
+            session.execute(stmt)
+        session.commit()
+
+
+def _empty_file_log() -> dict[str, Any]:
+    return {
+        "log_schema_version": "1.1",
+        "cumulative_totals": {"deepl": 0, "google": 0, "overall": 0, "last_updated": None},
+        "jobs": [],
+        "deepl_keys_snapshot": {},
+    }
+
+
+def _load_file_log(log_path: Path) -> dict[str, Any]:
+    if not log_path.exists():
+        return _empty_file_log()
+    try:
+        with log_path.open(encoding="utf-8") as f:
+            log_data = cast(dict[str, Any], json.load(f))
+        # Migrate older log formats
+        if "total_chars" in log_data and "cumulative_totals" not in log_data:
+            log_data["cumulative_totals"] = log_data.pop("total_chars")
+            log_data["cumulative_totals"]["last_updated"] = None
+        if "files" in log_data and "jobs" not in log_data:
+            log_data["jobs"] = log_data.pop("files")
+        if "deepl_keys_usage_snapshot" in log_data and "deepl_keys_snapshot" not in log_data:
+            log_data["deepl_keys_snapshot"] = log_data.pop("deepl_keys_usage_snapshot")
+
+        # Ensure current structure exists
+        log_data.setdefault("log_schema_version", "1.0")  # Mark older logs
+        log_data.setdefault(
+            "cumulative_totals", {"deepl": 0, "google": 0, "overall": 0, "last_updated": None}
+        )
+        log_data["cumulative_totals"].setdefault("deepl", 0)
+        log_data["cumulative_totals"].setdefault("google", 0)
+        log_data.setdefault("jobs", [])
+        log_data.setdefault("deepl_keys_snapshot", {})
+    except (OSError, json.JSONDecodeError, TypeError, KeyError, AttributeError) as e:
+        logger.warning(
+            f"Log file '{log_path}' invalid, unreadable, or old format: {e}. Re-initializing log."
+        )
+        return _empty_file_log()
+    return log_data
+
+
+def append_file_log(log_path: Path, entries: list[dict[str, Any]]) -> None:
+    """Adds a batch of jobs to the JSON usage log (translation_log.json) with one rewrite."""
+    log_data = _load_file_log(log_path)
+    totals = cast(dict[str, Any], log_data["cumulative_totals"])
+    jobs = cast(list[Any], log_data["jobs"])
+    snapshot = cast(dict[str, Any], log_data["deepl_keys_snapshot"])
+    for entry in entries:
+        totals["deepl"] = totals.get("deepl", 0) + entry["deepl"]
+        totals["google"] = totals.get("google", 0) + entry["google"]
+        totals["overall"] = totals["deepl"] + totals["google"]
+        totals["last_updated"] = entry["job"]["timestamp_utc"]
+        jobs.append(entry["job"])
+        snapshot.update(entry["deepl_keys_snapshot"])
+
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("w", encoding="utf-8") as f:
+        json.dump(log_data, f, indent=2, ensure_ascii=False)
+
+
+class UsageAccountant:
+    """Queues usage events and applies them in batches from a background thread."""
+
+    def __init__(
+        self,
+        spool_dir: str | Path | None = None,
+        flush_interval_s: float | None = None,
+        enabled: bool | None = None,
+        apply: Callable[[list[dict[str, Any]]], None] = _db_apply,
+    ) -> None:
+        self._spool_dir = Path(spool_dir) if spool_dir is not None else None
+        self._flush_interval_s = flush_interval_s
+        self._enabled = enabled
+        self._apply = apply
+        self._atexit_registered = False
+        self._reset()
+        # Threads and held locks do not survive a fork (Celery prefork)
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def spool_dir(self) -> Path:
+        if self._spool_dir is not None:
+            return self._spool_dir
+        return Path(settings.TRANSLATION_USAGE_SPOOL_DIR)
+
+    @property
+    def flush_interval_s(self) -> float:
+        if self._flush_interval_s is not None:
+            return self._flush_interval_s
+        return settings.TRANSLATION_USAGE_FLUSH_INTERVAL_S
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return settings.TRANSLATION_USAGE_ASYNC_ENABLED
+
+    def _reset(self) -> None:
+        self._queue: queue.SimpleQueue[dict[str, Any]] = queue.SimpleQueue()
+        self._counters = CacheCounters(
+            "recorded", "applied", "spooled", "replayed", "quarantined", "errors"
+        )
+        self._lock = threading.Lock()  # The flusher thread
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def stats(self) -> dict[str, int]:
+        return {**self._counters.snapshot(), "queued": self._queue.qsize()}
+
+    def record(self, event: dict[str, Any]) -> None:
+        """
+        Queues one usage event. Keys: 'log' (translation_log columns, ISO timestamp),
+        'deepl_keys' ({key hash: {chars, limit, valid}}) and 'file_log' (JSON log entry).
+        """
+        self._counters.add("recorded")
+        self._queue.put(event)
+        if not self.enabled:
+            self.flush()
+            return
+        self._ensure_flusher()
+        if self._queue.qsize() >= _WAKE_AT_QUEUED:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Applies everything queued, plus spooled events, now. Returns the events written.
+
+        Each spool file is applied in a transaction of its own, before the new
+        batch. When every write of a flush fails, the database is taken to be
+        down and everything stays in the spool. A spool file that fails while
+        another write succeeds is moved aside as '<name>.bad', so it cannot
+        hold back the rest of the spool.
+        """
+        with self._flush_lock:
+            events: list[dict[str, Any]] = []
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_file_logs(events)
+            batch = [
+                {"log": event.get("log"), "deepl_keys": event.get("deepl_keys") or {}}
+                for event in events
+                if event.get("log") or event.get("deepl_keys")
+            ]
+
+            written, failed = self._replay_spool()
+            batch_applied = not batch or self._apply_events(batch, f"{len(batch)} new events")
+            if batch_applied:
+                written += len(batch)
+                self._counters.add("applied", len(batch))
+
+            if written:  # The database is up: those files fail on their own
+                for path in failed:
+                    self._quarantine(path)
+            else:
+                self._release_claims(failed)
+            if not batch_applied:
+                self._spool(batch)
+            return written
+
+    # --- Internals ---
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="translation-usage-flusher", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # Keep the flusher alive whatever happens
+                self._counters.add("errors")
+                logger.warning(f"Translation usage: flush failed: {e}")
+
+    def _replay_spool(self) -> tuple[int, list[Path]]:
+        """Applies the claimed spool files one by one; returns the events written and the failures."""
+        written = 0
+        failed: list[Path] = []
+        for path in self._claim_spool():
+            replay = self._read_spool(path)
+            if replay is None:
+                self._quarantine(path)
+                continue
+            if replay and not self._apply_events(replay, f"spool file {path.name}"):
+                failed.append(path)
+                continue
+            path.unlink(missing_ok=True)
+            written += len(replay)
+            self._counters.add("replayed", len(replay))
+        return written, failed
+
+    def _apply_events(self, events: list[dict[str, Any]], what: str) -> bool:
+        try:
+            self._apply(events)
+        except Exception as e:
+            self._counters.add("errors")
+            logger.warning(f"Translation usage: database write of {what} failed: {e}")
+            return False
+        return True
+
+    def _write_file_logs(self, events: list[dict[str, Any]]) -> None:
+        by_path: dict[str, list[dict[str, Any]]] = {}
+        for event in events:
+            if event.get("file_log"):
+                by_path.setdefault(event["file_log"]["path"], []).append(event["file_log"])
+        for path, entries in by_path.items():
+            try:
+                append_file_log(Path(path), entries)
+            except (OSError, TypeError, ValueError) as e:
+                self._counters.add("errors")
+                logger.error(f"Could not write to translation log file '{path}': {e}")
+
+    def _claim_spool(self) -> list[Path]:
+        """Takes over spool files by renaming them, so only one process replays each."""
+        claimed = []
+        try:
+            candidates = list(self.spool_dir.glob("*.jsonl"))
+            for path in self.spool_dir.glob("*.claimed"):
+                if time.time() - path.stat().st_mtime > _STALE_CLAIM_S:
+                    candidates.append(path)
+        except OSError:
+            return []
+        for path in sorted(candidates):
+            target = path.with_name(f"{path.stem.split('.')[0]}.{os.getpid()}.claimed")
+            try:
+                path.replace(target)
+                target.touch()
+            except OSError:
+                continue  # Claimed by another process first
+            claimed.append(target)
+        return claimed
+
+    def _release_claims(self, claimed: list[Path]) -> None:
+        for path in claimed:
+            try:
+                path.replace(path.with_name(f"{path.stem.split('.')[0]}.jsonl"))
+            except OSError as e:
+                logger.warning(f"Translation usage: could not release spool file {path}: {e}")
+
+    def _quarantine(self, path: Path) -> None:
+        """Sets aside a spool file that cannot be applied; rename it back to .jsonl to retry."""
+        target = path.with_name(f"{path.stem.split('.')[0]}.bad")
+        try:
+            path.replace(target)
+        except OSError as e:
+            logger.warning(f"Translation usage: could not set aside spool file {path}: {e}")
+            return
+        self._counters.add("quarantined")
+        logger.error(f"Translation usage: spool file could not be applied, moved to {target}.")
+
+    def _read_spool(self, path: Path) -> list[dict[str, Any]] | None:
+        events = []
+        try:
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        events.append(json.loads(line))
+        except (OSError, ValueError) as e:
+            self._counters.add("errors")
+            logger.warning(f"Translation usage: could not read spool file {path}: {e}")
+            return None
+        return events
+
+    def _spool(self, events: list[dict[str, Any]]) -> None:
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=".usage.", dir=self.spool_dir)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    for event in events:
+                        f.write(json.dumps(event, separators=(",", ":")) + "\n")
+                Path(tmp_name).replace(
+                    self.spool_dir / f"usage-{time.time_ns()}-{os.getpid()}.jsonl"
+                )
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            self._counters.add("errors")
+            logger.error(f"Translation usage: could not spool {len(events)} events, lost: {e}")
+            return
+        self._counters.add("spooled", len(events))
+
+
+usage_accountant = UsageAccountant()
+
+
+__all__ = [
+    "UsageAccountant",
+    "append_file_log",
+    "daily_rollups",
+    "usage_accountant",
+]
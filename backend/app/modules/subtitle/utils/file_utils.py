@@ -9,9 +9,10 @@ import zipfile  # Requires 'zipfile' - built-in
 from collections import defaultdict  # For directory cleanup logic
 from pathlib import Path  # Use pathlib for robustness
 
-import chardet  # Requires 'chardet' package
 import rarfile  # Requires 'rarfile' package and 'unrar' command-line tool
 
+from app.modules.subtitle.utils import srt_codec
+
 logger = logging.getLogger(__name__)
 
 # Check rarfile availability and unrar command status once at module level
@@ -61,57 +62,25 @@ def get_preferred_subtitle_path(base_path_no_ext: str, language_code: str) -> st
 
 
 def detect_encoding(file_path: str | Path, default: str = "utf-8") -> str:
-    """Detects the encoding of a file using chardet."""
+    """Detects the encoding of a file from its first 128KB (BOM, then chardet)."""
     file_path_str = str(file_path)  # Ensure string path
-    if not Path(file_path_str).exists():
-        logging.error(f"Cannot detect encoding: File not found at {file_path_str}")
-        return default
     try:
         with Path(file_path_str).open("rb") as file:
-            # Read a significant chunk, but limit memory usage
-            raw_data = file.read(128 * 1024)  # Read up to 128KB
-        if not raw_data:  # Handle empty file
-            logging.warning(
-                f"File is empty, cannot detect encoding: {file_path_str}. Using default '{default}'."
-            )
-            return default
-
-        result = chardet.detect(raw_data)
-        encoding = result["encoding"]
-        confidence = result["confidence"]
-
-        # Use default for low confidence or None, but log it
-        if encoding is None or confidence < 0.75:  # Slightly higher confidence threshold
-            logging.debug(
-                f"Chardet detected {encoding} with low confidence ({confidence:.2f}) for {Path(file_path_str).name}. Falling back to '{default}'."
-            )
-            return default
-        # Handle common misdetections or aliases
-        elif encoding.lower() == "ascii":
-            logging.debug(f"Chardet detected ASCII for {Path(file_path_str).name}, using 'utf-8'.")
-            return "utf-8"
-        elif encoding.lower() == "iso-8859-1":
-            # Often interchangeable with Windows-1252, but 1252 is more common for subs
-            logging.debug(
-                f"Chardet detected ISO-8859-1 for {Path(file_path_str).name}, trying 'cp1252'."
-            )
-            return "cp1252"
-        elif encoding.lower() == "windows-1252":
-            return "cp1252"  # Standardize to cp1252 alias
-        else:
-            logging.debug(
-                f"Detected encoding: {encoding} with confidence {confidence:.2f} for {Path(file_path_str).name}"
-            )
-            return encoding
-
-    except FileNotFoundError:  # Should be caught above, but defensive
-        logging.error(f"File not found during encoding detection: {file_path_str}")
+            raw_data = file.read(srt_codec.DETECTION_PREFIX_BYTES)
+    except FileNotFoundError:
+        logging.error(f"Cannot detect encoding: File not found at {file_path_str}")
         return default
-    except Exception as e:
+    except OSError as e:
         logging.warning(
             f"Could not detect encoding for {file_path_str} due to error: {e}. Falling back to '{default}'."
         )
         return default
+    if not raw_data:  # Handle empty file
+        logging.warning(
+            f"File is empty, cannot detect encoding: {file_path_str}. Using default '{default}'."
+        )
+        return default
+    return srt_codec.detect_encoding_from_prefix(raw_data, default)
 
 
 # --- File Reading/Writing ---
@@ -127,55 +96,16 @@ def read_srt_file(file_path: str) -> str:
         logging.warning(f"SRT file is empty: {file_path_str}")
         return ""  # Return empty string for empty file
 
-    initial_encoding = detect_encoding(file_path_str)
-    # List of encodings to try in order
-    encodings_to_try = [
-        initial_encoding,
-        "utf-8",
-        "utf-8-sig",  # Try with BOM handling
-        "cp1252",  # Common Windows encoding for Western/Central Europe
-        "cp1250",  # Common Windows encoding for Central/Eastern Europe
-        "iso-8859-2",  # Latin-2, alternative for Central/Eastern Europe
-    ]
-    # Remove duplicates while preserving order (ish)
-    tried_encodings = set()
-    unique_encodings = []
-    for enc in encodings_to_try:
-        if enc and enc not in tried_encodings:
-            unique_encodings.append(enc)
-            tried_encodings.add(enc)
-
-    for encoding in unique_encodings:
-        try:
-            with codecs.open(
-                file_path_str, "r", encoding=encoding, errors="strict"
-            ) as file:  # Use 'strict' first
-                content = file.read()
-            # Remove BOM manually if necessary (though utf-8-sig should handle it)
-            if content.startswith("\ufeff"):
-                content = content[1:]
-            logging.debug(
-                f"Successfully read {len(content)} chars from {Path(file_path_str).name} using encoding '{encoding}'."
-            )
-            return content
-        except UnicodeDecodeError:
-            logging.debug(
-                f"Read failed for {Path(file_path_str).name} with encoding '{encoding}' (strict)."
-            )
-            # Optionally try again with 'replace' or 'ignore' errors?
-            # For now, just move to the next encoding.
-            continue
-        except Exception as e:
-            logging.warning(
-                f"Unexpected error reading {Path(file_path_str).name} with encoding '{encoding}': {e}"
-            )
-            # Continue trying other encodings unless it's a fundamental error
-
-    # If all attempts fail
-    logging.error(
-        f"Failed to read SRT file {Path(file_path_str).name} with any attempted encoding: {unique_encodings}. Corrupted file or unknown encoding?"
-    )
-    raise OSError(f"Could not read file {file_path_str} with attempted encodings.")
+    # One pass: encoding detected on the first chunk, the rest decoded incrementally
+    try:
+        content = srt_codec.read_srt_text(file_path_str)
+    except UnicodeDecodeError as e:
+        logging.error(
+            f"Failed to read SRT file {Path(file_path_str).name} with any attempted encoding: {e}. Corrupted file or unknown encoding?"
+        )
+        raise OSError(f"Could not read file {file_path_str} with attempted encodings.") from e
+    logging.debug(f"Successfully read {len(content)} chars from {Path(file_path_str).name}.")
+    return content
 
 
 def _ensure_writable_target(target_path: Path) -> None:
@@ -4,6 +4,7 @@ import os
 import shutil
 import subprocess
 import tempfile
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
@@ -11,6 +12,11 @@ from typing import Any
 # Import configuration from app.core.config (Pydantic settings)
 from app.core.config import settings
 from app.modules.subtitle.core import constants
+from app.modules.subtitle.services.media_probe_cache import (
+    MediaProbe,
+    make_probe_key,
+    media_probe_cache,
+)
 from app.modules.subtitle.utils import file_utils, subtitle_parser
 
 logger = logging.getLogger(__name__)
@@ -89,6 +95,87 @@ def _is_tool_available(tool_path: str, tool_name: str) -> bool:
     return is_available
 
 
+# --- ffprobe (one probe per file, shared through the media probe index) ---
+def _run_ffprobe(video_path_str: str) -> MediaProbe | None:
+    """Runs a single ffprobe for all streams and the container format."""
+    base_video_filename = Path(video_path_str).name
+    if not _is_tool_available(FFPROBE_PATH, "ffprobe"):
+        logger.error(f"Cannot probe media: '{FFPROBE_PATH}' tool unavailable.")
+        return None
+
+    # Use the actual executable path found by _is_tool_available if possible
+    resolved_ffprobe_path = shutil.which(FFPROBE_PATH) or FFPROBE_PATH
+    ffprobe_cmd = [
+        resolved_ffprobe_path,
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_streams",
+        "-show_format",
+        video_path_str,
+    ]
+    logger.debug(f"Running ffprobe command: {' '.join(ffprobe_cmd)}")
+    result = None
+    try:
+        result = subprocess.run(
+            ffprobe_cmd,
+            capture_output=True,
+            text=True,
+            check=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=FFPROBE_TIMEOUT,
+        )
+        return MediaProbe.from_ffprobe(json.loads(result.stdout))
+    except subprocess.TimeoutExpired:
+        logger.error(f"ffprobe timed out after {FFPROBE_TIMEOUT}s for '{base_video_filename}'.")
+    except subprocess.CalledProcessError as e:
+        stderr_snippet = e.stderr.strip()[-500:] if e.stderr else "(no stderr)"
+        logger.error(
+            f"ffprobe failed for '{base_video_filename}'. RC: {e.returncode}. Stderr: {stderr_snippet}"
+        )
+    except json.JSONDecodeError as e:
+        stdout_snippet = result.stdout.strip()[:500] if result and result.stdout else "(no stdout)"
+        logger.error(
+            f"Failed to parse ffprobe JSON output for '{base_video_filename}': {e}. Output: {stdout_snippet}..."
+        )
+    except FileNotFoundError:
+        logger.error(
+            f"ffprobe command not found during execution (tried: {FFPROBE_PATH}). Ensure ffprobe (from FFmpeg) is installed and in PATH."
+        )
+        _tool_cache[f"ffprobe|{FFPROBE_PATH}"] = False  # Update cache
+    except Exception as e:
+        logger.error(
+            f"An unexpected error occurred running ffprobe for '{base_video_filename}': {e}",
+            exc_info=True,
+        )
+    return None
+
+
+def probe_media(video_path: str | Path) -> MediaProbe | None:
+    """
+    Returns all streams and the container format of a video file.
+
+    Served from the media probe index while the file is unchanged (same path,
+    size, mtime and inode); otherwise ffprobe runs once and the result is
+    stored. Failed probes are not cached. Returns None if the file cannot be
+    probed.
+    """
+    video_path_str = str(video_path)
+    key = make_probe_key(video_path_str) if settings.MEDIA_PROBE_CACHE_ENABLED else None
+    if key is not None:
+        probe = media_probe_cache.get(key)
+        if probe is not None:
+            logger.debug(f"Using indexed ffprobe result for '{Path(video_path_str).name}'.")
+            return probe
+
+    probe = _run_ffprobe(video_path_str)
+    if probe is not None and key is not None:
+        media_probe_cache.put(key, probe)
+    return probe
+
+
 # --- PGS to SRT Conversion ---
 def _convert_pgs_to_srt(  # noqa: C901
     sup_file_path: str, output_srt_path: str, language_code_2_letter: str
@@ -289,7 +376,7 @@ def get_2_letter_code(code: str | None) -> str | None:
 
 
 def check_and_extract_embedded_subtitle(  # noqa: C901
-    video_path: str, target_language_code: str
+    video_path: str, target_language_code: str, prefetch: Mapping[int, str] | None = None
 ) -> tuple[str, str | None]:
     """
     Checks for embedded subtitles for a given language, prioritizes text-based,
@@ -300,6 +387,10 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
     Args:
         video_path (str): Path to the video file.
         target_language_code (str): The desired language code (e.g., 'ro', 'rum', 'en', 'eng').
+        prefetch (Mapping[int, str] | None): Other text streams (global index -> output .srt
+            path) to extract in the same ffmpeg pass, if this call has to demux the file
+            anyway. They are post-processed only when the target extraction fails; the
+            paths that exist afterwards are valid SRT files.
 
     Returns:
         tuple[str, str | None]: A tuple containing:
@@ -327,65 +418,12 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
     if not Path(video_path_str).exists():
         logger.error(f"Video file not found: {video_path_str}")
         return "failed", None
-    if not _is_tool_available(FFPROBE_PATH, "ffprobe"):
-        logger.error(f"Cannot check embedded subtitles: '{FFPROBE_PATH}' tool unavailable.")
-        return "failed", None
 
-    # 1. Get stream info using ffprobe
-    all_streams_data = []
-    try:
-        # Use the actual executable path found by _is_tool_available if possible
-        resolved_ffprobe_path = shutil.which(FFPROBE_PATH) or FFPROBE_PATH
-        ffprobe_cmd = [
-            resolved_ffprobe_path,
-            "-v",
-            "error",
-            "-print_format",
-            "json",
-            "-show_streams",
-            "-select_streams",
-            "s",  # Select only subtitle streams
-            video_path_str,
-        ]
-        logger.debug(f"Running ffprobe command: {' '.join(ffprobe_cmd)}")
-        result = subprocess.run(
-            ffprobe_cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=FFPROBE_TIMEOUT,
-        )
-        all_streams_data = json.loads(result.stdout).get("streams", [])
-
-    except subprocess.TimeoutExpired:
-        logger.error(f"ffprobe timed out after {FFPROBE_TIMEOUT}s for '{base_video_filename}'.")
-        return "failed", None
-    except subprocess.CalledProcessError as e:
-        stderr_snippet = e.stderr.strip()[-500:] if e.stderr else "(no stderr)"
-        logger.error(
-            f"ffprobe failed for '{base_video_filename}'. RC: {e.returncode}. Stderr: {stderr_snippet}"
-        )
-        return "failed", None
-    except json.JSONDecodeError as e:
-        stdout_snippet = result.stdout.strip()[:500] if result.stdout else "(no stdout)"
-        logger.error(
-            f"Failed to parse ffprobe JSON output for '{base_video_filename}': {e}. Output: {stdout_snippet}..."
-        )
-        return "failed", None
-    except FileNotFoundError:
-        logger.error(
-            f"ffprobe command not found during execution (tried: {FFPROBE_PATH}). Ensure ffprobe (from FFmpeg) is installed and in PATH."
-        )
-        _tool_cache[f"ffprobe|{FFPROBE_PATH}"] = False  # Update cache
-        return "failed", None
-    except Exception as e:
-        logger.error(
-            f"An unexpected error occurred running ffprobe for '{base_video_filename}': {e}",
-            exc_info=True,
-        )
+    # 1. Get stream info (one ffprobe per file, shared through the media probe index)
+    probe = probe_media(video_path_str)
+    if probe is None:
         return "failed", None
+    all_streams_data = probe.subtitle_streams
 
     if not all_streams_data:
         logger.info(f"No embedded subtitle streams found by ffprobe in '{base_video_filename}'.")
@@ -438,7 +476,10 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
             is_extractable_text = stream_codec in TEXT_SUBTITLE_CODECS
             is_extractable_image = stream_codec in image_codecs_to_consider
 
-            if is_extractable_text or is_extractable_image:
+            if not isinstance(stream.get("index"), int):
+                # ffmpeg can only map a stream by its global index
+                logger.debug(f"    Stream without an index (Codec: {stream_codec}) - skipped.")
+            elif is_extractable_text or is_extractable_image:
                 candidate_streams.append(stream)
                 logger.debug(
                     f"    Stream #{log_index}: Found candidate for target '{target_lang_2_letter}' (Codec: {stream_codec}, Type: {'Text' if is_extractable_text else 'Image'})."
@@ -468,7 +509,7 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
     )
     best_stream_for_extraction = candidate_streams[0]  # Choose the best candidate
 
-    stream_index = best_stream_for_extraction.get("index")
+    stream_index: int = best_stream_for_extraction["index"]
     stream_codec = best_stream_for_extraction.get("codec_name", "").lower()
     is_sdh = best_stream_for_extraction.get("disposition", {}).get("hearing_impaired", 0) == 1
     is_default = best_stream_for_extraction.get("disposition", {}).get("default", 0) == 1
@@ -506,134 +547,63 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
         if output_dir:  # Ensure output dir exists if it's not the current dir
             output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Use global stream index!
-        map_specifier = f"0:{stream_index}"
         temp_srt_path = str(Path(temp_dir) / f"stream_{stream_index}_temp.srt")
         temp_sup_path = str(Path(temp_dir) / f"stream_{stream_index}_temp.sup")  # For image subs
         extracted_srt_path = None  # Path to the successfully extracted/converted SRT in temp dir
 
-        # Use the actual executable path found by _is_tool_available if possible
-        resolved_ffmpeg_path = shutil.which(FFMPEG_PATH) or FFMPEG_PATH
-
-        if stream_codec in TEXT_SUBTITLE_CODECS:
+        # One demux pass for the selected stream and any prefetched ones
+        is_text_stream = stream_codec in TEXT_SUBTITLE_CODECS
+        outputs = {index: path for index, path in (prefetch or {}).items() if index != stream_index}
+        outputs[stream_index] = temp_srt_path if is_text_stream else temp_sup_path
+        if is_text_stream:
             logger.info(
                 f"Extracting text-based stream using global index #{stream_index} (map 0:{stream_index}) to SRT format..."
             )
-            ffmpeg_cmd = [
-                resolved_ffmpeg_path,
-                "-nostdin",
-                "-y",
-                "-i",
-                video_path_str,
-                "-map",
-                map_specifier,
-                "-c:s",
-                "srt",  # Force output to SRT format
-                temp_srt_path,
-            ]
-            logger.debug(f"Running ffmpeg command: {' '.join(ffmpeg_cmd)}")
-            result = subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=FFMPEG_TIMEOUT,
-                encoding="utf-8",
-                errors="replace",
+        else:
+            logger.info(
+                f"Extracting image-based stream using global index #{stream_index} (map 0:{stream_index}) ({stream_codec})..."
             )
+        extracted = extract_embedded_streams(video_path_str, outputs)
+        prefetched = {index: path for index, path in extracted.items() if index != stream_index}
 
-            stderr_snippet = result.stderr.strip()[-500:] if result.stderr else "(no stderr)"
+        if is_text_stream:
+            if extracted.get(stream_index):
+                extracted_srt_path = temp_srt_path
+                final_status = "text_extracted"
+                logger.debug(f"Successfully extracted text stream #{stream_index} to temp SRT.")
+            else:
+                logger.warning(
+                    f"ffmpeg failed or produced empty file extracting text stream #{stream_index}."
+                )
+        elif extracted.get(stream_index):
+            logger.debug(
+                f"Successfully extracted image stream #{stream_index} to '{temp_sup_path}'. Attempting OCR..."
+            )
+            # Use the normalized 2-letter code for sup2srt OCR
+            ocr_success = _convert_pgs_to_srt(temp_sup_path, temp_srt_path, target_lang_2_letter)
             if (
-                result.returncode == 0
+                ocr_success
                 and Path(temp_srt_path).exists()
                 and Path(temp_srt_path).stat().st_size > 10
             ):
                 extracted_srt_path = temp_srt_path
-                final_status = "text_extracted"
-                logger.debug(
-                    f"Successfully extracted text stream #{stream_index} to temp SRT. RC={result.returncode}. Stderr: {stderr_snippet}"
-                )
+                final_status = "pgs_extracted"  # Specific status for successful PGS OCR
+                logger.info(f"Successfully OCR'd image stream #{stream_index} to SRT.")
             else:
-                logger.warning(
-                    f"ffmpeg failed or produced empty file extracting text stream #{stream_index}. RC={result.returncode}. Stderr: {stderr_snippet}"
+                logger.error(
+                    f"Image subtitle OCR failed or produced empty/missing SRT for stream #{stream_index}."
                 )
+                # Clean up failed OCR output if it exists
                 if Path(temp_srt_path).exists():
                     try:
                         Path(temp_srt_path).unlink()
                     except OSError:
                         pass
-
-        elif stream_codec in image_codecs_to_consider:  # Handle allowed image formats
-            logger.info(
-                f"Extracting image-based stream using global index #{stream_index} (map 0:{stream_index}) ({stream_codec})..."
-            )
-            extract_cmd = [
-                resolved_ffmpeg_path,
-                "-nostdin",
-                "-y",
-                "-i",
-                video_path_str,
-                "-map",
-                map_specifier,
-                "-c:s",
-                "copy",  # Copy the raw stream data (e.g., .sup for PGS)
-                temp_sup_path,
-            ]
-            logger.debug(f"Running ffmpeg extract command: {' '.join(extract_cmd)}")
-            result_extract = subprocess.run(
-                extract_cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=FFMPEG_TIMEOUT,
-                encoding="utf-8",
-                errors="replace",
-            )
-            stderr_snippet = (
-                result_extract.stderr.strip()[-500:] if result_extract.stderr else "(no stderr)"
+        else:
+            logger.warning(
+                f"ffmpeg failed or produced empty file extracting image stream #{stream_index}."
             )
 
-            # Check if raw extraction worked
-            if (
-                result_extract.returncode == 0
-                and Path(temp_sup_path).exists()
-                and Path(temp_sup_path).stat().st_size > 10
-            ):  # Check size > 10 for raw image subs
-                logger.debug(
-                    f"Successfully extracted image stream #{stream_index} to '{temp_sup_path}'. Attempting OCR..."
-                )
-                # Use the normalized 2-letter code for sup2srt OCR
-                ocr_success = _convert_pgs_to_srt(
-                    temp_sup_path, temp_srt_path, target_lang_2_letter
-                )
-                if (
-                    ocr_success
-                    and Path(temp_srt_path).exists()
-                    and Path(temp_srt_path).stat().st_size > 10
-                ):
-                    extracted_srt_path = temp_srt_path
-                    final_status = "pgs_extracted"  # Specific status for successful PGS OCR
-                    logger.info(f"Successfully OCR'd image stream #{stream_index} to SRT.")
-                else:
-                    logger.error(
-                        f"Image subtitle OCR failed or produced empty/missing SRT for stream #{stream_index}."
-                    )
-                    # Clean up failed OCR output if it exists
-                    if Path(temp_srt_path).exists():
-                        try:
-                            Path(temp_srt_path).unlink()
-                        except OSError:
-                            pass
-            else:
-                logger.warning(
-                    f"ffmpeg failed or produced empty file extracting image stream #{stream_index}. RC={result_extract.returncode}. Stderr: {stderr_snippet}"
-                )
-                if Path(temp_sup_path).exists():  # Clean up failed raw extract
-                    try:
-                        Path(temp_sup_path).unlink()
-                    except OSError:
-                        pass
-
         # --- Post-processing and Saving ---
         if extracted_srt_path:
             logger.info(f"Processing and saving extracted subtitle from stream #{stream_index}...")
@@ -689,6 +659,11 @@ def check_and_extract_embedded_subtitle(  # noqa: C901
                 final_saved_path = None
                 # Clean up final target if save failed halfway? Maybe not needed.
 
+        # Prefetched streams are only used if the target language could not be extracted
+        if final_status == "failed":
+            for index, path in prefetched.items():
+                _apply_extraction_fixes(path, index)
+
     except subprocess.TimeoutExpired as time_err:
         logger.error(
             f"ffmpeg extraction process timed out for stream #{stream_index} after {FFMPEG_TIMEOUT}s: {time_err}"
@@ -762,72 +737,15 @@ def find_best_embedded_stream_info(  # noqa: C901
     video_path_str = str(video_path)
     base_video_filename = Path(video_path_str).name
 
-    # Check ffprobe availability
-    if not _is_tool_available(FFPROBE_PATH, "ffprobe"):
-        logger.error(
-            f"ffprobe command not found or not executable (tried: {FFPROBE_PATH}). Cannot detect embedded streams."
-        )
-        return None
     if not Path(video_path_str).exists():
         logger.error(f"Video file not found: {video_path_str}")
         return None
 
-    # Use the actual executable path found by _is_tool_available if possible
-    resolved_ffprobe_path = shutil.which(FFPROBE_PATH) or FFPROBE_PATH
-    command = [
-        resolved_ffprobe_path,
-        "-v",
-        "error",  # Keep error level to avoid noise, check return code
-        "-print_format",
-        "json",
-        "-show_streams",
-        "-select_streams",
-        "s",  # Select only subtitle streams
-        video_path_str,
-    ]
-
-    logger.debug(f"Running ffprobe command for stream detection: {' '.join(command)}")
-    media_info = None
-    try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=FFPROBE_TIMEOUT,
-        )
-        media_info = json.loads(result.stdout)
-    except FileNotFoundError:
-        logger.error(f"ffprobe command '{FFPROBE_PATH}' not found during execution.")
-        _tool_cache[f"ffprobe|{FFPROBE_PATH}"] = False  # Update cache
-        return None
-    except subprocess.TimeoutExpired:
-        logger.error(
-            f"ffprobe timed out after {FFPROBE_TIMEOUT}s for '{base_video_filename}' during stream detection."
-        )
-        return None
-    except subprocess.CalledProcessError as e:
-        stderr_snippet = e.stderr.strip()[-500:] if e.stderr else "(no stderr)"
-        logger.error(
-            f"ffprobe failed for stream detection on {base_video_filename} (RC={e.returncode}). Stderr: {stderr_snippet}"
-        )
-        return None
-    except json.JSONDecodeError as e:
-        stdout_snippet = result.stdout.strip()[:500] if result.stdout else "(no stdout)"
-        logger.error(
-            f"Failed to parse ffprobe JSON output for stream detection on '{base_video_filename}': {e}. Output: {stdout_snippet}..."
-        )
-        return None
-    except Exception as e:
-        logger.error(
-            f"An unexpected error occurred running ffprobe for stream detection on '{base_video_filename}': {e}",
-            exc_info=True,
-        )
+    probe = probe_media(video_path_str)
+    if probe is None:
         return None
 
-    subtitle_streams = media_info.get("streams", [])
+    subtitle_streams = probe.subtitle_streams
     if not subtitle_streams:
         logger.debug(f"No embedded subtitle streams found in {base_video_filename}.")
         return None
@@ -923,6 +841,135 @@ def find_best_embedded_stream_info(  # noqa: C901
     return best_candidate
 
 
+def _apply_extraction_fixes(output_subtitle_path: str, stream_index: int) -> bool:
+    """Applies the diacritics and timestamp fixes to an extracted SRT in place."""
+    logger.debug(f"Applying post-processing fixes to extracted stream #{stream_index}...")
+    processed = False
+    try:
+        content = file_utils.read_srt_file(output_subtitle_path)
+        if content and content.strip():
+            processed_content = subtitle_parser.fix_diacritics(content)
+            processed_content = subtitle_parser.ensure_correct_timestamp_format(processed_content)
+            if processed_content and processed_content.strip():
+                file_utils.write_srt_file(
+                    output_subtitle_path, processed_content, allow_fallback=False
+                )
+                processed = True
+            else:
+                logger.warning(
+                    f"Content became empty after processing for stream #{stream_index}. Reverting to original."
+                )
+        else:
+            logger.warning(
+                f"Extracted file for stream #{stream_index} was empty before processing."
+            )
+    except Exception as fix_err:
+        logger.error(
+            f"Error applying fixes to extracted stream #{stream_index}: {fix_err}",
+            exc_info=True,
+        )
+        # Keep the original extracted file even if fixes fail
+
+    if processed:
+        logger.debug(f"Successfully applied fixes to {Path(output_subtitle_path).name}")
+    else:
+        # If processing failed or wasn't possible, the original extracted file remains
+        logger.debug(
+            f"Skipped or failed applying fixes to {Path(output_subtitle_path).name}. Using raw extraction."
+        )
+    return processed
+
+
+def _run_ffmpeg_extract(video_path_str: str, outputs: Mapping[int, str]) -> dict[int, str]:
+    """Runs one ffmpeg process with an output per stream; returns the outputs that are valid."""
+    resolved_ffmpeg_path = shutil.which(FFMPEG_PATH) or FFMPEG_PATH
+    command = [resolved_ffmpeg_path, "-nostdin", "-y", "-i", video_path_str]
+    for stream_index, output_path in outputs.items():
+        # Global stream index (ffprobe's 'index'); text streams are converted, others copied raw
+        codec = "srt" if output_path.lower().endswith(".srt") else "copy"
+        command += ["-map", f"0:{stream_index}", "-c:s", codec, output_path]
+
+    logger.debug(f"Running ffmpeg command: {' '.join(command)}")
+    try:
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=FFMPEG_TIMEOUT,
+            encoding="utf-8",
+            errors="replace",
+        )
+        returncode = result.returncode
+        stderr_snippet = result.stderr.strip()[-500:] if result.stderr else "(no stderr)"
+    except subprocess.TimeoutExpired:
+        returncode = None
+        stderr_snippet = f"timed out after {FFMPEG_TIMEOUT}s"
+
+    valid: dict[int, str] = {}
+    for stream_index, output_path in outputs.items():
+        path = Path(output_path)
+        if returncode == 0 and path.exists() and path.stat().st_size > 10:
+            valid[stream_index] = output_path
+        elif path.exists():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    if len(valid) < len(outputs):
+        failed = sorted(set(outputs) - set(valid))
+        logger.warning(
+            f"ffmpeg did not produce valid output for stream(s) {failed}. RC={returncode}. Stderr: {stderr_snippet}"
+        )
+    return valid
+
+
+def extract_embedded_streams(video_path: str, outputs: Mapping[int, str]) -> dict[int, str]:
+    """
+    Extracts several embedded subtitle streams in a single ffmpeg demux pass.
+
+    The container is read once however many streams are requested, instead of
+    once per `extract_embedded_stream_by_index` call. Outputs ending in ".srt"
+    are converted to SRT, any other output receives the raw stream (e.g. .sup
+    for PGS). No post-processing is applied.
+
+    Args:
+        video_path: Path to the video file.
+        outputs: Global stream index (ffprobe's 'index') -> output file path.
+
+    Returns:
+        Stream index -> output path for the streams that were extracted to a
+        non-empty file. If the combined run fails (one bad stream makes ffmpeg
+        fail the whole command), the streams are retried one per process.
+    """
+    video_path_str = str(video_path)
+    if not outputs:
+        return {}
+    if not _is_tool_available(FFMPEG_PATH, "ffmpeg"):
+        logger.error(f"Cannot extract embedded subtitles: '{FFMPEG_PATH}' tool unavailable.")
+        return {}
+    if not Path(video_path_str).exists():
+        logger.error(f"Video file not found: {video_path_str}")
+        return {}
+    for output_path in outputs.values():
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info(
+        f"Extracting {len(outputs)} embedded stream(s) {sorted(outputs)} from '{Path(video_path_str).name}' in one ffmpeg pass..."
+    )
+    try:
+        extracted = _run_ffmpeg_extract(video_path_str, outputs)
+        if len(outputs) > 1 and not extracted:
+            logger.info("Combined extraction failed, retrying the streams one at a time...")
+            for stream_index, output_path in outputs.items():
+                extracted.update(_run_ffmpeg_extract(video_path_str, {stream_index: output_path}))
+    except FileNotFoundError:
+        logger.error(f"ffmpeg command '{FFMPEG_PATH}' not found during execution.")
+        _tool_cache[f"ffmpeg|{FFMPEG_PATH}"] = False  # Update cache
+        return {}
+    return extracted
+
+
 # --- Optional: Helper for direct extraction by index ---
 def extract_embedded_stream_by_index(  # noqa: C901
     video_path: str,
@@ -1073,57 +1120,7 @@ def extract_embedded_stream_by_index(  # noqa: C901
 
             # Optional: Post-process (fix diacritics, timestamps)
             if apply_fixes:
-                logger.debug(
-                    f"Applying post-processing fixes to extracted stream #{stream_index}..."
-                )
-                processed = False
-                try:
-                    # Use file_utils/parser if available
-                    if (
-                        "file_utils" in globals()
-                        and hasattr(file_utils, "read_srt_file")
-                        and "subtitle_parser" in globals()
-                    ):
-                        content = file_utils.read_srt_file(output_subtitle_path)
-                        if content and content.strip():
-                            processed_content = subtitle_parser.fix_diacritics(content)
-                            processed_content = subtitle_parser.ensure_correct_timestamp_format(
-                                processed_content
-                            )
-                            if processed_content and processed_content.strip():
-                                file_utils.write_srt_file(
-                                    output_subtitle_path, processed_content, allow_fallback=False
-                                )
-                                processed = True
-                            else:
-                                logger.warning(
-                                    f"Content became empty after processing for stream #{stream_index}. Reverting to original."
-                                )
-                        else:
-                            logger.warning(
-                                f"Extracted file for stream #{stream_index} was empty before processing."
-                            )
-                    else:
-                        logger.warning(
-                            "Cannot apply fixes: file_utils or subtitle_parser not fully available."
-                        )
-
-                    if processed:
-                        logger.debug(
-                            f"Successfully applied fixes to {Path(output_subtitle_path).name}"
-                        )
-                    else:
-                        # If processing failed or wasn't possible, the original extracted file remains
-                        logger.debug(
-                            f"Skipped or failed applying fixes to {Path(output_subtitle_path).name}. Using raw extraction."
-                        )
-
-                except Exception as fix_err:
-                    logger.error(
-                        f"Error applying fixes to extracted stream #{stream_index}: {fix_err}",
-                        exc_info=True,
-                    )
-                    # Keep the original extracted file even if fixes fail
+                _apply_extraction_fixes(output_subtitle_path, stream_index)
 
             return output_subtitle_path
         else:
@@ -1173,8 +1170,10 @@ __all__ = [
     "TEXT_SUBTITLE_CODECS",
     "check_and_extract_embedded_subtitle",
     "extract_embedded_stream_by_index",
+    "extract_embedded_streams",
     "find_best_embedded_stream_info",
     "get_2_letter_code",
+    "probe_media",
     # Constants related to codecs might be exported if needed externally
     # Tool paths might be useful sometimes, but usually accessed via functions
     # "FFMPEG_PATH", "FFPROBE_PATH", "SUP2SRT_PATH"
@@ -60,7 +60,12 @@ def create_session_with_retries(
         backoff_factor=backoff_factor,
         respect_retry_after_header=True,  # Respect server-provided delay
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    # Parallel per-file pipelines share these module-level sessions; size the pool
+    # so their keep-alive connections are reused instead of discarded.
+    pool_size = max(10, int(getattr(settings, "SUBTITLE_PIPELINE_WORKERS", 1)) * 2)
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
 
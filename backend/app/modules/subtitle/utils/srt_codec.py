@@ -0,0 +1,328 @@
+"""
+Streaming SRT reader/writer shared by the parser, translator and file utilities.
+
+Files are read as bytes in chunks: the encoding is detected once on the first
+chunk, the rest is decoded incrementally and split into lines on the fly, so a
+file is never re-read to try another encoding. Cues are compact `SrtCue`
+records with integer millisecond timings; `compose_srt` writes them back.
+
+Timing lines are accepted in the same forms `ensure_correct_timestamp_format`
+repairs ('.' milliseconds, '->' arrows, missing spaces) and are always written
+in the standard 'HH:MM:SS,mmm --> HH:MM:SS,mmm' form.
+"""
+
+import codecs
+import io
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import chardet  # Requires 'chardet' package
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "utf-8"
+DETECTION_PREFIX_BYTES = 128 * 1024
+_CHUNK_BYTES = 64 * 1024
+# Tried in order after the detected encoding; iso-8859-2 decodes any byte sequence
+FALLBACK_ENCODINGS = ("utf-8", "utf-8-sig", "cp1252", "cp1250", "iso-8859-2")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"  # What str.splitlines splits on
+_INDEX, _TIMESTAMP, _TEXT = range(3)  # Parser states
+_TIMING_RE = re.compile(
+    r"(\d{2}):(\d{2}):(\d{2})[,.](\d{3})\s*--?>\s*(\d{2}):(\d{2}):(\d{2})[,.](\d{3})(.*)"
+)
+
+
+class SrtCue:
+    """One subtitle entry; ``extra`` keeps anything after the end time (e.g. 'X1:..')."""
+
+    __slots__ = ("end_ms", "extra", "index", "start_ms", "text")
+
+    def __init__(self, index: int, start_ms: int, end_ms: int, text: str, extra: str = "") -> None:
+        self.index = index
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.text = text
+        self.extra = extra
+
+    def timing_line(self) -> str:
+        line = f"{format_timestamp(self.start_ms)} --> {format_timestamp(self.end_ms)}"
+        return f"{line} {self.extra}" if self.extra else line
+
+    def with_text(self, text: str) -> "SrtCue":
+        return SrtCue(self.index, self.start_ms, self.end_ms, text, self.extra)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SrtCue):
+            return NotImplemented
+        return (self.index, self.start_ms, self.end_ms, self.text, self.extra) == (
+            other.index,
+            other.start_ms,
+            other.end_ms,
+            other.text,
+            other.extra,
+        )
+
+    __hash__ = None  # type: ignore[assignment]  # Mutable record
+
+    def __repr__(self) -> str:
+        return f"SrtCue({self.index}, {self.timing_line()!r}, {self.text[:40]!r})"
+
+
+# --- Timestamps ---
+
+
+_PAD2 = tuple(f"{n:02d}" for n in range(100))
+_PAD3 = tuple(f"{n:03d}" for n in range(1000))
+
+
+def format_timestamp(ms: int) -> str:
+    """Milliseconds -> 'HH:MM:SS,mmm'."""
+    if ms <= 0:
+        return "00:00:00,000"
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    hh = _PAD2[hours] if hours < 100 else str(hours)
+    return f"{hh}:{_PAD2[minutes]}:{_PAD2[seconds]},{_PAD3[millis]}"
+
+
+def parse_timing_line(line: str) -> tuple[int, int, str] | None:
+    """'00:00:01,000 --> 00:00:02,500' -> (1000, 2500, extra), or None if not a timing line."""
+    match = _TIMING_RE.match(line.strip())
+    if not match:
+        return None
+    h1, m1, s1, f1, h2, m2, s2, f2, extra = match.groups()
+    start = ((int(h1) * 60 + int(m1)) * 60 + int(s1)) * 1000 + int(f1)
+    end = ((int(h2) * 60 + int(m2)) * 60 + int(s2)) * 1000 + int(f2)
+    return start, end, extra.strip()
+
+
+# --- Encoding detection and decoding ---
+
+
+def detect_encoding_from_prefix(prefix: bytes, default: str = DEFAULT_ENCODING) -> str:
+    """
+    Detects the encoding from the first bytes of a file: BOM, then a strict UTF-8
+    check (cheap, and what most subtitles are), then chardet for legacy code pages.
+    """
+    for bom, bom_encoding in _BOMS:
+        if prefix.startswith(bom):
+            return bom_encoding
+    if not prefix:
+        return default
+    try:
+        # final=False: the prefix may end inside a multibyte character
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        result = chardet.detect(prefix)
+    except Exception as e:
+        logger.warning(f"Could not detect encoding: {e}. Falling back to '{default}'.")
+        return default
+    encoding, confidence = result.get("encoding"), result.get("confidence") or 0.0
+
+    # Use default for low confidence or None
+    if encoding is None or confidence < 0.75:
+        logger.debug(
+            f"Chardet detected {encoding} with low confidence ({confidence:.2f}). Falling back to '{default}'."
+        )
+        return default
+    # Handle common misdetections or aliases
+    if encoding.lower() == "ascii":
+        return "utf-8"
+    if encoding.lower() in ("iso-8859-1", "windows-1252"):
+        # Often interchangeable with Windows-1252, but 1252 is more common for subs
+        return "cp1252"
+    return encoding
+
+
+def _candidate_encodings(detected: str) -> list[str]:
+    return list(dict.fromkeys((detected, *FALLBACK_ENCODINGS)))
+
+
+def _decoder_for(encodings: list[str], data: bytes, final: bool) -> tuple[int, Any, str]:
+    """First encoding (from ``encodings``) that strictly decodes ``data``: (position, decoder, text)."""
+    for position, encoding in enumerate(encodings):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+            return position, decoder, decoder.decode(data, final=final)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    raise UnicodeDecodeError("srt", data[:1], 0, 1, f"none of {encodings} could decode")
+
+
+def iter_decoded_chunks(stream: BinaryIO, default: str = DEFAULT_ENCODING) -> Iterator[str]:
+    """
+    Decodes a binary stream chunk by chunk. The encoding is chosen on the first
+    chunk; if a later chunk is invalid in it, decoding continues with the next
+    candidate that accepts that chunk (logged), without re-reading the stream.
+    """
+    prefix = stream.read(DETECTION_PREFIX_BYTES)
+    encodings = _candidate_encodings(detect_encoding_from_prefix(prefix, default))
+    chunk = prefix
+    final = len(prefix) < DETECTION_PREFIX_BYTES
+    position, decoder, text = _decoder_for(encodings, chunk, final)
+    logger.debug(f"Decoding SRT as '{encodings[position]}'.")
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    yield text
+
+    while not final:
+        chunk = stream.read(_CHUNK_BYTES)
+        final = len(chunk) < _CHUNK_BYTES
+        try:
+            text = decoder.decode(chunk, final=final)
+        except UnicodeDecodeError:
+            pending, _ = decoder.getstate()
+            remaining = encodings[position + 1 :]
+            offset, decoder, text = _decoder_for(remaining, pending + chunk, final)
+            position += offset + 1
+            logger.warning(
+                f"SRT is not valid '{encodings[position - offset - 1]}' past the detection prefix; "
+                f"decoding the rest as '{encodings[position]}'."
+            )
+        yield text
+
+
+def decode_srt_bytes(data: bytes, default: str = DEFAULT_ENCODING) -> str:
+    """Decodes in-memory subtitle bytes (e.g. a download) in one pass."""
+    return "".join(iter_decoded_chunks(io.BytesIO(data), default))
+
+
+def read_srt_text(file_path: str | Path) -> str:
+    """Reads and decodes an SRT file in one pass. Raises FileNotFoundError/UnicodeDecodeError."""
+    with Path(file_path).open("rb") as stream:
+        return "".join(iter_decoded_chunks(stream))
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Splits decoded chunks into lines (without line endings), like str.splitlines."""
+    pending = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        lines = pending.splitlines(keepends=True)
+        last = lines[-1]
+        # Keep an unterminated line, or a trailing '\r' that may be half of '\r\n'
+        if last[-1] not in _LINE_BREAKS or last[-1] == "\r":
+            pending = lines.pop()
+        else:
+            pending = ""
+        for line in lines:
+            yield line.rstrip(_LINE_BREAKS)
+    if pending:
+        yield pending.rstrip(_LINE_BREAKS)
+
+
+# --- Parsing ---
+
+
+def iter_cues(lines: Iterable[str]) -> Iterator[SrtCue]:
+    """
+    Parses SRT lines into cues. Malformed blocks are skipped with a warning:
+    a non-numeric line where an index is expected is ignored, and an index not
+    followed by a timing line discards the block.
+    """
+    match_timing = _TIMING_RE.match
+    index = 0
+    start_ms = end_ms = 0
+    extra = ""
+    text_lines: list[str] = []
+    state = _INDEX
+
+    for line_num, line in enumerate(lines, 1):
+        stripped_line = line.strip()
+
+        # Ordered by frequency: most lines are cue text
+        if state == _TEXT:
+            if stripped_line:
+                text_lines.append(line)
+            else:  # Blank line marks the end of the text block
+                yield SrtCue(index, start_ms, end_ms, "\n".join(text_lines), extra)
+                text_lines = []
+                state = _INDEX
+
+        elif state == _INDEX:
+            if stripped_line.isdigit() and stripped_line.isascii():
+                index = int(stripped_line)
+                state = _TIMESTAMP
+            elif stripped_line:
+                logger.warning(
+                    f"SRT Parse (Line {line_num}): Expected index number, found: '{line}'. Skipping line."
+                )
+
+        elif match := match_timing(stripped_line):
+            h1, m1, s1, f1, h2, m2, s2, f2, tail = match.groups()
+            start_ms = int(h1) * 3_600_000 + int(m1) * 60_000 + int(s1) * 1000 + int(f1)
+            end_ms = int(h2) * 3_600_000 + int(m2) * 60_000 + int(s2) * 1000 + int(f2)
+            extra = tail.strip()
+            state = _TEXT
+        elif stripped_line:
+            logger.warning(
+                f"SRT Parse (Line {line_num}): Expected timestamp 'HH:MM:SS,ms --> HH:MM:SS,ms', found: '{line}'. Resetting segment."
+            )
+            state = _INDEX
+
+    # Last cue if the file doesn't end with a blank line
+    if state == _TEXT and text_lines:
+        yield SrtCue(index, start_ms, end_ms, "\n".join(text_lines), extra)
+
+
+def parse_srt(content: str) -> list[SrtCue]:
+    """Parses SRT text into cues."""
+    if not isinstance(content, str):
+        logger.error("SRT parsing failed: Input content is not a string.")
+        return []
+    return list(iter_cues(content.removeprefix("\ufeff").splitlines()))
+
+
+def iter_srt_file(file_path: str | Path) -> Iterator[SrtCue]:
+    """Streams the cues of an SRT file without holding its text in memory."""
+    with Path(file_path).open("rb") as stream:
+        yield from iter_cues(iter_lines(iter_decoded_chunks(stream)))
+
+
+# --- Writing ---
+
+
+def iter_srt_blocks(cues: Iterable[SrtCue]) -> Iterator[str]:
+    """Yields each cue as an SRT block ('index\\ntiming\\ntext'), without separators."""
+    for cue in cues:
+        yield f"{cue.index}\n{cue.timing_line()}\n{cue.text}"
+
+
+def compose_srt(cues: Iterable[SrtCue]) -> str:
+    """Serializes cues with one blank line between entries and a single trailing newline."""
+    result = "\n\n".join(iter_srt_blocks(cues))
+    return result.rstrip() + "\n" if result else ""
+
+
+__all__ = [
+    "SrtCue",
+    "compose_srt",
+    "decode_srt_bytes",
+    "detect_encoding_from_prefix",
+    "format_timestamp",
+    "iter_cues",
+    "iter_decoded_chunks",
+    "iter_lines",
+    "iter_srt_blocks",
+    "iter_srt_file",
+    "parse_srt",
+    "parse_timing_line",
+    "read_srt_text",
+]
@@ -1,7 +1,11 @@
 import logging
 import os
 import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 # Import constants and other utilities safely
@@ -111,7 +115,7 @@ except Exception as e:
 
 
 # --- Candidate Scoring ---
-def score_candidate(  # noqa: C901
+def score_candidate(
     candidate: dict[str, Any],
     media_tokens: list[str],
     media_basename: str,
@@ -123,6 +127,9 @@ def score_candidate(  # noqa: C901
     Scores a subtitle candidate dictionary against media file info.
     Handles different sources (OpenSubtitles, Subs.ro) and language priority.
 
+    Prefer `MediaMatchProfile.score_candidates` when scoring many candidates
+    against the same media file.
+
     Args:
         candidate (dict): Dictionary representing the subtitle candidate.
                           Expected keys: 'source', 'id', 'language', 'extracted_path' (for subsro),
@@ -137,6 +144,21 @@ def score_candidate(  # noqa: C901
         tuple or None: (score, priority, candidate) if scoring is successful and meets criteria,
                        otherwise None.
     """
+    profile = MediaMatchProfile.from_filename(media_basename, media_tokens)
+    return profile.score_candidate(
+        candidate, required_language, check_episode=bool(media_e), media_s=media_s
+    )
+
+
+def _score_candidate(  # noqa: C901
+    profile: "MediaMatchProfile",
+    candidate: dict[str, Any],
+    required_language: str,
+    check_episode: bool,
+    media_s: str | None,
+    tokenize: Any,
+) -> tuple[float, int, dict[str, Any]] | None:
+    """Body of `score_candidate`; ``tokenize`` may be a memoized `tokenize_and_normalize`."""
     source = candidate.get("source")
     language = candidate.get("language")  # Should be 2-letter code
     identifier = candidate.get("id")
@@ -171,12 +193,12 @@ def score_candidate(  # noqa: C901
     # If it's a TV episode (media_e is not None) and the subtitle doesn't match, skip it
     # Only perform check if name_for_episode_check is valid
     if (
-        media_e
+        check_episode
         and name_for_episode_check
-        and not is_matching_episode(media_basename, name_for_episode_check)
+        and not profile.matches_episode(name_for_episode_check)
     ):
         logging.debug(
-            f"Skipping candidate {source} '{identifier}' (Lang: {language}, Prio: {priority}): Episode mismatch based on '{name_for_episode_check}'. Media: S{media_s or '?'}E{media_e}"
+            f"Skipping candidate {source} '{identifier}' (Lang: {language}, Prio: {priority}): Episode mismatch based on '{name_for_episode_check}'. Media: S{media_s or '?'}E{profile.episode}"
         )
         return None  # Skip this candidate entirely
 
@@ -199,9 +221,9 @@ def score_candidate(  # noqa: C901
                     f"OpenSubtitles candidate {identifier} has no usable name for scoring."
                 )
             else:
-                subtitle_tokens = tokenize_and_normalize(name_for_scoring)
+                subtitle_tokens = tokenize(name_for_scoring)
                 if subtitle_tokens:
-                    score = calculate_match_score(media_tokens, subtitle_tokens)
+                    score = profile.score_tokens(subtitle_tokens)
                 else:
                     score = 0  # No tokens to match
 
@@ -226,27 +248,15 @@ def score_candidate(  # noqa: C901
                 # Score based on the extracted filename
                 extracted_filename = Path(extracted_path).name
                 sub_base_name_no_ext = Path(extracted_filename).stem
-                name_for_scoring = sub_base_name_no_ext  # Start with base name
-
-                # Attempt to remove language code suffix for potentially better scoring
-                # This uses the language already determined for the candidate
-                if language:
-                    pattern_to_remove = r"[._-]" + re.escape(language.lower()) + r"$"
-                    # Check if the pattern actually exists at the end before removing
-                    if re.search(pattern_to_remove, sub_base_name_no_ext, flags=re.IGNORECASE):
-                        temp_name_for_scoring = re.sub(
-                            pattern_to_remove, "", sub_base_name_no_ext, flags=re.IGNORECASE
-                        ).strip("._- ")
-                        # Only use the cleaned name if it's not empty
-                        if temp_name_for_scoring:
-                            name_for_scoring = temp_name_for_scoring
-                            logging.debug(
-                                f"  Using language-removed name for Subs.ro scoring: '{name_for_scoring}'"
-                            )
-
-                subtitle_tokens = tokenize_and_normalize(name_for_scoring)
+                name_for_scoring = _strip_language_suffix(sub_base_name_no_ext, language)
+                if name_for_scoring != sub_base_name_no_ext:
+                    logging.debug(
+                        f"  Using language-removed name for Subs.ro scoring: '{name_for_scoring}'"
+                    )
+
+                subtitle_tokens = tokenize(name_for_scoring)
                 if subtitle_tokens:
-                    score = calculate_match_score(media_tokens, subtitle_tokens)
+                    score = profile.score_tokens(subtitle_tokens)
                 else:
                     score = 1  # Minimal score if tokens fail but path exists
 
@@ -285,8 +295,202 @@ def score_candidate(  # noqa: C901
     return result_tuple
 
 
+def _strip_language_suffix(name: str, language: str | None) -> str:
+    """Removes a trailing '.ro' / '_en' style language code, unless nothing would be left."""
+    if not language:
+        return name
+    pattern_to_remove = r"[._-]" + re.escape(language.lower()) + r"$"
+    if re.search(pattern_to_remove, name, flags=re.IGNORECASE):
+        cleaned_name = re.sub(pattern_to_remove, "", name, flags=re.IGNORECASE).strip("._- ")
+        if cleaned_name:
+            return cleaned_name
+    return name
+
+
+# --- Media Match Profile ---
+
+_RESOLUTION_RE = re.compile(r"^(?:\d{3,4}[pi]|[248]k|uhd)$")
+_RELEASE_GROUP_RE = re.compile(r"-([A-Za-z0-9]+)(?:\[[^\]]*\])?$")
+_SOURCE_CATEGORIES = (
+    "Rips from Physical Media",
+    "Digital and Streaming Rips",
+    "Specific Streaming Service Sources",
+    "Broadcast Captures",
+    "Camcorder and Screeners",
+)
+
+
+@lru_cache(maxsize=8192)
+def _token_weights(token: str) -> tuple[tuple[str, int], ...]:
+    """(category, weight) for every priority criterion matching a token, in scoring order."""
+    weights = constants.category_weights if isinstance(constants.category_weights, dict) else {}
+    matches: list[tuple[str, int]] = []
+    for category, patterns in compiled_patterns.items():
+        category_weight = weights.get(category)
+        if category_weight is None:
+            continue  # Skip if no weight defined
+        matches.extend((category, category_weight) for pattern in patterns if pattern.search(token))
+    return tuple(matches)
+
+
+def _token_bonus(token: str) -> int:
+    return sum(weight for _, weight in _token_weights(token))
+
+
+@dataclass(frozen=True, slots=True)
+class MediaMatchProfile:
+    """
+    What the scorers need to know about one media file, computed once per video.
+
+    Holds the media tokens (and the weighted category bonus of each), the
+    season/episode parsed from the filename and the descriptive release tags.
+    Candidates are scored against the precomputed token set instead of
+    re-tokenizing the media name and re-running the episode regexes each time.
+    """
+
+    basename: str
+    tokens: tuple[str, ...]
+    token_set: frozenset[str]
+    token_bonus: Mapping[str, int]
+    season: str | None
+    episode: str | None
+    release_group: str | None
+    resolution: str | None
+    source_tags: frozenset[str]
+
+    @classmethod
+    def from_filename(
+        cls, media_filename: str, media_tokens: Iterable[str] | None = None
+    ) -> "MediaMatchProfile":
+        basename = Path(media_filename).name
+        stem = Path(basename).stem
+        tokens = tuple(media_tokens if media_tokens is not None else tokenize_and_normalize(stem))
+        season, episode = extract_season_episode(basename)
+        group_match = _RELEASE_GROUP_RE.search(stem)
+        return cls(
+            basename=basename,
+            tokens=tokens,
+            token_set=frozenset(tokens),
+            token_bonus=MappingProxyType({token: _token_bonus(token) for token in set(tokens)}),
+            season=season,
+            episode=episode,
+            release_group=group_match.group(1).lower() if group_match else None,
+            resolution=next((t for t in tokens if _RESOLUTION_RE.match(t)), None),
+            source_tags=frozenset(
+                token
+                for token in tokens
+                if any(category in _SOURCE_CATEGORIES for category, _ in _token_weights(token))
+            ),
+        )
+
+    def describe(self) -> str:
+        episode = f"S{self.season or '??'}E{self.episode}" if self.episode else "movie"
+        tags = ",".join(sorted(self.source_tags)) or "-"
+        return (
+            f"{episode} res={self.resolution or '-'} source={tags} "
+            f"group={self.release_group or '-'}"
+        )
+
+    def score_tokens(self, subtitle_tokens: Iterable[str]) -> int:
+        """Same result as `calculate_match_score(self.tokens, subtitle_tokens)`."""
+        if not self.tokens:
+            return 0
+        common_tokens = self.token_set.intersection(subtitle_tokens)
+        return len(common_tokens) * 5 + sum(self.token_bonus[token] for token in common_tokens)
+
+    def matches_episode(self, subtitle_filename: str | None) -> bool:
+        """Same result as `is_matching_episode(self.basename, subtitle_filename)`."""
+        if not subtitle_filename:
+            return False
+        return _episodes_match(self.basename, self.season, self.episode, subtitle_filename)
+
+    def score_candidate(
+        self,
+        candidate: dict[str, Any],
+        required_language: str,
+        check_episode: bool | None = None,
+        media_s: str | None = None,
+    ) -> tuple[float, int, dict[str, Any]] | None:
+        """
+        Scores one candidate like `score_candidate`. The episode check runs when
+        ``check_episode`` is true (default: when the filename has an episode).
+        """
+        if check_episode is None:
+            check_episode = bool(self.episode)
+        return _score_candidate(
+            self,
+            candidate,
+            required_language,
+            check_episode,
+            media_s if media_s is not None else self.season,
+            tokenize_and_normalize,
+        )
+
+    def score_candidates(
+        self,
+        candidates: Iterable[dict[str, Any]],
+        required_language: str,
+        check_episode: bool | None = None,
+        media_s: str | None = None,
+    ) -> list[tuple[float, int, dict[str, Any]] | None]:
+        """
+        Scores a batch of candidates in one pass; results are in input order and
+        None marks a disqualified (or unscorable) candidate. Names shared by several results
+        (the same release uploaded in several files) are tokenized once.
+        """
+        if check_episode is None:
+            check_episode = bool(self.episode)
+        if media_s is None:
+            media_s = self.season
+        token_cache: dict[str, list[str]] = {}
+
+        def tokenize(name: str) -> list[str]:
+            tokens = token_cache.get(name)
+            if tokens is None:
+                tokens = token_cache[name] = tokenize_and_normalize(name)
+            return tokens
+
+        results: list[tuple[float, int, dict[str, Any]] | None] = []
+        for candidate in candidates:
+            try:
+                results.append(
+                    _score_candidate(
+                        self, candidate, required_language, check_episode, media_s, tokenize
+                    )
+                )
+            except Exception:
+                candidate_id_repr = str(candidate.get("id", "N/A"))[:80]  # Truncate long URLs
+                logger.exception(
+                    f"Error scoring candidate {candidate.get('source')} {candidate_id_repr}."
+                )
+                results.append(None)
+        return results
+
+
+@lru_cache(maxsize=256)
+def get_media_profile(media_filename: str) -> MediaMatchProfile:
+    """Cached `MediaMatchProfile.from_filename`; profiles are immutable and shared freely."""
+    return MediaMatchProfile.from_filename(media_filename)
+
+
 # --- Filename Parsing ---
 
+_SEPARATORS_RE = re.compile(r"[._-]+")
+# Patterns ranked by specificity (Season+Episode first)
+_SEASON_EPISODE_PATTERNS = (
+    # S01 E02 / S01.E02 / S01-E02 / S01E02 (Season mandatory)
+    re.compile(r"\bS(\d{1,3})\s?E(\d{1,3})\b", re.IGNORECASE),
+    # 1x02 / 1 x 02 (Season mandatory)
+    re.compile(r"\b(\d{1,3})\s?x\s?(\d{1,3})\b", re.IGNORECASE),
+    # Season 1 Episode 2 (Season optional if already found by other patterns)
+    re.compile(r"\b(?:Season\s)?(\d{1,3})\s(?:Episode|Ep)\s(\d{1,3})\b", re.IGNORECASE),
+)
+# Episode-only patterns (lower priority)
+_EPISODE_ONLY_PATTERNS = (
+    # E01 / Ep 01 / Episode 01
+    re.compile(r"\bE[Pp]?(?:isode)?\s?(\d{1,3})\b", re.IGNORECASE),
+)
+
 
 def extract_season_episode(filename: str | None) -> tuple[str | None, str | None]:
     """
@@ -300,27 +504,12 @@ def extract_season_episode(filename: str | None) -> tuple[str | None, str | None
     # Clean filename: remove extension, replace separators
     base_name = Path(filename).stem
     # Replace common separators with a space for easier regex
-    clean_name = re.sub(r"[._-]+", " ", base_name)
-
-    # Patterns ranked by specificity (Season+Episode first)
-    patterns = [
-        # S01 E02 / S01.E02 / S01-E02 / S01E02 (Season mandatory)
-        re.compile(r"\bS(\d{1,3})\s?E(\d{1,3})\b", re.IGNORECASE),
-        # 1x02 / 1 x 02 (Season mandatory)
-        re.compile(r"\b(\d{1,3})\s?x\s?(\d{1,3})\b", re.IGNORECASE),
-        # Season 1 Episode 2 (Season optional if already found by other patterns)
-        re.compile(r"\b(?:Season\s)?(\d{1,3})\s(?:Episode|Ep)\s(\d{1,3})\b", re.IGNORECASE),
-    ]
-    # Episode-only patterns (lower priority)
-    ep_only_patterns = [
-        # E01 / Ep 01 / Episode 01
-        re.compile(r"\bE[Pp]?(?:isode)?\s?(\d{1,3})\b", re.IGNORECASE),
-    ]
+    clean_name = _SEPARATORS_RE.sub(" ", base_name)
 
     s_match, e_match = None, None
 
     # Try Season+Episode patterns first
-    for pattern in patterns:
+    for pattern in _SEASON_EPISODE_PATTERNS:
         match = pattern.search(clean_name)
         if match:
             s_potential = match.group(1)
@@ -336,7 +525,7 @@ def extract_season_episode(filename: str | None) -> tuple[str | None, str | None
 
     # If no Season+Episode match, try Episode-only patterns
     if not e_match:  # Check if episode wasn't found yet
-        for pattern in ep_only_patterns:
+        for pattern in _EPISODE_ONLY_PATTERNS:
             match = pattern.search(clean_name)
             if match:
                 e_potential = match.group(1)
@@ -362,6 +551,13 @@ def is_matching_episode(media_filename: str | None, subtitle_filename: str | Non
         return False
 
     media_s, media_e = extract_season_episode(media_filename)
+    return _episodes_match(media_filename, media_s, media_e, subtitle_filename)
+
+
+def _episodes_match(
+    media_filename: str, media_s: str | None, media_e: str | None, subtitle_filename: str
+) -> bool:
+    """`is_matching_episode` with the media season/episode already extracted."""
     sub_s, sub_e = extract_season_episode(subtitle_filename)
 
     log_msg_prefix = f"Episode Matching: Media='{media_filename}' (S{media_s or '??'}E{media_e or '??'}) vs Subtitle='{subtitle_filename}' (S{sub_s or '??'}E{sub_e or '??'}) ->"
@@ -443,7 +639,7 @@ def get_subtitle_language_code(filename: str | None) -> str | None:
 # --- Scoring Logic ---
 
 
-def calculate_match_score(media_tokens: list[str], subtitle_tokens: list[str]) -> int:  # noqa: C901
+def calculate_match_score(media_tokens: list[str], subtitle_tokens: list[str]) -> int:
     """
     Calculates a match score based on shared tokens and weighted keywords.
 
@@ -458,60 +654,28 @@ def calculate_match_score(media_tokens: list[str], subtitle_tokens: list[str]) -
         return 0
 
     try:
-        score = 0
-        media_set = set(media_tokens)
-        subtitle_set = set(subtitle_tokens)
-        common_tokens = media_set.intersection(subtitle_set)
+        common_tokens = set(media_tokens).intersection(subtitle_tokens)
 
         # Base score for common tokens (e.g., 5 points per common token)
         base_common_score = len(common_tokens) * 5
-        score += base_common_score
-
-        # Bonus/Penalty points for weighted category matches found in *subtitle* tokens
-        # Only apply bonus if the token is also present in the media tokens (relevant match)
-        weighted_bonus = 0
-        matched_categories = set()
-        processed_tokens_for_bonus = set()  # Avoid double counting bonus for same token
 
         # Ensure category_weights exists and is a dict
         if not isinstance(constants.category_weights, dict):
             logging.error("Category weights not loaded correctly. Weighted scoring disabled.")
-            return score  # Return only base score
-
-        for token in subtitle_tokens:
-            token_processed = False  # Flag if this token gave a bonus this iteration
-            # Check if this token is relevant (present in media too) and hasn't received a bonus yet
-            if token in common_tokens and token not in processed_tokens_for_bonus:
-                for category, patterns in compiled_patterns.items():
-                    category_weight = constants.category_weights.get(category)
-                    if category_weight is None:
-                        continue  # Skip if no weight defined
-
-                    # Skip if this token already got a bonus for this category? No, allow multiple matches per token?
-                    # Let's allow a token to match multiple patterns in *different* categories.
-
-                    for pattern in patterns:
-                        # Use fullmatch or search? Search is more lenient. Let's use search.
-                        if pattern.search(token):
-                            # Apply weight only if the token is common
-                            weighted_bonus += category_weight
-                            matched_categories.add(category)
-                            # logging.debug(f"  Token '{token}' matched category '{category}' (Weight: {category_weight})")
-                            token_processed = True
-                            # Should a token contribute to multiple categories? Yes, potentially.
-                            # Break from pattern loop for this category once matched? Optional.
-                            # break # Break inner pattern loop if one match is enough per category per token
-                # Mark token as processed for bonus if it matched *any* category
-                if token_processed:
-                    processed_tokens_for_bonus.add(token)
-
-        score += weighted_bonus
+            return base_common_score  # Return only base score
+
+        # Bonus/Penalty points for weighted category matches of the common tokens: each
+        # distinct token gets the weight of every criterion it matches, in any category
+        weighted_bonus = sum(_token_bonus(token) for token in common_tokens)
+        score = base_common_score + weighted_bonus
         # Log breakdown only if there was a weighted bonus applied
         if weighted_bonus != 0:
+            matched_categories = {
+                category for token in common_tokens for category, _ in _token_weights(token)
+            }
             logging.debug(
                 f"  Score Breakdown: BaseCommon={base_common_score}, WeightedBonus={weighted_bonus} (Categories: {matched_categories or 'None'}) -> Total={score}"
             )
-        # else: log only base score? Too verbose maybe.
 
         return score
     except Exception as e:
@@ -550,9 +714,9 @@ def find_best_matching_subtitle_local(  # noqa: C901
         return None, -1
 
     media_basename = Path(media_file_path).name
-    media_base_name_no_ext = Path(media_basename).stem
-    media_tokens = tokenize_and_normalize(media_base_name_no_ext)
-    media_s, media_e = extract_season_episode(media_basename)
+    # Cached per media file: archives of the same video reuse one profile
+    profile = get_media_profile(media_basename)
+    media_tokens, media_s, media_e = profile.tokens, profile.season, profile.episode
 
     req_lang_lower = required_language.lower()
     logging.info(
@@ -592,21 +756,12 @@ def find_best_matching_subtitle_local(  # noqa: C901
         priority = lang_priority_map.get(language_code, 3)  # Assign priority
 
         # Skip if episode mismatch for TV shows
-        if media_e and not is_matching_episode(media_basename, sub_filename):
+        if media_e and not profile.matches_episode(sub_filename):
             logging.debug(f"Skipping local '{sub_filename}': Episode mismatch.")
             continue
 
         # Prepare subtitle name for tokenization (remove lang code and extension)
-        sub_base_name_no_ext = Path(sub_filename).stem
-        sub_name_for_scoring = sub_base_name_no_ext
-        if language_code:
-            pattern_to_remove = r"[._-]" + re.escape(language_code) + r"$"
-            if re.search(pattern_to_remove, sub_base_name_no_ext, flags=re.IGNORECASE):
-                cleaned_name = re.sub(
-                    pattern_to_remove, "", sub_base_name_no_ext, flags=re.IGNORECASE
-                ).strip("._- ")
-                if cleaned_name:
-                    sub_name_for_scoring = cleaned_name
+        sub_name_for_scoring = _strip_language_suffix(Path(sub_filename).stem, language_code)
 
         sub_tokens = tokenize_and_normalize(sub_name_for_scoring)
         if not sub_tokens:
@@ -615,7 +770,7 @@ def find_best_matching_subtitle_local(  # noqa: C901
             )
             continue
 
-        score = calculate_match_score(media_tokens, sub_tokens)
+        score = profile.score_tokens(sub_tokens)
         logging.debug(
             f"Scored local '{sub_filename}' (Lang: {language_code or 'Unknown'}, Prio: {priority}): Score={score}"
         )
@@ -651,9 +806,11 @@ def find_best_matching_subtitle_local(  # noqa: C901
 
 # --- Explicit Exports ---
 __all__ = [
+    "MediaMatchProfile",
     "calculate_match_score",
     "extract_season_episode",
     "find_best_matching_subtitle_local",
+    "get_media_profile",
     "get_subtitle_language_code",
     "is_matching_episode",
     "score_candidate",
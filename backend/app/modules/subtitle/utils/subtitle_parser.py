@@ -3,6 +3,8 @@ import logging
 import re
 from urllib.error import URLError  # Import URLError for potential download issues
 
+from app.modules.subtitle.utils import srt_codec
+
 # Import NLTK for sentence tokenization, handle import error gracefully
 # Global flag to track if NLTK is usable
 NLTK_AVAILABLE = False
@@ -173,97 +175,25 @@ def tokenize_and_normalize(text: str | None) -> list[str]:
         return []
 
 
-# --- SRT Parsing/Manipulation Utilities (Used by Translator) ---
-# These are kept as they are used by the Translator service, not just the old processor.
+# --- SRT Parsing/Manipulation Utilities ---
+# Tuple-based views over `srt_codec`, kept for existing callers.
 
 
-def parse_srt_into_segments(srt_content: str) -> list[tuple[str, str, str]]:  # noqa: C901
+def parse_srt_into_segments(srt_content: str) -> list[tuple[str, str, str]]:
     """
     Parses SRT content into a list of (index_line, timestamp_line, subtitle_text).
     Robustly handles formatting variations and potential errors.
-    """
-    segments = []
-    if not isinstance(srt_content, str):
-        logger.error("SRT parsing failed: Input content is not a string.")
-        return segments
-
-    # Pre-process: Ensure basic timestamp format and clean up whitespace
-    srt_content_corrected = ensure_correct_timestamp_format(srt_content.strip())
-    lines = srt_content_corrected.splitlines()
-
-    segment_index = 0
-    current_index_line = None
-    current_ts_line = None
-    current_text_lines: list[str] = []
-    state = "index"  # Possible states: index, timestamp, text
-
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-
-        if state == "index":
-            if re.fullmatch(r"\d+", stripped_line):
-                current_index_line = line  # Keep original line including spacing if any
-                state = "timestamp"
-            elif stripped_line:  # Non-empty, non-numeric line where index was expected
-                logger.warning(
-                    f"SRT Parse (Line {line_num}): Expected index number, found: '{line}'. Skipping line."
-                )
-            # Ignore blank lines when expecting index
-
-        elif state == "timestamp":
-            # Use regex for more flexible timestamp matching (already corrected format)
-            ts_match = re.match(
-                r"\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}", stripped_line
-            )
-            if ts_match:
-                current_ts_line = line  # Keep original line including spacing
-                state = "text"
-            elif stripped_line:  # Non-empty, non-timestamp line where timestamp was expected
-                logger.warning(
-                    f"SRT Parse (Line {line_num}): Expected timestamp 'HH:MM:SS,ms --> HH:MM:SS,ms', found: '{line}'. Resetting segment."
-                )
-                # Reset state and discard the partial segment
-                current_index_line, current_ts_line, current_text_lines = None, None, []
-                state = "index"  # Look for a new index
-            # Ignore blank lines when expecting timestamp
-
-        elif state == "text":
-            if stripped_line:  # Collect non-empty lines as text
-                current_text_lines.append(line)  # Keep original line format
-            else:  # Blank line marks the end of the text block
-                if current_index_line and current_ts_line:
-                    segment_text = "\n".join(current_text_lines)
-                    segments.append((current_index_line, current_ts_line, segment_text))
-                    segment_index += 1
-                else:
-                    # Should not happen if state machine is correct, but safeguard
-                    logger.warning(
-                        f"SRT Parse (Near Line {line_num}): Reached end of text block (blank line) but missing index or timestamp. Discarding collected text: {current_text_lines}"
-                    )
-
-                # Reset for the next segment
-                current_index_line, current_ts_line, current_text_lines = None, None, []
-                state = "index"  # Expect index next
-
-    # Handle the last segment if the file doesn't end with a blank line
-    if state == "text" and current_text_lines:
-        if current_index_line and current_ts_line:
-            segment_text = "\n".join(current_text_lines)
-            segments.append((current_index_line, current_ts_line, segment_text))
-            segment_index += 1
-        else:
-            logger.warning(
-                f"SRT Parse (End of File): Reached EOF while collecting text, but missing index or timestamp. Discarding final text: {current_text_lines}"
-            )
 
-    if not segments and srt_content:
+    Tuple view over `srt_codec.parse_srt`; new code should use the cues directly.
+    """
+    cues = srt_codec.parse_srt(srt_content)
+    if not cues and srt_content:
         logger.warning(
             "SRT parsing resulted in zero segments, although content was provided. Check SRT format."
         )
-    elif segments:
-        logger.info(f"Parsed {len(segments)} SRT segments.")
-
-    return segments
+    elif cues:
+        logger.info(f"Parsed {len(cues)} SRT segments.")
+    return [(str(cue.index), cue.timing_line(), cue.text) for cue in cues]
 
 
 def rebuild_srt_from_segments(segments: list[tuple[str, str, str]]) -> str:
@@ -271,40 +201,19 @@ def rebuild_srt_from_segments(segments: list[tuple[str, str, str]]) -> str:
     Rebuilds an SRT file content string from parsed segments.
     Ensures standard formatting with blank lines between entries.
     """
-    if not segments:
-        return ""
-
-    srt_blocks = []
-    for i, (idx_line, ts_line, text_content) in enumerate(segments):
-        # Basic validation
+    cues = []
+    for i, (idx_line, ts_line, text_content) in enumerate(segments or []):
         idx_str = str(idx_line).strip() if idx_line is not None else ""
-        ts_str = str(ts_line).strip() if ts_line is not None else ""
-        txt_str = str(text_content) if text_content is not None else ""  # Allow empty text
-
-        if not idx_str or "-->" not in ts_str:  # Check if timestamp line looks valid
+        timing = srt_codec.parse_timing_line(str(ts_line)) if ts_line is not None else None
+        if not idx_str.isdigit() or timing is None:
             logger.warning(
-                f"Skipping segment {i + 1} during rebuild due to invalid index ('{idx_str}') or timestamp ('{ts_str}')."
+                f"Skipping segment {i + 1} during rebuild due to invalid index ('{idx_str}') or timestamp ('{ts_line}')."
             )
             continue
-
-        # Use original lines to preserve potential formatting, ensure they end with newline
-        idx_line_fmt = str(idx_line).rstrip("\n") + "\n"
-        ts_line_fmt = str(ts_line).rstrip("\n") + "\n"
-        # Text content might already have internal newlines and should be preserved as is
-        txt_fmt = txt_str
-
-        # Add block: index, timestamp, text (potentially multi-line)
-        srt_blocks.append(f"{idx_line_fmt}{ts_line_fmt}{txt_fmt}")
-
-    # Join blocks with exactly one blank line (two newlines)
-    result = "\n\n".join(srt_blocks)
-
-    # Ensure the final string ends with exactly one newline if there's content
-    if result:
-        # Normalize trailing newlines: strip all trailing whitespace, add one newline
-        result = result.rstrip() + "\n"
-
-    return result
+        start_ms, end_ms, extra = timing
+        text = str(text_content) if text_content is not None else ""  # Allow empty text
+        cues.append(srt_codec.SrtCue(int(idx_str), start_ms, end_ms, text, extra))
+    return srt_codec.compose_srt(cues)
 
 
 # --- Text Chunking (Used by Translator) ---
@@ -407,7 +316,7 @@ __all__ = [
     "chunk_text_for_translation",  # Used by Translator
     "ensure_correct_timestamp_format",
     "fix_diacritics",
-    "parse_srt_into_segments",  # Used by Translator
-    "rebuild_srt_from_segments",  # Used by Translator
+    "parse_srt_into_segments",
+    "rebuild_srt_from_segments",
     "tokenize_and_normalize",
 ]
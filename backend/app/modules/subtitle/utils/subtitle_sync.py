@@ -6,6 +6,9 @@ import shutil
 import subprocess
 import tempfile
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path  # Use pathlib
 
 # Import config safely
@@ -43,6 +46,15 @@ except ImportError:
             pass
 
 
+from app.modules.subtitle.services.media_probe_cache import make_probe_key
+from app.modules.subtitle.services.speech_track_cache import (
+    load_speech_track,
+    speech_segments,
+    speech_track_cache,
+)
+from app.modules.subtitle.utils import srt_codec
+from app.modules.subtitle.utils.sync_offset import estimate_offset
+
 logger = logging.getLogger(__name__)
 
 # --- Configuration ---
@@ -55,6 +67,7 @@ OFFSET_THRESHOLD = getattr(settings, "SUBTITLE_SYNC_OFFSET_THRESHOLD", 1.0)
 FFSUBSYNC_TIMEOUT = getattr(settings, "FFSUBSYNC_TIMEOUT", 300)
 ALASS_TIMEOUT = getattr(settings, "ALASS_TIMEOUT", 300)
 FFSUBSYNC_CHECK_TIMEOUT = getattr(settings, "FFSUBSYNC_CHECK_TIMEOUT", 600)
+NATIVE_OFFSET_MIN_CONFIDENCE = getattr(settings, "SUBTITLE_SYNC_NATIVE_OFFSET_MIN_CONFIDENCE", 0.15)
 
 # --- Helper: Check Tool Availability ---
 # Module-level cache dictionary for tool availability (replaces globals() usage)
@@ -110,6 +123,81 @@ def _is_tool_available(tool_path: str, tool_name: str) -> bool:
     return is_available
 
 
+# --- Speech track reuse (one audio decode per video) ---
+
+
+def _speech_track_key(video_path: Path) -> str | None:
+    if not getattr(settings, "SUBTITLE_SYNC_SPEECH_CACHE_ENABLED", False):
+        return None
+    return make_probe_key(video_path)
+
+
+@dataclass(slots=True)
+class _FfsubsyncReference:
+    args: list[str]  # Reference argument first, then the options that go with it
+    succeeded: bool = False  # Set by the caller once ffsubsync exited with code 0
+
+
+@contextmanager
+def _ffsubsync_reference(video_path: Path) -> Iterator[_FfsubsyncReference]:
+    """
+    Yields the reference arguments for an ffsubsync run against `video_path`.
+
+    With a cached speech track for the video this is just the .npz, so ffsubsync
+    skips the audio decode. Otherwise the video is passed (through a link in the
+    cache's staging area) with --serialize-speech. The track ffsubsync writes is
+    stored for the following runs only if the caller marks the run as
+    succeeded; after a failure, timeout or kill it may be incomplete.
+    """
+    key = _speech_track_key(video_path)
+    if key is None:  # Cache disabled, or the video could not be probed
+        yield _FfsubsyncReference([str(video_path), "--reference-stream", "audio"])
+        return
+    cached_track = speech_track_cache.get(key)
+    if cached_track is not None:
+        logging.debug(f"Using cached speech track for '{video_path.name}'.")
+        yield _FfsubsyncReference([str(cached_track)])
+        return
+
+    staged_reference = speech_track_cache.staging_reference(key, video_path)
+    if staged_reference is None:
+        yield _FfsubsyncReference([str(video_path), "--reference-stream", "audio"])
+        return
+    reference = _FfsubsyncReference(
+        [str(staged_reference), "--reference-stream", "audio", "--serialize-speech"]
+    )
+    try:
+        yield reference
+    finally:
+        if not reference.succeeded:
+            speech_track_cache.discard(staged_reference)
+        elif speech_track_cache.store(key, staged_reference) is not None:
+            logging.debug(f"Stored speech track for '{video_path.name}'.")
+
+
+def _write_speech_reference_srt(video_path: Path, output_path: Path) -> bool:
+    """Writes the cached speech track of a video as an SRT of speech intervals (alass reference)."""
+    key = _speech_track_key(video_path)
+    cached_track = speech_track_cache.get(key) if key else None
+    if cached_track is None:
+        return False
+    try:
+        segments = speech_segments(load_speech_track(cached_track))
+        if not segments:
+            return False
+        output_path.write_text(
+            srt_codec.compose_srt(
+                srt_codec.SrtCue(n, start_ms, end_ms, "...")
+                for n, (start_ms, end_ms) in enumerate(segments, start=1)
+            ),
+            encoding="utf-8",
+        )
+    except Exception as e:
+        logging.warning(f"Could not build speech reference for '{video_path.name}': {e}")
+        return False
+    return True
+
+
 # --- Synchronization Functions ---
 
 
@@ -152,86 +240,89 @@ def check_offset_with_ffsubsync(video_file: str, subtitle_file: str) -> float |
     start_time = time.monotonic()
     offset = None  # Default to None (failure)
 
-    try:
-        # Run ffsubsync without --check-only, parse output for offset
-        command = [
-            FFSUBSYNC_PATH,
-            str(video_path),
-            "-i",
-            subtitle_file,
-            # '--max-offset-seconds', '60', # Limit search range
-            "--reference-stream",
-            "audio",
-            # '--no-fix-framerate',
-            # '--gss-num-workers=1',
-        ]
-        # Add optional arguments if needed (e.g., for debugging or performance)
-        # command.extend(['--log-level', 'debug'])
-        # command.extend(['--max-offset-seconds', '60'])
-        # command.extend(['--gss-num-workers', '1']) # Limit workers if causing issues
-
-        logging.debug(f"Running command: {' '.join(command)}")
-        check_timeout = FFSUBSYNC_CHECK_TIMEOUT
-        logging.debug(f"Using offset check timeout: {check_timeout} seconds")
+    with _ffsubsync_reference(video_path) as reference:
+        reference_args = reference.args
+        try:
+            # Run ffsubsync without --check-only, parse output for offset.
+            # The reference is the cached speech track when there is one.
+            command = [
+                FFSUBSYNC_PATH,
+                reference_args[0],
+                "-i",
+                subtitle_file,
+                *reference_args[1:],
+                # '--max-offset-seconds', '60', # Limit search range
+                # '--no-fix-framerate',
+                # '--gss-num-workers=1',
+            ]
+            # Add optional arguments if needed (e.g., for debugging or performance)
+            # command.extend(['--log-level', 'debug'])
+            # command.extend(['--max-offset-seconds', '60'])
+            # command.extend(['--gss-num-workers', '1']) # Limit workers if causing issues
+
+            logging.debug(f"Running command: {' '.join(command)}")
+            check_timeout = FFSUBSYNC_CHECK_TIMEOUT
+            logging.debug(f"Using offset check timeout: {check_timeout} seconds")
+
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                check=False,  # Don't raise on error, check manually
+                encoding="utf-8",
+                errors="replace",
+                timeout=check_timeout,  # Apply specific check timeout
+            )
+            # Combine stdout and stderr for parsing
+            output = result.stdout + "\n" + result.stderr
+            logging.debug(f"ffsubsync offset check exit code: {result.returncode}")
+            reference.succeeded = result.returncode == 0
+            # Log more output for debugging failures
+            if result.returncode != 0 or "shifting subtitles by" not in output.lower():
+                logging.debug(
+                    f"ffsubsync offset check output:\n{output[:3000]}..."
+                )  # Log more on potential failure
 
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=False,  # Don't raise on error, check manually
-            encoding="utf-8",
-            errors="replace",
-            timeout=check_timeout,  # Apply specific check timeout
-        )
-        # Combine stdout and stderr for parsing
-        output = result.stdout + "\n" + result.stderr
-        logging.debug(f"ffsubsync offset check exit code: {result.returncode}")
-        # Log more output for debugging failures
-        if result.returncode != 0 or "shifting subtitles by" not in output.lower():
-            logging.debug(
-                f"ffsubsync offset check output:\n{output[:3000]}..."
-            )  # Log more on potential failure
-
-        # Parse offset from standard sync output patterns
-        # Look for "shifting subtitles by [number] seconds"
-        offset_match = re.search(
-            r"shifting subtitles by\s*([-+]?\d*\.?\d+)\s*seconds", output, re.IGNORECASE
-        )
+            # Parse offset from standard sync output patterns
+            # Look for "shifting subtitles by [number] seconds"
+            offset_match = re.search(
+                r"shifting subtitles by\s*([-+]?\d*\.?\d+)\s*seconds", output, re.IGNORECASE
+            )
 
-        if offset_match:
-            offset = float(offset_match.group(1))
-            logging.info(f"Detected offset via ffsubsync output: {offset:.3f} seconds.")
-        else:
-            # If command finished with non-zero code and no offset found -> Failure
-            if result.returncode != 0:
-                logging.error(
-                    f"ffsubsync offset check command failed (exit code {result.returncode}) and no offset info found in output."
-                )
-                offset = None  # Ensure failure state
-            # If command finished with zero code and no offset found -> Assume 0.0 offset
+            if offset_match:
+                offset = float(offset_match.group(1))
+                logging.info(f"Detected offset via ffsubsync output: {offset:.3f} seconds.")
             else:
-                logging.info(
-                    "No offset shift message detected in ffsubsync output (assuming 0.0s)."
-                )
-                offset = 0.0
+                # If command finished with non-zero code and no offset found -> Failure
+                if result.returncode != 0:
+                    logging.error(
+                        f"ffsubsync offset check command failed (exit code {result.returncode}) and no offset info found in output."
+                    )
+                    offset = None  # Ensure failure state
+                # If command finished with zero code and no offset found -> Assume 0.0 offset
+                else:
+                    logging.info(
+                        "No offset shift message detected in ffsubsync output (assuming 0.0s)."
+                    )
+                    offset = 0.0
 
-    except subprocess.TimeoutExpired:
-        logging.error(
-            f"ffsubsync offset check timed out after {check_timeout} seconds for '{sub_basename}'."
-        )
-        offset = None
-    except FileNotFoundError:
-        logging.error(f"'{FFSUBSYNC_PATH}' command not found during execution.")
-        _ffsubsync_available = False  # Update cache
-        offset = None
-    except Exception as e:
-        logging.error(
-            f"Error checking offset with ffsubsync for '{sub_basename}': {e}", exc_info=True
-        )
-        offset = None
-    finally:
-        duration = time.monotonic() - start_time
-        logging.debug(f"Offset check for '{sub_basename}' took {duration:.2f} seconds.")
+        except subprocess.TimeoutExpired:
+            logging.error(
+                f"ffsubsync offset check timed out after {check_timeout} seconds for '{sub_basename}'."
+            )
+            offset = None
+        except FileNotFoundError:
+            logging.error(f"'{FFSUBSYNC_PATH}' command not found during execution.")
+            _ffsubsync_available = False  # Update cache
+            offset = None
+        except Exception as e:
+            logging.error(
+                f"Error checking offset with ffsubsync for '{sub_basename}': {e}", exc_info=True
+            )
+            offset = None
+        finally:
+            duration = time.monotonic() - start_time
+            logging.debug(f"Offset check for '{sub_basename}' took {duration:.2f} seconds.")
 
     return offset
 
@@ -383,9 +474,19 @@ def sync_with_alass(video_file: str, subtitle_file: str, synced_output_path: str
         logging.error(f"alass: Subtitle not found {sub_p}")
         return False
 
+    # Align against the video's cached speech intervals instead of decoding its audio again
+    reference = video_p
+    speech_reference = output_p.with_name(f"{output_p.stem}_speech_reference.srt")
+    if _write_speech_reference_srt(video_p.resolve(), speech_reference):
+        logging.debug("alass: using the cached speech track as reference.")
+        reference = speech_reference
+
     logging.info("Attempting subtitle sync with alass-cli...")
-    command = [ALASS_CLI_PATH, str(video_p), str(sub_p), str(output_p)]
-    return _run_sync_tool(command, "alass", ALASS_TIMEOUT)
+    command = [ALASS_CLI_PATH, str(reference), str(sub_p), str(output_p)]
+    try:
+        return _run_sync_tool(command, "alass", ALASS_TIMEOUT)
+    finally:
+        speech_reference.unlink(missing_ok=True)
 
 
 def sync_with_ffsubsync(video_file: str, subtitle_file: str, synced_output_path: str) -> bool:
@@ -410,19 +511,45 @@ def sync_with_ffsubsync(video_file: str, subtitle_file: str, synced_output_path:
         return False
 
     logging.info("Attempting subtitle sync with ffsubsync...")
-    command = [
-        FFSUBSYNC_PATH,
-        str(video_p),
-        "-i",
-        str(sub_p),
-        "-o",
-        str(output_p),
-        # Consider adding/removing optional args based on performance/accuracy needs
-        # '--max-offset-seconds', '60', # Limit search range? Default is 300
-        # '--vad', 'google', # Use google VAD if installed? (pip install webrtcvad-wheels)
-    ]
-    # Use the FULL sync timeout here
-    return _run_sync_tool(command, "ffsubsync", FFSUBSYNC_TIMEOUT)
+    with _ffsubsync_reference(video_p.resolve()) as reference:
+        command = [
+            FFSUBSYNC_PATH,
+            reference.args[0],
+            "-i",
+            str(sub_p),
+            "-o",
+            str(output_p),
+            *reference.args[1:],
+            # Consider adding/removing optional args based on performance/accuracy needs
+            # '--max-offset-seconds', '60', # Limit search range? Default is 300
+            # '--vad', 'google', # Use google VAD if installed? (pip install webrtcvad-wheels)
+        ]
+        # Use the FULL sync timeout here
+        reference.succeeded = _run_sync_tool(command, "ffsubsync", FFSUBSYNC_TIMEOUT)
+        return reference.succeeded
+
+
+def _check_initial_offset(video_path: Path, sub_path: Path) -> float | None:
+    """
+    Offset of the subtitle against the audio, estimated in-process when possible.
+
+    A confident in-process estimate (see `sync_offset`) answers directly; an
+    ambiguous or failed one falls back to the ffsubsync check.
+    """
+    if getattr(settings, "SUBTITLE_SYNC_NATIVE_OFFSET_ENABLED", False):
+        estimate = estimate_offset(video_path, sub_path)
+        if estimate is not None and estimate.confidence >= NATIVE_OFFSET_MIN_CONFIDENCE:
+            logging.info(
+                f"Estimated offset for '{sub_path.name}': {estimate.offset_s:.3f}s "
+                f"(confidence {estimate.confidence:.2f})."
+            )
+            return estimate.offset_s
+        if estimate is not None:
+            logging.info(
+                f"Offset estimate for '{sub_path.name}' is ambiguous "
+                f"(confidence {estimate.confidence:.2f}). Checking with ffsubsync."
+            )
+    return check_offset_with_ffsubsync(str(video_path), str(sub_path))
 
 
 def sync_subtitles_with_audio(video_file_path: str, subtitle_file_path: str) -> str:  # noqa: C901
@@ -456,7 +583,7 @@ def sync_subtitles_with_audio(video_file_path: str, subtitle_file_path: str) ->
     logging.info(f"Starting subtitle synchronization process for '{sub_basename}'")
 
     # 1. Check offset
-    offset = check_offset_with_ffsubsync(str(video_path), str(sub_path))
+    offset = _check_initial_offset(video_path, sub_path)
     perform_sync = True  # Default to performing sync unless offset is small
 
     if offset is not None:  # Offset check completed (successfully or returned 0.0)
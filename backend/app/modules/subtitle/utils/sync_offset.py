@@ -0,0 +1,291 @@
+"""
+In-process estimate of the offset between a subtitle file and the audio of a video.
+
+`sync_subtitles_with_audio` only needs to know whether a subtitle is already in
+sync before deciding to run alass/ffsubsync. Instead of a full ffsubsync run it
+compares two 100 Hz on/off masks:
+
+- speech: the video's speech-activity track. It is taken from the speech track
+  cache when present; otherwise the audio is decoded once by ffmpeg to 16 kHz
+  mono PCM, run through a VAD (webrtcvad when installed, an energy threshold
+  otherwise), and the track is stored for the sync tools that may follow;
+- subtitles: 1 while a cue is on screen, 0 otherwise.
+
+The lag that maximizes their cross-correlation (computed with a NumPy FFT) is
+the offset. The confidence tells how clearly that lag beats every alignment
+more than a second away, so ambiguous estimates can fall back to ffsubsync.
+"""
+
+import logging
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.modules.subtitle.services.media_probe_cache import make_probe_key
+from app.modules.subtitle.services.speech_track_cache import (
+    SPEECH_SAMPLE_RATE,
+    load_speech_track,
+    speech_track_cache,
+)
+from app.modules.subtitle.utils import srt_codec
+
+try:
+    import webrtcvad
+except ImportError:  # Optional; installed alongside ffsubsync
+    webrtcvad = None
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_PATH = getattr(settings, "FFMPEG_PATH", "ffmpeg")
+PCM_SAMPLE_RATE = 16000  # Hz, one of the rates webrtcvad accepts
+_FRAME_SAMPLES = PCM_SAMPLE_RATE // SPEECH_SAMPLE_RATE  # 10 ms per speech-track frame
+_FRAME_BYTES = _FRAME_SAMPLES * 2  # s16le
+_PCM_CHUNK_BYTES = _FRAME_BYTES * SPEECH_SAMPLE_RATE * 10  # 10 s of audio per read
+_PEAK_EXCLUSION_S = 1.0  # Lags this close to the best one do not count as rivals
+_PLATEAU_TOLERANCE = 0.005  # Relative to the peak
+
+
+@dataclass(frozen=True, slots=True)
+class OffsetEstimate:
+    offset_s: float  # Shift to apply to the subtitles (positive = later)
+    confidence: float  # 0 = no distinct alignment, 1 = a single unambiguous peak
+
+
+# --- Masks ---
+
+
+def subtitle_mask(
+    cues: Iterable[srt_codec.SrtCue], length: int = 0, sample_rate: int = SPEECH_SAMPLE_RATE
+) -> np.ndarray:
+    """100 Hz on/off track of when subtitle cues are displayed."""
+    step_ms = 1000 / sample_rate
+    spans = [
+        (int(cue.start_ms / step_ms), int(cue.end_ms / step_ms))
+        for cue in cues
+        if cue.end_ms > cue.start_ms >= 0
+    ]
+    size = max(length, max((end for _, end in spans), default=0))
+    edges = np.zeros(size + 1, dtype=np.int32)
+    if spans:
+        bounds = np.asarray(spans)
+        np.add.at(edges, bounds[:, 0], 1)
+        np.add.at(edges, bounds[:, 1], -1)
+    return (np.cumsum(edges[:-1]) > 0).astype(np.float32)
+
+
+def _energy_vad(energies: np.ndarray) -> np.ndarray:
+    """Marks frames well above the noise floor as speech (fallback without webrtcvad)."""
+    if not energies.size:
+        return energies
+    levels = 20 * np.log10(energies + 1.0)
+    noise_floor = float(np.percentile(levels, 10))
+    threshold = max(noise_floor + 12.0, float(np.percentile(levels, 40)))
+    return np.asarray(levels > threshold, dtype=np.float32)
+
+
+def speech_track_from_pcm(chunks: Iterable[bytes], use_webrtc: bool | None = None) -> np.ndarray:
+    """
+    Turns 16 kHz mono s16le PCM into a 100 Hz speech track.
+
+    The PCM is consumed chunk by chunk, so memory stays proportional to the
+    track (one value per 10 ms), not to the decoded audio.
+    """
+    vad = None
+    if use_webrtc is None:
+        use_webrtc = webrtcvad is not None
+    if use_webrtc:
+        vad = webrtcvad.Vad()
+        vad.set_mode(3)  # Same aggressiveness as ffsubsync
+
+    parts: list[np.ndarray] = []
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        usable = len(data) - len(data) % _FRAME_BYTES
+        pending = data[usable:]
+        if not usable:
+            continue
+        if vad is not None:
+            parts.append(
+                np.fromiter(
+                    (
+                        vad.is_speech(data[start : start + _FRAME_BYTES], PCM_SAMPLE_RATE)
+                        for start in range(0, usable, _FRAME_BYTES)
+                    ),
+                    dtype=np.float32,
+                    count=usable // _FRAME_BYTES,
+                )
+            )
+        else:
+            frames = np.frombuffer(data, dtype="<i2", count=usable // 2).reshape(-1, _FRAME_SAMPLES)
+            parts.append(np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)))
+
+    track = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    return track if vad is not None else _energy_vad(track)
+
+
+def _read_pcm(process: subprocess.Popen) -> Iterator[bytes]:
+    assert process.stdout is not None
+    while chunk := process.stdout.read(_PCM_CHUNK_BYTES):
+        yield chunk
+
+
+def extract_speech_track(
+    video_path: str | Path, timeout_s: float | None = None
+) -> np.ndarray | None:
+    """Decodes the first audio stream once with ffmpeg and returns its speech track."""
+    resolved_ffmpeg_path = shutil.which(FFMPEG_PATH) or FFMPEG_PATH
+    command = [
+        resolved_ffmpeg_path,
+        "-nostdin",
+        "-v",
+        "error",
+        "-i",
+        str(video_path),
+        "-map",
+        "0:a:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(PCM_SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    logger.debug(f"Running ffmpeg command: {' '.join(command)}")
+    try:
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL
+        )
+    except OSError as e:
+        logger.warning(f"Could not start ffmpeg to decode audio of '{Path(video_path).name}': {e}")
+        return None
+
+    timer = threading.Timer(timeout_s, process.kill) if timeout_s else None
+    if timer is not None:
+        timer.start()
+    try:
+        track = speech_track_from_pcm(_read_pcm(process))
+        returncode = process.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+    if returncode != 0 or not track.size:
+        logger.warning(
+            f"ffmpeg could not decode the audio of '{Path(video_path).name}' (RC={returncode})."
+        )
+        return None
+    return track
+
+
+# --- Cross-correlation ---
+
+
+def estimate_offset_from_masks(
+    speech: np.ndarray,
+    subtitles: np.ndarray,
+    max_offset_s: float = 60.0,
+    sample_rate: int = SPEECH_SAMPLE_RATE,
+) -> OffsetEstimate | None:
+    """
+    Finds the subtitle shift that best lines the subtitle mask up with the speech mask.
+
+    Both masks are centred so that long cues or long speech do not favour any
+    lag, then cross-correlated in one FFT. Only shifts up to `max_offset_s`
+    are considered.
+    """
+    if not speech.size or not subtitles.size:
+        return None
+    a = np.asarray(speech, dtype=np.float64) - float(np.mean(speech))
+    b = np.asarray(subtitles, dtype=np.float64) - float(np.mean(subtitles))
+    if not a.any() or not b.any():
+        return None
+
+    max_lag = min(int(max_offset_s * sample_rate), a.size - 1, b.size - 1)
+    # Padding by max_lag is enough to keep the wrap-around out of the lags looked at
+    n = 1 << int(max(a.size, b.size) + max_lag - 1).bit_length()
+    # corr[k] = sum_i speech[i + k] * subtitles[i]: shifting the subtitles by k frames
+    corr = np.fft.irfft(np.fft.rfft(a, n) * np.conj(np.fft.rfft(b, n)), n)
+    lags = np.arange(-max_lag, max_lag + 1)
+    window = corr[lags % n]
+
+    best = int(np.argmax(window))
+    peak = float(window[best])
+    if peak <= 0:
+        return OffsetEstimate(offset_s=0.0, confidence=0.0)
+    # Cues a bit longer or shorter than the speech give a flat top; take its middle
+    flat = window >= peak * (1 - _PLATEAU_TOLERANCE)
+    first, last = best, best
+    while first > 0 and flat[first - 1]:
+        first -= 1
+    while last < flat.size - 1 and flat[last + 1]:
+        last += 1
+    best = (first + last) // 2
+    exclusion = int(_PEAK_EXCLUSION_S * sample_rate)
+    rivals = np.concatenate((window[: max(best - exclusion, 0)], window[best + exclusion + 1 :]))
+    runner_up = float(rivals.max()) if rivals.size else 0.0
+    confidence = min(max((peak - max(runner_up, 0.0)) / peak, 0.0), 1.0)
+    return OffsetEstimate(offset_s=float(lags[best]) / sample_rate, confidence=confidence)
+
+
+def _cached_speech_track(key: str, video_path: Path) -> np.ndarray | None:
+    """The cached speech track of a video, if any. An unreadable entry is dropped."""
+    cached_track = speech_track_cache.get(key)
+    if cached_track is None:
+        return None
+    try:
+        return load_speech_track(cached_track)
+    except Exception as e:  # Truncated or corrupt .npz: BadZipFile, OSError, KeyError...
+        logger.warning(f"Could not load cached speech track for '{video_path.name}': {e}")
+        speech_track_cache.invalidate(key)  # Not to be used by this or any later job
+        return None
+
+
+def estimate_offset(
+    video_path: str | Path, subtitle_path: str | Path, max_offset_s: float = 60.0
+) -> OffsetEstimate | None:
+    """
+    Estimates how far `subtitle_path` is off from the speech in `video_path`.
+
+    Returns None if the audio or the subtitle cannot be read.
+    """
+    video_path = Path(video_path).resolve()
+    key = make_probe_key(video_path) if settings.SUBTITLE_SYNC_SPEECH_CACHE_ENABLED else None
+    speech = _cached_speech_track(key, video_path) if key else None
+    if speech is None:
+        speech = extract_speech_track(video_path, timeout_s=settings.FFSUBSYNC_CHECK_TIMEOUT)
+        if speech is None:
+            return None
+        if key:
+            speech_track_cache.put(key, speech)
+
+    try:
+        cues = list(srt_codec.iter_srt_file(subtitle_path))
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Could not read subtitle '{Path(subtitle_path).name}': {e}")
+        return None
+    if not cues:
+        return None
+    return estimate_offset_from_masks(
+        speech, subtitle_mask(cues, length=speech.size), max_offset_s=max_offset_s
+    )
+
+
+__all__ = [
+    "OffsetEstimate",
+    "estimate_offset",
+    "estimate_offset_from_masks",
+    "extract_speech_track",
+    "speech_track_from_pcm",
+    "subtitle_mask",
+]
@@ -20,6 +20,10 @@ class JobBase(BaseModel):
         description="Logging level for the job (DEBUG, INFO, WARNING, ERROR)",
         pattern="^(DEBUG|INFO|WARNING|ERROR)$",
     )
+    incremental: bool = Field(
+        default=False,
+        description="Only process video files that are new or changed since the last run",
+    )
 
 
 # Schema for creating a new job (input from API consumer)
@@ -66,6 +70,12 @@ class JobUpdate(BaseModel):
         default=None,
         description="Complete logs from job execution",
     )
+    log_path: str | None = Field(
+        default=None, max_length=255, description="File name of the job's output archive"
+    )
+    log_size: int | None = Field(
+        default=None, description="Uncompressed size of the job's output archive in bytes"
+    )
     # New fields from model, typically set by the worker, not direct user update
     script_command: str | None = Field(default=None, description="The command executed for the job")
     script_pid: int | None = Field(
@@ -95,6 +105,7 @@ class JobRead(JobBase):  # Inherit common fields from JobBase
     result_message: str | None = None
     exit_code: int | None = None
     log_snippet: str | None = None
+    log_size: int | None = None  # Bytes readable from GET /jobs/{id}/logs
 
     script_command: str | None = None  # Added: The command executed
     script_pid: int | None = None  # Added: PID of the script
@@ -0,0 +1,250 @@
+# backend/app/services/audit_chain.py
+"""
+Incremental verification of the audit log hash chain.
+
+`verify_log_integrity` re-checks the latest N entries on demand. This module
+walks the whole chain instead, oldest first, in keyset pages over
+(timestamp, id) across all monthly partitions, reading only the hashed columns.
+After every page it commits a checkpoint (last verified id/timestamp/hash), so
+the next run starts where the previous one stopped and only checks new events.
+
+Runs can overlap (the hourly beat task and POST /audit/verify/chain). Each page
+is read and committed under a transaction-level advisory lock, starting from
+the checkpoint as stored at that moment, so overlapping runs share the walk:
+no entry is counted twice and the checkpoint never moves backwards.
+
+Entries newer than AUDIT_CHAIN_VERIFY_LAG_S, or than the oldest event still
+waiting in the outbox, are left for a later run: the outbox may still insert
+events before them.
+"""
+
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Row, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.audit_log import AuditChainCheckpoint, AuditLog, AuditOutbox
+from app.services.audit_service import compute_event_hash
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "audit_logs"
+_CHECKPOINT_LOCK_KEY = 0x61756469745F636B  # pg advisory lock key ("audit_ck")
+_MAX_REPORTED_ISSUES = 100
+
+# Only what compute_event_hash needs, plus the keyset columns
+_CHAIN_COLUMNS = (
+    AuditLog.id,
+    AuditLog.timestamp,
+    AuditLog.event_id,
+    AuditLog.action,
+    AuditLog.actor_user_id,
+    AuditLog.target_user_id,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.success,
+    AuditLog.http_status,
+    AuditLog.details,
+    AuditLog.prev_hash,
+    AuditLog.event_hash,
+)
+
+
+@dataclass
+class ChainVerification:
+    """Running state of a chain walk; `feed` it pages of rows in chain order."""
+
+    last_log_id: int | None = None
+    last_timestamp: datetime | None = None
+    last_event_hash: str | None = None
+    checked: int = 0
+    issue_count: int = 0
+    issues: list[str] = field(default_factory=list)
+
+    def feed(self, rows: Sequence[Row[Any]]) -> None:
+        for row in rows:
+            # The very first entry has nothing before it; trust its own prev_hash
+            expected_prev_hash = (
+                self.last_event_hash if self.last_log_id is not None else row.prev_hash
+            )
+            computed_hash = compute_event_hash(
+                event_id=str(row.event_id),
+                timestamp=row.timestamp.isoformat(),
+                action=row.action,
+                actor_user_id=str(row.actor_user_id) if row.actor_user_id else None,
+                target_user_id=str(row.target_user_id) if row.target_user_id else None,
+                resource_type=row.resource_type,
+                resource_id=row.resource_id,
+                success=row.success,
+                http_status=row.http_status,
+                details=row.details,
+                prev_hash=expected_prev_hash,
+            )
+            if computed_hash != row.event_hash:
+                actual_hash = row.event_hash or "unknown"
+                self.issue_count += 1
+                if len(self.issues) < _MAX_REPORTED_ISSUES:
+                    self.issues.append(
+                        f"Hash mismatch at ID {row.id} (Event {row.event_id}). "
+                        f"Expected {actual_hash[:12]}, Computed {computed_hash[:12]}"
+                    )
+            # Like verify_log_integrity, the next entry chains onto the stored hash
+            self.last_log_id = row.id
+            self.last_timestamp = row.timestamp
+            self.last_event_hash = row.event_hash
+            self.checked += 1
+
+
+async def load_checkpoint(db: AsyncSession) -> AuditChainCheckpoint | None:
+    return await db.get(AuditChainCheckpoint, CHECKPOINT_NAME)
+
+
+async def _lock_checkpoint(db: AsyncSession) -> None:
+    """Serializes chain walks until the current transaction commits."""
+    await db.execute(select(func.pg_advisory_xact_lock(_CHECKPOINT_LOCK_KEY)))
+
+
+async def _resume_from_checkpoint(db: AsyncSession, state: ChainVerification) -> None:
+    """
+    Moves `state` to the stored checkpoint (read past the session's identity map),
+    in case an overlapping run advanced or reset it since our last page.
+    """
+    stored = (
+        await db.execute(
+            select(
+                AuditChainCheckpoint.last_log_id,
+                AuditChainCheckpoint.last_timestamp,
+                AuditChainCheckpoint.last_event_hash,
+            ).where(AuditChainCheckpoint.name == CHECKPOINT_NAME)
+        )
+    ).first()
+    if stored is None or stored.last_log_id is None:
+        state.last_log_id = state.last_timestamp = state.last_event_hash = None
+    else:
+        state.last_log_id = stored.last_log_id
+        state.last_timestamp = stored.last_timestamp
+        state.last_event_hash = stored.last_event_hash
+
+
+async def _save_checkpoint(
+    db: AsyncSession, state: ChainVerification, checked: int, issues: int
+) -> None:
+    """Advances the stored checkpoint by `checked` entries and `issues` mismatches."""
+    values: dict[str, Any] = {
+        "last_log_id": state.last_log_id,
+        "last_timestamp": state.last_timestamp,
+        "last_event_hash": state.last_event_hash,
+        "updated_at": datetime.now(UTC),
+    }
+    if issues and state.issues:
+        values["last_issue"] = state.issues[-1]
+    stmt = insert(AuditChainCheckpoint).values(
+        name=CHECKPOINT_NAME, verified_count=checked, issue_count=issues, **values
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuditChainCheckpoint.name],
+        set_={
+            **values,
+            "verified_count": AuditChainCheckpoint.verified_count + checked,
+            "issue_count": AuditChainCheckpoint.issue_count + issues,
+        },
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def _verification_horizon(db: AsyncSession, lag_s: float) -> datetime:
+    horizon = datetime.now(UTC) - timedelta(seconds=lag_s)
+    oldest_pending = (
+        await db.execute(
+            select(func.min(AuditOutbox.created_at)).where(
+                AuditOutbox.processed == False,  # noqa: E712
+                AuditOutbox.failed == False,  # noqa: E712
+            )
+        )
+    ).scalar()
+    if oldest_pending is not None:
+        horizon = min(horizon, oldest_pending)
+    return horizon
+
+
+async def verify_audit_chain(
+    db: AsyncSession,
+    page_size: int | None = None,
+    max_rows: int | None = None,
+    lag_s: float | None = None,
+    reset: bool = False,
+    progress: Callable[[ChainVerification], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Verify the audit log chain from the stored checkpoint onwards.
+
+    Args:
+        page_size: Entries read and checked per query (and per checkpoint commit).
+        max_rows: Stop after this many entries; the next run resumes from there.
+        lag_s: Leave entries younger than this for a later run.
+        reset: Ignore the checkpoint and verify the whole history again.
+        progress: Called after every page with the running state.
+
+    Returns a dict with 'verified' status, 'issues' list and counters.
+    """
+    page_size = page_size or settings.AUDIT_CHAIN_VERIFY_PAGE_SIZE
+    if lag_s is None:
+        lag_s = settings.AUDIT_CHAIN_VERIFY_LAG_S
+
+    state = ChainVerification()
+    if reset:
+        await _lock_checkpoint(db)
+        await db.execute(
+            delete(AuditChainCheckpoint).where(AuditChainCheckpoint.name == CHECKPOINT_NAME)
+        )
+        await db.commit()
+    horizon = await _verification_horizon(db, lag_s)
+
+    while max_rows is None or state.checked < max_rows:
+        limit = page_size if max_rows is None else min(page_size, max_rows - state.checked)
+        await _lock_checkpoint(db)  # Released by the commit in _save_checkpoint
+        await _resume_from_checkpoint(db, state)
+        query = select(*_CHAIN_COLUMNS).where(AuditLog.timestamp < horizon)
+        last_timestamp, last_log_id = state.last_timestamp, state.last_log_id
+        if last_timestamp is not None and last_log_id is not None:
+            query = query.where(
+                tuple_(AuditLog.timestamp, AuditLog.id) > (last_timestamp, last_log_id)
+            )
+        query = query.order_by(AuditLog.timestamp, AuditLog.id).limit(limit)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            await db.commit()  # Release the lock
+            break
+
+        checked_before, issues_before = state.checked, state.issue_count
+        state.feed(rows)
+        await _save_checkpoint(
+            db, state, state.checked - checked_before, state.issue_count - issues_before
+        )
+        if progress is not None:
+            progress(state)
+        if len(rows) < limit:
+            break
+
+    if state.issue_count:
+        logger.error(
+            f"Audit chain verification found {state.issue_count} mismatches "
+            f"in {state.checked} entries (up to ID {state.last_log_id})."
+        )
+    else:
+        logger.info(f"Audit chain verification: {state.checked} new entries verified.")
+    return {
+        "verified": state.issue_count == 0,
+        "issues": state.issues,
+        "checked_count": state.checked,
+        "issue_count": state.issue_count,
+        "last_log_id": state.last_log_id,
+        "last_timestamp": state.last_timestamp.isoformat() if state.last_timestamp else None,
+    }
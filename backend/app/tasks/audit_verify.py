@@ -0,0 +1,56 @@
+# backend/app/tasks/audit_verify.py
+"""
+Audit hash-chain verification task.
+
+Verifies audit_logs entries added since the last checkpoint (see
+app.services.audit_chain), reporting progress while it walks the chain.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from celery import Task
+
+from app.db import session as db_session  # Import module, not variable
+from app.services.audit_chain import ChainVerification, verify_audit_chain
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_chain_verification(task: Task, max_rows: int | None, reset: bool) -> dict[str, Any]:
+    db_session.initialize_worker_db_resources()
+    if db_session.WorkerSessionLocal is None:
+        raise RuntimeError("WorkerSessionLocal not initialized")
+
+    def report(state: ChainVerification) -> None:
+        task.update_state(
+            state="PROGRESS",
+            meta={
+                "checked": state.checked,
+                "issue_count": state.issue_count,
+                "last_log_id": state.last_log_id,
+            },
+        )
+
+    async with db_session.WorkerSessionLocal() as db:
+        return await verify_audit_chain(db, max_rows=max_rows, reset=reset, progress=report)
+
+
+@celery_app.task(name="app.tasks.audit.verify_audit_chain", bind=True)
+def verify_audit_chain_task(
+    self: Task, max_rows: int | None = None, reset: bool = False
+) -> dict[str, Any]:
+    """
+    Celery task to verify new audit log entries against the hash chain.
+
+    Args:
+        max_rows: Stop after this many entries (the next run resumes there)
+        reset: Discard the checkpoint and verify the full history
+    """
+    try:
+        return asyncio.run(_run_chain_verification(self, max_rows, reset))
+    except Exception as exc:
+        logger.error("Audit chain verification failed", exc_info=exc)
+        raise
@@ -4,17 +4,25 @@ Background worker for processing the audit outbox.
 
 Polls the audit_outbox table, computes hash chains, and moves events
 to the immutable audit_logs table. Uses SKIP LOCKED for concurrency safety.
+
+Each batch reads the chain head once, chains the whole batch in memory and
+writes it with one multi-row INSERT. `drain_outbox` keeps taking batches,
+doubling their size while they come back full, until the backlog is gone or
+its time budget is spent.
 """
 
 import asyncio
 import logging
+import time
 from collections.abc import Sequence
 from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.schema import DDL
 
+from app.core.config import settings
 from app.db import session as db_session  # Import module, not variable
 from app.db.models.audit_log import AuditLog, AuditOutbox
 from app.services.audit_service import compute_event_hash, get_last_hash
@@ -22,6 +30,8 @@ from app.tasks.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+_MAX_ATTEMPTS = 5
+
 
 def _next_month_start(month_start: date) -> date:
     if month_start.month == 12:
@@ -70,121 +80,216 @@ def _collect_partition_months(outbox_rows: Sequence[AuditOutbox]) -> list[date]:
     return sorted(month_starts)
 
 
-@celery_app.task(name="app.tasks.audit_worker_batch")
-def audit_worker_batch_task(batch_size: int = 100) -> int:
-    """Celery task wrapper for outbox processing."""
-
-    async def _run() -> int:
-        db_session.initialize_worker_db_resources()
-        if db_session.WorkerSessionLocal is None:
-            raise RuntimeError("WorkerSessionLocal not initialized")
-        async with db_session.WorkerSessionLocal() as db:
-            return await process_outbox_batch(db, batch_size)
-
-    return asyncio.run(_run())
+def _build_log_entry(row: AuditOutbox, prev_hash: str | None) -> dict[str, Any]:
+    """Maps an outbox event to its audit_logs row, chained onto `prev_hash`."""
+    event_data = row.event_data
+    event_hash = compute_event_hash(
+        event_id=str(row.event_id),
+        timestamp=event_data["timestamp"],
+        action=event_data["action"],
+        actor_user_id=event_data.get("actor_user_id"),
+        target_user_id=event_data.get("target_user_id"),
+        resource_type=event_data.get("resource_type"),
+        resource_id=event_data.get("resource_id"),
+        success=event_data["success"],
+        http_status=event_data.get("http_status"),
+        details=event_data.get("details"),
+        prev_hash=prev_hash,
+    )
+    return {
+        "event_id": row.event_id,
+        "timestamp": datetime.fromisoformat(event_data["timestamp"]),
+        "category": event_data["category"],
+        "action": event_data["action"],
+        "severity": event_data["severity"],
+        "success": event_data["success"],
+        "actor_user_id": event_data.get("actor_user_id"),
+        "actor_email": event_data.get("actor_email"),
+        "actor_type": event_data.get("actor_type", "user"),
+        "request_id": event_data.get("request_id"),
+        "session_id": event_data.get("session_id"),
+        "source": event_data.get("source", "web"),
+        "ip_address": event_data.get("ip_address"),
+        "forwarded_for": event_data.get("forwarded_for"),
+        "user_agent": event_data.get("user_agent"),
+        "resource_type": event_data.get("resource_type"),
+        "resource_id": event_data.get("resource_id"),
+        "target_user_id": event_data.get("target_user_id"),
+        "error_code": event_data.get("error_code"),
+        "http_status": event_data.get("http_status"),
+        "details": event_data.get("details"),
+        "schema_version": 1,
+        "prev_hash": prev_hash,
+        "event_hash": event_hash,
+    }
 
 
-async def process_outbox_batch(db: AsyncSession, batch_size: int = 100) -> int:
+def chain_outbox_rows(
+    outbox_rows: Sequence[AuditOutbox], head: str | None
+) -> tuple[list[tuple[AuditOutbox, dict[str, Any]]], list[tuple[AuditOutbox, Exception]]]:
     """
-    Process a batch of outbox events.
+    Hash-chain a batch in memory, in the given order, starting from `head`.
 
-    Returns:
-        Number of events processed.
+    Returns the (outbox row, audit_logs entry) pairs and the rows that could
+    not be mapped; those are left out of the chain.
     """
-    # Select candidate rows with SKIP LOCKED
-    now = datetime.now(UTC)
+    chained: list[tuple[AuditOutbox, dict[str, Any]]] = []
+    rejected: list[tuple[AuditOutbox, Exception]] = []
+    prev_hash = head
+    for row in outbox_rows:
+        try:
+            entry = _build_log_entry(row, prev_hash)
+        except Exception as e:
+            rejected.append((row, e))
+            continue
+        chained.append((row, entry))
+        prev_hash = entry["event_hash"]
+    return chained, rejected
+
+
+def _schedule_retry(row: AuditOutbox, error: Exception, now: datetime) -> None:
+    logger.error(f"Error processing audit outbox event {row.event_id}: {error}", exc_info=error)
+    row.attempts += 1
+    row.last_error = str(error)
+
+    if row.attempts >= _MAX_ATTEMPTS:
+        row.failed = True
+    else:
+        # Exponential backoff: 5s, 25s, 125s...
+        backoff_seconds = 5**row.attempts
+        row.next_attempt_at = now + timedelta(seconds=backoff_seconds)
+
+
+async def _insert_one_by_one(
+    db: AsyncSession, outbox_rows: Sequence[AuditOutbox], head: str | None, now: datetime
+) -> list[AuditOutbox]:
+    """Slow path after a failed bulk INSERT: isolates the rows the database rejects."""
+    inserted: list[AuditOutbox] = []
+    prev_hash = head
+    for row in outbox_rows:
+        try:
+            entry = _build_log_entry(row, prev_hash)
+            async with db.begin_nested():
+                await db.execute(insert(AuditLog), [entry])
+        except Exception as e:
+            _schedule_retry(row, e, now)
+            continue
+        inserted.append(row)
+        prev_hash = entry["event_hash"]
+    return inserted
 
-    query = (
+
+def _pending_outbox_query(batch_size: int, now: datetime) -> Select[tuple[AuditOutbox]]:
+    # Select candidate rows with SKIP LOCKED
+    return (
         select(AuditOutbox)
         .where(
             AuditOutbox.processed == False,  # noqa: E712
             AuditOutbox.failed == False,  # noqa: E712
             (AuditOutbox.next_attempt_at.is_(None) | (AuditOutbox.next_attempt_at <= now)),
         )
-        .order_by(AuditOutbox.created_at)
+        .order_by(AuditOutbox.created_at, AuditOutbox.id)
         .limit(batch_size)
         .with_for_update(skip_locked=True)
     )
 
-    result = await db.execute(query)
+
+async def _drain_batch(db: AsyncSession, batch_size: int) -> tuple[int, int]:
+    """Move one batch to audit_logs and commit. Returns (rows fetched, rows processed)."""
+    now = datetime.now(UTC)
+    result = await db.execute(_pending_outbox_query(batch_size, now))
     outbox_rows = result.scalars().all()
 
     if not outbox_rows:
-        return 0
-
-    processed_count = 0
+        return 0, 0
 
     for month_start in _collect_partition_months(outbox_rows):
         await _ensure_audit_partition(db, month_start)
 
-    for row in outbox_rows:
+    # One chain-head lookup per batch; the rest of the chain is computed in memory
+    head = await get_last_hash(db, outbox_rows[0].created_at)
+    chained, rejected = chain_outbox_rows(outbox_rows, head)
+    for row, error in rejected:
+        _schedule_retry(row, error, now)
+
+    inserted = [row for row, _ in chained]
+    if chained:
         try:
-            event_data = row.event_data
-
-            # Get previous hash for chaining
-            prev_hash_row = await get_last_hash(db, row.created_at)
-
-            # Calculate new hash
-            event_hash = compute_event_hash(
-                event_id=str(row.event_id),
-                timestamp=event_data["timestamp"],
-                action=event_data["action"],
-                actor_user_id=event_data.get("actor_user_id"),
-                target_user_id=event_data.get("target_user_id"),
-                resource_type=event_data.get("resource_type"),
-                resource_id=event_data.get("resource_id"),
-                success=event_data["success"],
-                http_status=event_data.get("http_status"),
-                details=event_data.get("details"),
-                prev_hash=prev_hash_row,
+            # Executed as multi-row INSERT ... VALUES statements (insertmanyvalues)
+            async with db.begin_nested():
+                await db.execute(insert(AuditLog), [entry for _, entry in chained])
+        except Exception as e:
+            logger.warning(
+                f"Bulk insert of {len(chained)} audit events failed ({e}); retrying one by one."
             )
+            inserted = await _insert_one_by_one(db, inserted, head, now)
+
+    if inserted:
+        await db.execute(
+            update(AuditOutbox)
+            .where(AuditOutbox.id.in_([row.id for row in inserted]))
+            .values(processed=True, processed_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
 
-            # Create AuditLog entry
-            audit_log = AuditLog(
-                event_id=row.event_id,
-                timestamp=datetime.fromisoformat(event_data["timestamp"]),
-                category=event_data["category"],
-                action=event_data["action"],
-                severity=event_data["severity"],
-                success=event_data["success"],
-                actor_user_id=event_data.get("actor_user_id"),
-                actor_email=event_data.get("actor_email"),
-                actor_type=event_data.get("actor_type", "user"),
-                request_id=event_data.get("request_id"),
-                session_id=event_data.get("session_id"),
-                source=event_data.get("source", "web"),
-                ip_address=event_data.get("ip_address"),
-                forwarded_for=event_data.get("forwarded_for"),
-                user_agent=event_data.get("user_agent"),
-                resource_type=event_data.get("resource_type"),
-                resource_id=event_data.get("resource_id"),
-                target_user_id=event_data.get("target_user_id"),
-                error_code=event_data.get("error_code"),
-                http_status=event_data.get("http_status"),
-                details=event_data.get("details"),
-                schema_version=1,
-                prev_hash=prev_hash_row,
-                event_hash=event_hash,
-            )
+    await db.commit()
+    return len(outbox_rows), len(inserted)
 
-            db.add(audit_log)
 
-            # Mark outbox as processed
-            row.processed = True
-            row.processed_at = datetime.now(UTC)
-            processed_count += 1
+async def process_outbox_batch(db: AsyncSession, batch_size: int = 100) -> int:
+    """
+    Process a batch of outbox events.
 
-        except Exception as e:
-            logger.error(f"Error processing audit outbox event {row.event_id}: {e}", exc_info=True)
-            row.attempts += 1
-            row.last_error = str(e)
+    Returns:
+        Number of events processed.
+    """
+    _, processed_count = await _drain_batch(db, batch_size)
+    return processed_count
 
-            if row.attempts >= 5:
-                row.failed = True
-            else:
-                # Exponential backoff: 5s, 25s, 125s...
-                backoff_seconds = 5**row.attempts
-                row.next_attempt_at = now + timedelta(seconds=backoff_seconds)
 
-    await db.commit()
-    return processed_count
+async def drain_outbox(
+    db: AsyncSession,
+    min_batch_size: int | None = None,
+    max_batch_size: int | None = None,
+    time_budget_s: float | None = None,
+) -> int:
+    """
+    Process outbox batches until the backlog is drained or the time budget is spent.
+
+    Batches start at `min_batch_size` and double while they come back full,
+    up to `max_batch_size`, so a burst is worked off in a few large INSERTs.
+
+    Returns:
+        Number of events processed.
+    """
+    batch_size = max(min_batch_size or settings.AUDIT_OUTBOX_BATCH_SIZE, 1)
+    max_batch_size = max(max_batch_size or settings.AUDIT_OUTBOX_MAX_BATCH_SIZE, batch_size)
+    if time_budget_s is None:
+        time_budget_s = settings.AUDIT_OUTBOX_DRAIN_TIME_BUDGET_S
+    deadline = time.monotonic() + time_budget_s
+
+    processed_total = 0
+    while True:
+        fetched, processed = await _drain_batch(db, batch_size)
+        processed_total += processed
+        if fetched < batch_size or time.monotonic() >= deadline:
+            break
+        batch_size = min(batch_size * 2, max_batch_size)
+
+    if processed_total:
+        logger.info(f"Audit outbox: moved {processed_total} events (last batch size {batch_size}).")
+    return processed_total
+
+
+@celery_app.task(name="app.tasks.audit_worker_batch")
+def audit_worker_batch_task(batch_size: int | None = None) -> int:
+    """Celery task wrapper for outbox processing."""
+
+    async def _run() -> int:
+        db_session.initialize_worker_db_resources()
+        if db_session.WorkerSessionLocal is None:
+            raise RuntimeError("WorkerSessionLocal not initialized")
+        async with db_session.WorkerSessionLocal() as db:
+            return await drain_outbox(db, min_batch_size=batch_size)
+
+    return asyncio.run(_run())
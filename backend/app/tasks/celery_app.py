@@ -24,6 +24,8 @@ celery_app = Celery(
         "app.tasks.subtitle_jobs",
         "app.tasks.audit_export",
         "app.tasks.audit_worker",
+        "app.tasks.audit_verify",
+        "app.tasks.deepl_quota",
         "app.tasks.maintenance",
     ],
 )
@@ -40,7 +42,14 @@ celery_app.conf.beat_schedule = {
     "audit_outbox_drain": {
         "task": "app.tasks.audit_worker_batch",
         "schedule": 15.0,
-        "args": (100,),
+    },
+    "audit_chain_verification": {
+        "task": "app.tasks.audit.verify_audit_chain",
+        "schedule": crontab(minute=30),
+    },
+    "deepl_quota_reconcile": {
+        "task": "app.tasks.deepl_quota.reconcile",
+        "schedule": float(settings.DEEPL_QUOTA_RECONCILE_INTERVAL_S),
     },
     "audit_partition_maintenance": {
         "task": "app.tasks.maintenance.manage_audit_partitions",
@@ -67,6 +76,10 @@ def init_worker_process_signal(**_kwargs: object) -> None:
     logger.info("CELERY_WORKER_PROCESS_INIT: nest_asyncio applied. Initializing DB resources.")
     initialize_worker_db_resources()
     logger.info("CELERY_WORKER_PROCESS_INIT: DB resources initialization complete.")
+    if settings.JOB_EXECUTION_MODE == "inprocess":
+        from app.tasks.inprocess_runner import prewarm_subtitle_stack
+
+        prewarm_subtitle_stack()
 
 
 @worker_process_shutdown.connect(weak=False)
@@ -0,0 +1,99 @@
+# backend/app/tasks/deepl_quota.py
+"""
+Reconciliation of the DeepL quota ledger.
+
+Replaces the ledger's counts with the DeepL usage API's figures for every
+configured key and drops reservations older than DEEPL_QUOTA_RESERVATION_TTL_S,
+which were left behind by workers that died mid-request.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.effective_settings import get_effective_setting
+from app.db import session as db_session  # Import module, not variable
+from app.db.models.deepl_usage import DeepLUsage
+from app.modules.subtitle.services.deepl_quota import key_identifier
+from app.services.api_validation import validate_deepl
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# DeepL answers 403 for rejected keys and 456 for exhausted ones
+_KEY_UNUSABLE_STATUS = {403, 456}
+
+
+async def reconcile_deepl_quota(db: AsyncSession) -> dict[str, Any]:
+    """
+    Sync every configured key's row with the DeepL usage API.
+
+    Returns counters of synced, unusable and skipped (transient error) keys and
+    of expired reservations.
+    """
+    configured = await get_effective_setting(db, "deepl_api_keys")
+    keys = [key for key in configured if key] if isinstance(configured, list) else []
+    now = datetime.now(UTC)
+    result = {"synced": 0, "unusable": 0, "skipped": 0, "expired_reservations": 0}
+
+    for key in keys:
+        usage = await validate_deepl(key)
+        values: dict[str, Any]
+        if usage.get("valid"):
+            values = {
+                "character_count": usage.get("character_count", 0),
+                "character_limit": usage.get("character_limit", 0),
+                "valid": True,
+            }
+            result["synced"] += 1
+        elif usage.get("status_code") in _KEY_UNUSABLE_STATUS:
+            values = {"valid": False}
+            result["unusable"] += 1
+        else:
+            # Rate limits and network errors say nothing about the key
+            result["skipped"] += 1
+            continue
+
+        stmt = insert(DeepLUsage).values(key_identifier=key_identifier(key), **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DeepLUsage.key_identifier], set_={**values, "last_updated": now}
+        )
+        await db.execute(stmt)
+
+    expired = await db.execute(
+        update(DeepLUsage)
+        .where(
+            DeepLUsage.reserved_count > 0,
+            DeepLUsage.reserved_at
+            < now - timedelta(seconds=settings.DEEPL_QUOTA_RESERVATION_TTL_S),
+        )
+        .values(reserved_count=0, last_updated=DeepLUsage.last_updated)
+    )
+    result["expired_reservations"] = getattr(expired, "rowcount", 0) or 0
+    await db.commit()
+
+    logger.info(
+        f"DeepL quota reconciliation: {result['synced']} synced, {result['unusable']} unusable, "
+        f"{result['skipped']} skipped, {result['expired_reservations']} stale reservations dropped."
+    )
+    return result
+
+
+@celery_app.task(name="app.tasks.deepl_quota.reconcile")
+def reconcile_deepl_quota_task() -> dict[str, Any]:
+    """Celery task wrapper for quota ledger reconciliation."""
+
+    async def _run() -> dict[str, Any]:
+        db_session.initialize_worker_db_resources()
+        if db_session.WorkerSessionLocal is None:
+            raise RuntimeError("WorkerSessionLocal not initialized")
+        async with db_session.WorkerSessionLocal() as db:
+            return await reconcile_deepl_quota(db)
+
+    return asyncio.run(_run())
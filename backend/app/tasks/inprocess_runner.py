@@ -0,0 +1,251 @@
+"""
+In-process execution mode for subtitle jobs (JOB_EXECUTION_MODE=inprocess).
+
+Instead of spawning a fresh interpreter that re-imports the whole app stack for
+every job, the Celery worker process imports the subtitle pipeline once
+(`prewarm_subtitle_stack`, called from `worker_process_init`) and then forks a
+child per job. The child inherits the warm module cache, runs
+`run_subtitle_job` directly and exits, so per-job module state (provider
+tokens, translation manager singleton, logging handlers) never leaks between
+jobs and a crash or timeout still only takes down the child.
+
+`ForkedJobProcess` mimics the subset of `asyncio.subprocess.Process` used by
+`app.tasks.subtitle_jobs` (pid, returncode, stdout/stderr readers, terminate,
+kill, wait), so the existing stream publishing, timeout and cancellation logic
+is shared by both execution modes.
+
+A raw `os.fork()` is used on purpose: Celery prefork children are flagged as
+daemonic by billiard, and `multiprocessing` refuses to start children from
+daemonic processes.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import sys
+import traceback
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# Poll interval used by wait() when pidfd is not available on this platform.
+_WAIT_POLL_INTERVAL_S = 0.05
+
+
+def prewarm_subtitle_stack() -> None:
+    """Imports the subtitle pipeline so forked job children start with a warm module cache."""
+    from app.modules.subtitle.core import job_runner  # noqa: F401
+
+    logger.info("In-process job runner: subtitle pipeline modules pre-imported.")
+
+
+class ForkedJobProcess:
+    """Async handle around a forked job child, API-compatible with asyncio.subprocess.Process."""
+
+    def __init__(
+        self,
+        pid: int,
+        stdout: asyncio.StreamReader,
+        stderr: asyncio.StreamReader,
+    ) -> None:
+        self.pid = pid
+        self.stdout: asyncio.StreamReader | None = stdout
+        self.stderr: asyncio.StreamReader | None = stderr
+        self.returncode: int | None = None
+
+    def _poll(self) -> int | None:
+        """Reaps the child if it has exited. Returns the exit code or None while running."""
+        if self.returncode is not None:
+            return self.returncode
+        try:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+        except ChildProcessError:
+            # Already reaped elsewhere; the real status is lost.
+            self.returncode = 255
+            return self.returncode
+        if pid == 0:
+            return None
+        self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        if self._poll() is not None:
+            raise ProcessLookupError(f"Process {self.pid} has already exited.")
+        os.kill(self.pid, sig)
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+    async def wait(self) -> int:
+        """Waits for the child to exit without blocking the event loop and returns its exit code."""
+        if self._poll() is not None:
+            return self.returncode  # type: ignore[return-value]
+
+        pidfd_open = getattr(os, "pidfd_open", None)
+        pidfd: int | None = None
+        if pidfd_open is not None:
+            with contextlib.suppress(OSError):
+                pidfd = pidfd_open(self.pid)
+
+        if pidfd is None:
+            while self._poll() is None:  # noqa: ASYNC110 - nothing to await on without pidfd
+                await asyncio.sleep(_WAIT_POLL_INTERVAL_S)
+            return self.returncode  # type: ignore[return-value]
+
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+
+        def _on_exit() -> None:
+            if not exited.done():
+                exited.set_result(None)
+
+        loop.add_reader(pidfd, _on_exit)
+        try:
+            # The child may have exited between the first poll and pidfd_open.
+            if self._poll() is None:
+                await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+        # pidfd readiness means the child has exited, so this reaps it.
+        return self._poll()  # type: ignore[return-value]
+
+
+def _refresh_settings_from_env() -> None:
+    """Rebuilds the global settings object in place from the (job-specific) environment."""
+    from app.core.config import settings
+
+    fresh = type(settings)()
+    settings.__dict__.update(fresh.__dict__)
+    private = getattr(fresh, "__pydantic_private__", None)
+    if private:
+        object.__setattr__(settings, "__pydantic_private__", dict(private))
+
+
+def _prepare_child(env: dict[str, str] | None) -> None:
+    """Resets state inherited from the worker that must not be shared with a job child."""
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT):
+        signal.signal(sig, signal.SIG_DFL)
+
+    if env is not None:
+        os.environ.clear()
+        os.environ.update(env)
+        _refresh_settings_from_env()
+
+    # Connections pooled by the parent must not be reused across the fork.
+    from app.db.session import sync_engine
+
+    if sync_engine is not None:
+        sync_engine.dispose(close=False)
+
+
+def _run_child(
+    target: Callable[[], int],
+    env: dict[str, str] | None,
+    stdout_w: int,
+    stderr_w: int,
+) -> None:
+    """Body of the forked child. Never returns."""
+    exit_code = 1
+    try:
+        os.dup2(stdout_w, 1)
+        os.dup2(stderr_w, 2)
+        os.close(stdout_w)
+        os.close(stderr_w)
+        sys.stdout = open(1, "w", buffering=1, encoding="utf-8", errors="replace", closefd=False)
+        sys.stderr = open(2, "w", buffering=1, encoding="utf-8", errors="replace", closefd=False)
+        # The worker's handlers write to its own streams; the job sets up its logging anew
+        logging.getLogger().handlers.clear()
+
+        _prepare_child(env)
+        exit_code = int(target())
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        with contextlib.suppress(Exception):
+            # os._exit skips atexit hooks: write the job's queued translation usage first
+            usage = sys.modules.get("app.modules.subtitle.services.usage_accounting")
+            if usage is not None:
+                usage.usage_accountant.flush()
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+        os._exit(exit_code)
+
+
+async def _wrap_read_pipe(fd: int) -> asyncio.StreamReader:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(loop=loop)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader, loop=loop),
+        os.fdopen(fd, "rb", buffering=0),
+    )
+    return reader
+
+
+async def start_forked_job(
+    target: Callable[[], int], env: dict[str, str] | None = None
+) -> ForkedJobProcess:
+    """
+    Forks the current process and runs `target` in the child.
+
+    The child's stdout/stderr are connected to pipes exposed as asyncio stream
+    readers on the returned handle. If `env` is given, the child's environment
+    and the global settings object are replaced with it before `target` runs.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    stdout_r, stdout_w = os.pipe()
+    stderr_r, stderr_w = os.pipe()
+    try:
+        pid = os.fork()
+    except OSError:
+        for fd in (stdout_r, stdout_w, stderr_r, stderr_w):
+            os.close(fd)
+        raise
+
+    if pid == 0:  # pragma: no cover - child side, exercised via exit codes/output in tests
+        os.close(stdout_r)
+        os.close(stderr_r)
+        _run_child(target, env, stdout_w, stderr_w)
+
+    os.close(stdout_w)
+    os.close(stderr_w)
+    stdout_reader = await _wrap_read_pipe(stdout_r)
+    stderr_reader = await _wrap_read_pipe(stderr_r)
+    return ForkedJobProcess(pid, stdout_reader, stderr_reader)
+
+
+async def start_inprocess_subtitle_job(
+    folder_path: str,
+    language: str | None,
+    log_level: str,
+    env: dict[str, str] | None = None,
+    incremental: bool = False,
+) -> ForkedJobProcess:
+    """Starts `run_subtitle_job` in a forked child of the (pre-warmed) worker process."""
+    from app.modules.subtitle.core.job_runner import run_subtitle_job
+
+    def _target() -> int:
+        return run_subtitle_job(
+            folder_path, language=language, log_level=log_level, incremental=incremental
+        )
+
+    return await start_forked_job(_target, env)
+
+
+__all__ = [
+    "ForkedJobProcess",
+    "prewarm_subtitle_stack",
+    "start_forked_job",
+    "start_inprocess_subtitle_job",
+]
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import traceback
 from datetime import UTC, datetime
@@ -15,6 +14,7 @@ import redis.asyncio as aioredis
 from celery import Task as CeleryTaskDef
 from celery import states
 from celery.exceptions import Ignore, TaskRevokedError, Terminated
+from sqlalchemy import update
 
 # asyncio.CancelledError is a built-in exception
 from sqlalchemy.exc import SQLAlchemyError
@@ -22,8 +22,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.effective_settings import build_subprocess_env
+from app.core.job_log_archive import (
+    JobLogArchive,
+    JobLogArchiveSummary,
+    JobOutputCapture,
+    job_log_archive_name,
+    remove_job_log,
+)
+from app.core.job_log_stream import (
+    JobLogSink,
+    job_log_stream_key,
+    serialize_job_log_message,
+    write_job_log_messages,
+)
 from app.crud.crud_job import CRUDJob
 from app.crud.crud_job import job as crud_job_operations
+from app.db.models.job import Job
 from app.db.session import get_worker_db_session
 from app.exceptions import (
     JobAlreadyCancellingError,
@@ -33,6 +47,7 @@ from app.exceptions import (
 )
 from app.schemas.job import JobStatus
 from app.tasks.celery_app import celery_app
+from app.tasks.inprocess_runner import ForkedJobProcess, start_inprocess_subtitle_job
 
 logger = logging.getLogger(__name__)
 
@@ -73,49 +88,36 @@ async def _publish_to_redis_pubsub_async(
     task_log_prefix: str,
 ) -> None:
     """
-    Publishes a message to a job-specific Redis Pub/Sub channel.
+    Appends a message to the job-specific Redis log stream (XADD + EXPIRE in one pipeline).
+    WebSocket clients replay and follow the same stream, so history and live logs share one source.
     """
-    channel = f"job:{job_db_id_str}:logs"
-    if "ts" not in payload:
-        payload["ts"] = datetime.now(UTC).isoformat()
-    elif isinstance(payload["ts"], datetime):
-        payload["ts"] = payload["ts"].isoformat()
-
-    message_data = {"type": message_type, "payload": payload}
+    stream_key = job_log_stream_key(job_db_id_str)
     try:
-        json_message = json.dumps(message_data)
-
-        # Publish to live channel
-        await redis_client.publish(channel, json_message)
+        json_message = serialize_job_log_message(message_type, payload)
 
-        # Also push to history list for late subscribers
-        # We store all messages to preserve complete context
-        history_key = f"job:{job_db_id_str}:history"
-        await redis_client.rpush(history_key, json_message)  # type: ignore[misc]
-        # Refresh expiry on every push (sliding window) - 7 days
-        await redis_client.expire(history_key, 604800)
+        await write_job_log_messages(redis_client, job_db_id_str, [json_message])
 
         if message_type == "status":
             logger.info(
-                f"{task_log_prefix} Published STATUS to Redis Pub/Sub channel '{channel}': {payload.get('status', 'N/A')}"
+                f"{task_log_prefix} Published STATUS to Redis log stream '{stream_key}': {payload.get('status', 'N/A')}"
             )
         elif message_type == "log":
-            logger.debug(f"{task_log_prefix} Published LOG to Redis Pub/Sub channel '{channel}'")
+            logger.debug(f"{task_log_prefix} Published LOG to Redis log stream '{stream_key}'")
         elif message_type == "info":
             logger.info(
-                f"{task_log_prefix} Published INFO to Redis Pub/Sub channel '{channel}': {payload.get('message', 'N/A')}"
+                f"{task_log_prefix} Published INFO to Redis log stream '{stream_key}': {payload.get('message', 'N/A')}"
             )
 
         if settings.DEBUG:
-            logger.debug(f"{task_log_prefix} Pub/Sub message data: {json_message}")
+            logger.debug(f"{task_log_prefix} Log stream message data: {json_message}")
     except aioredis.RedisError as e_redis:
         logger.error(
-            f"{task_log_prefix} Redis Pub/Sub publish error to channel '{channel}': {e_redis}",
+            f"{task_log_prefix} Redis log stream write error to '{stream_key}': {e_redis}",
             exc_info=settings.LOG_TRACEBACKS,
         )
     except Exception as e_general:
         logger.error(
-            f"{task_log_prefix} Unexpected error during Redis Pub/Sub publish to channel '{channel}': {e_general}",
+            f"{task_log_prefix} Unexpected error during Redis log stream write to '{stream_key}': {e_general}",
             exc_info=settings.LOG_TRACEBACKS,
         )
 
@@ -127,9 +129,11 @@ async def _read_stream_and_publish(
     job_db_id_str: str,
     task_log_prefix: str,
     output_buffer: list[bytes],
+    log_sink: JobLogSink | None = None,
 ) -> None:
     """
     Reads lines from a stream, publishes them to Redis Pub/Sub, and appends to buffer.
+    Lines go through `log_sink` (batched) when given, otherwise one publish per line.
     """
     while True:
         try:
@@ -145,7 +149,9 @@ async def _read_stream_and_publish(
             break
         output_buffer.append(line_bytes)
         line_str = line_bytes.decode("utf-8", errors="replace").strip()
-        if redis_client:
+        if log_sink:
+            await log_sink.publish("log", {"stream": stream_name, "message": line_str})
+        elif redis_client:
             await _publish_to_redis_pubsub_async(
                 redis_client,
                 job_db_id_str,
@@ -260,6 +266,7 @@ async def _execute_subtitle_downloader_async_logic(
     folder_path: str,
     language: str | None,
     log_level: str = "INFO",
+    incremental: bool = False,
 ) -> dict:
     """
     Main orchestrator for the async task logic. It no longer manages a single
@@ -272,8 +279,7 @@ async def _execute_subtitle_downloader_async_logic(
 
     # Initialize resources
     redis_client = await _initialize_redis_client(settings.REDIS_PUBSUB_URL, task_log_prefix)
-    stdout_accumulator: list[bytes] = []
-    stderr_accumulator: list[bytes] = []
+    log_archive: JobLogArchive | None = None
     response = {
         "job_id": job_db_id_str,
         "status": JobStatus.FAILED.value,
@@ -282,13 +288,27 @@ async def _execute_subtitle_downloader_async_logic(
 
     try:
         # STEP 1: Set the job to RUNNING. This function now manages its own DB session.
+        # It also points the job at its log archive, so the log is readable while it runs.
         await _setup_job_as_running(
-            redis_client, crud_job_operations, job_db_id, celery_internal_task_id, task_log_prefix
-        )
-
-        # Check for script existence before running
+            redis_client,
+            crud_job_operations,
+            job_db_id,
+            celery_internal_task_id,
+            task_log_prefix,
+            log_path=job_log_archive_name(job_db_id_str)
+            if settings.JOB_LOG_ARCHIVE_ENABLED
+            else None,
+        )
+        # Opened only now: a redelivered task of a finished job is rejected above and
+        # must not truncate that job's archive.
+        # Full output goes to the compressed archive; only a bounded head/tail stays in memory
+        log_archive = await _open_job_log_archive(job_db_id, task_log_prefix)
+        stdout_accumulator = JobOutputCapture(log_archive)
+        stderr_accumulator = JobOutputCapture(log_archive)
+
+        # Check for script existence before running (not needed when forking the warm worker)
         script_path = Path(settings.SUBTITLE_DOWNLOADER_SCRIPT_PATH)
-        if not script_path.exists():
+        if not _is_inprocess_execution_mode() and not script_path.exists():
             # This will be caught by the general exception handler below
             raise FileNotFoundError(
                 f"Configuration error: Subtitle downloader script not found at {script_path}"
@@ -308,6 +328,7 @@ async def _execute_subtitle_downloader_async_logic(
             folder_path=folder_path,
             language=language,
             log_level=log_level,
+            incremental=incremental,
             job_timeout_sec=float(settings.JOB_TIMEOUT_SEC),
             task_log_prefix=task_log_prefix,
             redis_client=redis_client,
@@ -327,6 +348,7 @@ async def _execute_subtitle_downloader_async_logic(
             b"".join(stdout_accumulator),
             b"".join(stderr_accumulator),
             task_log_prefix,
+            log_archive=log_archive,
         )
 
     except (JobAlreadyCancellingError, JobAlreadyTerminalError) as e:
@@ -359,6 +381,8 @@ async def _execute_subtitle_downloader_async_logic(
         )
     finally:
         # Cleanup resources
+        if log_archive and not log_archive.recorded:
+            await _attach_job_log_archive(job_db_id, log_archive, task_log_prefix)
         if redis_client:
             await redis_client.close()
         logger.info(
@@ -368,6 +392,59 @@ async def _execute_subtitle_downloader_async_logic(
     return response
 
 
+async def _open_job_log_archive(job_db_id: UUID, task_log_prefix: str) -> JobLogArchive | None:
+    """
+    Opens the job's output archive, under the name `_setup_job_as_running` recorded.
+    Without one, the bounded output is kept on the job row.
+    """
+    if not settings.JOB_LOG_ARCHIVE_ENABLED:
+        return None
+    try:
+        return JobLogArchive(job_db_id)
+    except Exception as e:
+        logger.warning(
+            f"{task_log_prefix} Job log archive unavailable, storing logs on the job row: {e}"
+        )
+    try:
+        await _store_job_log_path(job_db_id, None)
+    except Exception as e:
+        logger.warning(f"{task_log_prefix} Could not unlink the job from its log archive: {e}")
+    return None
+
+
+async def _store_job_log_path(job_db_id: UUID, summary: JobLogArchiveSummary | None) -> bool:
+    """Points the job row at its archive, or at none. Returns False if the job is gone."""
+    async with get_worker_db_session() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_db_id)
+            .values(
+                log_path=summary.name if summary else None,
+                log_size=summary.size if summary else None,
+            )
+        )
+        await db.commit()
+    return bool(getattr(result, "rowcount", 0))
+
+
+async def _attach_job_log_archive(
+    job_db_id: UUID, log_archive: JobLogArchive, task_log_prefix: str
+) -> None:
+    """
+    Records the archive of a job that did not finish through `_finalize_job_after_script`
+    (failures after setup). An archive that ended up empty is unlinked from the job.
+    """
+    summary = log_archive.close()
+    try:
+        if not await _store_job_log_path(job_db_id, summary) and summary:
+            remove_job_log(summary.name)  # The job was deleted while it ran
+        log_archive.recorded = True
+    except Exception as e:
+        logger.warning(
+            f"{task_log_prefix} Could not record job log archive {log_archive.name}: {e}"
+        )
+
+
 async def _create_default_error_response(job_id_str: str) -> dict:  # Renamed job_id to job_id_str
     """Create a default error response for early task failures."""
     return {
@@ -717,9 +794,10 @@ async def _setup_job_as_running(
     job_db_id: UUID,
     celery_task_id: str,
     task_log_prefix: str,
+    log_path: str | None = None,
 ) -> None:
     """
-    Sets the job status to RUNNING in the DB.
+    Sets the job status to RUNNING in the DB, pointing it at its log archive (`log_path`).
     It creates and manages its own dedicated, short-lived database session
     to ensure it reads the most current job status before making changes.
     Includes full error handling.
@@ -747,7 +825,11 @@ async def _setup_job_as_running(
             # --- Update and Commit logic within the same fresh session ---
             current_time_utc = datetime.now(UTC)
             await crud_ops.update_job_start_details(
-                db=db, job_id=job_db_id, started_at=current_time_utc, celery_task_id=celery_task_id
+                db=db,
+                job_id=job_db_id,
+                started_at=current_time_utc,
+                celery_task_id=celery_task_id,
+                log_path=log_path,
             )
             await (
                 db.commit()
@@ -908,6 +990,51 @@ async def _execute_subtitle_script(
     return final_script_exit_code
 
 
+def _is_inprocess_execution_mode() -> bool:
+    """True when jobs run in a forked child of the pre-warmed worker instead of a new interpreter."""
+    return settings.JOB_EXECUTION_MODE == "inprocess"
+
+
+async def _setup_inprocess_job(
+    folder_path: str,
+    language: str | None,
+    log_level: str,
+    task_log_prefix: str,
+    redis_client: aioredis.Redis | None,
+    job_db_id_str: str,
+    stderr_accumulator: list[bytes],
+    subprocess_env: dict[str, str] | None = None,
+    incremental: bool = False,
+) -> ForkedJobProcess:
+    """
+    Forks the pre-warmed worker to run the subtitle pipeline in-process.
+    Same contract as _setup_subprocess: raises SubprocessSetupError with an exit code on failure.
+    """
+    try:
+        process = await start_inprocess_subtitle_job(
+            folder_path, language, log_level, env=subprocess_env, incremental=incremental
+        )
+        logger.info(
+            f"{task_log_prefix} In-process job child (PID: {process.pid}) forked for folder: {folder_path}"
+        )
+    except Exception as e_fork:
+        err_msg_fork = f"Failed to fork in-process job runner: {e_fork}"
+        logger.error(f"{task_log_prefix} {err_msg_fork}", exc_info=settings.LOG_TRACEBACKS)
+        stderr_accumulator.append(f"[TASK_INTERNAL_ERROR] {err_msg_fork}\n".encode())
+        setup_error = SubprocessSetupError(err_msg_fork, EXIT_CODE_SUBPROCESS_CREATE_FAILED)
+        raise setup_error from e_fork
+
+    if redis_client:
+        await _publish_to_redis_pubsub_async(
+            redis_client,
+            job_db_id_str,
+            "info",
+            {"message": f"Subtitle downloader process (PID: {process.pid}) started execution."},
+            task_log_prefix,
+        )
+    return process
+
+
 async def _setup_subprocess(
     cmd_args: list[str],
     task_log_prefix: str,
@@ -979,6 +1106,7 @@ async def _create_monitoring_tasks_and_gather_future(
     task_log_prefix: str,
     stdout_accumulator: list[bytes],
     stderr_accumulator: list[bytes],
+    log_sink: JobLogSink | None = None,
 ) -> tuple[list[asyncio.Task[Any] | None], asyncio.Future[list[Any]]]:
     """Creates stdout/stderr reading tasks, process wait task, and their gather future."""
     assert process.stdout is not None  # Should be guaranteed by _setup_subprocess
@@ -992,6 +1120,7 @@ async def _create_monitoring_tasks_and_gather_future(
             job_db_id_str,
             task_log_prefix,
             stdout_accumulator,
+            log_sink=log_sink,
         ),
         name=f"stdout_reader_{job_db_id_str}",
     )
@@ -1003,6 +1132,7 @@ async def _create_monitoring_tasks_and_gather_future(
             job_db_id_str,
             task_log_prefix,
             stderr_accumulator,
+            log_sink=log_sink,
         ),
         name=f"stderr_reader_{job_db_id_str}",
     )
@@ -1307,28 +1437,50 @@ async def _final_process_cleanup_kill(
         return current_exit_code  # Return the exit code determined before this cleanup
 
 
-async def _run_script_and_get_output(
+def _create_job_log_sink(
+    redis_client: aioredis.Redis | None, job_db_id_str: str, task_log_prefix: str
+) -> JobLogSink | None:
+    """Batches the job's output lines into its log stream; None without Redis."""
+    if not redis_client:
+        return None
+    return JobLogSink(
+        redis_client,
+        job_db_id_str,
+        task_log_prefix,
+        max_lines=settings.JOB_LOG_BATCH_MAX_LINES,
+        flush_interval_s=settings.JOB_LOG_BATCH_INTERVAL_MS / 1000,
+    )
+
+
+async def _start_job_process(
     script_path: str,
     folder_path: str,
     language: str | None,
     log_level: str,
-    job_timeout_sec: float,
     task_log_prefix: str,
     redis_client: aioredis.Redis | None,
     job_db_id_str: str,
-    stdout_accumulator: list[bytes],
     stderr_accumulator: list[bytes],
-    subprocess_env: dict[str, str] | None = None,  # Custom env from DB settings
-) -> int:
+    subprocess_env: dict[str, str] | None = None,
+    incremental: bool = False,
+) -> asyncio.subprocess.Process | ForkedJobProcess:
     """
-    Core subprocess execution logic. Manages subprocess creation, stream reading, timeout,
-    and cancellation signals (asyncio.CancelledError).
-    Returns the script's exit code.
-    Raises TimeoutError, asyncio.CancelledError, or RuntimeError (with exit_code attribute for setup issues).
-
-    The subprocess_env parameter allows injecting effective settings (from DB)
-    as environment variables for the script to use.
+    Starts the job in the configured execution mode: a forked child of the pre-warmed
+    worker (JOB_EXECUTION_MODE=inprocess) or the downloader script as a subprocess.
     """
+    if _is_inprocess_execution_mode():
+        return await _setup_inprocess_job(
+            folder_path,
+            language,
+            log_level,
+            task_log_prefix,
+            redis_client,
+            job_db_id_str,
+            stderr_accumulator,
+            subprocess_env=subprocess_env,
+            incremental=incremental,
+        )
+
     # Use -u flag for unbuffered Python output to enable real-time log streaming
     cmd_args = [
         str(settings.PYTHON_EXECUTABLE_PATH),
@@ -1341,7 +1493,44 @@ async def _run_script_and_get_output(
     ]
     if language:
         cmd_args.extend(["--language", language])
+    if incremental:
+        cmd_args.append("--incremental")
+    return await _setup_subprocess(
+        cmd_args,
+        task_log_prefix,
+        redis_client,
+        job_db_id_str,
+        stderr_accumulator,
+        subprocess_env=subprocess_env,
+    )
+
 
+async def _run_script_and_get_output(
+    script_path: str,
+    folder_path: str,
+    language: str | None,
+    log_level: str,
+    job_timeout_sec: float,
+    task_log_prefix: str,
+    redis_client: aioredis.Redis | None,
+    job_db_id_str: str,
+    stdout_accumulator: list[bytes],
+    stderr_accumulator: list[bytes],
+    subprocess_env: dict[str, str] | None = None,  # Custom env from DB settings
+    incremental: bool = False,
+) -> int:
+    """
+    Core subprocess execution logic. Manages subprocess creation, stream reading, timeout,
+    and cancellation signals (asyncio.CancelledError).
+    Returns the script's exit code.
+    Raises TimeoutError, asyncio.CancelledError, or RuntimeError (with exit_code attribute for setup issues).
+
+    The subprocess_env parameter allows injecting effective settings (from DB)
+    as environment variables for the script to use.
+
+    With JOB_EXECUTION_MODE=inprocess the script is not spawned; the pre-warmed worker
+    is forked instead and the child runs the same pipeline (see app.tasks.inprocess_runner).
+    """
     final_script_exit_code = -255  # Default if errors occur before/during script run
     process: asyncio.subprocess.Process | None = None
     monitoring_tasks: list[asyncio.Task[Any] | None] = [
@@ -1350,15 +1539,21 @@ async def _run_script_and_get_output(
         None,
     ]  # stdout, stderr, process_wait
     all_tasks_gather_future: asyncio.Future[list[Any]] | None = None
+    # Coalesces script output lines into pipelined Redis writes; flushed in `finally`.
+    log_sink = _create_job_log_sink(redis_client, job_db_id_str, task_log_prefix)
 
     try:
-        process = await _setup_subprocess(
-            cmd_args,
+        process = await _start_job_process(
+            script_path,
+            folder_path,
+            language,
+            log_level,
             task_log_prefix,
             redis_client,
             job_db_id_str,
             stderr_accumulator,
             subprocess_env=subprocess_env,
+            incremental=incremental,
         )
         # _setup_subprocess raises RuntimeError with .exit_code if it fails, caught below
 
@@ -1372,6 +1567,7 @@ async def _run_script_and_get_output(
             task_log_prefix,
             stdout_accumulator,
             stderr_accumulator,
+            log_sink=log_sink,
         )
 
         logger.debug(
@@ -1453,6 +1649,9 @@ async def _run_script_and_get_output(
             final_script_exit_code,
             task_log_prefix,
         )
+        # Flush-on-exit: buffered log lines must reach Redis before the final status message.
+        if log_sink:
+            await log_sink.aclose()
     return final_script_exit_code
 
 
@@ -1464,6 +1663,7 @@ async def _finalize_job_after_script(
     stdout_bytes: bytes,
     stderr_bytes: bytes,
     task_log_prefix: str,
+    log_archive: JobLogArchive | None = None,
 ) -> dict:
     """
     Finalizes the job's status after the script has run.
@@ -1480,6 +1680,7 @@ async def _finalize_job_after_script(
     log_snippet = _build_log_snippet(
         stdout_str, stderr_str, script_status, exit_code, task_log_prefix
     )
+    log_summary = log_archive.close() if log_archive else None
 
     # Create a new, fresh session to get the absolute latest state from the DB.
     async with get_worker_db_session() as db:
@@ -1507,12 +1708,16 @@ async def _finalize_job_after_script(
             final_exit_code = -102  # Use a specific code for this race condition scenario.
             final_message = "Job cancelled by user during execution."
 
-        # Build full logs for database storage (limit to 1MB to prevent DB bloat)
-        full_logs = stdout_str + ("\n--- STDERR ---\n" + stderr_str if stderr_str.strip() else "")
-        if len(full_logs) > 1_000_000:
-            full_logs = (
-                full_logs[:500_000] + "\n\n... [LOGS TRUNCATED] ...\n\n" + full_logs[-500_000:]
+        # Without an archive, store the full logs on the row (limit to 1MB to prevent DB bloat)
+        full_logs = None
+        if not log_summary:
+            full_logs = stdout_str + (
+                "\n--- STDERR ---\n" + stderr_str if stderr_str.strip() else ""
             )
+            if len(full_logs) > 1_000_000:
+                full_logs = (
+                    full_logs[:500_000] + "\n\n... [LOGS TRUNCATED] ...\n\n" + full_logs[-500_000:]
+                )
 
         # Now, update the database with the definitively correct final state.
         await crud_ops.update_job_completion_details(
@@ -1523,9 +1728,13 @@ async def _finalize_job_after_script(
             result_message=final_message,
             log_snippet=log_snippet,
             full_logs=full_logs,
+            log_path=log_summary.name if log_summary else None,
+            log_size=log_summary.size if log_summary else None,
             completed_at=datetime.now(UTC),
         )
         await db.commit()
+        if log_summary:
+            log_archive.recorded = True
         logger.info(
             f"{task_log_prefix} Job final status '{final_status_to_set.value}' committed to DB."
         )
@@ -1874,6 +2083,7 @@ def execute_subtitle_downloader_task(  # noqa: C901
     folder_path: str,
     language: str | None,
     log_level: str = "INFO",
+    incremental: bool = False,
 ):
     celery_task_id = str(self.request.id) if self.request.id else "unknown-celery-id"
     task_name_for_log = self.name
@@ -1881,7 +2091,7 @@ def execute_subtitle_downloader_task(  # noqa: C901
         f"[CeleryTaskWrapper:{task_name_for_log} CeleryID:{celery_task_id} DBJobID:{job_db_id_str}]"
     )
     logger.info(
-        f"{wrapper_log_prefix} SYNC WRAPPER ENTERED for job on folder '{folder_path}', lang '{language}', log_level '{log_level}'."
+        f"{wrapper_log_prefix} SYNC WRAPPER ENTERED for job on folder '{folder_path}', lang '{language}', log_level '{log_level}', incremental {incremental}."
     )
 
     job_db_id: UUID
@@ -1899,7 +2109,13 @@ def execute_subtitle_downloader_task(  # noqa: C901
         logger.info(f"{wrapper_log_prefix} Invoking asyncio.run() for async logic.")
         final_result_from_async_logic = asyncio.run(
             _execute_subtitle_downloader_async_logic(
-                task_name_for_log, celery_task_id, job_db_id, folder_path, language, log_level
+                task_name_for_log,
+                celery_task_id,
+                job_db_id,
+                folder_path,
+                language,
+                log_level,
+                incremental,
             )
         )
         logger.info(
@@ -4,6 +4,7 @@ from sqlalchemy import select
 
 from app.db.models.audit_log import AuditLog
 from app.services import audit_service
+from app.services.audit_chain import load_checkpoint, verify_audit_chain
 from app.tasks.audit_worker import process_outbox_batch
 
 
@@ -55,6 +56,31 @@ async def test_audit_tamper_detection(db_session) -> None:
     assert any("Hash mismatch" in issue for issue in result["issues"])
 
 
+@pytest.mark.asyncio
+async def test_audit_chain_verification_resumes_from_checkpoint(db_session) -> None:
+    await audit_service.log_event(db_session, category="admin", action="admin.audit.view")
+    await db_session.commit()
+    await process_outbox_batch(db_session)
+    await verify_audit_chain(db_session, lag_s=0)
+    checkpoint = await load_checkpoint(db_session)
+    assert checkpoint is not None
+
+    # Two new entries; only those are checked by the next run
+    await audit_service.log_event(db_session, category="admin", action="admin.audit.view")
+    await audit_service.log_event(db_session, category="admin", action="admin.audit.export")
+    await db_session.commit()
+    await process_outbox_batch(db_session)
+    res = await db_session.execute(select(AuditLog).order_by(AuditLog.id.desc()).limit(1))
+    entry = res.scalar()
+    entry.action = "admin.user.delete"
+    await db_session.commit()
+
+    result = await verify_audit_chain(db_session, lag_s=0, page_size=1)
+    assert result["checked_count"] == 2
+    assert result["verified"] is False
+    assert result["last_log_id"] == entry.id
+
+
 @pytest.mark.usefixtures("override_auth_dependencies")
 @pytest.mark.asyncio
 async def test_audit_mfa_instrumentation(db_session) -> None:
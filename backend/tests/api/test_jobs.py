@@ -334,3 +334,148 @@ async def test_get_recent_torrents_no_client(
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_pages_by_cursor(
+    test_client: AsyncClient, db_session: AsyncSession
+) -> None:
+    from datetime import UTC, datetime, timedelta
+
+    user = UserFactory.create_user(session=db_session, email="job_pager@example.com")
+    other = UserFactory.create_user(session=db_session, email="job_pager_other@example.com")
+    await db_session.flush()
+    start = datetime(2024, 5, 1, tzinfo=UTC)
+    for i in range(5):
+        db_session.add(
+            Job(
+                folder_path=f"/media/movies/{i}",
+                user_id=user.id,
+                status=JobStatus.FAILED if i % 2 else JobStatus.SUCCEEDED,
+                # Two jobs share a timestamp; the id breaks the tie
+                submitted_at=start + timedelta(minutes=min(i, 3)),
+                full_logs="x" * 10000,
+            )
+        )
+    db_session.add(Job(folder_path="/media/other", user_id=other.id, status=JobStatus.FAILED))
+    await db_session.commit()
+    headers = await login_user(test_client, user.email, "password123")
+
+    seen = []
+    params: dict = {"limit": 2}
+    while True:
+        response = await test_client.get(f"{API_PREFIX}/jobs/", headers=headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(job["folder_path"] for job in response.json())
+        if "x-next-cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["x-next-cursor"]
+    assert sorted(seen) == [f"/media/movies/{i}" for i in range(5)]
+    assert len(set(seen)) == 5
+    assert seen[-1] == "/media/movies/0"  # Newest first
+
+    response = await test_client.get(
+        f"{API_PREFIX}/jobs/", headers=headers, params={"status": "FAILED"}
+    )
+    assert sorted(job["folder_path"] for job in response.json()) == [
+        "/media/movies/1",
+        "/media/movies/3",
+    ]
+
+    response = await test_client.get(
+        f"{API_PREFIX}/jobs/", headers=headers, params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_job_logs_streams_ranges_of_the_archive(
+    test_client: AsyncClient,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    from app.core.job_log_archive import JobLogArchive
+
+    monkeypatch.setattr(settings, "JOB_LOG_ARCHIVE_DIR_ENV", str(tmp_path))
+    user = UserFactory.create_user(session=db_session, email="job_logs@example.com")
+    other = UserFactory.create_user(session=db_session, email="job_logs_other@example.com")
+    await db_session.flush()
+    job = Job(folder_path="/media/movies/logs", user_id=user.id, status=JobStatus.SUCCEEDED)
+    legacy = Job(
+        folder_path="/media/movies/legacy",
+        user_id=user.id,
+        status=JobStatus.SUCCEEDED,
+        full_logs="stored on the row\n",
+    )
+    db_session.add_all([job, legacy])
+    await db_session.flush()
+
+    archive = JobLogArchive(job.id, chunk_bytes=64)
+    full = b"".join(f"output line {i}\n".encode() for i in range(100))
+    archive.write(full)
+    summary = archive.close()
+    job.log_path, job.log_size = summary.name, summary.size
+    await db_session.commit()
+    headers = await login_user(test_client, user.email, "password123")
+    url = f"{API_PREFIX}/jobs/{job.id}/logs"
+
+    response = await test_client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == full
+    assert response.headers["accept-ranges"] == "bytes"
+
+    response = await test_client.get(url, headers={**headers, "Range": "bytes=100-199"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == full[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(full)}"
+
+    response = await test_client.get(url, headers={**headers, "Range": "bytes=-16"})
+    assert response.content == full[-16:]
+
+    response = await test_client.get(url, headers={**headers, "Range": f"bytes={len(full)}-"})
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+    response = await test_client.get(f"{API_PREFIX}/jobs/{legacy.id}/logs", headers=headers)
+    assert response.content == b"stored on the row\n"
+
+    other_headers = await login_user(test_client, other.email, "password123")
+    response = await test_client.get(url, headers=other_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_get_job_logs_reads_the_archive_of_a_running_job(
+    test_client: AsyncClient,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    from app.core.job_log_archive import JobLogArchive
+    from app.crud.crud_job import job as crud_job
+
+    monkeypatch.setattr(settings, "JOB_LOG_ARCHIVE_DIR_ENV", str(tmp_path))
+    user = UserFactory.create_user(session=db_session, email="running_logs@example.com")
+    await db_session.flush()
+    job = Job(folder_path="/media/movies/running", user_id=user.id, status=JobStatus.PENDING)
+    db_session.add(job)
+    await db_session.flush()
+
+    # What the worker does: open the archive, then mark the job RUNNING with its name
+    archive = JobLogArchive(job.id, chunk_bytes=64)
+    await crud_job.update_job_start_details(
+        db_session, job_id=job.id, celery_task_id="celery-running", log_path=archive.name
+    )
+    await db_session.commit()
+    archive.write(b"a" * 64)  # One complete chunk
+    archive.write(b"b" * 10)  # Still buffered
+    headers = await login_user(test_client, user.email, "password123")
+    url = f"{API_PREFIX}/jobs/{job.id}/logs"
+
+    response = await test_client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b"a" * 64
+
+    archive.close()
+    response = await test_client.get(url, headers=headers)
+    assert response.content == b"a" * 64 + b"b" * 10
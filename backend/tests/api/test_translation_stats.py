@@ -154,3 +154,50 @@ async def test_translation_stats_response_format(
         assert "google_characters" in period_data
         assert "success_count" in period_data
         assert "failure_count" in period_data
+
+
+@pytest.mark.asyncio
+async def test_translation_stats_are_summed_from_daily_rollups(
+    test_client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that statistics come from translation_stats_daily, per calendar-day window."""
+    from datetime import UTC, datetime, timedelta
+
+    from app.api.routers import translation_stats
+    from app.db.models.translation_log import TranslationStatsDaily
+
+    today = datetime.now(UTC).date()
+    for days_ago, status_value, chars in (
+        (0, "success", 100),
+        (10, "failed", 50),
+        (40, "success", 7),
+    ):
+        db_session.add(
+            TranslationStatsDaily(
+                day=today - timedelta(days=days_ago),
+                service_used="deepl",
+                target_language="ro",
+                status=status_value,
+                translations=2,
+                characters_billed=chars,
+                deepl_characters=chars,
+                google_characters=0,
+                memory_chars_saved=0,
+            )
+        )
+    user = UserFactory.create_user(session=db_session, email="stats_rollups@example.com")
+    await db_session.flush()
+    translation_stats._stats_cache = None
+
+    headers = await login_user(test_client, user.email, "password123")
+    response = await test_client.get(f"{API_PREFIX}/translation-stats", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["all_time"]["total_translations"] == 6
+    assert data["all_time"]["total_characters"] == 157
+    assert data["last_30_days"]["total_characters"] == 150
+    assert data["last_30_days"]["failure_count"] == 2
+    assert data["last_7_days"]["total_characters"] == 100
+    assert data["last_7_days"]["success_count"] == 2
+    translation_stats._stats_cache = None
@@ -0,0 +1,127 @@
+"""
+Throughput benchmark for subtitle candidate scoring in `subtitle_matcher`.
+
+Generates thousands of synthetic OpenSubtitles results for one episode and
+ranks them twice:
+
+- before: `score_candidate` per result with the per-token criteria scan
+  uncached, i.e. media re-tokenized, episode regexes and every priority
+  criterion re-run for each candidate (the pre-profile cost);
+- after: one `MediaMatchProfile` and a single `score_candidates` pass.
+
+Both passes must produce identical scores.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_candidate_scoring.py --candidates 5000 --repeat 3
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.modules.subtitle.core import constants  # noqa: E402, F401 Load before the matcher
+from app.modules.subtitle.utils import subtitle_matcher  # noqa: E402
+
+MEDIA = "Dark.S01E02.Lies.1080p.NF.WEB-DL.DDP5.1.x264-NTb.mkv"
+_PARTS = {
+    "episode": ["S01E02", "S01E03", "1x02", "S02E02", "E02"],
+    "resolution": ["1080p", "720p", "2160p", "480p", ""],
+    "source": ["NF.WEB-DL", "WEBRip", "BluRay", "AMZN.WEB-DL", "HDTV", "DVDRip"],
+    "codec": ["x264", "x265", "HEVC", "H.264", ""],
+    "audio": ["DDP5.1", "AAC2.0", "DTS", "Atmos", ""],
+    "group": ["NTb", "RARBG", "GalaxyTV", "ION10", "TEPES", "playWEB"],
+}
+
+
+def _candidates(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        release = (
+            ".".join(
+                part
+                for part in (
+                    "Dark",
+                    rng.choice(_PARTS["episode"]),
+                    rng.choice(_PARTS["resolution"]),
+                    rng.choice(_PARTS["source"]),
+                    rng.choice(_PARTS["audio"]),
+                    rng.choice(_PARTS["codec"]),
+                )
+                if part
+            )
+            + f"-{rng.choice(_PARTS['group'])}"
+        )
+        results.append(
+            {
+                "source": "opensubtitles",
+                "id": f"file-{i}",
+                "language": rng.choice(["ro", "ro", "en"]),
+                "release_name": release,
+                "file_name": f"{release}.srt",
+                "attributes": {
+                    "from_trusted": rng.random() < 0.2,
+                    "hearing_impaired": rng.random() < 0.1,
+                    "machine_translated": rng.random() < 0.05,
+                },
+            }
+        )
+    return results
+
+
+def _before(candidates: list[dict]) -> list:
+    media_tokens = subtitle_matcher.tokenize_and_normalize(Path(MEDIA).stem)
+    media_s, media_e = subtitle_matcher.extract_season_episode(MEDIA)
+    uncached = subtitle_matcher._token_weights.__wrapped__
+    with patch.object(subtitle_matcher, "_token_weights", uncached):
+        return [
+            subtitle_matcher.score_candidate(c, media_tokens, MEDIA, media_s, media_e, "ro")
+            for c in candidates
+        ]
+
+
+def _after(candidates: list[dict]) -> list:
+    return subtitle_matcher.MediaMatchProfile.from_filename(MEDIA).score_candidates(
+        candidates, "ro"
+    )
+
+
+def _best_of(fn, candidates: list[dict], repeat: int) -> tuple[float, list]:
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(candidates)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    candidates = _candidates(args.candidates, args.seed)
+    before_s, before = _best_of(_before, candidates, args.repeat)
+    after_s, after = _best_of(_after, candidates, args.repeat)
+    if before != after:
+        raise SystemExit("Scores differ between the two passes")
+
+    kept = sum(1 for r in after if r)
+    print(f"{args.candidates} candidates, {kept} kept after the episode check")
+    print(f"before: {before_s * 1000:8.1f} ms ({args.candidates / before_s:9.0f} cand/s)")
+    print(f"after:  {after_s * 1000:8.1f} ms ({args.candidates / after_s:9.0f} cand/s)")
+    print(f"speedup: {before_s / after_s:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
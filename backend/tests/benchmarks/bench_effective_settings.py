@@ -0,0 +1,101 @@
+"""
+Per-job cost of reading the effective settings (DB > env) in a worker.
+
+A job reads the settings twice: `get_effective_settings_dict` for logging and
+`build_subprocess_env` for the script. The "before" column replays the old
+access pattern (one AppSettings query per field plus one for the env, each
+value decrypted again); "after" reads the cached snapshot, which costs a single
+``updated_at`` lookup while the row is unchanged. DB round trips are simulated
+with a fixed sleep; decryption is the real Fernet path.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_effective_settings.py --jobs 200 --rtt 0.0005
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core import effective_settings  # noqa: E402
+from app.core.security import encrypt_value  # noqa: E402
+from app.db import base  # noqa: E402, F401 Register all models before building queries
+
+
+class SimulatedSession:
+    def __init__(self, row: SimpleNamespace, rtt: float) -> None:
+        self.row = row
+        self.rtt = rtt
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        await asyncio.sleep(self.rtt)
+        value = self.row.updated_at if len(stmt.selected_columns) == 1 else self.row
+        return SimpleNamespace(scalar_one_or_none=lambda: value)
+
+
+def _row() -> SimpleNamespace:
+    values = dict.fromkeys(effective_settings.DB_TO_ENV_MAPPING)
+    values.update(
+        tmdb_api_key=encrypt_value("tmdb-key"),
+        omdb_api_key=encrypt_value("omdb-key"),
+        opensubtitles_api_key=encrypt_value("os-key"),
+        opensubtitles_username=encrypt_value("user"),
+        opensubtitles_password=encrypt_value("secret"),
+        deepl_api_keys=encrypt_value(json.dumps(["k1:fx", "k2:fx", "k3:fx"])),
+        qbittorrent_host="qbittorrent",
+        qbittorrent_port=8080,
+        qbittorrent_username="admin",
+        qbittorrent_password=encrypt_value("adminadmin"),
+        allowed_media_folders=json.dumps(["/media/movies", "/media/series"]),
+        updated_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+    return SimpleNamespace(**values)
+
+
+async def _job_before(db: SimulatedSession) -> None:
+    for field in effective_settings.DB_TO_ENV_MAPPING:
+        effective_settings._resolve_field(await effective_settings._get_db_settings(db), field)
+    effective_settings.build_settings_snapshot(await effective_settings._get_db_settings(db))
+
+
+async def _job_after(db: SimulatedSession) -> None:
+    await effective_settings.get_effective_settings_dict(db)
+    await effective_settings.build_subprocess_env(db)
+
+
+async def _measure(job, jobs: int, rtt: float) -> tuple[float, float]:
+    db = SimulatedSession(_row(), rtt)
+    effective_settings.invalidate_settings_snapshot()
+    started = time.perf_counter()
+    for _ in range(jobs):
+        await job(db)
+    elapsed = time.perf_counter() - started
+    return elapsed / jobs * 1e6, db.queries / jobs
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--rtt", type=float, default=0.0005, help="Simulated seconds per query.")
+    args = parser.parse_args()
+
+    before_us, before_queries = await _measure(_job_before, args.jobs, args.rtt)
+    after_us, after_queries = await _measure(_job_after, args.jobs, args.rtt)
+    print(f"before: {before_us:8.0f} us/job, {before_queries:5.2f} queries/job")
+    print(f"after:  {after_us:8.0f} us/job, {after_queries:5.2f} queries/job")
+    print(f"speedup: {before_us / after_us:4.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,79 @@
+"""
+Per-job latency benchmark: subprocess vs in-process (forked, pre-warmed) execution.
+
+Runs `_run_script_and_get_output` against an empty temporary folder, so the
+measured time is almost entirely runner overhead (interpreter start-up, imports,
+process creation, stream plumbing) rather than subtitle work.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_job_execution_modes.py --runs 10
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set);
+no database or Redis connection is made.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.tasks import subtitle_jobs  # noqa: E402
+from app.tasks.inprocess_runner import prewarm_subtitle_stack  # noqa: E402
+
+SCRIPT_PATH = str(BACKEND_DIR / "scripts" / "sub_downloader.py")
+
+
+async def _run_once(mode: str, folder: str) -> tuple[float, int]:
+    settings.JOB_EXECUTION_MODE = mode
+    stdout_acc: list[bytes] = []
+    stderr_acc: list[bytes] = []
+    started = time.perf_counter()
+    exit_code = await subtitle_jobs._run_script_and_get_output(
+        script_path=SCRIPT_PATH,
+        folder_path=folder,
+        language="ro",
+        log_level="INFO",
+        job_timeout_sec=120.0,
+        task_log_prefix=f"[bench:{mode}]",
+        redis_client=None,
+        job_db_id_str="benchmark",
+        stdout_accumulator=stdout_acc,
+        stderr_accumulator=stderr_acc,
+        subprocess_env=None,
+    )
+    return time.perf_counter() - started, exit_code
+
+
+async def _bench(runs: int) -> None:
+    prewarm_subtitle_stack()
+    with tempfile.TemporaryDirectory() as folder:
+        for mode in ("subprocess", "inprocess"):
+            await _run_once(mode, folder)  # warm-up (page cache, pidfd, etc.)
+            timings = []
+            for _ in range(runs):
+                elapsed, exit_code = await _run_once(mode, folder)
+                if exit_code != 0:
+                    raise SystemExit(f"{mode} run failed with exit code {exit_code}")
+                timings.append(elapsed * 1000)
+            print(
+                f"{mode:>10}: median {statistics.median(timings):8.1f} ms | "
+                f"min {min(timings):8.1f} ms | max {max(timings):8.1f} ms ({runs} runs)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(_bench(args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Job log publishing throughput benchmark (lines/sec) against a real Redis.
+
+Compares three ways of writing N log lines for one job:
+  sequential - XADD and EXPIRE as separately awaited calls per line
+  pipelined  - one pipelined XADD/EXPIRE round trip per line
+  batched    - JobLogSink coalescing lines into pipelined batch writes
+
+Usage (from backend/):
+    python tests/benchmarks/bench_job_log_publishing.py --lines 20000 \\
+        --redis-url redis://localhost:6379/2
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import redis.asyncio as aioredis  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.job_log_stream import (  # noqa: E402
+    JOB_LOG_HISTORY_TTL_S,
+    JOB_LOG_STREAM_FIELD,
+    JobLogSink,
+    job_log_stream_key,
+    serialize_job_log_message,
+    write_job_log_messages,
+)
+
+
+def _payload(i: int) -> dict:
+    return {"stream": "stdout", "message": f"INFO: Processing episode line {i} of the season"}
+
+
+async def _sequential(client: aioredis.Redis, job_id: str, lines: int) -> None:
+    for i in range(lines):
+        message = serialize_job_log_message("log", _payload(i))
+        await client.xadd(
+            job_log_stream_key(job_id),
+            {JOB_LOG_STREAM_FIELD: message},
+            maxlen=settings.JOB_LOG_STREAM_MAXLEN,
+            approximate=True,
+        )
+        await client.expire(job_log_stream_key(job_id), JOB_LOG_HISTORY_TTL_S)
+
+
+async def _pipelined(client: aioredis.Redis, job_id: str, lines: int) -> None:
+    for i in range(lines):
+        await write_job_log_messages(
+            client, job_id, [serialize_job_log_message("log", _payload(i))]
+        )
+
+
+async def _batched(
+    client: aioredis.Redis, job_id: str, lines: int, max_lines: int, interval_s: float
+) -> None:
+    sink = JobLogSink(client, job_id, max_lines=max_lines, flush_interval_s=interval_s)
+    for i in range(lines):
+        await sink.publish("log", _payload(i))
+    await sink.aclose()
+
+
+async def _bench(args: argparse.Namespace) -> None:
+    client = aioredis.from_url(args.redis_url)
+    try:
+        await client.ping()
+        modes = {
+            "sequential": lambda job_id: _sequential(client, job_id, args.lines),
+            "pipelined": lambda job_id: _pipelined(client, job_id, args.lines),
+            "batched": lambda job_id: _batched(
+                client, job_id, args.lines, args.batch_lines, args.batch_interval_ms / 1000
+            ),
+        }
+        for name, run in modes.items():
+            job_id = f"bench-{uuid.uuid4()}"
+            started = time.perf_counter()
+            await run(job_id)
+            elapsed = time.perf_counter() - started
+            stored = await client.xlen(job_log_stream_key(job_id))
+            await client.delete(job_log_stream_key(job_id))
+            print(
+                f"{name:>10}: {args.lines / elapsed:12,.0f} lines/sec "
+                f"({elapsed * 1000:8.1f} ms, {stored} lines stored)"
+            )
+    finally:
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/2")
+    parser.add_argument("--batch-lines", type=int, default=200)
+    parser.add_argument("--batch-interval-ms", type=int, default=100)
+    asyncio.run(_bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Speed and accuracy benchmark for the in-process subtitle offset estimator.
+
+Builds a synthetic feature-length speech track (random dialogue turns) and, for
+a range of known displacements, subtitles that follow the dialogue with timing
+noise and missing lines. Measures:
+
+- estimate: `subtitle_mask` + `estimate_offset_from_masks` per subtitle, and
+  the error against the known displacement;
+- vad: `speech_track_from_pcm` over synthetic 16 kHz PCM (noise with loud
+  bursts), for the energy VAD and webrtcvad when installed, as a multiple of
+  real time. Decoding with ffmpeg comes on top and is not measured here.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_offset_estimation.py --minutes 120 --vad-minutes 10
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.modules.subtitle.utils import sync_offset  # noqa: E402
+from app.modules.subtitle.utils.srt_codec import SrtCue  # noqa: E402
+
+_DISPLACEMENTS_S = (0.0, 0.4, -1.3, 3.2, -7.5, 12.0, -25.0, 42.0)
+
+
+def _dialogue(rng: np.random.Generator, length_s: float) -> list[tuple[float, float]]:
+    intervals, t = [], rng.uniform(0, 5)
+    while t < length_s - 5:
+        end = t + rng.uniform(0.5, 4.0)
+        intervals.append((t, end))
+        t = end + rng.uniform(0.3, 6.0)
+    return intervals
+
+
+def _speech_track(intervals: list[tuple[float, float]], length_s: float) -> np.ndarray:
+    speech = np.zeros(int(length_s * 100), dtype=np.float32)
+    for start, end in intervals:
+        speech[int(start * 100) : int(end * 100)] = 1.0
+    return speech
+
+
+def _cues(
+    intervals: list[tuple[float, float]], shift_s: float, rng: np.random.Generator
+) -> list[SrtCue]:
+    cues = []
+    for index, (start, end) in enumerate(intervals, 1):
+        if rng.random() < 0.1:
+            continue
+        start_ms = int((start + shift_s + rng.normal(0, 0.1)) * 1000)
+        end_ms = int((end + shift_s + rng.normal(0, 0.1)) * 1000)
+        if start_ms >= 0:
+            cues.append(SrtCue(index, start_ms, end_ms, "..."))
+    return cues
+
+
+def _pcm_chunks(rng: np.random.Generator, minutes: float) -> list[bytes]:
+    samples = rng.normal(0, 30, int(minutes * 60 * 16000))
+    for start, end in _dialogue(rng, minutes * 60):
+        burst = slice(int(start * 16000), int(end * 16000))
+        samples[burst] += rng.normal(0, 3000, burst.stop - burst.start)
+    pcm = samples.clip(-32768, 32767).astype("<i2").tobytes()
+    step = 320 * 1000  # 10 s per chunk, as read from ffmpeg
+    return [pcm[i : i + step] for i in range(0, len(pcm), step)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=120.0)
+    parser.add_argument("--vad-minutes", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    length_s = args.minutes * 60
+    intervals = _dialogue(rng, length_s)
+    speech = _speech_track(intervals, length_s)
+    print(f"track: {args.minutes:.0f} min, {len(intervals)} dialogue turns")
+
+    timings, errors, confidences = [], [], []
+    for displacement in _DISPLACEMENTS_S:
+        cues = _cues(intervals, displacement, rng)
+        start = time.perf_counter()
+        estimate = sync_offset.estimate_offset_from_masks(
+            speech, sync_offset.subtitle_mask(cues, length=speech.size)
+        )
+        timings.append(time.perf_counter() - start)
+        assert estimate is not None
+        errors.append(abs(estimate.offset_s + displacement))
+        confidences.append(estimate.confidence)
+        print(
+            f"  displaced {displacement:+6.1f} s -> offset {estimate.offset_s:+7.2f} s, "
+            f"confidence {estimate.confidence:.2f}, {timings[-1] * 1000:6.1f} ms"
+        )
+    unrelated = sync_offset.estimate_offset_from_masks(
+        speech,
+        sync_offset.subtitle_mask(_cues(_dialogue(rng, length_s), 0.0, rng), length=speech.size),
+    )
+    print(
+        f"estimate: median {np.median(timings) * 1000:.1f} ms, max error {max(errors):.2f} s, "
+        f"min confidence {min(confidences):.2f}; unrelated subtitle confidence "
+        f"{unrelated.confidence if unrelated else 0.0:.2f}"
+    )
+
+    chunks = _pcm_chunks(rng, args.vad_minutes)
+    audio_s = args.vad_minutes * 60
+    modes = [("energy", False)] + ([("webrtc", True)] if sync_offset.webrtcvad else [])
+    for label, use_webrtc in modes:
+        start = time.perf_counter()
+        sync_offset.speech_track_from_pcm(chunks, use_webrtc=use_webrtc)
+        elapsed = time.perf_counter() - start
+        print(
+            f"vad {label:>6}: {elapsed:6.2f} s for {audio_s:.0f} s of audio, {audio_s / elapsed:7.0f}x real time"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Season wall-time benchmark: sequential vs parallel per-file subtitle pipelines.
+
+Creates a temporary season folder with N empty episode files and runs
+`process_tv_show_folder` with `_run_pipeline_for_file` replaced by a stand-in
+that spends simulated time in the same provider slots as the real strategies
+(metadata lookup, ffmpeg probe, subtitle provider, translation, sync). The
+result shows how SUBTITLE_PIPELINE_WORKERS and the per-provider limits shape
+the total wall time.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_parallel_pipelines.py --episodes 24 --workers 1 4 8
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.modules.subtitle.core import processor  # noqa: E402
+from app.modules.subtitle.core.concurrency import (  # noqa: E402
+    provider_slot,
+    reset_provider_limits,
+)
+
+# Simulated seconds spent per stage of one episode.
+STAGES = (
+    ("metadata", 0.15),
+    ("ffmpeg", 0.10),
+    ("opensubtitles", 0.40),
+    ("translation", 0.30),
+    ("sync", 0.50),
+)
+
+
+def _fake_pipeline(scale: float):
+    def _run(_video_path: str, _options, **_kwargs) -> bool:
+        for provider, seconds in STAGES:
+            with provider_slot(provider):
+                time.sleep(seconds * scale)
+        return True
+
+    return _run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--episodes", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--scale", type=float, default=0.1, help="Multiplier for stage times.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        for episode in range(1, args.episodes + 1):
+            (Path(folder) / f"Show.S01E{episode:02d}.1080p.mkv").write_bytes(b"")
+
+        baseline = None
+        for workers in args.workers:
+            reset_provider_limits()
+            with (
+                patch.object(processor, "_run_pipeline_for_file", _fake_pipeline(args.scale)),
+                patch.object(settings, "SUBTITLE_PIPELINE_WORKERS", workers),
+            ):
+                started = time.perf_counter()
+                succeeded = processor.process_tv_show_folder(folder)
+                elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers:>2}: {elapsed:7.2f} s for {succeeded} episodes "
+                f"({baseline / elapsed:4.1f}x vs first run)"
+            )
+
+
+if __name__ == "__main__":
+    main()
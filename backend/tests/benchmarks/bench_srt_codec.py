@@ -0,0 +1,166 @@
+"""
+Parse/serialize benchmark for the streaming SRT codec.
+
+Writes a corpus of synthetic SRT files (UTF-8 and cp1250, CRLF line endings)
+and measures, per file:
+
+- before: the previous pipeline, i.e. encoding candidates tried by re-reading
+  the whole file, the whole-text timestamp regex pass, the line state machine
+  producing string tuples, and the tuple rebuild (replayed here verbatim);
+- after: `srt_codec.iter_srt_file` (prefix detection, incremental decoding,
+  `SrtCue` records) and `srt_codec.compose_srt`.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_srt_codec.py --files 40 --cues 2000
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import codecs
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import chardet  # noqa: E402
+
+from app.modules.subtitle.utils import srt_codec  # noqa: E402
+
+_WORDS = "ce faci acum unde mergem este bine ţară şcoală încă până mâine".split()
+
+
+def _write_corpus(root: Path, files: int, cues: int, seed: int) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for n in range(files):
+        blocks = []
+        for i in range(1, cues + 1):
+            start = i * 2500
+            lines = [" ".join(rng.choices(_WORDS, k=rng.randint(3, 8))) for _ in range(2)]
+            blocks.append(
+                f"{i}\r\n{srt_codec.format_timestamp(start)} --> "
+                f"{srt_codec.format_timestamp(start + 2000)}\r\n" + "\r\n".join(lines)
+            )
+        path = root / f"episode_{n:03d}.srt"
+        path.write_bytes(("\r\n\r\n".join(blocks) + "\r\n").encode("utf-8" if n % 2 else "cp1250"))
+        paths.append(path)
+    return paths
+
+
+# --- Previous pipeline, replayed for comparison ---
+
+
+def _before_read(path: Path) -> str:
+    # Old file_utils.detect_encoding: chardet on the first 128 KB, always.
+    result = chardet.detect(path.read_bytes()[: 128 * 1024])
+    encoding = (result.get("encoding") or "utf-8").lower()
+    if encoding == "ascii" or (result.get("confidence") or 0) < 0.75:
+        encoding = "utf-8"
+    elif encoding in ("iso-8859-1", "windows-1252"):
+        encoding = "cp1252"
+    for candidate in dict.fromkeys((encoding, *srt_codec.FALLBACK_ENCODINGS)):
+        try:
+            with codecs.open(str(path), "r", encoding=candidate, errors="strict") as f:
+                return f.read().removeprefix("\ufeff")
+        except UnicodeDecodeError:
+            continue
+    raise OSError(path)
+
+
+def _before_parse(content: str) -> list[tuple[str, str, str]]:
+    content = re.sub(r"(\d{2}:\d{2}:\d{2})\.(\d{3})", r"\1,\2", content.strip())
+    content = re.sub(
+        r"(\d{2}:\d{2}:\d{2},\d{3})\s*--?>\s*(\d{2}:\d{2}:\d{2},\d{3})", r"\1 --> \2", content
+    )
+    segments, idx, ts, text, state = [], None, None, [], "index"
+    for line in content.splitlines():
+        stripped = line.strip()
+        if state == "index":
+            if re.fullmatch(r"\d+", stripped):
+                idx, state = line, "timestamp"
+        elif state == "timestamp":
+            if re.match(r"\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}", stripped):
+                ts, state = line, "text"
+            elif stripped:
+                idx, ts, text, state = None, None, [], "index"
+        elif stripped:
+            text.append(line)
+        else:
+            segments.append((idx, ts, "\n".join(text)))
+            idx, ts, text, state = None, None, [], "index"
+    if state == "text" and text:
+        segments.append((idx, ts, "\n".join(text)))
+    return segments
+
+
+def _before_rebuild(segments: list[tuple[str, str, str]]) -> str:
+    blocks = [
+        f"{str(i).rstrip()}\n{str(t).rstrip()}\n{x}" for i, t, x in segments if i and "-->" in t
+    ]
+    return "\n\n".join(blocks).rstrip() + "\n"
+
+
+def _before(path: Path) -> int:
+    segments = _before_parse(_before_read(path))
+    return len(_before_rebuild(segments))
+
+
+def _after(path: Path) -> int:
+    return len(srt_codec.compose_srt(srt_codec.iter_srt_file(path)))
+
+
+def _timed(fn, items: list) -> tuple[float, int]:
+    started = time.perf_counter()
+    total = sum(fn(item) for item in items)
+    return time.perf_counter() - started, total
+
+
+def _peak_bytes(fn, item) -> int:
+    tracemalloc.start()
+    fn(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--cues", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_corpus(Path(tmp), args.files, args.cues, args.seed)
+        size_mb = sum(p.stat().st_size for p in paths) / 1e6
+        texts = [srt_codec.read_srt_text(p) for p in paths]
+        rows = {
+            "read+parse+write": (
+                _timed(_before, paths),
+                _timed(_after, paths),
+            ),
+            "parse+write only": (
+                _timed(lambda t: len(_before_rebuild(_before_parse(t))), texts),
+                _timed(lambda t: len(srt_codec.compose_srt(srt_codec.parse_srt(t))), texts),
+            ),
+        }
+        peaks = (_peak_bytes(_before, paths[0]), _peak_bytes(_after, paths[0]))
+
+    print(f"corpus: {args.files} files, {args.files * args.cues} cues, {size_mb:.1f} MB")
+    for label, ((before_s, before_n), (after_s, after_n)) in rows.items():
+        print(
+            f"{label:>16}: before {before_s:6.2f} s, after {after_s:6.2f} s, "
+            f"{before_s / after_s:4.1f}x, output {'equal' if before_n == after_n else 'differs'}"
+        )
+    print(f"peak memory per file: before {peaks[0] / 1e6:5.1f} MB, after {peaks[1] / 1e6:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Wall-time benchmark for `TranslationManager.batched_srt_translate` batch dispatch.
+
+Builds a feature-length SRT (default 1600 cues) and translates it with
+`_translate_deepl_list` replaced by a stand-in that sleeps for a simulated
+round trip per batch. Shows how TRANSLATION_BATCH_CONCURRENCY turns
+N x RTT into roughly N / window x RTT.
+
+Usage (from backend/):
+    python tests/benchmarks/bench_translation_dispatch.py --cues 1600 --rtt 0.4 --windows 1 2 4 8
+
+Only needs an environment in which `Settings` loads (e.g. POSTGRES_PASSWORD set).
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.modules.subtitle.services import translator  # noqa: E402
+
+
+def _srt(cues: int) -> str:
+    return "\n".join(
+        f"{i}\n00:{i // 60 % 60:02d}:{i % 60:02d},000 --> 00:{i // 60 % 60:02d}:{i % 60:02d},900\n"
+        f"Dialogue line number {i}, long enough to look like a real subtitle.\n"
+        for i in range(1, cues + 1)
+    )
+
+
+def _manager(rtt: float) -> translator.TranslationManager:
+    manager = translator.TranslationManager.__new__(translator.TranslationManager)
+    manager.deepl_keys = ["benchmark-key"]
+    manager.deepl_usage_cache = {0: {"count": 0, "limit": 10**9, "valid": True}}
+    manager.current_deepl_key_index = 0
+    manager.google_client = None
+    manager.google_used_session = 0
+    manager._deepl_state_lock = threading.RLock()
+    manager._log_usage = MagicMock()
+
+    def fake_list(texts, *_args, **_kwargs):
+        time.sleep(rtt)
+        return list(texts), sum(map(len, texts))
+
+    manager._translate_deepl_list = fake_list
+    return manager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cues", type=int, default=1600)
+    parser.add_argument("--rtt", type=float, default=0.4, help="Simulated seconds per request.")
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    srt = _srt(args.cues)
+    baseline = None
+    for window in args.windows:
+        with (
+            patch.object(settings, "TRANSLATION_BATCH_CONCURRENCY", window),
+            patch.object(translator, "_get_translation_memory", return_value=None),
+        ):
+            started = time.perf_counter()
+            result = _manager(args.rtt).batched_srt_translate("bench.srt", srt, "en", "ro")
+            elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(
+            f"window={window:>2}: {elapsed:6.2f} s ({result.service_used}, "
+            f"{result.characters_translated} chars) {baseline / elapsed:4.1f}x vs first run"
+        )
+
+
+if __name__ == "__main__":
+    main()
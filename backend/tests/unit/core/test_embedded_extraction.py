@@ -0,0 +1,132 @@
+# backend/tests/unit/core/test_embedded_extraction.py
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.modules.subtitle.core.strategies.base import ProcessingContext
+from app.modules.subtitle.core.strategies.embed_scanner import EmbedScanner
+from app.modules.subtitle.core.strategies.final_selector import FinalSelector
+from app.modules.subtitle.services.media_probe_cache import MediaProbe, MediaProbeCache
+from app.modules.subtitle.utils import media_utils
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello there\n"
+
+
+class FakeFfmpeg:
+    """Records ffmpeg invocations and writes every requested output."""
+
+    def __init__(self, fail_combined: bool = False) -> None:
+        self.commands: list[list[str]] = []
+        self.fail_combined = fail_combined
+
+    def __call__(self, command: list[str], **_kwargs) -> MagicMock:
+        self.commands.append(command)
+        outputs = [command[i + 4] for i, arg in enumerate(command) if arg == "-map"]
+        if self.fail_combined and len(outputs) > 1:
+            return MagicMock(returncode=1, stdout="", stderr="Subtitle encoding failed")
+        for output in outputs:
+            Path(output).write_text(SRT if output.endswith(".srt") else "PGS" * 10)
+        return MagicMock(returncode=0, stdout="", stderr="")
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    path = tmp_path / "Movie.2020.mkv"
+    path.write_bytes(b"matroska")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def tools_available():
+    with patch.object(media_utils, "_is_tool_available", return_value=True):
+        yield
+
+
+def test_streams_are_extracted_in_one_ffmpeg_pass(tmp_path: Path, video: Path):
+    ffmpeg = FakeFfmpeg()
+    outputs = {3: str(tmp_path / "out" / "en.srt"), 4: str(tmp_path / "out" / "ro.sup")}
+
+    with patch.object(media_utils.subprocess, "run", side_effect=ffmpeg):
+        extracted = media_utils.extract_embedded_streams(str(video), outputs)
+
+    assert extracted == outputs
+    assert len(ffmpeg.commands) == 1
+    command = ffmpeg.commands[0]
+    assert command.count("-i") == 1
+    assert command[command.index("0:3") + 2] == "srt"
+    assert command[command.index("0:4") + 2] == "copy"
+
+
+def test_failed_combined_pass_is_retried_per_stream(tmp_path: Path, video: Path):
+    ffmpeg = FakeFfmpeg(fail_combined=True)
+    outputs = {3: str(tmp_path / "en.srt"), 5: str(tmp_path / "fr.srt")}
+
+    with patch.object(media_utils.subprocess, "run", side_effect=ffmpeg):
+        extracted = media_utils.extract_embedded_streams(str(video), outputs)
+
+    assert extracted == outputs
+    assert len(ffmpeg.commands) == 3
+
+
+def test_en_track_is_extracted_with_the_ro_demux(tmp_path: Path, video: Path):
+    probe = MediaProbe.from_ffprobe(
+        {
+            "streams": [
+                {"index": 0, "codec_type": "video", "codec_name": "h264"},
+                {
+                    "index": 2,
+                    "codec_type": "subtitle",
+                    "codec_name": "subrip",
+                    "tags": {"language": "eng"},
+                },
+                {
+                    "index": 3,
+                    "codec_type": "subtitle",
+                    "codec_name": "hdmv_pgs_subtitle",
+                    "tags": {"language": "rum"},
+                },
+            ]
+        }
+    )
+    context = ProcessingContext(video_path=str(video), video_info={}, options={}, di=MagicMock())
+    ffmpeg = FakeFfmpeg()
+
+    with (
+        patch.object(media_utils, "media_probe_cache", MediaProbeCache(root=tmp_path / "idx")),
+        patch.object(media_utils, "_run_ffprobe", return_value=probe),
+        patch.object(media_utils, "_convert_pgs_to_srt", return_value=False),  # OCR fails
+        patch.object(media_utils.subprocess, "run", side_effect=ffmpeg),
+    ):
+        EmbedScanner().execute(context)
+        FinalSelector().execute(context)
+
+    assert not context.found_final_ro
+    assert len(ffmpeg.commands) == 1
+    assert ffmpeg.commands[0].count("-map") == 2
+    assert context.final_en_sub_path == context.potential_embedded_en_info["extracted_path"]
+    assert "Hello there" in Path(context.final_en_sub_path).read_text(encoding="utf-8")
+
+
+def test_streams_without_an_index_are_not_extracted(video: Path):
+    probe = MediaProbe.from_ffprobe(
+        {
+            "streams": [
+                {
+                    "codec_type": "subtitle",
+                    "codec_name": "hdmv_pgs_subtitle",
+                    "tags": {"language": "rum"},
+                }
+            ]
+        }
+    )
+    ffmpeg = FakeFfmpeg()
+
+    with (
+        patch.object(media_utils, "probe_media", return_value=probe),
+        patch.object(media_utils.subprocess, "run", side_effect=ffmpeg),
+    ):
+        status, path = media_utils.check_and_extract_embedded_subtitle(str(video), "ro")
+
+    assert (status, path) == ("failed", None)
+    assert ffmpeg.commands == []
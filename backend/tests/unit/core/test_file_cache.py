@@ -0,0 +1,52 @@
+# backend/tests/unit/core/test_file_cache.py
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.file_cache import (
+    CacheCounters,
+    EvictionSchedule,
+    atomic_write,
+    atomic_write_json,
+    evict_least_recently_used,
+)
+
+
+def test_counters_snapshot():
+    counters = CacheCounters("hits", "misses")
+
+    counters.add("hits")
+    assert counters.add("hits", 2) == 3
+    assert counters.snapshot() == {"hits": 3, "misses": 0}
+
+
+def test_eviction_schedule_scans_first_then_every_nth_store():
+    schedule = EvictionSchedule()
+
+    assert [schedule.due(3) for _ in range(7)] == [True, False, False, True, False, False, True]
+
+
+def test_atomic_write_leaves_no_temp_file_on_failure(tmp_path: Path):
+    target = tmp_path / "entries" / "a.json"
+    atomic_write_json(target, {"v": 1})
+
+    def broken(f):
+        f.write(b"partial")
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(target, broken)
+
+    assert target.read_text() == '{"v": 1}'
+    assert [p.name for p in target.parent.iterdir()] == ["a.json"]
+
+
+def test_evict_least_recently_used_skips_temp_files(tmp_path: Path):
+    for index, name in enumerate(["old.json", "new.json", "mid.json", ".tmp.json"]):
+        path = tmp_path / name
+        path.write_text("{}")
+        os.utime(path, (index, {"old.json": 1, "mid.json": 2, "new.json": 3}.get(name, 0)))
+
+    assert evict_least_recently_used(tmp_path.glob("*.json"), max_entries=2) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".tmp.json", "mid.json", "new.json"]
@@ -0,0 +1,87 @@
+# backend/tests/unit/core/test_job_log_archive.py
+import gzip
+from pathlib import Path
+
+import pytest
+
+from app.core.job_log_archive import (
+    JobLogArchive,
+    JobOutputCapture,
+    job_log_size,
+    parse_byte_range,
+    read_job_log,
+)
+
+JOB_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def _lines(n: int) -> list[bytes]:
+    return [f"line {i:05d}\n".encode() for i in range(n)]
+
+
+def test_archive_is_chunked_gzip_readable_by_range(tmp_path: Path):
+    archive = JobLogArchive(JOB_ID, directory=tmp_path, chunk_bytes=100)
+    lines = _lines(53)
+    for line in lines:
+        archive.write(line)
+
+    # Only whole chunks are on disk while the job runs
+    assert 0 < job_log_size(archive.name, tmp_path) < len(b"".join(lines))
+
+    summary = archive.close()
+    full = b"".join(lines)
+    assert summary is not None and summary.size == len(full)
+    assert gzip.decompress((tmp_path / summary.name).read_bytes()) == full
+    assert job_log_size(summary.name, tmp_path) == len(full)
+    assert read_job_log(summary.name, 0, None, tmp_path) == full
+    # Ranges crossing member boundaries
+    assert read_job_log(summary.name, 95, 305, tmp_path) == full[95:305]
+    assert read_job_log(summary.name, len(full) - 7, None, tmp_path) == full[-7:]
+
+
+def test_empty_archive_is_removed(tmp_path: Path):
+    archive = JobLogArchive(JOB_ID, directory=tmp_path)
+    assert archive.close() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_capture_keeps_head_and_tail_and_forwards_everything(tmp_path: Path):
+    archive = JobLogArchive(JOB_ID, directory=tmp_path, chunk_bytes=64)
+    capture = JobOutputCapture(archive, head_bytes=30, tail_bytes=40)
+    lines = _lines(100)
+    for line in lines:
+        capture.append(line)
+
+    retained = b"".join(capture)
+    full = b"".join(lines)
+    assert retained.startswith(full[:30])
+    assert retained.endswith(full[-40:])
+    assert f"[{len(full) - 70} bytes omitted".encode() in retained
+    assert read_job_log(archive.close().name, directory=tmp_path) == full
+
+    # Short output is kept whole
+    small = JobOutputCapture(head_bytes=30, tail_bytes=40)
+    small.append(b"only line\n")
+    assert b"".join(small) == b"only line\n"
+    assert not JobOutputCapture()
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-9", (0, 10)),
+        ("bytes=90-", (90, 100)),
+        ("bytes=95-200", (95, 100)),
+        ("bytes=-30", (70, 100)),
+        ("bytes=0-1,5-6", None),
+    ],
+)
+def test_parse_byte_range(header: str | None, expected: tuple[int, int] | None):
+    assert parse_byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=5-2", "lines=0-1", "bytes=-"])
+def test_parse_byte_range_rejects_unsatisfiable(header: str):
+    with pytest.raises(ValueError):
+        parse_byte_range(header, 100)
@@ -0,0 +1,201 @@
+# backend/tests/unit/core/test_job_log_stream.py
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis.asyncio as aioredis
+
+from app.core.job_log_stream import (
+    JOB_LOG_HISTORY_TTL_S,
+    JobLogSink,
+    follow_job_log_stream,
+    serialize_job_log_message,
+    with_stream_id,
+    write_job_log_messages,
+)
+
+JOB_ID = "job-123"
+STREAM_KEY = f"job:{JOB_ID}:stream"
+
+
+class FakeStreamRedis:
+    """Minimal in-memory stand-in for the Redis stream commands used by the log stream."""
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[bytes, dict]] = []
+        self.xread_calls: list[str] = []
+        self._seq = 0
+
+    def add(self, message: str) -> str:
+        self._seq += 1
+        entry_id = f"1-{self._seq}"
+        self.entries.append((entry_id.encode(), {b"data": message.encode()}))
+        return entry_id
+
+    @staticmethod
+    def _seq_of(entry_id: str | bytes) -> int:
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode()
+        return int(entry_id.split("-")[1])
+
+    async def xrange(self, name: str, min: str, max: str, count: int):
+        assert name == STREAM_KEY
+        assert max == "+"
+        after = self._seq_of(min.lstrip("("))
+        return [e for e in self.entries if self._seq_of(e[0]) > after][:count]
+
+    async def xread(self, streams: dict, count: int, block: int):
+        assert block > 0
+        ((name, last_id),) = streams.items()
+        self.xread_calls.append(last_id)
+        after = self._seq_of(last_id)
+        new = [e for e in self.entries if self._seq_of(e[0]) > after][:count]
+        if not new:
+            await asyncio.sleep(0)
+            return []
+        return [[name.encode(), new]]
+
+
+@pytest.fixture
+def redis_client() -> MagicMock:
+    client = MagicMock()
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock(return_value=[])
+    pipeline.__aenter__ = AsyncMock(return_value=pipeline)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+    client.pipeline = MagicMock(return_value=pipeline)
+    client.pipe = pipeline
+    return client
+
+
+def _stream_messages(redis_client: MagicMock) -> list[dict]:
+    return [json.loads(c.args[1]["data"]) for c in redis_client.pipe.xadd.call_args_list]
+
+
+async def _collect(iterator, expected: int) -> list[tuple[str, str]]:
+    collected: list[tuple[str, str]] = []
+    async for batch in iterator:
+        collected.extend(batch)
+        if len(collected) >= expected:
+            break
+    return collected
+
+
+def test_with_stream_id_prepends_entry_id():
+    message = serialize_job_log_message("log", {"stream": "stdout", "message": "hi"})
+    decoded = json.loads(with_stream_id("5-1", message))
+    assert decoded["id"] == "5-1"
+    assert decoded["payload"]["message"] == "hi"
+
+
+@pytest.mark.asyncio
+async def test_write_uses_single_pipeline_round_trip(redis_client: MagicMock):
+    messages = [serialize_job_log_message("log", {"message": str(i)}) for i in range(2)]
+
+    await write_job_log_messages(redis_client, JOB_ID, messages, maxlen=50)
+
+    pipe = redis_client.pipe
+    assert pipe.xadd.call_count == 2
+    for call, message in zip(pipe.xadd.call_args_list, messages, strict=True):
+        assert call.args == (STREAM_KEY, {"data": message})
+        assert call.kwargs == {"maxlen": 50, "approximate": True}
+    pipe.expire.assert_called_once_with(STREAM_KEY, JOB_LOG_HISTORY_TTL_S)
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_follow_pages_history_then_reads_live_without_gap_or_duplicate():
+    fake = FakeStreamRedis()
+    for i in range(5):
+        fake.add(serialize_job_log_message("log", {"message": f"old {i}"}))
+
+    iterator = follow_job_log_stream(fake, JOB_ID, page_size=2, block_ms=1)
+    replayed = await _collect(iterator, 5)
+    fake.add(serialize_job_log_message("log", {"message": "live"}))
+    live = await _collect(iterator, 1)
+    await iterator.aclose()
+
+    ids = [entry_id for entry_id, _ in replayed + live]
+    assert ids == ["1-1", "1-2", "1-3", "1-4", "1-5", "1-6"]
+    assert json.loads(live[0][1])["payload"]["message"] == "live"
+    # Live reads continue from the last replayed entry.
+    assert fake.xread_calls[0] == "1-5"
+
+
+@pytest.mark.asyncio
+async def test_follow_resumes_after_last_seen_id():
+    fake = FakeStreamRedis()
+    for i in range(4):
+        fake.add(serialize_job_log_message("log", {"message": f"line {i}"}))
+
+    iterator = follow_job_log_stream(fake, JOB_ID, after_id="1-2", page_size=10, block_ms=1)
+    resumed = await _collect(iterator, 2)
+    await iterator.aclose()
+
+    assert [entry_id for entry_id, _ in resumed] == ["1-3", "1-4"]
+
+
+@pytest.mark.asyncio
+async def test_sink_flushes_when_batch_is_full(redis_client: MagicMock):
+    sink = JobLogSink(redis_client, JOB_ID, max_lines=3, flush_interval_s=60)
+
+    for i in range(7):
+        await sink.publish("log", {"stream": "stdout", "message": f"line {i}"})
+
+    assert redis_client.pipe.execute.await_count == 2
+    await sink.aclose()
+    assert redis_client.pipe.execute.await_count == 3
+    assert [m["payload"]["message"] for m in _stream_messages(redis_client)] == [
+        f"line {i}" for i in range(7)
+    ]
+    assert sink.lines_published == 7
+
+
+@pytest.mark.asyncio
+async def test_sink_flushes_after_interval(redis_client: MagicMock):
+    sink = JobLogSink(redis_client, JOB_ID, max_lines=100, flush_interval_s=0.01)
+
+    await sink.publish("log", {"stream": "stdout", "message": "only line"})
+    assert redis_client.pipe.execute.await_count == 0
+    await asyncio.sleep(0.05)
+
+    assert redis_client.pipe.execute.await_count == 1
+    await sink.aclose()
+    assert redis_client.pipe.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sink_drops_batch_on_redis_error_and_keeps_going(redis_client: MagicMock):
+    redis_client.pipe.execute.side_effect = [aioredis.RedisError("down"), []]
+    sink = JobLogSink(redis_client, JOB_ID, max_lines=1)
+
+    await sink.publish("log", {"message": "lost"})
+    await sink.publish("log", {"message": "kept"})
+
+    assert sink.lines_published == 1
+    assert redis_client.pipe.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sink_keeps_timer_batch_when_cancelled_mid_flush(redis_client: MagicMock):
+    release = asyncio.Event()
+    flushing = asyncio.Event()
+
+    async def slow_execute():
+        flushing.set()
+        await release.wait()
+        return []
+
+    redis_client.pipe.execute.side_effect = slow_execute
+    sink = JobLogSink(redis_client, JOB_ID, max_lines=100, flush_interval_s=0.01)
+
+    await sink.publish("log", {"message": "last line"})
+    timer_task = sink._timer_task
+    await flushing.wait()
+    timer_task.cancel()
+    release.set()
+    await sink.aclose()
+
+    assert sink.lines_published == 1
+    assert [m["payload"]["message"] for m in _stream_messages(redis_client)] == ["last line"]
@@ -0,0 +1,123 @@
+# backend/tests/unit/core/test_online_fetcher_concurrency.py
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.modules.subtitle.core import concurrency
+from app.modules.subtitle.core.strategies.base import ProcessingContext
+from app.modules.subtitle.core.strategies.online_fetcher import OnlineFetcher
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limits():
+    concurrency.reset_provider_limits()
+    yield
+    concurrency.reset_provider_limits()
+
+
+def _context() -> ProcessingContext:
+    return ProcessingContext(
+        video_path="/tmp/Movie.2020.1080p.mkv",
+        video_info={"basename": "Movie.2020.1080p.mkv", "type": "movie", "imdb_id": "tt1"},
+        options={},
+        di=MagicMock(),
+    )
+
+
+def _opensubs(delays: dict[str, float]) -> MagicMock:
+    def search(**params):
+        time.sleep(delays.get(params["language"], 0))
+        lang = params["language"]
+        return [
+            {
+                "attributes": {
+                    "language": lang,
+                    "release": f"Movie.2020.{lang}",
+                    "files": [{"file_id": f"os-{lang}", "file_name": f"movie.{lang}.srt"}],
+                }
+            }
+        ]
+
+    client = MagicMock()
+    client.authenticate.return_value = True
+    client.search_subtitles.side_effect = search
+    return client
+
+
+def test_providers_and_languages_are_searched_concurrently(tmp_path):
+    subsro = MagicMock()
+    subsro.find_subtitle_download_urls.side_effect = lambda *_a, **_k: time.sleep(0.2) or []
+    opensubs = _opensubs({"ro": 0.2, "en": 0.2})
+
+    seen_labels = []
+    original = OnlineFetcher._search_opensubtitles
+
+    def labelled(self, *args):
+        seen_labels.append(concurrency.current_file_label())
+        return original(self, *args)
+
+    token = concurrency._current_file.set("Movie.2020.1080p.mkv")
+    try:
+        with (
+            patch.object(settings, "ONLINE_FETCH_WORKERS", 4),
+            patch.object(settings, "ONLINE_FETCH_EARLY_STOP_SCORE", 0),
+            patch.object(settings, "SUBTITLE_CONCURRENCY_SUBSRO", 2),
+            patch.object(settings, "SUBTITLE_CONCURRENCY_OPENSUBTITLES", 2),
+            patch.object(OnlineFetcher, "_search_opensubtitles", labelled),
+        ):
+            started = time.perf_counter()
+            candidates = OnlineFetcher()._gather_candidates(
+                _context(), subsro, opensubs, "tt1", "movie", str(tmp_path)
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        concurrency._current_file.reset(token)
+
+    assert elapsed < 0.6  # Four 0.2 s searches, sequentially 0.8 s
+    assert [c["id"] for c in candidates] == ["os-ro", "os-en"]
+    assert seen_labels == ["Movie.2020.1080p.mkv"] * 2
+
+
+def test_high_scoring_ro_candidate_cancels_remaining_work(tmp_path):
+    subsro = MagicMock()
+    subsro.find_subtitle_download_urls.side_effect = lambda _imdb, language_code: [
+        f"https://subs.ro/{language_code}/{i}" for i in range(3)
+    ]
+    opensubs = _opensubs({"en": 0.3})
+
+    def rank(_self, candidates, *_args, **_kwargs):
+        return [(100, 1, c) for c in candidates if c["language"] == "ro"]
+
+    with (
+        patch.object(settings, "ONLINE_FETCH_WORKERS", 1),
+        patch.object(settings, "ONLINE_FETCH_EARLY_STOP_SCORE", 70),
+        patch.object(OnlineFetcher, "_rank_candidates", rank),
+    ):
+        candidates = OnlineFetcher()._gather_candidates(
+            _context(), subsro, opensubs, "tt1", "movie", str(tmp_path)
+        )
+
+    assert "os-ro" in [c["id"] for c in candidates]
+    subsro.download_subtitle_archive.assert_not_called()
+
+
+def test_failing_opensubtitles_login_keeps_other_candidates(tmp_path):
+    opensubs = _opensubs({})
+    opensubs.authenticate.side_effect = RuntimeError("login endpoint down")
+
+    def subsro_search(_self, _context, _subsro, _imdb_id, lang):
+        return [{"source": "subsro", "language": lang, "id": f"subsro-{lang}"}], []
+
+    with (
+        patch.object(settings, "ONLINE_FETCH_WORKERS", 4),
+        patch.object(settings, "ONLINE_FETCH_EARLY_STOP_SCORE", 0),
+        patch.object(OnlineFetcher, "_search_subsro", subsro_search),
+    ):
+        candidates = OnlineFetcher()._gather_candidates(
+            _context(), MagicMock(), opensubs, "tt1", "movie", str(tmp_path)
+        )
+
+    assert [c["id"] for c in candidates] == ["subsro-ro", "subsro-en"]
+    opensubs.search_subtitles.assert_not_called()
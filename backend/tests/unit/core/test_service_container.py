@@ -0,0 +1,69 @@
+# backend/tests/unit/core/test_service_container.py
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.modules.subtitle.core import di
+from app.modules.subtitle.core.di import ServiceContainer
+from app.modules.subtitle.services import opensubtitles_client
+
+
+def test_per_file_container_logs_out_on_shutdown():
+    container = ServiceContainer()
+    client = MagicMock()
+    container._opensubtitles_client_instance = client
+
+    container.shutdown()
+
+    client.logout.assert_called_once()
+
+
+def test_shared_container_ignores_pipeline_shutdown_until_closed():
+    client = MagicMock()
+    with ServiceContainer(shared=True) as container:
+        container._opensubtitles_client_instance = client
+        for _ in range(3):  # One pipeline per file
+            container.shutdown()
+        client.logout.assert_not_called()
+
+    client.logout.assert_called_once()
+
+
+def test_shared_container_initializes_clients_once_across_threads():
+    container = ServiceContainer(shared=True)
+    barrier = threading.Barrier(4, timeout=5)
+    seen = []
+
+    def borrow() -> None:
+        barrier.wait()
+        seen.append(container.opensubtitles)
+
+    with patch.object(di, "OpenSubtitlesClient", side_effect=lambda: MagicMock()) as factory:
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    factory.assert_called_once()
+    assert all(client is seen[0] for client in seen)
+
+
+def test_opensubtitles_clients_share_one_login_until_last_logout():
+    service = opensubtitles_client.opensubtitles_service
+    with (
+        patch.object(service, "authenticate", return_value=True) as authenticate,
+        patch.object(service, "get_token", return_value="token-12345"),
+        patch.object(service, "logout", return_value=True) as logout,
+    ):
+        first = opensubtitles_client.OpenSubtitlesClient()
+        second = opensubtitles_client.OpenSubtitlesClient()
+        assert first.authenticate() and first.authenticate()
+        assert second.authenticate()
+
+        assert first.logout()
+        logout.assert_not_called()
+        assert second.logout()
+        logout.assert_called_once()
+
+    assert authenticate.call_count == 2
+    assert opensubtitles_client._active_sessions == 0
@@ -0,0 +1,135 @@
+# backend/tests/unit/core/test_subtitle_concurrency.py
+import io
+import logging
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.subtitle.core import concurrency, processor
+from app.modules.subtitle.core.concurrency import (
+    provider_slot,
+    reset_provider_limits,
+    run_file_pipelines,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limits():
+    reset_provider_limits()
+    yield
+    reset_provider_limits()
+
+
+def _unexpected_error(path: str, e: Exception) -> None:
+    raise AssertionError(f"unexpected error for {path}: {e}")
+
+
+def test_runs_files_concurrently_and_keeps_input_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def run_one(path: str) -> str:
+        barrier.wait()  # Deadlocks (times out) unless all three run at once.
+        return path.upper()
+
+    results = run_file_pipelines(
+        ["/tv/a.mkv", "/tv/b.mkv", "/tv/c.mkv"], run_one, _unexpected_error, 3
+    )
+
+    assert results == ["/TV/A.MKV", "/TV/B.MKV", "/TV/C.MKV"]
+
+
+def test_single_worker_runs_sequentially_on_calling_thread():
+    threads = []
+
+    def run_one(path: str) -> str:
+        threads.append(threading.current_thread())
+        return path
+
+    run_file_pipelines(["a", "b"], run_one, _unexpected_error, workers=1)
+
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_failing_file_does_not_stop_the_others():
+    def run_one(path: str) -> bool:
+        if path == "bad.mkv":
+            raise RuntimeError("boom")
+        return True
+
+    errors = []
+
+    def on_error(path: str, e: Exception) -> bool:
+        errors.append((path, str(e)))
+        return False
+
+    results = run_file_pipelines(["ok1.mkv", "bad.mkv", "ok2.mkv"], run_one, on_error, 2)
+
+    assert results == [True, False, True]
+    assert errors == [("bad.mkv", "boom")]
+
+
+def test_provider_slot_caps_concurrent_calls():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run_one(path: str) -> str:
+        nonlocal active, peak
+        with provider_slot("sync"):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+        return path
+
+    with patch.object(concurrency.settings, "SUBTITLE_CONCURRENCY_SYNC", 2):
+        run_file_pipelines([f"ep{i}.mkv" for i in range(6)], run_one, _unexpected_error, 6)
+
+    assert peak == 2
+
+
+def test_log_lines_are_attributed_to_their_file():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    test_logger = logging.getLogger("tests.subtitle_concurrency")
+    test_logger.setLevel(logging.INFO)
+    try:
+
+        def run_one(_path: str) -> None:
+            test_logger.info("Searching %s", "online")
+
+        run_file_pipelines(
+            ["/tv/Show.S01E01.mkv", "/tv/Show.S01E02.mkv"], run_one, _unexpected_error, 2
+        )
+        test_logger.info("after run")
+    finally:
+        root_logger.removeHandler(handler)
+
+    lines = sorted(stream.getvalue().splitlines())
+    assert "INFO: [Show.S01E01.mkv] Searching online" in lines
+    assert "INFO: [Show.S01E02.mkv] Searching online" in lines
+    assert "INFO: after run" in lines
+    assert handler.filters == []
+
+
+def test_process_tv_show_folder_counts_parallel_results(tmp_path):
+    for episode in range(1, 5):
+        (tmp_path / f"Show.S01E0{episode}.mkv").write_bytes(b"")
+
+    def fake_pipeline(video_path: str, _options, **_kwargs) -> bool:
+        if video_path.endswith("E03.mkv"):
+            raise RuntimeError("pipeline crashed")
+        return not video_path.endswith("E04.mkv")
+
+    with (
+        patch.object(processor, "_run_pipeline_for_file", side_effect=fake_pipeline),
+        patch.object(concurrency.settings, "SUBTITLE_PIPELINE_WORKERS", 4),
+    ):
+        assert processor.process_tv_show_folder(str(tmp_path)) == 2
@@ -0,0 +1,125 @@
+# backend/tests/unit/services/test_audit_chain.py
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.services import audit_chain
+from app.services.audit_chain import ChainVerification
+from app.services.audit_service import compute_event_hash
+
+_START = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def _chain(count: int, prev_hash: str | None = None) -> list[SimpleNamespace]:
+    """Audit log rows, hash-chained the way the outbox worker writes them."""
+    rows = []
+    for i in range(count):
+        row = SimpleNamespace(
+            id=i + 1,
+            timestamp=_START + timedelta(seconds=i),
+            event_id=uuid.uuid4(),
+            action="auth.login",
+            actor_user_id=None,
+            target_user_id=None,
+            resource_type=None,
+            resource_id=None,
+            success=True,
+            http_status=200,
+            details={"attempt": i},
+            prev_hash=prev_hash,
+        )
+        row.event_hash = compute_event_hash(
+            event_id=str(row.event_id),
+            timestamp=row.timestamp.isoformat(),
+            action=row.action,
+            actor_user_id=None,
+            target_user_id=None,
+            resource_type=None,
+            resource_id=None,
+            success=True,
+            http_status=200,
+            details=row.details,
+            prev_hash=prev_hash,
+        )
+        prev_hash = row.event_hash
+        rows.append(row)
+    return rows
+
+
+def test_pages_of_an_intact_chain_verify():
+    rows = _chain(10, prev_hash="f" * 64)
+    state = ChainVerification()
+
+    state.feed(rows[:4])
+    state.feed(rows[4:])
+
+    assert (state.checked, state.issue_count) == (10, 0)
+    assert state.last_log_id == 10
+    assert state.last_event_hash == rows[-1].event_hash
+
+
+def test_tampered_entry_is_reported_once():
+    rows = _chain(6)
+    rows[2].action = "admin.user.delete"
+    state = ChainVerification()
+
+    state.feed(rows)
+
+    assert state.issue_count == 1
+    assert state.issues[0].startswith("Hash mismatch at ID 3")
+
+
+def test_resuming_from_a_checkpoint_checks_the_link_to_it():
+    rows = _chain(8)
+    checkpoint = rows[4]
+    resumed = ChainVerification(
+        last_log_id=checkpoint.id,
+        last_timestamp=checkpoint.timestamp,
+        last_event_hash=checkpoint.event_hash,
+    )
+    resumed.feed(rows[5:])
+    assert (resumed.checked, resumed.issue_count) == (3, 0)
+
+    # An entry that was chained onto something else than the checkpoint
+    detached = ChainVerification(
+        last_log_id=checkpoint.id, last_timestamp=checkpoint.timestamp, last_event_hash="0" * 64
+    )
+    detached.feed(rows[5:])
+    assert detached.issue_count == 1
+
+
+async def test_overlapping_runs_do_not_recheck_or_rewind_the_checkpoint():
+    rows = _chain(10)
+    stored = {"row": None, "verified": 0}
+
+    async def resume(_db, state):
+        row = stored["row"]
+        state.last_log_id = row.id if row else None
+        state.last_timestamp = row.timestamp if row else None
+        state.last_event_hash = row.event_hash if row else None
+
+    async def execute(_query):
+        start = 0 if stored["row"] is None else stored["row"].id
+        return SimpleNamespace(all=lambda: rows[start : start + 4])
+
+    async def save(_db, state, checked, _issues):
+        stored["row"] = rows[state.last_log_id - 1]
+        stored["verified"] += checked
+        if state.last_log_id == 4:  # Meanwhile another run verifies and commits 5-8
+            stored["row"] = rows[7]
+            stored["verified"] += 4
+
+    db = SimpleNamespace(execute=AsyncMock(side_effect=execute), commit=AsyncMock())
+    with (
+        patch.object(audit_chain, "_lock_checkpoint", AsyncMock()) as lock,
+        patch.object(audit_chain, "_resume_from_checkpoint", side_effect=resume),
+        patch.object(audit_chain, "_save_checkpoint", side_effect=save),
+        patch.object(audit_chain, "_verification_horizon", AsyncMock(return_value=_START)),
+    ):
+        result = await audit_chain.verify_audit_chain(db, page_size=4)
+
+    assert (result["checked_count"], result["issue_count"]) == (6, 0)  # 1-4, then 9-10
+    assert result["last_log_id"] == 10
+    assert stored == {"row": rows[9], "verified": 10}
+    assert lock.await_count == 2  # Before each page
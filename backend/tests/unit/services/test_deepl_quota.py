@@ -0,0 +1,96 @@
+# backend/tests/unit/services/test_deepl_quota.py
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.deepl_usage import DeepLUsage
+from app.modules.subtitle.services import translator
+from app.modules.subtitle.services.deepl_quota import DeepLQuotaLedger, key_identifier
+
+KEY = key_identifier("key-1:fx")
+
+
+@pytest.fixture
+def ledger(tmp_path: Path) -> DeepLQuotaLedger:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", connect_args={"timeout": 30})
+    DeepLUsage.__table__.create(engine)
+    ledger = DeepLQuotaLedger(session_factory=sessionmaker(engine), enabled=True)
+    ledger.seed(KEY, character_count=900, character_limit=1000, valid=True)
+    return ledger
+
+
+def test_reservations_never_exceed_the_limit(ledger: DeepLQuotaLedger):
+    granted, state = ledger.reserve(KEY, 60)
+    assert granted and state.reserved_count == 60 and state.available == 40
+
+    granted, state = ledger.reserve(KEY, 50)
+    assert not granted and state.available == 40
+
+    # An unknown key is left to the caller's own accounting
+    assert ledger.reserve(key_identifier("other"), 10) == (True, None)
+
+
+def test_commit_and_release_settle_reservations(ledger: DeepLQuotaLedger):
+    ledger.reserve(KEY, 60)
+    ledger.reserve(KEY, 30)
+    ledger.commit(KEY, 60, 60)
+    ledger.release(KEY, 30)
+
+    assert ledger.load([KEY])[KEY].character_count == 960
+    assert ledger.load([KEY])[KEY].reserved_count == 0
+
+    ledger.mark_exhausted(KEY)
+    state = ledger.load([KEY])[KEY]
+    assert state.character_count == 1000 and not state.valid
+    assert ledger.reserve(KEY, 1)[0] is False
+
+
+def test_concurrent_workers_do_not_overdraw(ledger: DeepLQuotaLedger):
+    granted: list[bool] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(10):
+            ok, _state = ledger.reserve(KEY, 7)
+            with lock:
+                granted.append(ok)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 100 characters left: 14 reservations of 7 fit, the 15th would overdraw
+    assert granted.count(True) == 14
+    assert ledger.load([KEY])[KEY].reserved_count == 98
+    assert ledger.stats()["errors"] == 0
+
+
+def test_manager_reads_key_states_without_calling_deepl(ledger: DeepLQuotaLedger):
+    with (
+        patch.object(translator, "DEEPL_KEYS", ["key-1:fx", "key-2:fx"]),
+        patch.object(translator, "deepl_quota_ledger", ledger),
+        patch.object(
+            translator,
+            "get_deepl_usage",
+            return_value={"character_count": 10, "character_limit": 500, "quota_exceeded": False},
+        ) as usage_api,
+    ):
+        manager = translator.TranslationManager()
+        # Only the key the ledger has never seen is looked up, then recorded
+        usage_api.assert_called_once_with("key-2:fx")
+        assert manager.deepl_usage_cache[0] == {"count": 900, "limit": 1000, "valid": True}
+        assert (
+            ledger.load([key_identifier("key-2:fx")])[key_identifier("key-2:fx")].available == 490
+        )
+
+        # A reservation another worker holds is seen by this one
+        ledger.reserve(KEY, 80)
+        assert manager._reserve_deepl_chars(0, 50) is False
+        assert manager.deepl_usage_cache[0]["count"] == 980
+        assert manager._reserve_deepl_chars(0, 20) is True
@@ -0,0 +1,147 @@
+# backend/tests/unit/services/test_download_cache.py
+import os
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.modules.subtitle.core.strategies import online_fetcher
+from app.modules.subtitle.core.strategies.online_fetcher import OnlineFetcher
+from app.modules.subtitle.services import download_cache
+from app.modules.subtitle.services.download_cache import SubtitleDownloadCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SubtitleDownloadCache:
+    return SubtitleDownloadCache(root=tmp_path / "cache", max_bytes=1024)
+
+
+def test_roundtrip_and_content_deduplication(cache: SubtitleDownloadCache):
+    assert cache.get("opensubtitles", 42) is None
+
+    cache.put("opensubtitles", 42, b"1\n00:00:01,000 --> 00:00:02,000\nHi\n", "a.srt")
+    cache.put("subsro", "https://subs.ro/x", b"1\n00:00:01,000 --> 00:00:02,000\nHi\n", "b.srt")
+
+    entry = cache.get("opensubtitles", 42)
+    assert entry is not None and entry.file_name == "a.srt"
+    assert entry.path.read_bytes().endswith(b"Hi\n")
+    assert len(list((cache.root / "blobs").iterdir())) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    cache = SubtitleDownloadCache(root=tmp_path, max_bytes=20)
+    first = cache.put("opensubtitles", 1, b"a" * 8)
+    second = cache.put("opensubtitles", 2, b"b" * 8)
+    os.utime(first.path, (1, 1))
+    os.utime(second.path, (2, 2))
+    cache.get("opensubtitles", 1)  # Refreshes entry 1
+
+    with patch.object(download_cache, "_EVICT_EVERY", 1):
+        cache.put("opensubtitles", 3, b"c" * 8)
+
+    assert cache.get("opensubtitles", 1) is not None
+    assert cache.get("opensubtitles", 2) is None
+    assert cache.get("opensubtitles", 3) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_extracted_contents_are_stored_without_the_archive(
+    cache: SubtitleDownloadCache, tmp_path: Path
+):
+    entry = cache.put("subsro", "https://subs.ro/x", b"PK-archive", "pack.zip")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    (work_dir / "pack.zip").write_bytes(b"PK-archive")
+    (work_dir / "movie.ro.srt").write_text("subtitle")
+
+    cache.store_extracted(entry.sha256, work_dir, exclude={"pack.zip"})
+
+    extracted = cache.get("subsro", "https://subs.ro/x").extracted_dir
+    assert sorted(p.name for p in extracted.iterdir()) == ["movie.ro.srt"]
+
+
+def test_cached_subsro_archive_is_not_downloaded_or_extracted_again(
+    cache: SubtitleDownloadCache, tmp_path: Path
+):
+    def download(_url, output_dir, filename_prefix):
+        archive = Path(output_dir) / f"{filename_prefix}_pack.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("Movie.2020.ro.srt", "1\n00:00:01,000 --> 00:00:02,000\nSalut\n")
+        return str(archive)
+
+    subsro = MagicMock()
+    subsro.download_subtitle_archive.side_effect = download
+    fetcher = OnlineFetcher()
+
+    with (
+        patch.object(online_fetcher, "subtitle_download_cache", cache),
+        patch.object(settings, "SUBTITLE_DOWNLOAD_CACHE_ENABLED", True),
+        patch.object(
+            online_fetcher.file_utils,
+            "extract_archive",
+            wraps=online_fetcher.file_utils.extract_archive,
+        ) as extract,
+    ):
+        for run in ("first", "retry"):
+            target = tmp_path / run
+            target.mkdir()
+            assert fetcher._download_and_extract_subsro(
+                subsro, "https://subs.ro/x", "ro", target, 0, MagicMock(is_set=lambda: False)
+            )
+            assert (target / "Movie.2020.ro.srt").is_file()
+
+    subsro.download_subtitle_archive.assert_called_once()
+    extract.assert_called_once()
+
+
+def test_cached_opensubtitles_file_uses_no_download_quota(cache: SubtitleDownloadCache):
+    opensubs = MagicMock()
+    opensubs.get_download_info.return_value = {"link": "https://dl/1", "file_name": "m.srt"}
+    opensubs.download_subtitle_content.return_value = b"subtitle bytes"
+    fetcher = OnlineFetcher()
+
+    with (
+        patch.object(online_fetcher, "subtitle_download_cache", cache),
+        patch.object(settings, "SUBTITLE_DOWNLOAD_CACHE_ENABLED", True),
+    ):
+        first = fetcher._download_opensubtitles_file(opensubs, 1234)
+        retry = fetcher._download_opensubtitles_file(opensubs, 1234)
+
+    assert first == retry == (b"subtitle bytes", "m.srt")
+    opensubs.get_download_info.assert_called_once_with(1234)
+
+
+def test_eviction_scans_only_every_few_stores(tmp_path: Path):
+    cache = SubtitleDownloadCache(root=tmp_path, max_bytes=10)
+
+    with (
+        patch.object(download_cache, "_EVICT_EVERY", 3),
+        patch.object(cache, "_evict", wraps=cache._evict) as evict,
+    ):
+        for key in range(7):
+            cache.put("opensubtitles", key, bytes([key]) * 4)
+
+    assert evict.call_count == 3  # First store, then every third
+
+
+def test_blob_evicted_after_lookup_counts_as_miss(cache: SubtitleDownloadCache):
+    opensubs = MagicMock()
+    opensubs.get_download_info.return_value = {"link": "https://dl/1", "file_name": "m.srt"}
+    opensubs.download_subtitle_content.return_value = b"fresh bytes"
+    cache.put("opensubtitles", 1234, b"cached bytes", "m.srt")
+    entry = cache.get("opensubtitles", 1234)
+    entry.path.unlink()  # Evicted by another worker
+
+    with (
+        patch.object(online_fetcher, "subtitle_download_cache", cache),
+        patch.object(settings, "SUBTITLE_DOWNLOAD_CACHE_ENABLED", True),
+        patch.object(cache, "get", return_value=entry),
+    ):
+        result = OnlineFetcher()._download_opensubtitles_file(opensubs, 1234)
+
+    assert result == (b"fresh bytes", "m.srt")
+    assert cache.copy_payload(entry, cache.root / "copy.zip") is False
+    assert not (cache.root / "copy.zip").exists()
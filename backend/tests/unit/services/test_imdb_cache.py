@@ -0,0 +1,161 @@
+# backend/tests/unit/services/test_imdb_cache.py
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.subtitle.services import imdb
+from app.modules.subtitle.services.imdb_cache import (
+    CachedImdbLookup,
+    ImdbIdCache,
+    make_lookup_key,
+)
+
+
+class FakeStore:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict] = {}
+        self.loads = 0
+
+    def load(self, lookup_key: str, now: datetime) -> CachedImdbLookup | None:
+        self.loads += 1
+        row = self.rows.get(lookup_key)
+        if row is None or row["expires_at"] <= now:
+            return None
+        return CachedImdbLookup(row["imdb_id"], row["found_type"], row["expires_at"])
+
+    def save(self, lookup_key: str, values: dict) -> None:
+        self.rows[lookup_key] = values
+
+
+@pytest.fixture
+def store() -> FakeStore:
+    return FakeStore()
+
+
+def _cache(store: FakeStore, **kwargs) -> ImdbIdCache:
+    options = {"memory_size": 8, "positive_ttl_s": 3600, "negative_ttl_s": 60}
+    options.update(kwargs)
+    return ImdbIdCache(load=store.load, save=store.save, **options)
+
+
+def test_lookup_key_normalizes_title_year_and_type():
+    assert make_lookup_key("The.Office.US", "2005", "series") == "series|the office us|2005"
+    assert make_lookup_key("The Office (US)", 2005, "series") == "series|the office us|2005"
+    assert make_lookup_key("Amélie & Co", None, None) == "any|amelie and co|"
+
+
+def test_memory_hit_after_put_skips_store(store: FakeStore):
+    cache = _cache(store)
+
+    cache.put("Dark", 2017, "series", "tt5753856", "series")
+    entry = cache.get("dark", "2017", "series")
+
+    assert entry is not None and entry.imdb_id == "tt5753856"
+    assert store.loads == 0
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_new_process_is_served_from_persistent_store(store: FakeStore):
+    _cache(store).put("Dark", 2017, "series", "tt5753856", "series")
+
+    fresh = _cache(store)  # e.g. the next job: empty LRU, same table
+    assert fresh.get("Dark", 2017, "series").imdb_id == "tt5753856"
+    assert fresh.get("Dark", 2017, "series").imdb_id == "tt5753856"
+
+    assert store.loads == 1
+    stats = fresh.stats()
+    assert (stats["memory_hits"], stats["store_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_negative_results_use_the_short_ttl(store: FakeStore):
+    cache = _cache(store)
+
+    cache.put("Unknown Show", None, "series", None, None)
+
+    row = store.rows["series|unknown show|"]
+    ttl = row["expires_at"] - row["created_at"]
+    assert ttl == timedelta(seconds=60)
+    assert cache.get("Unknown Show", None, "series").is_negative
+
+
+def test_expired_entries_are_misses(store: FakeStore):
+    cache = _cache(store, positive_ttl_s=0)
+
+    cache.put("Dark", 2017, "series", "tt5753856", "series")
+
+    assert cache.get("Dark", 2017, "series") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_evicts_least_recently_used(store: FakeStore):
+    cache = _cache(store, memory_size=2)
+    cache.put("a", None, None, "tt1", "movie")
+    cache.put("b", None, None, "tt2", "movie")
+    cache.get("a", None, None)
+    cache.put("c", None, None, "tt3", "movie")
+
+    store.rows.clear()  # Only the memory level is left
+    assert cache.get("a", None, None) is not None
+    assert cache.get("b", None, None) is None
+
+
+def test_store_errors_do_not_fail_lookups():
+    def broken(*_args):
+        raise RuntimeError("db down")
+
+    cache = ImdbIdCache(
+        memory_size=4, positive_ttl_s=60, negative_ttl_s=60, load=broken, save=broken
+    )
+
+    cache.put("Dark", 2017, "series", "tt5753856", "series")
+    assert cache.get("Other", None, None) is None
+    assert cache.stats()["store_errors"] == 2
+
+
+def test_get_imdb_id_resolves_once_for_parallel_episodes(store: FakeStore):
+    calls = []
+
+    def slow_resolve(title, *_args):
+        calls.append(title)
+        time.sleep(0.05)
+        return "tt5753856", "series", []
+
+    results = []
+
+    def lookup() -> None:
+        results.append(imdb.get_imdb_id("Dark", 2017, content_type="series"))
+
+    with (
+        patch.object(imdb, "imdb_id_cache", _cache(store)),
+        patch.object(imdb, "_resolve_imdb_id", side_effect=slow_resolve),
+    ):
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert calls == ["Dark"]
+    assert [r[0] for r in results] == ["tt5753856"] * 4
+    assert datetime.now(UTC) < store.rows["series|dark|2017"]["expires_at"]
+
+
+def test_get_imdb_id_does_not_cache_misses_with_provider_errors(store: FakeStore):
+    resolve_results = [
+        (None, None, ["OMDb(t) 'Dark'(2017): Failed"]),
+        ("tt5753856", "series", []),
+    ]
+
+    with (
+        patch.object(imdb, "imdb_id_cache", _cache(store)),
+        patch.object(imdb, "_resolve_imdb_id", side_effect=resolve_results) as resolve,
+    ):
+        first = imdb.get_imdb_id("Dark", 2017, content_type="series")
+        second = imdb.get_imdb_id("Dark", 2017, content_type="series")
+
+    assert first == (None, None, ["OMDb(t) 'Dark'(2017): Failed"])
+    assert second == ("tt5753856", "series", [])
+    assert resolve.call_count == 2
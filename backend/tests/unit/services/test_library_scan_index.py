@@ -0,0 +1,156 @@
+# backend/tests/unit/services/test_library_scan_index.py
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.subtitle.core import processor
+from app.modules.subtitle.services.library_scan_index import LibraryScanIndex
+
+_HOUR_AGO = time.time() - 3600
+
+
+def _settle(*paths: Path, when: float = _HOUR_AGO) -> None:
+    """Backdates mtimes so the listings are outside the racy window."""
+    for path in paths:
+        os.utime(path, (when, when))
+
+
+@pytest.fixture
+def library(tmp_path: Path) -> Path:
+    root = tmp_path / "TV Shows" / "Dark"
+    for season in (1, 2):
+        folder = root / f"Season {season}"
+        folder.mkdir(parents=True)
+        for episode in (1, 2):
+            (folder / f"Dark.S0{season}E0{episode}.mkv").write_bytes(b"video")
+    (root / "Season 1" / "Dark.S01E01.ro.srt").write_text("1\n", encoding="utf-8")
+    _settle(root / "Season 1", root / "Season 2", root)
+    return root
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> LibraryScanIndex:
+    return LibraryScanIndex(root=tmp_path / "index", enabled=True)
+
+
+def _walk(index: LibraryScanIndex, top: Path) -> list[tuple[str, list[str], list[str]]]:
+    with index.open(top) as scan:
+        return list(scan.walk())
+
+
+def test_unchanged_directories_are_not_listed_again(index: LibraryScanIndex, library: Path):
+    first = _walk(index, library)
+    assert index.stats()["listed"] == 3
+
+    second = _walk(LibraryScanIndex(root=index.root, enabled=True), library)
+    assert sorted(second) == sorted(first)
+    assert sorted(first) == sorted((root, sorted(d), sorted(f)) for root, d, f in os.walk(library))
+
+    (library / "Season 2" / "Dark.S02E03.mkv").write_bytes(b"video")
+    _settle(library / "Season 2", when=_HOUR_AGO + 60)
+    reloaded = LibraryScanIndex(root=index.root, enabled=True)
+    third = {root: files for root, _, files in _walk(reloaded, library)}
+
+    assert reloaded.stats() == {"reused": 2, "listed": 1, "errors": 0}
+    assert "Dark.S02E03.mkv" in third[str(library / "Season 2")]
+
+
+def test_recently_changed_directories_are_listed_again(index: LibraryScanIndex, library: Path):
+    _settle(library / "Season 1", when=time.time())  # Within the racy window
+    _walk(index, library)
+    reloaded = LibraryScanIndex(root=index.root, enabled=True)
+    _walk(reloaded, library)
+
+    assert reloaded.stats()["listed"] == 1
+
+
+def test_only_new_or_changed_videos_need_processing(index: LibraryScanIndex, library: Path):
+    season_1, season_2 = library / "Season 1", library / "Season 2"
+    with index.open(library) as scan:
+        list(scan.walk())
+        assert scan.has_ro_subtitle(season_1 / "Dark.S01E01.mkv")
+        assert not scan.needs_processing(season_1 / "Dark.S01E01.mkv")
+        assert scan.needs_processing(season_2 / "Dark.S02E01.mkv")
+        scan.mark_processed(season_2 / "Dark.S02E01.mkv")
+        scan.mark_processed(season_2 / "Dark.S02E02.mkv")
+
+    (season_2 / "Dark.S02E02.mkv").unlink()  # Replaced by a new release
+    (season_2 / "Dark.S02E02.mkv").write_bytes(b"better video")
+    _settle(season_2, when=_HOUR_AGO + 60)
+    with LibraryScanIndex(root=index.root, enabled=True).open(library) as scan:
+        list(scan.walk())
+        assert not scan.needs_processing(season_2 / "Dark.S02E01.mkv")
+        assert scan.needs_processing(season_2 / "Dark.S02E02.mkv")
+        assert scan.needs_processing(season_1 / "Dark.S01E02.mkv")
+
+
+def test_content_type_is_reused_until_a_sampled_folder_changes(
+    index: LibraryScanIndex, library: Path
+):
+    with patch.object(processor, "library_scan_index", index):
+        assert processor.determine_content_type_for_path(library) == "tvshow"
+        with patch.object(processor, "_extract_signals") as extract:
+            assert processor.determine_content_type_for_path(library) == "tvshow"
+        extract.assert_not_called()
+
+        _settle(library / "Season 2", when=_HOUR_AGO + 60)
+        with patch.object(
+            processor, "_extract_signals", wraps=processor._extract_signals
+        ) as extract:
+            assert processor.determine_content_type_for_path(library) == "tvshow"
+        extract.assert_called_once()
+
+
+def test_incremental_folder_run_skips_processed_episodes(index: LibraryScanIndex, library: Path):
+    processed: list[str] = []
+
+    def fake_pipeline(video_path: str, _options, **_kwargs) -> bool:
+        processed.append(Path(video_path).name)
+        return True
+
+    with (
+        patch.object(processor, "library_scan_index", index),
+        patch.object(processor, "_run_pipeline_for_file", side_effect=fake_pipeline),
+    ):
+        processor.process_tv_show_folder(str(library))
+        first_run = sorted(processed)
+        processed.clear()
+
+        (library / "Season 2" / "Dark.S02E03.mkv").write_bytes(b"video")
+        _settle(library / "Season 2", when=_HOUR_AGO + 60)
+        processor.process_tv_show_folder(str(library), options={"incremental": True})
+
+    assert len(first_run) == 4  # A full run takes every episode
+    assert processed == ["Dark.S02E03.mkv"]
+
+
+def test_incremental_run_retries_videos_that_failed(index: LibraryScanIndex, library: Path):
+    processed: list[str] = []
+
+    def fake_pipeline(video_path: str, _options, **_kwargs) -> bool:
+        processed.append(Path(video_path).name)
+        return Path(video_path).name != "Dark.S02E01.mkv"  # No subtitle found for this one
+
+    with (
+        patch.object(processor, "library_scan_index", index),
+        patch.object(processor, "_run_pipeline_for_file", side_effect=fake_pipeline),
+    ):
+        processor.process_tv_show_folder(str(library))
+        processed.clear()
+        processor.process_tv_show_folder(str(library), options={"incremental": True})
+
+    assert processed == ["Dark.S02E01.mkv"]
+
+
+def test_content_type_from_a_timed_out_scan_is_not_stored(index: LibraryScanIndex, library: Path):
+    with patch.object(processor, "library_scan_index", index):
+        with patch.object(processor, "_scan_timed_out", return_value=True):
+            processor.determine_content_type_for_path(library)
+        with patch.object(
+            processor, "_extract_signals", wraps=processor._extract_signals
+        ) as extract:
+            assert processor.determine_content_type_for_path(library) == "tvshow"
+        extract.assert_called_once()
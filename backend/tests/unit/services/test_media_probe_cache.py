@@ -0,0 +1,88 @@
+# backend/tests/unit/services/test_media_probe_cache.py
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.subtitle.services.media_probe_cache import (
+    MediaProbe,
+    MediaProbeCache,
+    make_probe_key,
+)
+from app.modules.subtitle.utils import media_utils
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {"index": 0, "codec_type": "video", "codec_name": "h264"},
+        {"index": 1, "codec_type": "audio", "codec_name": "aac", "tags": {"language": "eng"}},
+        {"index": 2, "codec_type": "subtitle", "codec_name": "subrip", "tags": {"language": "eng"}},
+        {"index": 3, "codec_type": "subtitle", "codec_name": "ass", "tags": {"language": "rum"}},
+    ],
+    "format": {"duration": "2712.480000", "tags": {"title": "Dark S01E01"}},
+}
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    path = tmp_path / "Dark.S01E01.mkv"
+    path.write_bytes(b"\x1a\x45\xdf\xa3 matroska")
+    return path
+
+
+def test_probe_exposes_streams_duration_and_tags():
+    probe = MediaProbe.from_ffprobe(FFPROBE_OUTPUT)
+
+    assert [s["index"] for s in probe.subtitle_streams] == [2, 3]
+    assert probe.duration == pytest.approx(2712.48)
+    assert probe.tags == {"title": "Dark S01E01"}
+
+
+def test_index_survives_new_process_and_tracks_file_changes(tmp_path: Path, video: Path):
+    key = make_probe_key(video)
+    MediaProbeCache(root=tmp_path / "index").put(key, MediaProbe.from_ffprobe(FFPROBE_OUTPUT))
+
+    fresh = MediaProbeCache(root=tmp_path / "index")  # e.g. the next job: empty LRU
+    assert fresh.get(key).subtitle_streams[1]["codec_name"] == "ass"
+    assert fresh.get(key) is not None
+    assert (fresh.stats()["store_hits"], fresh.stats()["memory_hits"]) == (1, 1)
+
+    video.write_bytes(b"re-muxed, different size")
+    assert make_probe_key(video) != key
+    stat = video.stat()
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert fresh.get(make_probe_key(video)) is None
+
+
+def test_oldest_entries_are_evicted(tmp_path: Path):
+    cache = MediaProbeCache(root=tmp_path, max_entries=2, memory_size=0)
+    probe = MediaProbe.from_ffprobe(FFPROBE_OUTPUT)
+    for n, key in enumerate(["aa01", "aa02", "aa03"]):
+        cache.put(key, probe)
+        os.utime(tmp_path / "aa" / f"{key}.json", (n + 1, n + 1))
+    cache._evict()
+
+    assert cache.get("aa01") is None
+    assert cache.get("aa03") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ro_and_en_checks_share_one_ffprobe(tmp_path: Path, video: Path):
+    calls = []
+
+    def fake_ffprobe(path: str) -> MediaProbe:
+        calls.append(path)
+        return MediaProbe.from_ffprobe(FFPROBE_OUTPUT)
+
+    with (
+        patch.object(media_utils, "media_probe_cache", MediaProbeCache(root=tmp_path / "idx")),
+        patch.object(media_utils, "_run_ffprobe", side_effect=fake_ffprobe),
+    ):
+        status, _ = media_utils.check_and_extract_embedded_subtitle(str(video), "ro")
+        en = media_utils.find_best_embedded_stream_info(
+            str(video), "en", preferred_codecs=["subrip"]
+        )
+
+    assert status == "text_found_no_extract"
+    assert en["stream_index"] == 2
+    assert calls == [str(video)]
@@ -0,0 +1,112 @@
+# backend/tests/unit/services/test_translation_dispatch.py
+import threading
+import time
+from typing import ClassVar
+from unittest.mock import MagicMock, patch
+
+import deepl
+import pytest
+
+from app.core.config import settings
+from app.modules.subtitle.services import translator
+
+
+def _srt(count: int) -> str:
+    return "\n".join(
+        f"{i}\n00:00:{i % 60:02d},000 --> 00:00:{i % 60:02d},500\nLine {i}\n"
+        for i in range(1, count + 1)
+    )
+
+
+def _manager(keys: int = 1) -> translator.TranslationManager:
+    manager = translator.TranslationManager.__new__(translator.TranslationManager)
+    manager.deepl_keys = [f"key-{i}" for i in range(keys)]
+    manager.deepl_key_ids = []  # No shared quota ledger
+    manager.deepl_usage_cache = {
+        i: {"count": 0, "limit": 500000, "valid": True} for i in range(keys)
+    }
+    manager.current_deepl_key_index = 0
+    manager.google_client = None
+    manager.google_used_session = 0
+    manager._deepl_state_lock = threading.RLock()
+    manager._log_usage = MagicMock()
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def _small_batches():
+    with (
+        patch.object(translator, "DEEPL_MAX_STRINGS_PER_REQUEST", 2),
+        patch.object(translator, "_get_translation_memory", return_value=None),
+    ):
+        yield
+
+
+def test_batches_run_concurrently_and_are_reassembled_in_order():
+    manager = _manager()
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_list(texts, *_args, **_kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later batches finish first
+        time.sleep(0.02 * (10 - int(texts[0].split()[1]) // 2))
+        with lock:
+            in_flight -= 1
+        return [t.replace("Line", "Linia") for t in texts], sum(map(len, texts))
+
+    manager._translate_deepl_list = fake_list
+    with patch.object(settings, "TRANSLATION_BATCH_CONCURRENCY", 3):
+        result = manager.batched_srt_translate("movie.srt", _srt(16), "en", "ro")
+
+    lines = [line for line in result.translated_content.splitlines() if line.startswith("Linia")]
+    assert lines == [f"Linia {i}" for i in range(1, 17)]
+    assert peak == 3
+    assert result.service_used == "deepl"
+
+
+class FakeTranslator:
+    calls: ClassVar[list[str]] = []
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def translate_text(self, texts, **_kwargs):
+        FakeTranslator.calls.append(self.key)
+        time.sleep(0.01)
+        if self.key == "key-0":
+            raise deepl.QuotaExceededException("quota")
+        return [deepl.TextResult(f"RO {t}", "EN", len(t)) for t in texts]
+
+
+def test_key_switch_is_shared_by_concurrent_batches():
+    manager = _manager(keys=3)
+    FakeTranslator.calls = []
+
+    with (
+        patch.object(settings, "TRANSLATION_BATCH_CONCURRENCY", 4),
+        patch.object(translator.deepl, "Translator", FakeTranslator),
+    ):
+        result = manager.batched_srt_translate("movie.srt", _srt(16), "en", "ro")
+
+    # Every batch ends up on key 2; key 3 is never skipped to by a second, late switch.
+    assert "key-2" not in FakeTranslator.calls
+    assert manager.current_deepl_key_index == 1
+    assert result.service_used == "deepl"
+    billed = manager._log_usage.call_args.kwargs["billing_details"]
+    assert {d["service"] for d in billed} == {"deepl_key_2"}
+    assert manager.deepl_usage_cache[1]["count"] == sum(d["chars"] for d in billed)
+    assert manager.deepl_usage_cache[0]["valid"] is False
+
+
+def test_reservations_never_overdraw_a_key():
+    manager = _manager()
+    manager.deepl_usage_cache[0]["limit"] = 10
+
+    assert manager._reserve_deepl_chars(0, 6)
+    assert not manager._reserve_deepl_chars(0, 6)
+    assert manager._reserve_deepl_chars(0, -6)
+    assert manager._reserve_deepl_chars(0, 10)
@@ -0,0 +1,125 @@
+# backend/tests/unit/services/test_translation_memory.py
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.modules.subtitle.services import translator
+from app.modules.subtitle.services.translation_memory import (
+    TranslationMemory,
+    make_memory_key,
+    normalize_segment,
+)
+
+SRT = """1
+00:00:01,000 --> 00:00:02,000
+Previously on Dark...
+
+2
+00:00:03,000 --> 00:00:04,000
+Where is Mikkel?
+
+3
+00:00:05,000 --> 00:00:06,000
+Previously  on Dark...
+"""
+
+
+class FakeStore:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict] = {}
+        self.loads = 0
+
+    def load(self, key_hashes: list[str], _now: datetime) -> dict[str, str]:
+        self.loads += 1
+        return {k: self.rows[k]["translated_text"] for k in key_hashes if k in self.rows}
+
+    def save(self, rows: list[dict], max_entries: int) -> int:
+        for row in rows:
+            self.rows[row["key_hash"]] = row
+        evicted = 0
+        while len(self.rows) > max_entries:
+            oldest = min(self.rows, key=lambda k: self.rows[k]["last_used_at"])
+            del self.rows[oldest]
+            evicted += 1
+        return evicted
+
+
+@pytest.fixture
+def store() -> FakeStore:
+    return FakeStore()
+
+
+def _manager() -> translator.TranslationManager:
+    manager = translator.TranslationManager.__new__(translator.TranslationManager)
+    manager.deepl_keys = ["key"]
+    manager.deepl_key_ids = []  # No shared quota ledger
+    manager.current_deepl_key_index = 0
+    manager.google_client = None
+    manager._deepl_state_lock = threading.RLock()
+    manager._log_usage = MagicMock()
+    manager._translate_deepl_list = MagicMock(
+        side_effect=lambda texts, *_args, **_kwargs: (
+            [f"RO {t}" for t in texts],
+            sum(map(len, texts)),
+        )
+    )
+    return manager
+
+
+def test_normalization_ignores_spacing_but_keeps_lines():
+    assert normalize_segment("  Hello   there \r\n\n General  Kenobi ") == (
+        "Hello there\nGeneral Kenobi"
+    )
+    assert make_memory_key(None, "RO", "Hi") == make_memory_key("auto", "ro", "Hi")
+    assert make_memory_key("en", "ro", "Hi") != make_memory_key("en", "de", "Hi")
+
+
+def test_store_evicts_least_recently_used_rows(store: FakeStore):
+    memory = TranslationMemory(max_entries=2, load=store.load, save=store.save)
+
+    memory.store("en", "ro", [("a", "A")])
+    memory.store("en", "ro", [("b", "B"), ("c", "C")])
+
+    assert len(store.rows) == 2
+    assert memory.lookup("en", "ro", ["a", "b", "c"]).keys() <= {"b", "c"}
+    assert memory.stats()["evicted"] == 1
+
+
+def test_lookup_errors_fall_back_to_translating_everything():
+    def broken(*_args):
+        raise RuntimeError("db down")
+
+    memory = TranslationMemory(max_entries=10, load=broken, save=broken)
+
+    assert memory.lookup("en", "ro", ["a"]) == {}
+    memory.store("en", "ro", [("a", "A")])
+    assert memory.stats()["store_errors"] == 2
+
+
+def test_only_unseen_segments_are_sent_and_savings_are_logged(store: FakeStore):
+    memory = TranslationMemory(max_entries=100, load=store.load, save=store.save)
+    first, second = _manager(), _manager()
+
+    with (
+        patch.object(translator, "translation_memory", memory),
+        patch.object(settings, "TRANSLATION_MEMORY_ENABLED", True),
+    ):
+        result = first.batched_srt_translate("ep1.srt", SRT, "en", "ro")
+        rerun = second.batched_srt_translate("ep1.srt", SRT, "en", "ro")
+
+    # The repeated intro line is sent once; the re-run sends nothing at all.
+    sent = first._translate_deepl_list.call_args.args[0]
+    assert sent == ["Previously on Dark...", "Where is Mikkel?"]
+    assert result.translated_content.count("RO Previously on Dark...") == 2
+    second._translate_deepl_list.assert_not_called()
+    assert rerun.translated_content == result.translated_content
+    assert rerun.service_used == "memory"
+
+    usage = second._log_usage.call_args.kwargs
+    assert (usage["segments_total"], usage["memory_hits"], usage["deepl_chars"]) == (3, 3, 0)
+    assert usage["memory_chars_saved"] == len(
+        "Previously on Dark...Where is Mikkel?Previously  on Dark..."
+    )
@@ -0,0 +1,152 @@
+# backend/tests/unit/services/test_usage_accounting.py
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from app.modules.subtitle.services import translator
+from app.modules.subtitle.services.usage_accounting import UsageAccountant, daily_rollups
+
+
+def _event(i: int) -> dict:
+    return {
+        "log": {"timestamp": "2024-05-01T12:00:00+00:00", "file_name": f"f{i}.srt"},
+        "deepl_keys": {"hash": {"chars": 10, "limit": 1000, "valid": True}},
+    }
+
+
+def test_events_are_applied_in_one_batch_off_the_caller(tmp_path: Path):
+    apply = MagicMock()
+    accountant = UsageAccountant(spool_dir=tmp_path, flush_interval_s=3600, apply=apply)
+
+    for i in range(5):
+        accountant.record(_event(i))
+    apply.assert_not_called()  # Recording never waits for the database
+
+    assert accountant.flush() == 5
+    apply.assert_called_once()
+    assert [e["log"]["file_name"] for e in apply.call_args.args[0]] == [
+        f"f{i}.srt" for i in range(5)
+    ]
+
+
+def test_events_are_spooled_while_the_database_is_down(tmp_path: Path):
+    apply = MagicMock(side_effect=OSError("connection refused"))
+    accountant = UsageAccountant(spool_dir=tmp_path, flush_interval_s=3600, apply=apply)
+    accountant.record(_event(1))
+    accountant.record(_event(2))
+
+    assert accountant.flush() == 0
+    assert accountant.flush() == 0  # Nothing new; the spool stays as it is
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+    # Another process (or a later flush) replays the spool with its own events
+    apply = MagicMock()
+    other = UsageAccountant(spool_dir=tmp_path, flush_interval_s=3600, apply=apply)
+    other.record(_event(3))
+    assert other.flush() == 3
+    assert [[e["log"]["file_name"] for e in call.args[0]] for call in apply.call_args_list] == [
+        ["f1.srt", "f2.srt"],  # The spool file on its own, then the new batch
+        ["f3.srt"],
+    ]
+    assert list(tmp_path.iterdir()) == []
+    assert other.stats()["replayed"] == 2
+
+
+def test_a_spool_file_the_database_rejects_is_set_aside(tmp_path: Path):
+    accountant = UsageAccountant(
+        spool_dir=tmp_path, flush_interval_s=3600, apply=MagicMock(side_effect=OSError("down"))
+    )
+    accountant.record(_event(1))
+    accountant.flush()
+    (spooled,) = tmp_path.glob("*.jsonl")
+
+    def apply(events: list[dict]) -> None:
+        if events[0]["log"]["file_name"] == "f1.srt":
+            raise ValueError("value too long for column file_name")
+
+    accountant._apply = apply
+    accountant.record(_event(2))
+    assert accountant.flush() == 1  # The new batch still goes through
+
+    assert [p.name for p in tmp_path.iterdir()] == [f"{spooled.stem}.bad"]
+    assert accountant.stats()["quarantined"] == 1
+    assert accountant.flush() == 0  # Not replayed again
+
+
+def test_json_log_is_rewritten_once_per_batch(tmp_path: Path):
+    log_file = tmp_path / "translation_log.json"
+    accountant = UsageAccountant(spool_dir=tmp_path / "spool", enabled=False, apply=MagicMock())
+
+    def file_log(i: int) -> dict:
+        return {
+            "path": str(log_file),
+            "deepl": 100,
+            "google": 20,
+            "job": {"file_basename": f"f{i}.srt", "timestamp_utc": f"2024-05-0{i}T00:00:00"},
+            "deepl_keys_snapshot": {"key_1": {"count": 100 * i}},
+        }
+
+    for i in (1, 2):
+        accountant.record({"file_log": file_log(i)})
+
+    data = json.loads(log_file.read_text(encoding="utf-8"))
+    assert data["cumulative_totals"]["overall"] == 240
+    assert [job["file_basename"] for job in data["jobs"]] == ["f1.srt", "f2.srt"]
+    assert data["deepl_keys_snapshot"]["key_1"] == {"count": 200}
+
+
+def test_log_usage_only_queues_an_event(tmp_path: Path):
+    manager = translator.TranslationManager.__new__(translator.TranslationManager)
+    manager.deepl_keys = ["key-1"]
+    manager.deepl_usage_cache = {0: {"count": 500, "limit": 1000, "valid": True}}
+    manager._deepl_state_lock = threading.RLock()
+    accountant = MagicMock()
+    ledger = MagicMock(enabled=False)
+
+    with (
+        patch.object(translator, "TRANSLATION_LOG_FILE", str(tmp_path / "log.json")),
+        patch.object(translator, "usage_accountant", accountant),
+        patch.object(translator, "deepl_quota_ledger", ledger),
+        patch.object(translator, "SyncSessionLocal", None),
+    ):
+        manager._log_usage(
+            deepl_chars=120,
+            google_chars=0,
+            file_name="movie.srt",
+            service_details=["deepl_key_1"],
+            billing_details=[{"service": "deepl_key_1", "chars": 120}],
+            target_lang="ro",
+        )
+
+    (event,) = accountant.record.call_args.args
+    assert event["log"]["deepl_characters"] == 120
+    assert list(event["deepl_keys"].values()) == [{"chars": 120, "limit": 1000, "valid": True}]
+    assert event["file_log"]["job"]["file_basename"] == "movie.srt"
+
+
+def test_logs_are_rolled_up_per_utc_day_service_language_and_status():
+    logs = [
+        {
+            "timestamp": datetime.fromisoformat(ts),
+            "service_used": service,
+            "target_language": "ro",
+            "status": "success",
+            "characters_billed": chars,
+            "deepl_characters": chars,
+        }
+        for ts, service, chars in (
+            ("2024-05-01T23:30:00-02:00", "deepl", 10),  # 2024-05-02 in UTC
+            ("2024-05-02T08:00:00+00:00", "deepl", 5),
+            ("2024-05-02T09:00:00+00:00", "google_api", 7),
+        )
+    ]
+
+    rollups = {row["service_used"]: row for row in daily_rollups(logs)}
+
+    assert rollups["deepl"]["day"] == date(2024, 5, 2)
+    assert rollups["deepl"]["translations"] == 2
+    assert rollups["deepl"]["characters_billed"] == 15
+    assert rollups["google_api"]["translations"] == 1
+    assert rollups["google_api"]["memory_chars_saved"] == 0
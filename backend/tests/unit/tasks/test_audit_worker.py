@@ -0,0 +1,111 @@
+# backend/tests/unit/tasks/test_audit_worker.py
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db.models.audit_log import AuditOutbox
+from app.services.audit_service import compute_event_hash
+from app.tasks import audit_worker
+from app.tasks.audit_worker import chain_outbox_rows, drain_outbox, process_outbox_batch
+
+_START = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def _outbox_row(i: int, **overrides) -> AuditOutbox:
+    timestamp = _START + timedelta(milliseconds=i)
+    event_data = {
+        "timestamp": timestamp.isoformat(),
+        "category": "auth",
+        "action": "auth.login",
+        "severity": "info",
+        "success": True,
+        "ip_address": "192.0.2.10",
+        "details": {"attempt": i},
+        **overrides,
+    }
+    return AuditOutbox(
+        id=i + 1,
+        event_id=uuid.uuid4(),
+        created_at=timestamp,
+        event_data=event_data,
+        attempts=0,
+    )
+
+
+def _recompute(entry: dict, prev_hash: str | None) -> str:
+    """Recomputes a hash the way verify_log_integrity does from a stored row."""
+    return compute_event_hash(
+        event_id=str(entry["event_id"]),
+        timestamp=entry["timestamp"].isoformat(),
+        action=entry["action"],
+        actor_user_id=entry["actor_user_id"],
+        target_user_id=entry["target_user_id"],
+        resource_type=entry["resource_type"],
+        resource_id=entry["resource_id"],
+        success=entry["success"],
+        http_status=entry["http_status"],
+        details=entry["details"],
+        prev_hash=prev_hash,
+    )
+
+
+def test_batch_is_chained_in_memory_from_the_head():
+    rows = [_outbox_row(i) for i in range(5)]
+    rows[2].event_data.pop("action")  # Unmappable; must not break the chain
+
+    chained, rejected = chain_outbox_rows(rows, head="a" * 64)
+
+    assert [row for row, _ in rejected] == [rows[2]]
+    entries = [entry for _, entry in chained]
+    assert entries[0]["prev_hash"] == "a" * 64
+    for prev, entry in zip([None, *entries], entries, strict=False):
+        if prev is not None:
+            assert entry["prev_hash"] == prev["event_hash"]
+        assert entry["event_hash"] == _recompute(entry, entry["prev_hash"])
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_the_head_once_and_inserts_in_one_statement():
+    rows = [_outbox_row(i) for i in range(50)]
+    db = AsyncMock()
+    db.begin_nested = MagicMock(return_value=AsyncMock())
+    selected = MagicMock()
+    selected.scalars.return_value.all.return_value = rows
+    db.execute.side_effect = [selected, MagicMock(), MagicMock()]
+
+    with (
+        patch.object(audit_worker, "_ensure_audit_partition", AsyncMock()),
+        patch.object(audit_worker, "get_last_hash", AsyncMock(return_value=None)) as last_hash,
+    ):
+        processed = await process_outbox_batch(db, batch_size=100)
+
+    assert processed == 50
+    last_hash.assert_awaited_once()
+    _, insert_call, update_call = db.execute.call_args_list
+    assert "INSERT INTO audit_logs" in str(insert_call.args[0])
+    assert len(insert_call.args[1]) == 50
+    assert "UPDATE audit_outbox" in str(update_call.args[0])
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_drain_grows_the_batch_while_the_backlog_lasts():
+    backlog = 1000
+    sizes: list[int] = []
+
+    async def fake_batch(_db, batch_size: int) -> tuple[int, int]:
+        nonlocal backlog
+        sizes.append(batch_size)
+        taken = min(batch_size, backlog)
+        backlog -= taken
+        return taken, taken
+
+    with patch.object(audit_worker, "_drain_batch", side_effect=fake_batch):
+        processed = await drain_outbox(
+            AsyncMock(), min_batch_size=100, max_batch_size=300, time_budget_s=60
+        )
+
+    assert processed == 1000
+    assert sizes == [100, 200, 300, 300, 300]
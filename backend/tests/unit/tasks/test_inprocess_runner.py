@@ -0,0 +1,83 @@
+# backend/tests/unit/tasks/test_inprocess_runner.py
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+from app.tasks.inprocess_runner import start_forked_job
+
+
+def _print_and_exit_target() -> int:
+    print("line one")
+    print("line two")
+    print("problem", file=sys.stderr)
+    return 3
+
+
+def _env_target() -> int:
+    print(os.environ.get("INPROCESS_TEST_MARKER", "missing"))
+    return 0
+
+
+def _raising_target() -> int:
+    raise ValueError("boom")
+
+
+def _sleeping_target() -> int:
+    time.sleep(30)
+    return 0
+
+
+@pytest.mark.asyncio
+async def test_forked_job_streams_output_and_returns_exit_code():
+    process = await start_forked_job(_print_and_exit_target)
+
+    stdout = await process.stdout.read()
+    stderr = await process.stderr.read()
+    exit_code = await process.wait()
+
+    assert exit_code == 3
+    assert process.returncode == 3
+    assert stdout.decode().splitlines() == ["line one", "line two"]
+    assert stderr.decode().strip() == "problem"
+
+
+@pytest.mark.asyncio
+async def test_forked_job_uses_provided_environment():
+    os.environ.pop("INPROCESS_TEST_MARKER", None)
+    env = {**os.environ, "INPROCESS_TEST_MARKER": "from-job-env"}
+    process = await start_forked_job(_env_target, env=None)
+    assert (await process.stdout.read()).decode().strip() == "missing"
+    await process.wait()
+
+    process = await start_forked_job(_env_target, env=env)
+    assert (await process.stdout.read()).decode().strip() == "from-job-env"
+    assert await process.wait() == 0
+    # The parent environment is left untouched.
+    assert "INPROCESS_TEST_MARKER" not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_forked_job_exception_reports_traceback_and_failure():
+    process = await start_forked_job(_raising_target)
+
+    stderr = await process.stderr.read()
+    exit_code = await process.wait()
+
+    assert exit_code == 1
+    assert b"ValueError: boom" in stderr
+
+
+@pytest.mark.asyncio
+async def test_forked_job_terminate_and_lookup_after_exit():
+    process = await start_forked_job(_sleeping_target)
+    assert process.returncode is None
+
+    process.terminate()
+    exit_code = await process.wait()
+
+    assert exit_code == -signal.SIGTERM
+    with pytest.raises(ProcessLookupError):
+        process.kill()
@@ -3,6 +3,7 @@ import asyncio
 import json
 import uuid
 from collections.abc import AsyncGenerator
+from pathlib import Path
 from typing import Any
 
 # Import ANY for timestamp matching
@@ -15,6 +16,8 @@ from pydantic import RedisDsn
 from redis.exceptions import ConnectionError as RedisConnectionError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings as app_settings
+from app.core.job_log_archive import JobLogArchive, read_job_log
 from app.crud.crud_job import CRUDJob
 from app.db.models.job import Job
 from app.schemas.job import JobStatus
@@ -29,6 +32,19 @@ TEST_JOB_DB_ID_STR = str(TEST_JOB_DB_ID)
 TEST_CELERY_TASK_ID = "celery-task-id-test"
 TEST_FOLDER_PATH = "/test/folder"
 TEST_LANGUAGE = "eng"
+TEST_LOG_STREAM_KEY = f"job:{TEST_JOB_DB_ID_STR}:stream"
+
+
+def _stream_messages(redis_client: AsyncMock) -> list[tuple[str, dict]]:
+    """Returns (stream_key, decoded message) for every XADD made on the mocked client."""
+    return [(c.args[0], json.loads(c.args[1]["data"])) for c in redis_client.xadd.call_args_list]
+
+
+def _last_status_message(redis_client: AsyncMock) -> tuple[str, dict] | None:
+    for stream_key, message in reversed(_stream_messages(redis_client)):
+        if message.get("type") == "status":
+            return stream_key, message
+    return None
 
 
 @pytest.fixture
@@ -46,6 +62,9 @@ def mock_settings_env(monkeypatch: pytest.MonkeyPatch):
     mock_settings_obj.JOB_RESULT_MESSAGE_MAX_LEN = 256
     mock_settings_obj.JOB_LOG_SNIPPET_MAX_LEN = 1024
     mock_settings_obj.LOG_SNIPPET_PREVIEW_LEN = 100
+    mock_settings_obj.JOB_LOG_BATCH_MAX_LINES = 200
+    mock_settings_obj.JOB_LOG_BATCH_INTERVAL_MS = 100
+    mock_settings_obj.JOB_LOG_ARCHIVE_ENABLED = False
 
     original_settings = getattr(subtitle_jobs, "settings", None)
     monkeypatch.setattr(subtitle_jobs, "settings", mock_settings_obj)
@@ -59,9 +78,17 @@ def mock_settings_env(monkeypatch: pytest.MonkeyPatch):
 @pytest_asyncio.fixture
 async def mock_redis_client() -> AsyncGenerator[AsyncMock, None]:
     mock_client = AsyncMock(spec=aioredis_module.Redis)
-    mock_client.publish = AsyncMock(return_value=1)
-    mock_client.rpush = AsyncMock(return_value=1)
-    mock_client.expire = AsyncMock(return_value=True)
+    # Job messages are XADDed to the log stream through a pipeline; commands are queued
+    # synchronously and recorded on the client-level mocks so tests can inspect them directly.
+    mock_client.xadd = MagicMock(return_value=b"1-0")
+    mock_client.expire = MagicMock(return_value=True)
+    mock_pipeline = MagicMock()
+    mock_pipeline.xadd = mock_client.xadd
+    mock_pipeline.expire = mock_client.expire
+    mock_pipeline.execute = AsyncMock(return_value=[b"1-0", True])
+    mock_pipeline.__aenter__ = AsyncMock(return_value=mock_pipeline)
+    mock_pipeline.__aexit__ = AsyncMock(return_value=None)
+    mock_client.pipeline = MagicMock(return_value=mock_pipeline)
     mock_client.close = AsyncMock()
     yield mock_client
 
@@ -272,42 +299,33 @@ async def test_execute_subtitle_downloader_task_success_with_pubsub(
     assert result["status"] == JobStatus.SUCCEEDED.value
     assert "Script output line 2" in result.get("message", "")
 
-    expected_channel = f"job:{TEST_JOB_DB_ID_STR}:logs"
     mock_async_redis_from_url.assert_awaited_once_with(str(mock_settings_env.REDIS_PUBSUB_URL))
-    publish_calls = mock_redis_client.publish.call_args_list
-    assert len(publish_calls) >= 3
+    stream_messages = _stream_messages(mock_redis_client)
+    assert len(stream_messages) >= 3
+    assert all(stream_key == TEST_LOG_STREAM_KEY for stream_key, _ in stream_messages)
+    published_messages = [message for _, message in stream_messages]
 
-    initial_status_call = publish_calls[0]
-    args, _ = initial_status_call
-    message_data = json.loads(args[1])
-    assert args[0] == expected_channel
-    assert message_data["type"] == "status"
-    assert message_data["payload"]["status"] == JobStatus.RUNNING.value
+    assert published_messages[0]["type"] == "status"
+    assert published_messages[0]["payload"]["status"] == JobStatus.RUNNING.value
 
     stdout_messages_published = any(
-        json.loads(c.args[1])["type"] == "log"
-        and json.loads(c.args[1])["payload"]["stream"] == "stdout"
-        and "Script output line 1" in json.loads(c.args[1])["payload"]["message"]
-        for c in publish_calls
-        if c.args and len(c.args) > 1 and isinstance(c.args[1], str | bytes)
+        m["type"] == "log"
+        and m["payload"]["stream"] == "stdout"
+        and "Script output line 1" in m["payload"]["message"]
+        for m in published_messages
     )
     assert stdout_messages_published, "Stdout message 'Script output line 1' not published"
 
     stderr_messages_published = any(
-        json.loads(c.args[1])["type"] == "log"
-        and json.loads(c.args[1])["payload"]["stream"] == "stderr"
-        and "Script error detail 1" in json.loads(c.args[1])["payload"]["message"]
-        for c in publish_calls
-        if c.args and len(c.args) > 1 and isinstance(c.args[1], str | bytes)
+        m["type"] == "log"
+        and m["payload"]["stream"] == "stderr"
+        and "Script error detail 1" in m["payload"]["message"]
+        for m in published_messages
     )
     assert stderr_messages_published, "Stderr message 'Script error detail 1' not published"
 
-    final_status_call = publish_calls[-1]
-    args, _ = final_status_call
-    message_data = json.loads(args[1])
-    assert args[0] == expected_channel
-    assert message_data["type"] == "status"
-    assert message_data["payload"]["status"] == JobStatus.SUCCEEDED.value
+    assert published_messages[-1]["type"] == "status"
+    assert published_messages[-1]["payload"]["status"] == JobStatus.SUCCEEDED.value
 
     mock_path_exists.assert_any_call(str(mock_settings_env.SUBTITLE_DOWNLOADER_SCRIPT_PATH))
     assert mock_get_worker_db_session.call_count == 3
@@ -370,27 +388,10 @@ async def test_execute_subtitle_downloader_task_script_failure(
     assert result["status"] == JobStatus.FAILED.value
     assert "CRITICAL ERROR IN SCRIPT" in result.get("message", "")
 
-    expected_channel = f"job:{TEST_JOB_DB_ID_STR}:logs"
-    publish_calls = mock_redis_client.publish.call_args_list
-    last_status_publish_call = None
-    for call_item in reversed(publish_calls):
-        try:
-            if (
-                call_item.args
-                and len(call_item.args) > 1
-                and isinstance(call_item.args[1], str | bytes)
-            ):
-                message_data = json.loads(call_item.args[1])
-                if message_data.get("type") == "status":
-                    last_status_publish_call = call_item
-                    break
-        except (json.JSONDecodeError, IndexError, KeyError, TypeError):
-            continue
-
-    assert last_status_publish_call is not None, "No FAILED status message published to Redis"
-    args, _ = last_status_publish_call
-    message_data = json.loads(args[1])
-    assert args[0] == expected_channel
+    last_status = _last_status_message(mock_redis_client)
+    assert last_status is not None, "No FAILED status message published to Redis"
+    stream_key, message_data = last_status
+    assert stream_key == TEST_LOG_STREAM_KEY
     assert message_data["payload"]["status"] == JobStatus.FAILED.value
     assert message_data["payload"]["exit_code"] == 1
 
@@ -486,29 +487,10 @@ async def test_execute_subtitle_downloader_task_script_timeout(
     process_mock.terminate.assert_called_once()
     process_mock.kill.assert_called_once()  # Called after grace period timeout
 
-    expected_channel = f"job:{TEST_JOB_DB_ID_STR}:logs"
-    publish_calls = mock_redis_client.publish.call_args_list
-    last_status_publish_call = None
-    for call_item in reversed(publish_calls):
-        try:
-            if (
-                call_item.args
-                and len(call_item.args) > 1
-                and isinstance(call_item.args[1], str | bytes)
-            ):
-                message_data = json.loads(call_item.args[1])
-                if message_data.get("type") == "status":
-                    last_status_publish_call = call_item
-                    break
-        except (json.JSONDecodeError, IndexError, KeyError, TypeError):
-            continue
-
-    assert last_status_publish_call is not None, (
-        "No FAILED status message published to Redis on timeout"
-    )
-    args, _ = last_status_publish_call
-    message_data = json.loads(args[1])
-    assert args[0] == expected_channel
+    last_status = _last_status_message(mock_redis_client)
+    assert last_status is not None, "No FAILED status message published to Redis on timeout"
+    stream_key, message_data = last_status
+    assert stream_key == TEST_LOG_STREAM_KEY
     assert message_data["payload"]["status"] == JobStatus.FAILED.value
     # Exit code after kill is -9, set by on_kill_called -> set_rc(-9) in MockProcessController
     # The task-level failure handler uses a generic error code for unexpected exceptions.
@@ -599,3 +581,85 @@ async def test_execute_subtitle_downloader_task_redis_connection_failure(
     assert final_kwargs["completed_at"] == ANY
     assert final_kwargs["db"] == mock_db_session
     assert mock_db_session.commit.await_count >= 2
+
+
+@pytest.mark.asyncio
+async def test_execute_subtitle_downloader_task_archives_full_output(
+    mock_settings_env: Any,  # noqa: ARG001
+    mock_celery_task_context: MagicMock,
+    mock_async_redis_from_url: AsyncMock,  # noqa: ARG001
+    mock_get_worker_db_session: MagicMock,
+    mock_crud_job: AsyncMock,
+    _mock_create_subprocess_exec: AsyncMock,
+    mock_subprocess_protocol: tuple[AsyncMock, AsyncMock, AsyncMock],
+    mock_path_exists: MagicMock,  # noqa: ARG001
+    tmp_path: Path,
+) -> None:
+    process_mock, stdout_mock_reader, stderr_mock_reader = mock_subprocess_protocol
+    stdout_lines = [f"Processed file {i}\n".encode() for i in range(200)]
+    stdout_mock_reader.stdout_lines.extend(stdout_lines)
+    stderr_mock_reader.stderr_lines.append(b"Script error detail 1\n")
+    type(process_mock).returncode = PropertyMock(return_value=0)
+    process_mock.wait = AsyncMock(return_value=0)
+    archive = JobLogArchive(TEST_JOB_DB_ID_STR, directory=tmp_path, chunk_bytes=512)
+
+    with (
+        patch.object(subtitle_jobs, "crud_job_operations", mock_crud_job),
+        patch.object(subtitle_jobs, "_open_job_log_archive", AsyncMock(return_value=archive)),
+    ):
+        result = await subtitle_jobs._execute_subtitle_downloader_async_logic(
+            mock_celery_task_context.name,
+            mock_celery_task_context.request.id,
+            TEST_JOB_DB_ID,
+            TEST_FOLDER_PATH,
+            TEST_LANGUAGE,
+        )
+
+    assert result["status"] == JobStatus.SUCCEEDED.value
+    _, final_kwargs = mock_crud_job.update_job_completion_details.await_args_list[0]
+    # The row only points at the archive; the snippet stays bounded
+    assert final_kwargs["log_path"] == f"{TEST_JOB_DB_ID_STR}.log.gz"
+    assert final_kwargs["full_logs"] is None
+    assert len(final_kwargs["log_snippet"]) <= 1024
+    assert archive.recorded
+    assert mock_get_worker_db_session.call_count == 3  # No separate archive update
+
+    archived = read_job_log(final_kwargs["log_path"], directory=tmp_path)
+    assert final_kwargs["log_size"] == len(archived)
+    assert b"".join(stdout_lines) in archived
+    assert b"Script error detail 1\n" in archived
+
+
+@pytest.mark.asyncio
+async def test_redelivered_task_of_a_finished_job_keeps_its_log_archive(
+    mock_settings_env: Any,
+    mock_celery_task_context: MagicMock,
+    mock_async_redis_from_url: AsyncMock,  # noqa: ARG001
+    mock_get_worker_db_session: MagicMock,  # noqa: ARG001
+    mock_crud_job: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(app_settings, "JOB_LOG_ARCHIVE_DIR_ENV", str(tmp_path))
+    mock_settings_env.JOB_LOG_ARCHIVE_ENABLED = True
+    archive = JobLogArchive(TEST_JOB_DB_ID_STR)
+    archive.write(b"output of the finished run\n")
+    summary = archive.close()
+    mock_crud_job.get.return_value.status = JobStatus.SUCCEEDED
+
+    with (
+        patch.object(subtitle_jobs, "crud_job_operations", mock_crud_job),
+        patch.object(subtitle_jobs, "_store_job_log_path", AsyncMock()) as store_log_path,
+    ):
+        # Celery (acks_late) delivers the task of an already finished job again
+        await subtitle_jobs._execute_subtitle_downloader_async_logic(
+            mock_celery_task_context.name,
+            mock_celery_task_context.request.id,
+            TEST_JOB_DB_ID,
+            TEST_FOLDER_PATH,
+            TEST_LANGUAGE,
+        )
+
+    mock_crud_job.update_job_start_details.assert_not_awaited()
+    store_log_path.assert_not_awaited()
+    assert read_job_log(summary.name) == b"output of the finished run\n"
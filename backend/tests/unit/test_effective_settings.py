@@ -0,0 +1,169 @@
+# backend/tests/unit/test_effective_settings.py
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core import effective_settings
+from app.core.effective_settings import (
+    build_subprocess_env,
+    get_effective_setting,
+    get_effective_settings_dict,
+    invalidate_settings_snapshot,
+)
+
+
+class FakeSession:
+    """Answers the two AppSettings queries issued by the snapshot loader."""
+
+    def __init__(self, row: SimpleNamespace | None) -> None:
+        self.row = row
+        self.row_queries = 0
+        self.version_queries = 0
+
+    async def execute(self, stmt):
+        if len(stmt.selected_columns) == 1:  # SELECT updated_at
+            self.version_queries += 1
+            value = self.row.updated_at if self.row else None
+        else:
+            self.row_queries += 1
+            value = self.row
+        return SimpleNamespace(scalar_one_or_none=lambda: value)
+
+
+def _row(**fields) -> SimpleNamespace:
+    values = dict.fromkeys(effective_settings.DB_TO_ENV_MAPPING)
+    values["updated_at"] = datetime(2026, 1, 1, tzinfo=UTC)
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def decrypted_tokens():
+    invalidate_settings_snapshot()
+    decrypted = []
+
+    def fake_decrypt(token: str) -> str:
+        decrypted.append(token)
+        if token == "garbage":
+            raise ValueError("bad token")
+        return token.removeprefix("enc:")
+
+    with patch.object(effective_settings, "decrypt_value", side_effect=fake_decrypt):
+        yield decrypted
+    invalidate_settings_snapshot()
+
+
+async def test_snapshot_is_loaded_once_and_decrypted_once(decrypted_tokens):
+    db = FakeSession(
+        _row(
+            tmdb_api_key="enc:tmdb",
+            deepl_api_keys='enc:["k1", "k2"]',
+            qbittorrent_port=8080,
+            allowed_media_folders='["/media"]',
+        )
+    )
+
+    for _ in range(3):
+        env = await build_subprocess_env(db)
+        values = await get_effective_settings_dict(db)
+
+    assert db.row_queries == 1
+    assert len(decrypted_tokens) == 2  # tmdb_api_key and deepl_api_keys
+    assert env["TMDB_API_KEY"] == "tmdb"
+    assert env["DEEPL_API_KEYS"] == '["k1", "k2"]'
+    assert env["QBITTORRENT_PORT"] == "8080"
+    assert values["deepl_api_keys"] == ["k1", "k2"]
+    assert values["allowed_media_folders"] == ["/media"]
+    assert await get_effective_setting(db, "qbittorrent_port") == 8080
+
+
+async def test_snapshot_reloads_when_the_row_changes():
+    row = _row(tmdb_api_key="enc:old")
+    db = FakeSession(row)
+    assert await get_effective_setting(db, "tmdb_api_key") == "old"
+
+    row.tmdb_api_key = "enc:new"
+    assert await get_effective_setting(db, "tmdb_api_key") == "old"  # Same version
+
+    row.updated_at += timedelta(seconds=1)
+    assert await get_effective_setting(db, "tmdb_api_key") == "new"
+    assert db.row_queries == 2
+
+
+async def test_env_fallback_for_missing_row_and_bad_tokens():
+    with patch.object(effective_settings.env_settings, "TMDB_API_KEY", "from-env"):
+        assert await get_effective_setting(FakeSession(None), "tmdb_api_key") == "from-env"
+
+        invalidate_settings_snapshot()
+        db = FakeSession(_row(tmdb_api_key="garbage"))
+        assert await get_effective_setting(db, "tmdb_api_key") == "from-env"
+        with patch.dict("os.environ", {"TMDB_API_KEY": "container"}):
+            assert (await build_subprocess_env(db))["TMDB_API_KEY"] == "container"
+
+
+async def test_unreadable_deepl_keys_disable_deepl_instead_of_using_env():
+    with patch.object(effective_settings.env_settings, "_parsed_deepl_api_keys", ["env-key"]):
+        db = FakeSession(_row(deepl_api_keys="garbage"))
+        assert await get_effective_setting(db, "deepl_api_keys") is None
+
+        invalidate_settings_snapshot()
+        assert await get_effective_setting(FakeSession(None), "deepl_api_keys") == ["env-key"]
+
+
+class FakeSyncSession:
+    """Sync counterpart of FakeSession, usable as the SyncSessionLocal factory."""
+
+    def __init__(self, row: SimpleNamespace | None) -> None:
+        self.row = row
+        self.queries = 0
+
+    def __call__(self) -> "FakeSyncSession":
+        return self
+
+    def __enter__(self) -> "FakeSyncSession":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+    def scalar(self, stmt):
+        self.queries += 1
+        if len(stmt.selected_columns) == 1:
+            return self.row.updated_at if self.row else None
+        return self.row
+
+
+def test_sync_reads_share_the_snapshot_and_honour_cleared_fields(decrypted_tokens):
+    from app.db import session as db_session
+
+    sync_db = FakeSyncSession(_row(omdb_api_key="enc:omdb", deepl_api_keys=""))
+
+    with (
+        patch.object(db_session, "SyncSessionLocal", sync_db),
+        patch.object(effective_settings.env_settings, "DEEPL_API_KEYS_ENV_STR", "env-key"),
+    ):
+        for _ in range(5):
+            assert effective_settings.get_effective_setting_sync("omdb_api_key") == "omdb"
+        assert effective_settings.get_effective_setting_sync("deepl_api_keys") is None
+
+        assert sync_db.queries == 1  # Within SYNC_RECHECK_INTERVAL_S: no version check
+        assert decrypted_tokens == ["enc:omdb"]
+
+        with patch.object(effective_settings, "SYNC_RECHECK_INTERVAL_S", 0):
+            sync_db.row.omdb_api_key = "enc:rotated"
+            sync_db.row.updated_at += timedelta(seconds=1)
+            assert effective_settings.get_effective_setting_sync("omdb_api_key") == "rotated"
+
+
+def test_sync_reads_of_unreadable_deepl_keys_do_not_fall_back_to_env():
+    from app.db import session as db_session
+
+    with (
+        patch.object(
+            db_session, "SyncSessionLocal", FakeSyncSession(_row(deepl_api_keys="garbage"))
+        ),
+        patch.object(effective_settings.env_settings, "_parsed_deepl_api_keys", ["env-key"]),
+    ):
+        assert effective_settings.get_effective_setting_sync("deepl_api_keys") is None
@@ -0,0 +1,85 @@
+# backend/tests/unit/utils/test_srt_codec.py
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+from app.modules.subtitle.utils import file_utils, srt_codec, subtitle_parser
+from app.modules.subtitle.utils.srt_codec import SrtCue
+
+SAMPLE = (
+    "\ufeff1\n00:00:01,000 --> 00:00:02,500\nHello\nworld\n\n"
+    "2\r\n00:00:03.500->00:00:04,000 X1:10 X2:20\r\nCăţel\r\n\r\n"
+    "garbage\n"
+    "3\nnot a timestamp\ndropped\n\n"
+    "4\n01:02:03,004 --> 01:02:04,000\nLast line without trailing newline"
+)
+
+
+def test_parse_yields_compact_cues_with_millisecond_timings():
+    cues = srt_codec.parse_srt(SAMPLE)
+
+    assert cues == [
+        SrtCue(1, 1000, 2500, "Hello\nworld"),
+        SrtCue(2, 3500, 4000, "Căţel", "X1:10 X2:20"),
+        SrtCue(4, 3_723_004, 3_724_000, "Last line without trailing newline"),
+    ]
+    assert not hasattr(cues[0], "__dict__")
+
+
+def test_compose_round_trips_in_standard_format():
+    text = srt_codec.compose_srt(srt_codec.parse_srt(SAMPLE))
+
+    assert text.startswith("1\n00:00:01,000 --> 00:00:02,500\nHello\nworld\n\n2\n")
+    assert "00:00:03,500 --> 00:00:04,000 X1:10 X2:20\n" in text
+    assert text.endswith("without trailing newline\n")
+    assert srt_codec.parse_srt(text) == srt_codec.parse_srt(SAMPLE)
+
+
+def test_streaming_matches_in_memory_parse_across_chunk_boundaries():
+    data = (
+        "".join(
+            f"{i}\r\n00:00:01,000 --> 00:00:02,000\r\nŞi ţară {i}\r\n\r\n" for i in range(1, 20001)
+        )
+    ).encode()
+
+    with patch.object(srt_codec, "_CHUNK_BYTES", 4093):  # Splits '\r\n' and multibyte chars
+        streamed = list(
+            srt_codec.iter_cues(
+                srt_codec.iter_lines(srt_codec.iter_decoded_chunks(io.BytesIO(data)))
+            )
+        )
+
+    assert streamed == srt_codec.parse_srt(data.decode("utf-8"))
+    assert len(streamed) == 20000
+
+
+def test_encoding_is_detected_once_and_falls_back_without_rereading(tmp_path: Path):
+    utf8_prefix = ("1\n00:00:01,000 --> 00:00:02,000\nabc\n\n" * 5000).encode()
+    path = tmp_path / "mixed.srt"
+    path.write_bytes(utf8_prefix + "ţară\n".encode("cp1250"))
+
+    with patch.object(
+        srt_codec, "detect_encoding_from_prefix", wraps=srt_codec.detect_encoding_from_prefix
+    ) as detect:
+        content = file_utils.read_srt_file(str(path))
+
+    assert detect.call_count == 1
+    assert content.startswith("1\n00:00:01,000")
+    assert content.endswith("\n") and len(content) == len(utf8_prefix) + 5
+
+
+def test_read_srt_file_strips_bom_and_handles_utf16(tmp_path: Path):
+    path = tmp_path / "bom.srt"
+    path.write_bytes("1\n00:00:01,000 --> 00:00:02,000\nSalut\n".encode("utf-16"))  # With BOM
+
+    assert file_utils.read_srt_file(str(path)) == "1\n00:00:01,000 --> 00:00:02,000\nSalut\n"
+    assert [cue.text for cue in srt_codec.iter_srt_file(path)] == ["Salut"]
+
+
+def test_legacy_tuple_helpers_use_the_codec():
+    segments = subtitle_parser.parse_srt_into_segments(SAMPLE)
+
+    assert segments[1] == ("2", "00:00:03,500 --> 00:00:04,000 X1:10 X2:20", "Căţel")
+    assert subtitle_parser.rebuild_srt_from_segments(segments) == srt_codec.compose_srt(
+        srt_codec.parse_srt(SAMPLE)
+    )
@@ -0,0 +1,91 @@
+# backend/tests/unit/utils/test_subtitle_matcher_profile.py
+from pathlib import Path
+
+from app.modules.subtitle.core import constants  # noqa: F401 Load before the matcher
+from app.modules.subtitle.utils import subtitle_matcher
+from app.modules.subtitle.utils.subtitle_matcher import (
+    MediaMatchProfile,
+    calculate_match_score,
+    score_candidate,
+    tokenize_and_normalize,
+)
+
+MEDIA = "Dark.S01E02.Lies.1080p.NF.WEB-DL.DDP5.1.x264-NTb.mkv"
+
+
+def _opensubs(index: int, release: str, language: str = "ro", **attributes) -> dict:
+    return {
+        "source": "opensubtitles",
+        "id": f"file-{index}",
+        "language": language,
+        "release_name": release,
+        "file_name": f"{release}.srt",
+        "attributes": attributes,
+    }
+
+
+def test_profile_extracts_episode_and_release_tags():
+    profile = MediaMatchProfile.from_filename(f"/media/series/{MEDIA}")
+
+    assert profile.basename == MEDIA
+    assert (profile.season, profile.episode) == ("01", "02")
+    assert profile.resolution == "1080p"
+    assert profile.release_group == "ntb"
+    assert {"web", "nf"} <= profile.source_tags
+
+
+def test_profile_scores_like_calculate_match_score():
+    profile = MediaMatchProfile.from_filename(MEDIA)
+    for release in (
+        "Dark.S01E02.720p.NF.WEB-DL.x264-NTb",
+        "Dark.S01E02.1080p.BluRay.x265-RARBG",
+        "Dark.S01E02.CAM",
+        "",
+    ):
+        tokens = tokenize_and_normalize(release)
+        assert profile.score_tokens(tokens) == calculate_match_score(list(profile.tokens), tokens)
+
+
+def test_batch_scoring_matches_per_candidate_scoring(tmp_path: Path):
+    subsro_file = tmp_path / "Dark.S01E02.1080p.WEB-DL.ro.srt"
+    subsro_file.write_text("1\n00:00:01,000 --> 00:00:02,000\nSalut\n", encoding="utf-8")
+    candidates = [
+        _opensubs(1, "Dark.S01E02.1080p.NF.WEB-DL.DDP5.1.x264-NTb", from_trusted=True),
+        _opensubs(2, "Dark.S01E03.1080p.NF.WEB-DL.DDP5.1.x264-NTb"),  # Other episode
+        _opensubs(3, "Dark.S01E02.720p.WEBRip", language="en", hearing_impaired=True),
+        _opensubs(4, "Dark.S01E02.1080p.NF.WEB-DL.DDP5.1.x264-NTb", machine_translated=True),
+        {"source": "subsro", "id": "url", "language": "ro", "extracted_path": str(subsro_file)},
+        {"source": "unknown", "id": "x", "language": "ro"},
+    ]
+    media_tokens = tokenize_and_normalize(Path(MEDIA).stem)
+
+    batch = MediaMatchProfile.from_filename(MEDIA).score_candidates(candidates, "ro")
+    single = [score_candidate(c, media_tokens, MEDIA, "01", "02", "ro") for c in candidates]
+
+    assert batch == single
+    assert batch[1] is None and batch[5] is None
+    assert batch[0][0] > batch[3][0]  # Machine translation penalty
+    assert batch[2][1] == 3  # Other language
+
+
+def test_local_matching_reuses_cached_profile(tmp_path: Path):
+    media = tmp_path / MEDIA
+    media.write_bytes(b"")
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    for name in (
+        "Dark.S01E01.1080p.NF.WEB-DL-NTb.ro.srt",
+        "Dark.S01E02.720p.HDTV.ro.srt",
+        "Dark.S01E02.1080p.NF.WEB-DL.DDP5.1.x264-NTb.ro.srt",
+    ):
+        (archive / name).write_text("", encoding="utf-8")
+    subtitle_matcher.get_media_profile.cache_clear()
+
+    for _ in range(2):
+        best, score = subtitle_matcher.find_best_matching_subtitle_local(
+            str(media), str(archive), "ro"
+        )
+        assert Path(best).name == "Dark.S01E02.1080p.NF.WEB-DL.DDP5.1.x264-NTb.ro.srt"
+        assert score > 0
+
+    assert subtitle_matcher.get_media_profile.cache_info().hits == 1
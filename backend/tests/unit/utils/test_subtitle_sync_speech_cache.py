@@ -0,0 +1,108 @@
+# backend/tests/unit/utils/test_subtitle_sync_speech_cache.py
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.modules.subtitle.services.speech_track_cache import SpeechTrackCache, speech_segments
+from app.modules.subtitle.utils import subtitle_sync
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello\n"
+
+
+def _track(*intervals_s: tuple[float, float], length_s: float = 10.0) -> np.ndarray:
+    speech = np.zeros(int(length_s * 100))
+    for start, end in intervals_s:
+        speech[int(start * 100) : int(end * 100)] = 1.0
+    return speech
+
+
+def test_speech_segments_bridge_short_pauses_and_drop_blips():
+    speech = _track((1.0, 2.0), (2.1, 3.0), (5.0, 5.1), (7.0, 8.5))
+
+    assert speech_segments(speech) == [(1000, 3000), (7000, 8500)]
+
+
+@pytest.fixture
+def media(tmp_path: Path) -> tuple[Path, Path]:
+    video = tmp_path / "library" / "Movie.2020.mkv"
+    video.parent.mkdir()
+    video.write_bytes(b"matroska")
+    sub = video.with_suffix(".ro.srt")
+    sub.write_text(SRT, encoding="utf-8")
+    return video, sub
+
+
+def test_audio_is_analysed_once_per_video(tmp_path: Path, media: tuple[Path, Path]):
+    video, sub = media
+    ffsubsync_runs: list[list[str]] = []
+    sync_runs: list[tuple[list[str], str]] = []
+
+    def fake_ffsubsync(command: list[str], **_kwargs) -> MagicMock:
+        ffsubsync_runs.append(command)
+        if "--serialize-speech" in command:  # What ffsubsync does with the flag
+            np.savez_compressed(
+                Path(command[1]).with_suffix(".npz"), speech=_track((1.0, 4.0), (6.0, 9.0))
+            )
+        return MagicMock(returncode=0, stdout="", stderr="shifting subtitles by 2.5 seconds")
+
+    def fake_sync_tool(command: list[str], _tool_name: str, _timeout) -> bool:
+        reference = Path(command[1])
+        sync_runs.append((command, reference.read_text() if reference.suffix == ".srt" else ""))
+        return True
+
+    with (
+        patch.object(subtitle_sync, "speech_track_cache", SpeechTrackCache(root=tmp_path / "vad")),
+        patch.object(subtitle_sync, "_is_tool_available", return_value=True),
+        patch.object(subtitle_sync.subprocess, "run", side_effect=fake_ffsubsync),
+        patch.object(subtitle_sync, "_run_sync_tool", side_effect=fake_sync_tool),
+    ):
+        first = subtitle_sync.check_offset_with_ffsubsync(str(video), str(sub))
+        second = subtitle_sync.check_offset_with_ffsubsync(str(video), str(sub))
+        subtitle_sync.sync_with_alass(str(video), str(sub), str(tmp_path / "out_alass.srt"))
+        subtitle_sync.sync_with_ffsubsync(str(video), str(sub), str(tmp_path / "out_ffs.srt"))
+
+    assert first == second == 2.5
+    assert "--serialize-speech" in ffsubsync_runs[0]
+    assert "--serialize-speech" not in ffsubsync_runs[1]
+    assert ffsubsync_runs[1][1].endswith(".npz")
+    assert not list(video.parent.glob("*.npz"))  # Nothing written into the library
+
+    (alass_command, alass_reference), (ffsubsync_command, _) = sync_runs
+    assert alass_command[1].endswith("_speech_reference.srt")
+    assert "00:00:01,000 --> 00:00:04,000" in alass_reference
+    assert ffsubsync_command[1] == ffsubsync_runs[1][1]
+    assert not Path(alass_command[1]).exists()
+
+
+def test_track_from_a_failed_or_corrupt_run_is_not_cached(tmp_path: Path, media: tuple[Path, Path]):
+    video, sub = media
+    cache = SpeechTrackCache(root=tmp_path / "vad")
+    outcomes = iter(["timeout", "corrupt", "ok"])
+
+    def fake_ffsubsync(command: list[str], **_kwargs) -> MagicMock:
+        outcome = next(outcomes)
+        serialized = Path(command[1]).with_suffix(".npz")
+        if outcome == "timeout":
+            serialized.write_bytes(b"PK\x03\x04partial")
+            raise subtitle_sync.subprocess.TimeoutExpired(command, 1)
+        if outcome == "corrupt":
+            serialized.write_bytes(b"PK\x03\x04truncated")
+        else:
+            np.savez_compressed(serialized, speech=_track((1.0, 4.0)))
+        return MagicMock(returncode=0, stdout="", stderr="shifting subtitles by 1.0 seconds")
+
+    with (
+        patch.object(subtitle_sync, "speech_track_cache", cache),
+        patch.object(subtitle_sync, "_is_tool_available", return_value=True),
+        patch.object(subtitle_sync.subprocess, "run", side_effect=fake_ffsubsync),
+    ):
+        assert subtitle_sync.check_offset_with_ffsubsync(str(video), str(sub)) is None
+        assert cache.stats()["stores"] == 0
+        assert subtitle_sync.check_offset_with_ffsubsync(str(video), str(sub)) == 1.0
+        assert cache.stats()["stores"] == 0
+        assert subtitle_sync.check_offset_with_ffsubsync(str(video), str(sub)) == 1.0
+
+    assert cache.stats()["stores"] == 1
+    assert not [p for p in cache.root.iterdir() if p.name.startswith(".")]  # Staging removed
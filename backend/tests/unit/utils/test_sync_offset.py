@@ -0,0 +1,163 @@
+# backend/tests/unit/utils/test_sync_offset.py
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.modules.subtitle.services.speech_track_cache import SpeechTrackCache, load_speech_track
+from app.modules.subtitle.utils import subtitle_sync, sync_offset
+from app.modules.subtitle.utils.srt_codec import SrtCue, compose_srt
+from app.modules.subtitle.utils.sync_offset import (
+    OffsetEstimate,
+    estimate_offset_from_masks,
+    speech_track_from_pcm,
+    subtitle_mask,
+)
+
+
+def _dialogue(rng: np.random.Generator, length_s: float = 1200.0) -> list[tuple[float, float]]:
+    """Random speech turns: 0.5-4 s of talking separated by 0.3-6 s pauses."""
+    intervals, t = [], rng.uniform(0, 5)
+    while t < length_s - 5:
+        end = t + rng.uniform(0.5, 4.0)
+        intervals.append((t, end))
+        t = end + rng.uniform(0.3, 6.0)
+    return intervals
+
+
+def _speech_track(intervals: list[tuple[float, float]], length_s: float = 1200.0) -> np.ndarray:
+    speech = np.zeros(int(length_s * 100), dtype=np.float32)
+    for start, end in intervals:
+        speech[int(start * 100) : int(end * 100)] = 1.0
+    return speech
+
+
+def _cues(intervals: list[tuple[float, float]], shift_s: float, rng: np.random.Generator) -> list:
+    """Subtitles for the intervals, displaced by `shift_s`, with realistic timing noise."""
+    cues = []
+    for index, (start, end) in enumerate(intervals, 1):
+        if rng.random() < 0.1:  # Lines without a subtitle
+            continue
+        start_ms = int((start + shift_s + rng.normal(0, 0.1)) * 1000)
+        end_ms = int((end + shift_s + rng.normal(0, 0.1)) * 1000)
+        if start_ms >= 0:
+            cues.append(SrtCue(index, start_ms, end_ms, "..."))
+    return cues
+
+
+@pytest.mark.parametrize("displacement_s", [0.0, 3.2, -7.5, 42.0])
+def test_recovers_known_offsets(displacement_s: float):
+    rng = np.random.default_rng(7)
+    intervals = _dialogue(rng)
+    speech = _speech_track(intervals)
+    cues = _cues(intervals, displacement_s, rng)
+
+    estimate = estimate_offset_from_masks(speech, subtitle_mask(cues, length=speech.size))
+
+    assert estimate is not None
+    # The subtitles must be shifted back by their displacement
+    assert estimate.offset_s == pytest.approx(-displacement_s, abs=0.05)
+    assert estimate.confidence > 0.3
+
+
+def test_unrelated_subtitles_have_low_confidence():
+    rng = np.random.default_rng(11)
+    speech = _speech_track(_dialogue(rng))
+    cues = _cues(_dialogue(rng), 0.0, rng)
+
+    estimate = estimate_offset_from_masks(speech, subtitle_mask(cues, length=speech.size))
+
+    assert estimate is not None
+    assert estimate.confidence < 0.15
+
+
+def test_subtitle_mask_marks_displayed_frames():
+    mask = subtitle_mask([SrtCue(1, 1000, 1500, "a"), SrtCue(2, 1200, 2000, "b")])
+
+    assert mask.size == 200
+    assert not mask[:100].any()
+    assert mask[100:200].all()
+
+
+def test_energy_vad_finds_speech_bursts_in_pcm():
+    rng = np.random.default_rng(3)
+    samples = rng.normal(0, 30, 16000 * 10)  # 10 s of background noise
+    for start_s, end_s in [(1.0, 2.5), (4.0, 4.8), (7.2, 9.0)]:
+        burst = slice(int(start_s * 16000), int(end_s * 16000))
+        samples[burst] += rng.normal(0, 3000, burst.stop - burst.start)
+    pcm = samples.clip(-32768, 32767).astype("<i2").tobytes()
+    chunks = [pcm[i : i + 4097] for i in range(0, len(pcm), 4097)]  # Not frame-aligned
+
+    speech = speech_track_from_pcm(chunks, use_webrtc=False)
+
+    assert speech.size == 1000
+    expected = _speech_track([(1.0, 2.5), (4.0, 4.8), (7.2, 9.0)], length_s=10.0)
+    assert np.mean(speech == expected) > 0.98
+
+
+def test_sync_uses_confident_estimate_and_stores_the_track(tmp_path: Path):
+    video = tmp_path / "Movie.2020.mkv"
+    video.write_bytes(b"matroska")
+    sub = tmp_path / "Movie.2020.ro.srt"
+    rng = np.random.default_rng(5)
+    intervals = _dialogue(rng, length_s=600.0)
+    sub.write_text(compose_srt(_cues(intervals, 0.3, rng)), encoding="utf-8")
+    cache = SpeechTrackCache(root=tmp_path / "vad")
+
+    with (
+        patch.object(sync_offset, "speech_track_cache", cache),
+        patch.object(
+            sync_offset, "extract_speech_track", return_value=_speech_track(intervals, 600.0)
+        ) as extract,
+        patch.object(subtitle_sync, "check_offset_with_ffsubsync") as ffsubsync_check,
+        patch.object(subtitle_sync, "sync_with_alass") as alass,
+    ):
+        result = subtitle_sync.sync_subtitles_with_audio(str(video), str(sub))
+        again = sync_offset.estimate_offset(video, sub)
+
+    assert result == str(sub.resolve())
+    ffsubsync_check.assert_not_called()
+    alass.assert_not_called()  # Within the threshold, nothing to sync
+    extract.assert_called_once()  # The second estimate reads the cached track
+    assert again is not None and again.offset_s == pytest.approx(-0.3, abs=0.05)
+    (stored,) = (tmp_path / "vad").glob("*.npz")
+    assert load_speech_track(stored).size == 60000
+
+
+def test_ambiguous_estimate_falls_back_to_ffsubsync(tmp_path: Path):
+    video = tmp_path / "Movie.2020.mkv"
+    video.write_bytes(b"matroska")
+    sub = tmp_path / "Movie.2020.ro.srt"
+    sub.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n", encoding="utf-8")
+
+    with (
+        patch.object(
+            subtitle_sync, "estimate_offset", return_value=OffsetEstimate(4.0, confidence=0.02)
+        ),
+        patch.object(subtitle_sync, "check_offset_with_ffsubsync", return_value=0.2) as check,
+    ):
+        subtitle_sync.sync_subtitles_with_audio(str(video), str(sub))
+
+    check.assert_called_once()
+
+
+def test_corrupt_cached_track_is_dropped_and_ffsubsync_used(tmp_path: Path):
+    video = tmp_path / "Movie.2020.mkv"
+    video.write_bytes(b"matroska")
+    sub = tmp_path / "Movie.2020.ro.srt"
+    sub.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n", encoding="utf-8")
+    cache = SpeechTrackCache(root=tmp_path / "vad")
+    key = sync_offset.make_probe_key(video.resolve())
+    cache.root.mkdir()
+    (cache.root / f"{key}.npz").write_bytes(b"PK\x03\x04truncated")
+
+    with (
+        patch.object(sync_offset, "speech_track_cache", cache),
+        patch.object(sync_offset, "extract_speech_track", return_value=None),
+        patch.object(subtitle_sync, "check_offset_with_ffsubsync", return_value=0.2) as check,
+    ):
+        subtitle_sync.sync_subtitles_with_audio(str(video), str(sub))
+
+    check.assert_called_once()
+    assert cache.get(key) is None
@@ -87,7 +87,12 @@ export function useJobLogs(jobId: string | null) {
         ? import.meta.env.VITE_WS_BASE_URL
         : `${protocol}//${window.location.host}/api/v1`;
 
-      const url = `${baseUrl}/ws/jobs/${wsJobId}/logs?token=${token}`;
+      // Resume after the last stream entry we already have, so replay has no duplicates
+      const lastId = [...currentLogsRef.current]
+        .reverse()
+        .find((log) => log.id)?.id;
+      const resumeParam = lastId ? `&last_id=${encodeURIComponent(lastId)}` : "";
+      const url = `${baseUrl}/ws/jobs/${wsJobId}/logs?token=${token}${resumeParam}`;
 
       const ws = new WebSocket(url);
       wsRef.current = ws;
@@ -118,10 +123,11 @@ export function useJobLogs(jobId: string | null) {
           }
 
           // Use Ref to check for duplicates and append
-          const exists = currentLogsRef.current.some(
-            (log) =>
-              log.payload.message === data.payload.message &&
-              log.payload.ts === data.payload.ts,
+          const exists = currentLogsRef.current.some((log) =>
+            data.id && log.id
+              ? log.id === data.id
+              : log.payload.message === data.payload.message &&
+                log.payload.ts === data.payload.ts,
           );
 
           if (!exists) {
@@ -23,9 +23,12 @@ export interface JobCreate {
   folder_path: string;
   language?: string;
   log_level?: "DEBUG" | "INFO" | "WARNING" | "ERROR";
+  incremental?: boolean;
 }
 
 export interface LogMessage {
+  /** Redis stream entry ID; sent back as `last_id` to resume after a reconnect. */
+  id?: string;
   type: "log" | "status" | "info" | "system" | "error";
   payload: {
     ts?: string;